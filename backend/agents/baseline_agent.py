@@ -14,10 +14,10 @@ This allows us to measure the value-add of each SOTA architecture.
 
 import asyncio
 import logging
-import os
 from typing import Any, Dict, List, Optional
 
-from llama_index.core import VectorStoreIndex, StorageContext, load_index_from_storage, Settings
+from llama_index.core import Settings
+from backend.utils.segment_vector_store import SegmentVectorStore, default_vector_store_dir
 from backend.core.llm_factory import LLMFactory
 from backend.config import get_settings
 
@@ -49,20 +49,18 @@ class BaselineAgent:
         # Load Vector Store Index
         self.vector_index = self._load_vector_index()
     
-    def _load_vector_index(self) -> Optional[VectorStoreIndex]:
-        """Load the persisted vector index from Knowledge Extraction phase."""
+    def _load_vector_index(self) -> Optional[SegmentVectorStore]:
+        """Open the segment vector store persisted by the Knowledge Extraction phase."""
         try:
-            storage_dir = os.path.join(os.getcwd(), "backend", "storage", "vector_store")
+            storage_dir = default_vector_store_dir()
             
-            if not os.path.exists(storage_dir) or not os.path.exists(os.path.join(storage_dir, "docstore.json")):
+            if not SegmentVectorStore.exists(storage_dir):
                 self.logger.warning(f"⚠️ Vector store not found at {storage_dir}. Knowledge Extraction must run first.")
                 return None
                 
-            self.logger.info(f"Loading vector index from {storage_dir}...")
-            storage_context = StorageContext.from_defaults(persist_dir=storage_dir)
-            index = load_index_from_storage(storage_context)
-            self.logger.info("✅ Vector index loaded successfully.")
-            return index
+            store = SegmentVectorStore.open(storage_dir)
+            self.logger.info(f"✅ Vector store opened ({len(store)} chunks, {len(store.segments)} segments).")
+            return store
             
         except Exception as e:
             self.logger.error(f"❌ Failed to load vector index: {e}")
@@ -87,7 +85,7 @@ class BaselineAgent:
         if self.vector_index:
             try:
                 # Top-K = 3 for baseline
-                retriever = self.vector_index.as_retriever(similarity_top_k=3)
+                retriever = self.vector_index.as_retriever(self.embedding_model, similarity_top_k=3)
                 nodes = await retriever.aretrieve(question)
                 retrieved_nodes = [n.get_content() for n in nodes]
                 retrieved_context = "\n\n".join(retrieved_nodes)
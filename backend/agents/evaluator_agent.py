@@ -1,31 +1,38 @@
+import asyncio
 import logging
 import uuid
 import re
-import time  # FIX Issue 6: Move to top of file
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from enum import Enum
 import json
 
 from backend.core.base_agent import BaseAgent, AgentType
+from backend.core.course_kg_cache import get_course_kg_cache
 from backend.core.semantic_scorer import SemanticScorer
 from backend.core.error_classifier import ErrorClassifier
 from backend.core.mastery_tracker import MasteryTracker
 from backend.core.decision_engine import DecisionEngine
 from backend.models.evaluation import (
-    ErrorType, PathDecision, Misconception, EvaluationResult
+    ErrorType, PathDecision, Misconception, EvaluationResult, FusedEvaluation
 )
 from backend.config import get_settings
 from backend.core.constants import (
     EVAL_MASTERY_WEIGHT,
     EVAL_DIFFICULTY_ADJUSTMENT,
     EVAL_MASTERY_BOOST,
+    EVAL_FUSED_GRADING,
+    EVAL_FAST_PATH_ENABLED,
+    EVAL_BATCH_CONCURRENCY,
+    EVAL_BATCH_MAX_ITEMS,
     THRESHOLD_MASTERED,
     THRESHOLD_PROCEED,
     THRESHOLD_ALTERNATE,
     THRESHOLD_ALERT
 )
 from backend.core.llm_factory import LLMFactory
+from backend.core.grading_cascade import GradingCascade, CascadeVerdict
+from backend.core.kg_synchronizer import KGSynchronizer
 from backend.services.instructor_notification import InstructorNotificationService
 
 logger = logging.getLogger(__name__)
@@ -48,6 +55,10 @@ class EvaluatorAgent(BaseAgent):
     # FIX Issue 5: Mastery update weight constant (Legacy, kept for compatibility)
     MASTERY_WEIGHT = EVAL_MASTERY_WEIGHT
     
+    # Fused grading: one structured call instead of score/classify/misconception/feedback
+    FUSED_GRADING = EVAL_FUSED_GRADING
+    FAST_PATH_GRADING = EVAL_FAST_PATH_ENABLED
+    
     # SCIENTIFIC FIX: Hybrid DKT-LLM Parameters
     # Source: Piech et al. (2015) & Liu et al. (2024)
     P_LEARN = 0.1      # BKT: Probability of learning after one attempt
@@ -93,15 +104,17 @@ class EvaluatorAgent(BaseAgent):
             course_kg=course_kg,
             embedding_model=embedding_model
         )
+        # Deterministic fast path (exact / numeric / embedding) ahead of the LLM;
+        # the embedding model is only loaded when the embedding tier is reached
+        self.grading_cascade = GradingCascade(
+            embedding_model=embedding_model,
+            embedding_loader=LLMFactory.get_embedding_model
+        )
         self.tracker = MasteryTracker(
             personal_kg=personal_kg,
             course_kg=course_kg
         )
         
-        # FIX Issue 3+4: Add concept cache with TTL tracking
-        self._concept_cache = {}  # {concept_id: {"data": concept, "timestamp": time}}
-        self._cache_ttl = 3600  # 1 hour TTL
-        
         # Initialize Notification Service
         self.notification_service = InstructorNotificationService()
         
@@ -197,108 +210,69 @@ class EvaluatorAgent(BaseAgent):
             
             self.logger.info(f"📊 Evaluating {learner_id} on {concept_id}")
             
-            # Step 1: Get concept details (with cache + TTL)
-            cache_entry = self._concept_cache.get(concept_id)
+            # Step 1: Get concept details (shared Course KG cache, invalidated on COURSEKG_UPDATED)
+            concept = await self._load_concept(concept_id)
             
-            # FIX Issue 4: Check TTL
-            if cache_entry and (time.time() - cache_entry["timestamp"] < self._cache_ttl):
-                # FIX Issue 5: Return copy to prevent mutation
-                concept = cache_entry["data"].copy()
-                self.logger.debug(f"Concept {concept_id} loaded from cache")
-            else:
-                neo4j = self.state_manager.neo4j
-                # Expanded query to get all concept properties
-                concept_result = await neo4j.run_query(
-                    """
-                    MATCH (c:CourseConcept {concept_id: $concept_id})
-                    OPTIONAL MATCH (c)-[:HAS_PREREQUISITE]->(prereq:CourseConcept)
-                    RETURN c,
-                           c.common_misconceptions as misconceptions,
-                           collect(DISTINCT prereq.concept_id) as prerequisites
-                    """,
-                    concept_id=concept_id
-                )
-                
-                if not concept_result:
-                    return {
-                        "success": False,
-                        "error": f"Concept not found: {concept_id}",
-                        "agent_id": self.agent_id
-                    }
-                
-                concept = concept_result[0].get("c", {})
-                # FIX Issue 7: Only add if not already present
-                if "common_misconceptions" not in concept:
-                    concept["common_misconceptions"] = concept_result[0].get("misconceptions", [])
-                if "prerequisites" not in concept:
-                    concept["prerequisites"] = concept_result[0].get("prerequisites", [])
-                
-                self.logger.debug(f"Concept {concept_id} loaded: {concept.get('name', 'Unknown')}")
-                
-                # FIX Issue 4: Cache with timestamp for TTL
-                self._concept_cache[concept_id] = {
-                    "data": concept.copy(),  # FIX Issue 5: Store copy
-                    "timestamp": time.time()
+            if concept is None:
+                return {
+                    "success": False,
+                    "error": f"Concept not found: {concept_id}",
+                    "agent_id": self.agent_id
                 }
             
-            # Step 2: Score response
-            score_result = await self._score_response(
-                learner_response=learner_response,
-                expected_answer=expected_answer,
-                explanation=correct_answer_explanation,
-                force_real=force_real
-            )
-            
-            score = score_result["score"]  # 0-1
+            # Step 2: Score response - clearly correct answers are settled by the
+            # grading cascade without an LLM call; otherwise the fused call also
+            # returns the diagnosis. The learner profile is fetched alongside
+            verdict = await self._fast_path_grade(learner_response, expected_answer, force_real)
+            if verdict is not None:
+                score, fused = verdict.score, None
+                learner_profile = await self.state_manager.get_learner_profile(learner_id)
+            else:
+                (score, fused), learner_profile = await asyncio.gather(
+                    self._grade_response(
+                        learner_response=learner_response,
+                        expected_answer=expected_answer,
+                        explanation=correct_answer_explanation,
+                        concept=concept,
+                        force_real=force_real
+                    ),
+                    self.state_manager.get_learner_profile(learner_id)
+                )
             
-            # Step 3-5: If incorrect, classify error + detect misconception + feedback
-            error_type = ErrorType.CORRECT
-            misconception = None
-            feedback = None
+            current_mastery = 0.0
+            if learner_profile:
+                for mastery in learner_profile.get("current_mastery", []):
+                    if mastery.get("concept_id") == concept_id:
+                        current_mastery = mastery.get("mastery_level", 0.0)
+                        break
             
-            if score < 0.8:
-                # Step 3: Classify error (with concept context)
-                error_result = await self._classify_error(
+            # Step 3-5 (diagnosis + feedback) and Step 7 (LKT mastery update) run
+            # concurrently: LKT only needs the score
+            (error_type, misconception, feedback), new_mastery = await asyncio.gather(
+                self._diagnose_response(
+                    score=score,
+                    fused=fused,
                     learner_response=learner_response,
                     expected_answer=expected_answer,
-                    concept=concept,  # FIX Issue 1: Add concept context
-                    force_real=force_real
-                )
-                error_type = ErrorType(error_result["error_type"])
-                
-                # Step 4: Detect misconception
-                misconception_result = await self._detect_misconception(
-                    learner_response=learner_response,
+                    explanation=correct_answer_explanation,
                     concept=concept,
-                    error_type=error_type,
                     force_real=force_real
-                )
-                misconception = misconception_result.get("misconception")
-                
-                # Step 5: Generate feedback
-                feedback_result = await self._generate_feedback(
+                ),
+                self._update_learner_mastery(
+                    learner_id=learner_id,
+                    concept_id=concept_id,
+                    score=score,
+                    current_mastery=current_mastery,
+                    concept_difficulty=concept.get("difficulty", 2),
+                    error_type=fused.error_type if fused else None,
+                    misconception=fused.misconception if fused else None,
                     learner_response=learner_response,
                     expected_answer=expected_answer,
-                    error_type=error_type,
-                    misconception=misconception,
-                    explanation=correct_answer_explanation,
-                    force_real=force_real
+                    concept_name=concept.get("name", concept_id)
                 )
-                feedback = feedback_result["feedback"]
-            else:
-                # Correct answer - generate praise
-                feedback = f"Excellent! Your answer '{learner_response}' is correct. "
-                feedback += f"You understand that {expected_answer}. Well done!"
+            )
             
             # Step 6: Make path decision
-            learner_profile = await self.state_manager.get_learner_profile(learner_id)
-            current_mastery = 0.0
-            if learner_profile:
-                for mastery in learner_profile.get("current_mastery", []):
-                    if mastery.get("concept_id") == concept_id:
-                        current_mastery = mastery.get("mastery_level", 0.0)
-                        break
-            
             decision = await self._make_path_decision(
                 score=score,
                 current_mastery=current_mastery,
@@ -306,20 +280,6 @@ class EvaluatorAgent(BaseAgent):
                 concept_difficulty=concept.get("difficulty", 2)
             )
             
-            # Step 7: Update learner progress (Hybrid DKT-LLM)
-            new_mastery = await self._update_learner_mastery(
-                learner_id=learner_id,
-                concept_id=concept_id,
-                score=score,
-                current_mastery=current_mastery,
-                concept_difficulty=concept.get("difficulty", 2),
-                error_type=error_type,
-                misconception=misconception,
-                learner_response=learner_response,
-                expected_answer=expected_answer,
-                concept_name=concept.get("name", concept_id)
-            )
-            
             # Prepare result
             result = {
                 "success": True,
@@ -332,6 +292,7 @@ class EvaluatorAgent(BaseAgent):
                 "feedback": feedback,
                 "decision": decision.value,
                 "new_mastery": new_mastery,
+                "grading_mode": self._grading_mode(verdict, fused),
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -396,6 +357,518 @@ class EvaluatorAgent(BaseAgent):
                 "agent_id": self.agent_id
             }
     
+    async def execute_batch(self, **kwargs) -> Dict[str, Any]:
+        """
+        Grade a whole quiz for one learner.
+        
+        Concepts and the learner profile are loaded once, answers are graded
+        concurrently (at most EVAL_BATCH_CONCURRENCY at a time), mastery is
+        updated once per concept and one EVALUATION_COMPLETED batch event is
+        emitted for the quiz.
+        
+        Args:
+            learner_id: str - Learner ID
+            answers: List[Dict] - concept_id, learner_response, expected_answer,
+                correct_answer_explanation and optional question_id per answer
+            force_real: bool - Override mock settings
+            
+        Returns:
+            Dict with per-answer results (in input order) and a quiz summary
+        """
+        learner_id = (kwargs.get("learner_id") or "").strip()
+        answers = kwargs.get("answers") or []
+        force_real = kwargs.get("force_real", False)
+        
+        if not learner_id or not self.ID_PATTERN.match(learner_id):
+            return {
+                "success": False,
+                "error": f"Invalid learner_id format: {learner_id}",
+                "agent_id": self.agent_id
+            }
+        if not 0 < len(answers) <= EVAL_BATCH_MAX_ITEMS:
+            return {
+                "success": False,
+                "error": f"Between 1 and {EVAL_BATCH_MAX_ITEMS} answers required",
+                "agent_id": self.agent_id
+            }
+        
+        try:
+            items = [self._parse_batch_answer(index, answer) for index, answer in enumerate(answers)]
+            valid = [item for item in items if "error" not in item]
+            concept_ids = list(dict.fromkeys(item["concept_id"] for item in valid))
+            
+            self.logger.info(f"📊 Batch evaluating {learner_id}: {len(items)} answers, {len(concept_ids)} concepts")
+            
+            # Step 1: Concepts and learner profile, loaded once for the whole quiz,
+            # while the cascade embeds every reference answer up front
+            *concept_rows, learner_profile, _ = await asyncio.gather(
+                *(self._load_concept(concept_id) for concept_id in concept_ids),
+                self.state_manager.get_learner_profile(learner_id),
+                self._precompute_reference_embeddings(
+                    [item["expected_answer"] for item in valid], force_real
+                )
+            )
+            concepts = dict(zip(concept_ids, concept_rows))
+            learner_profile = learner_profile or {}
+            current_mastery = {
+                mastery.get("concept_id"): mastery.get("mastery_level", 0.0)
+                for mastery in learner_profile.get("current_mastery", [])
+            }
+            
+            # Step 2-5: Score and diagnose answers concurrently
+            semaphore = asyncio.Semaphore(EVAL_BATCH_CONCURRENCY)
+            
+            async def grade(item: Dict[str, Any]) -> None:
+                concept = concepts.get(item["concept_id"])
+                if concept is None:
+                    item["error"] = f"Concept not found: {item['concept_id']}"
+                    return
+                async with semaphore:
+                    await self._grade_batch_item(item, concept, force_real)
+            
+            await asyncio.gather(*(grade(item) for item in valid))
+            graded = [item for item in valid if "error" not in item]
+            
+            # Step 7: One aggregated LKT mastery update for the quiz
+            new_mastery = {}
+            if graded:
+                new_mastery = await self._update_learner_mastery_batch(
+                    learner_id, learner_profile, graded, concepts, current_mastery
+                )
+            
+            # Step 6: Path decision per answer
+            for item in graded:
+                concept = concepts[item["concept_id"]]
+                item["decision"] = await self._make_path_decision(
+                    score=item["score"],
+                    current_mastery=current_mastery.get(item["concept_id"], 0.0),
+                    error_type=item["error_type"],
+                    concept_difficulty=concept.get("difficulty", 2)
+                )
+            
+            results = [self._batch_item_result(item, new_mastery) for item in items]
+            scores = [item["score"] for item in graded]
+            average_score = sum(scores) / len(scores) if scores else 0.0
+            grading_modes: Dict[str, int] = {}
+            for item in graded:
+                grading_modes[item["grading_mode"]] = grading_modes.get(item["grading_mode"], 0) + 1
+            
+            # Step 8: One consolidated event for the whole quiz
+            if graded:
+                await self.send_message(
+                    receiver="path_planner",
+                    message_type="EVALUATION_COMPLETED",
+                    payload={
+                        "learner_id": learner_id,
+                        "batch": True,
+                        "average_score": average_score,
+                        "items": [
+                            {
+                                "concept_id": item["concept_id"],
+                                "question_id": item["question_id"],
+                                "score": item["score"],
+                                "decision": item["decision"].value,
+                                "new_mastery": new_mastery.get(item["concept_id"], 0.0)
+                            }
+                            for item in graded
+                        ]
+                    }
+                )
+            
+            # Instructor alert once per critically failed concept
+            lowest: Dict[str, float] = {}
+            for item in graded:
+                lowest[item["concept_id"]] = min(item["score"], lowest.get(item["concept_id"], 1.0))
+            concept_history = learner_profile.get("concept_attempts", {})
+            for concept_id, score in lowest.items():
+                if score < THRESHOLD_ALERT:
+                    await self.notification_service.notify_failure(
+                        learner_id=learner_id,
+                        concept_id=concept_id,
+                        score=score,
+                        attempts=concept_history.get(concept_id, {}).get("attempts", 1)
+                    )
+            
+            self.logger.info(f"✅ Batch evaluation complete: {len(graded)}/{len(items)} graded ({average_score:.1%})")
+            
+            return {
+                "success": True,
+                "agent_id": self.agent_id,
+                "learner_id": learner_id,
+                "results": results,
+                "summary": {
+                    "total": len(items),
+                    "graded": len(graded),
+                    "failed": len(items) - len(graded),
+                    "average_score": average_score,
+                    "grading_modes": grading_modes
+                },
+                "new_mastery": new_mastery,
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        except Exception as e:
+            self.logger.error(f"❌ Batch evaluation failed: {e}")
+            
+            try:
+                await self.send_message(
+                    receiver="path_planner",
+                    message_type="EVALUATION_FAILED",
+                    payload={"learner_id": learner_id, "batch": True, "error": str(e)}
+                )
+            except Exception:
+                pass
+            
+            return {
+                "success": False,
+                "error": str(e),
+                "agent_id": self.agent_id
+            }
+    
+    def _parse_batch_answer(self, index: int, answer: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize one quiz answer; invalid answers carry an 'error' key"""
+        concept_id = (answer.get("concept_id") or "").strip()
+        item = {
+            "index": index,
+            "question_id": answer.get("question_id"),
+            "concept_id": concept_id,
+            "learner_response": self._sanitize_input((answer.get("learner_response") or "").strip()),
+            "expected_answer": (answer.get("expected_answer") or "").strip(),
+            "explanation": answer.get("correct_answer_explanation") or ""
+        }
+        if not concept_id or not item["learner_response"]:
+            item["error"] = "concept_id, learner_response required"
+        elif not self.ID_PATTERN.match(concept_id):
+            item["error"] = f"Invalid concept_id format: {concept_id}"
+        return item
+    
+    async def _grade_batch_item(self, item: Dict[str, Any], concept: Dict[str, Any], force_real: bool) -> None:
+        """Steps 2-5 for one quiz answer; results are written into the item"""
+        try:
+            verdict = await self._fast_path_grade(item["learner_response"], item["expected_answer"], force_real)
+            if verdict is not None:
+                score, fused = verdict.score, None
+            else:
+                score, fused = await self._grade_response(
+                    learner_response=item["learner_response"],
+                    expected_answer=item["expected_answer"],
+                    explanation=item["explanation"],
+                    concept=concept,
+                    force_real=force_real
+                )
+            error_type, misconception, feedback = await self._diagnose_response(
+                score=score,
+                fused=fused,
+                learner_response=item["learner_response"],
+                expected_answer=item["expected_answer"],
+                explanation=item["explanation"],
+                concept=concept,
+                force_real=force_real
+            )
+            item.update(
+                score=score,
+                error_type=error_type,
+                misconception=misconception,
+                feedback=feedback,
+                grading_mode=self._grading_mode(verdict, fused)
+            )
+        except Exception as e:
+            self.logger.error(f"❌ Batch answer {item['index']} failed: {e}")
+            item["error"] = str(e)
+    
+    @staticmethod
+    def _batch_item_result(item: Dict[str, Any], new_mastery: Dict[str, float]) -> Dict[str, Any]:
+        result = {
+            "index": item["index"],
+            "question_id": item["question_id"],
+            "concept_id": item["concept_id"]
+        }
+        if "error" in item:
+            return {**result, "success": False, "error": item["error"]}
+        return {
+            **result,
+            "success": True,
+            "score": item["score"],
+            "error_type": item["error_type"].value,
+            "misconception": item["misconception"],
+            "feedback": item["feedback"],
+            "decision": item["decision"].value,
+            "new_mastery": new_mastery.get(item["concept_id"], 0.0),
+            "grading_mode": item["grading_mode"]
+        }
+    
+    @staticmethod
+    def _grading_mode(verdict: Optional[CascadeVerdict], fused: Optional[FusedEvaluation]) -> str:
+        if verdict is not None:
+            return f"fast_path:{verdict.tier}"
+        return "fused" if fused else "staged"
+    
+    async def _load_concept(self, concept_id: str) -> Optional[Dict[str, Any]]:
+        """Concept properties, misconceptions and prerequisites from the Course KG cache"""
+        neo4j = self.state_manager.neo4j
+        # Expanded query to get all concept properties
+        concept_result = await get_course_kg_cache().run_query(
+            neo4j,
+            """
+            MATCH (c:CourseConcept {concept_id: $concept_id})
+            OPTIONAL MATCH (c)-[:HAS_PREREQUISITE]->(prereq:CourseConcept)
+            RETURN c,
+                   c.common_misconceptions as misconceptions,
+                   collect(DISTINCT prereq.concept_id) as prerequisites
+            """,
+            concept_id=concept_id
+        )
+        
+        if not concept_result:
+            return None
+        
+        concept = concept_result[0].get("c", {})
+        # FIX Issue 7: Only add if not already present
+        if "common_misconceptions" not in concept:
+            concept["common_misconceptions"] = concept_result[0].get("misconceptions", [])
+        if "prerequisites" not in concept:
+            concept["prerequisites"] = concept_result[0].get("prerequisites", [])
+        
+        self.logger.debug(f"Concept {concept_id} loaded: {concept.get('name', 'Unknown')}")
+        return concept
+    
+    async def _fast_path_grade(
+        self,
+        learner_response: str,
+        expected_answer: str,
+        force_real: bool = False
+    ) -> Optional[CascadeVerdict]:
+        """
+        Grading cascade ahead of the LLM (see core/grading_cascade.py).
+        
+        Returns:
+            CascadeVerdict for a confidently correct answer, None to escalate
+        """
+        if not self.FAST_PATH_GRADING or not expected_answer:
+            return None
+        try:
+            # Mock mode stays on the deterministic tiers (no embedding model load)
+            verdict = await self.grading_cascade.grade(
+                learner_response,
+                expected_answer,
+                use_embeddings=force_real or not self.settings.MOCK_LLM
+            )
+        except Exception as e:
+            self.logger.warning(f"⚠️ Grading cascade failed, escalating to LLM: {e}")
+            return None
+        if verdict is not None:
+            self.logger.info(f"⚡ Fast-path grade ({verdict.tier}): {verdict.score:.2f}")
+        return verdict
+    
+    async def _precompute_reference_embeddings(self, references: List[str], force_real: bool = False) -> int:
+        """Embed a quiz's reference answers before grading (embedding tier only)"""
+        if not self.FAST_PATH_GRADING or not (force_real or not self.settings.MOCK_LLM):
+            return 0
+        try:
+            return await self.grading_cascade.precompute(references)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Reference embedding precompute failed: {e}")
+            return 0
+    
+    async def _grade_response(
+        self,
+        learner_response: str,
+        expected_answer: str,
+        explanation: str,
+        concept: Dict[str, Any],
+        force_real: bool = False
+    ) -> Tuple[float, Optional[FusedEvaluation]]:
+        """
+        Score the response, via the fused call when enabled.
+        
+        Returns:
+            (score, FusedEvaluation or None when the staged pipeline is used)
+        """
+        if self.FUSED_GRADING:
+            fused = await self._fused_evaluate(
+                learner_response=learner_response,
+                expected_answer=expected_answer,
+                explanation=explanation,
+                concept=concept,
+                force_real=force_real
+            )
+            if fused is not None:
+                return fused.score, fused
+        
+        score_result = await self._score_response(
+            learner_response=learner_response,
+            expected_answer=expected_answer,
+            explanation=explanation,
+            force_real=force_real
+        )
+        return score_result["score"], None
+    
+    async def _diagnose_response(
+        self,
+        score: float,
+        fused: Optional[FusedEvaluation],
+        learner_response: str,
+        expected_answer: str,
+        explanation: str,
+        concept: Dict[str, Any],
+        force_real: bool = False
+    ) -> Tuple[ErrorType, Optional[str], str]:
+        """
+        Steps 3-5: error type, misconception and feedback for incorrect answers.
+        Uses the fused result when available, otherwise the staged LLM calls.
+        """
+        if score >= 0.8:
+            # Correct answer - generate praise
+            feedback = f"Excellent! Your answer '{learner_response}' is correct. "
+            feedback += f"You understand that {expected_answer}. Well done!"
+            return ErrorType.CORRECT, None, feedback
+        
+        if fused is not None:
+            # Below the pass mark the answer is never CORRECT (same as the staged classifier)
+            error_type = fused.error_type if fused.error_type != ErrorType.CORRECT else ErrorType.CARELESS
+            feedback = fused.feedback or self._get_fallback_feedback(error_type, fused.misconception)
+            return error_type, fused.misconception, feedback
+        
+        # Step 3: Classify error (with concept context)
+        error_result = await self._classify_error(
+            learner_response=learner_response,
+            expected_answer=expected_answer,
+            concept=concept,  # FIX Issue 1: Add concept context
+            force_real=force_real
+        )
+        error_type = ErrorType(error_result["error_type"])
+        
+        # Step 4: Detect misconception
+        misconception_result = await self._detect_misconception(
+            learner_response=learner_response,
+            concept=concept,
+            error_type=error_type,
+            force_real=force_real
+        )
+        misconception = misconception_result.get("misconception")
+        
+        # Step 5: Generate feedback
+        feedback_result = await self._generate_feedback(
+            learner_response=learner_response,
+            expected_answer=expected_answer,
+            error_type=error_type,
+            misconception=misconception,
+            explanation=explanation,
+            force_real=force_real
+        )
+        return error_type, misconception, feedback_result["feedback"]
+    
+    async def _fused_evaluate(
+        self,
+        learner_response: str,
+        expected_answer: str,
+        explanation: str,
+        concept: Dict[str, Any],
+        target_bloom_level: int = 2,
+        force_real: bool = False
+    ) -> Optional[FusedEvaluation]:
+        """
+        Fused grading: JudgeLM score, error type, misconception and feedback
+        from one structured-output call.
+        
+        Returns None (caller falls back to the staged pipeline) in mock mode
+        or when the output cannot be parsed, repaired and validated.
+        """
+        if self.settings.MOCK_LLM and not force_real:
+            return None
+        
+        concept_name = concept.get("name", "Unknown") if concept else "Unknown"
+        known_misconceptions = concept.get("common_misconceptions", []) if concept else []
+        misconceptions_str = ", ".join(known_misconceptions) if known_misconceptions else "None known"
+        
+        prompt = f"""
+You are a helpful and precise assistant for checking the quality of the answer.
+
+[Question]
+The user asked a question about "{concept_name}" requiring a Bloom Level {target_bloom_level} response.
+(Implied Question from Truth): "{explanation}"
+
+[The Start of Assistant 1's Answer]
+{expected_answer}
+[The End of Assistant 1's Answer]
+
+[The Start of Assistant 2's Answer]
+{learner_response}
+[The End of Assistant 2's Answer]
+
+[System]
+Assistant 1 is the Reference Answer and receives a score of 10.
+Rate Assistant 2's answer on a scale of 0 to 10 compared to Assistant 1, then diagnose it.
+
+[Rubric]
+- Correctness (Weight 0.6): Factual alignment with Reference.
+- Completeness (Weight 0.2): Coverage of key points.
+- Clarity (Weight 0.2): Coherence.
+
+Error types:
+- CORRECT: No meaningful error
+- CARELESS: Simple typo or arithmetic mistake
+- INCOMPLETE: Partially correct, missing parts
+- PROCEDURAL: Wrong approach or steps
+- CONCEPTUAL: Fundamental misunderstanding
+
+Known common misconceptions for this concept: {misconceptions_str}
+
+Return ONLY one JSON object, no other text:
+{{
+    "score": <0-10>,
+    "correctness": <0-10>,
+    "completeness": <0-10>,
+    "clarity": <0-10>,
+    "error_type": "<CORRECT|CARELESS|INCOMPLETE|PROCEDURAL|CONCEPTUAL>",
+    "misconception": "<short sentence describing the mistaken belief, referencing a known misconception if it matches, or null>",
+    "feedback": "<2-3 sentences of personalized, encouraging feedback addressing THEIR misconception, not just the wrong answer>"
+}}
+        """
+        
+        try:
+            response = await self.llm.acomplete(prompt)
+            data = self._repair_json_output(response.text or "")
+            if data is None:
+                raise ValueError("no JSON object in output")
+            return FusedEvaluation.from_dict(data)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Fused evaluation unusable, falling back to staged pipeline: {e}")
+            return None
+    
+    @staticmethod
+    def _repair_json_output(raw_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Local repair for near-JSON LLM output: strips code fences and
+        surrounding prose, trailing commas, Python literals and smart quotes.
+        """
+        start, end = raw_text.find("{"), raw_text.rfind("}")
+        if start < 0 or end <= start:
+            return None
+        candidate = raw_text[start:end + 1]
+        
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+        
+        repaired = candidate.replace("\u201c", '"').replace("\u201d", '"').replace("\u2019", "'")
+        repaired = re.sub(r",\s*([}\]])", r"\1", repaired)
+        repaired = re.sub(r"\bNone\b", "null", repaired)
+        repaired = re.sub(r"\bTrue\b", "true", repaired)
+        repaired = re.sub(r"\bFalse\b", "false", repaired)
+        try:
+            return json.loads(repaired)
+        except json.JSONDecodeError:
+            pass
+        
+        if '"' not in repaired:
+            try:
+                return json.loads(repaired.replace("'", '"'))
+            except json.JSONDecodeError:
+                pass
+        return None
+    
     async def _score_response(
         self,
         learner_response: str,
@@ -782,6 +1255,7 @@ Output Format:
                 f"learner_mastery:{learner_id}:{concept_id}",
                 {"mastery": new_mastery, "updated": datetime.now().isoformat()}
             )
+            await self._persist_mastery_levels(learner_id, {concept_id: new_mastery})
             
             return new_mastery
         
@@ -789,6 +1263,79 @@ Output Format:
             self.logger.error(f"LKT mastery update error: {e}")
             return current_mastery
 
+    async def _update_learner_mastery_batch(
+        self,
+        learner_id: str,
+        profile: Dict[str, Any],
+        graded: List[Dict[str, Any]],
+        concepts: Dict[str, Dict[str, Any]],
+        current_mastery: Dict[str, float]
+    ) -> Dict[str, float]:
+        """
+        LKT update for a whole quiz: the interaction history is appended and
+        saved once, then mastery is predicted once per concept (targeting the
+        last question answered on it).
+        """
+        try:
+            history = profile.get("interaction_history", [])
+            for item in graded:
+                history.append({
+                    "concept_name": concepts[item["concept_id"]].get("name", item["concept_id"]),
+                    "question": item["expected_answer"],
+                    "result": "CORRECT" if item["score"] >= 0.8 else "INCORRECT",
+                    "response": item["learner_response"],
+                    "timestamp": datetime.now().isoformat()
+                })
+            
+            # Keep last 10 interactions to fit context window
+            history = history[-10:]
+            profile["interaction_history"] = history
+            await self.save_state(f"learner_profile:{learner_id}", profile)
+            
+            lkt_history_str = self._format_interaction_history(history)
+            targets = {item["concept_id"]: item for item in graded}
+            concept_ids = list(targets)
+            predictions = await asyncio.gather(*(
+                self._predict_mastery_lkt(
+                    lkt_history_str,
+                    target_concept=concepts[concept_id].get("name", concept_id),
+                    target_question=targets[concept_id]["expected_answer"]
+                )
+                for concept_id in concept_ids
+            ))
+            
+            updated = datetime.now().isoformat()
+            await asyncio.gather(*(
+                self.save_state(
+                    f"learner_mastery:{learner_id}:{concept_id}",
+                    {"mastery": mastery, "updated": updated}
+                )
+                for concept_id, mastery in zip(concept_ids, predictions)
+            ))
+            new_mastery = dict(zip(concept_ids, predictions))
+            await self._persist_mastery_levels(learner_id, new_mastery)
+            
+            return new_mastery
+        
+        except Exception as e:
+            self.logger.error(f"LKT batch mastery update error: {e}")
+            return {item["concept_id"]: current_mastery.get(item["concept_id"], 0.0) for item in graded}
+
+    async def _persist_mastery_levels(self, learner_id: str, levels: Dict[str, float]) -> None:
+        """
+        Write LKT mastery to HAS_MASTERY.level in the Personal KG, the same
+        value EVALUATION_COMPLETED carries, so cohort statistics rebuilt from
+        Neo4j match the incrementally maintained ones.
+        """
+        neo4j = getattr(self.state_manager, "neo4j", None)
+        if not neo4j or not levels:
+            return
+        try:
+            if await neo4j.run_many([KGSynchronizer.mastery_levels_statement(learner_id, levels)]) is None:
+                self.logger.warning(f"⚠️ Failed to persist mastery levels for {learner_id}")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to persist mastery levels for {learner_id}: {e}")
+
     def _format_interaction_history(self, history: List[Dict]) -> str:
         """
         Format history into LKT string:
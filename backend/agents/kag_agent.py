@@ -3,18 +3,22 @@ import uuid
 import re
 import json
 import asyncio
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, AsyncIterator
 from datetime import datetime
-from statistics import mean, stdev
 from enum import Enum
 
 from backend.core.base_agent import BaseAgent, AgentType
 from backend.core.note_generator import AtomicNoteGenerator
 from backend.core.kg_synchronizer import KGSynchronizer
 from backend.core.llm_factory import LLMFactory
+from backend.core.llm_scheduler import Priority
+from backend.core.single_flight import coalesced_embedding
+from backend.core.event_bus import unwrap_event
+from backend.core.cohort_stats import CohortAggregator, get_cohort_stats_store
 from backend.models.artifacts import (
     ArtifactType, AtomicNote, MisconceptionNote, ArtifactState
 )
+from backend.models.evaluation import evaluation_event_items
 from backend.config import get_settings
 from backend.core.constants import (
     KAG_MIN_LEARNERS,
@@ -23,7 +27,8 @@ from backend.core.constants import (
     KAG_EASY_THRESHOLD,
     KAG_PRIORITY_STRUGGLE_THRESHOLD,
     KAG_MODERATE_STRUGGLE_THRESHOLD,
-    KAG_STRUGGLE_MASTERY_THRESHOLD
+    KAG_STRUGGLE_MASTERY_THRESHOLD,
+    KAG_BATCH_ARTIFACT_CONCURRENCY
 )
 
 logger = logging.getLogger(__name__)
@@ -105,7 +110,7 @@ class KAGAgent(BaseAgent):
         super().__init__(agent_id, AgentType.KAG, state_manager, event_bus)
         
         self.settings = get_settings()
-        self.llm = llm or LLMFactory.get_llm()
+        self.llm = llm or LLMFactory.get_llm(priority=Priority.BACKGROUND)
         self.logger = logging.getLogger(f"KAGAgent.{agent_id}")
         
         # Store references
@@ -121,6 +126,13 @@ class KAGAgent(BaseAgent):
         self.kg_synchronizer = KGSynchronizer(
             neo4j_driver=state_manager.neo4j if state_manager else None
         )
+        self.cohort_aggregator = CohortAggregator(
+            struggle_threshold=self.STRUGGLE_MASTERY_THRESHOLD
+        )
+        
+        # Batch evaluations: per-item artifact tasks outlive the bus handler
+        self._artifact_semaphore = asyncio.Semaphore(KAG_BATCH_ARTIFACT_CONCURRENCY)
+        self._artifact_tasks = set()
         
         # MemGPT Components
         self.working_memory = self.WorkingMemory()
@@ -360,7 +372,7 @@ If you receive a "System Alert: Memory Pressure", you MUST save important detail
         try:
             # 1. Vector Search (Semantic)
             # Embed the query
-            query_embedding = await self.embedding_model.aget_text_embedding(query)
+            query_embedding = await coalesced_embedding(self.embedding_model, query)
             
             # Cypher for Vector Search
             # Assuming 'note_node_index' exists on NoteNode(embedding)
@@ -843,93 +855,61 @@ Return ONLY valid JSON:
             return {"success": False, "error": "Neo4j not available"}
         
         neo4j = self.state_manager.neo4j
-        sync_count = 0
         
-        # FIX Issue 2: Parallel mastery updates with asyncio.gather
+        # Mastery updates and misconception nodes are submitted as two UNWIND
+        # statements in one write transaction (one round trip per sync)
         mastery_updates = updates.get("mastery", {})
+        misconceptions = [m for m in updates.get("misconceptions", []) if m.get("concept_id")]
+        statements = []
         
-        async def update_mastery(concept_id: str, level: float):
-            await neo4j.run_query(
-                """
-                MATCH (l:Learner {learner_id: $learner_id})
-                MATCH (c:CourseConcept {concept_id: $concept_id})
-                MERGE (l)-[m:HAS_MASTERY]->(c)
-                SET m.level = $level, m.updated_at = datetime()
-                """,
-                learner_id=learner_id,
-                concept_id=concept_id,
-                level=level
-            )
+        if mastery_updates:
+            statements.append(KGSynchronizer.mastery_levels_statement(learner_id, mastery_updates))
         
-        mastery_tasks = [
-            update_mastery(concept_id, level)
-            for concept_id, level in mastery_updates.items()
-        ]
-        
-        # FIX Issue 4: Add try-except for asyncio.gather with return_exceptions
-        mastery_errors = 0
-        if mastery_tasks:
-            try:
-                results = await asyncio.gather(*mastery_tasks, return_exceptions=True)
-                for result in results:
-                    if isinstance(result, Exception):
-                        self.logger.warning(f"Mastery sync error: {result}")
-                        mastery_errors += 1
-                    else:
-                        sync_count += 1
-            except Exception as e:
-                self.logger.error(f"Mastery sync failed: {e}")
-        
-        # FIX Issue 3: Parallel misconception creates with asyncio.gather
-        misconceptions = updates.get("misconceptions", [])
-        
-        async def create_misconception(misconception: Dict):
-            error_id = f"error_{uuid.uuid4().hex[:8]}"
-            await neo4j.run_query(
+        if misconceptions:
+            statements.append((
                 """
                 MATCH (l:Learner {learner_id: $learner_id})
-                MATCH (c:CourseConcept {concept_id: $concept_id})
+                UNWIND $rows AS row
+                MATCH (c:CourseConcept {concept_id: row.concept_id})
                 CREATE (e:ErrorNode {
-                    error_id: $error_id,
-                    description: $description,
-                    error_type: $error_type,
+                    error_id: row.error_id,
+                    description: row.description,
+                    error_type: row.error_type,
                     created_at: datetime()
                 })
                 CREATE (l)-[:HAS_MISCONCEPTION]->(e)
                 CREATE (e)-[:ABOUT]->(c)
                 """,
-                learner_id=learner_id,
-                concept_id=misconception.get("concept_id"),
-                error_id=error_id,
-                description=misconception.get("description", ""),
-                error_type=misconception.get("error_type", "CONCEPTUAL")
-            )
-        
-        misconception_tasks = [
-            create_misconception(m)
-            for m in misconceptions
-            if m.get("concept_id")
-        ]
+                {
+                    "learner_id": learner_id,
+                    "rows": [
+                        {
+                            "concept_id": m.get("concept_id"),
+                            "error_id": f"error_{uuid.uuid4().hex[:8]}",
+                            "description": m.get("description", ""),
+                            "error_type": m.get("error_type", "CONCEPTUAL")
+                        }
+                        for m in misconceptions
+                    ]
+                }
+            ))
         
-        misconception_errors = 0
-        if misconception_tasks:
-            try:
-                results = await asyncio.gather(*misconception_tasks, return_exceptions=True)
-                for result in results:
-                    if isinstance(result, Exception):
-                        self.logger.warning(f"Misconception sync error: {result}")
-                        misconception_errors += 1
-                    else:
-                        sync_count += 1
-            except Exception as e:
-                self.logger.error(f"Misconception sync failed: {e}")
+        sync_count = 0
+        sync_errors = 0
+        if statements:
+            pending = len(mastery_updates) + len(misconceptions)
+            if await neo4j.run_many(statements) is None:
+                self.logger.error(f"❌ Personal KG sync failed for {learner_id}")
+                sync_errors = pending
+            else:
+                sync_count = pending
         
         result = {
             "success": True,
             "agent_id": self.agent_id,
             "learner_id": learner_id,
             "sync_count": sync_count,
-            "errors": mastery_errors + misconception_errors,
+            "errors": sync_errors,
             "timestamp": datetime.now().isoformat()
         }
         
@@ -955,8 +935,7 @@ Return ONLY valid JSON:
         """
         Analyze aggregated learner patterns.
         
-        - Retrieve all learner Personal KGs
-        - Calculate statistics
+        - Per-concept cohort statistics (incremental store, else Neo4j)
         - Identify bottleneck concepts
         - Generate recommendations
         """
@@ -966,27 +945,21 @@ Return ONLY valid JSON:
         
         self.logger.info(f"📊 Starting KAG analysis (depth={analysis_depth})")
         
-        # Step 1: Get all learner graphs
-        learner_graphs = await self._retrieve_all_learner_graphs()
+        # Step 1-3: Per-concept statistics from the incremental cohort store
+        # (or aggregated inside Neo4j; no learner graphs are pulled into Python)
+        num_learners, statistics = await self._aggregate_cohort_statistics()
         
-        if len(learner_graphs) < min_learners:
+        if num_learners < min_learners:
             return {
                 "success": False,
-                "error": f"Need at least {min_learners} learners, found {len(learner_graphs)}",
+                "error": f"Need at least {min_learners} learners, found {num_learners}",
                 "agent_id": self.agent_id
             }
         
-        self.logger.info(f"Retrieved {len(learner_graphs)} learner graphs")
-        
-        # Step 2: Merge into aggregated view
-        aggregated_graph = await self._merge_graphs(learner_graphs)
-        
-        # Step 3: Calculate statistics
-        statistics = await self._calculate_statistics(aggregated_graph)
+        self.logger.info(f"Aggregated {num_learners} learners over {len(statistics)} concepts")
         
         # Step 4: Identify patterns
         patterns = await self._identify_patterns(
-            aggregated_graph=aggregated_graph,
             statistics=statistics,
             depth=analysis_depth
         )
@@ -999,7 +972,7 @@ Return ONLY valid JSON:
         result = {
             "success": True,
             "agent_id": self.agent_id,
-            "num_learners_analyzed": len(learner_graphs),
+            "num_learners_analyzed": num_learners,
             "statistics": statistics,
             "patterns": patterns,
             "insights": insights,
@@ -1022,75 +995,67 @@ Return ONLY valid JSON:
         
         return result
     
-    async def _retrieve_all_learner_graphs(self) -> List[Dict[str, Any]]:
-        """Retrieve all learner Personal KGs"""
+    async def _stream_learner_graphs(self) -> AsyncIterator[Dict[str, Dict[str, float]]]:
+        """
+        Yield {learner_id: {concept_id: mastery}} one learner at a time.
+        
+        Uses Neo4jClient.stream_query, so the cohort is paged from a
+        server-side cursor instead of being materialized as one result.
+        """
         # FIX Issue 2: Check neo4j is available
         if not self.state_manager or not hasattr(self.state_manager, 'neo4j') or not self.state_manager.neo4j:
             self.logger.warning("Neo4j not available - cannot retrieve learner graphs")
-            return []
+            return
         
         neo4j = self.state_manager.neo4j
         
-        result = await neo4j.run_query(
-            """
-            MATCH (l:Learner)-[m:HAS_MASTERY]->(c:CourseConcept)
-            RETURN l.learner_id as learner_id,
-                   collect({concept_id: c.concept_id, mastery: m.level}) as masteries
-            """
-        )
-        
-        if result:
-            learner_graphs = []
-            for row in result:
-                graph = {row["learner_id"]: {}}
-                for mastery in row.get("masteries", []):
-                    graph[row["learner_id"]][mastery["concept_id"]] = mastery["mastery"]
-                learner_graphs.append(graph)
-            return learner_graphs
-        
-        return []
+        try:
+            async for row in neo4j.stream_query(
+                """
+                MATCH (l:Learner)
+                WHERE (l)-[:HAS_MASTERY]->(:CourseConcept)
+                RETURN l.learner_id as learner_id,
+                       [(l)-[m:HAS_MASTERY]->(c:CourseConcept) | {concept_id: c.concept_id, mastery: m.level}] as masteries
+                """
+            ):
+                yield {
+                    row["learner_id"]: {
+                        mastery["concept_id"]: mastery["mastery"]
+                        for mastery in row.get("masteries", [])
+                        if mastery.get("mastery") is not None
+                    }
+                }
+        except Exception as e:
+            # A truncated stream would yield statistics for part of the cohort
+            self.logger.error(f"❌ Learner graph stream failed: {e}")
+            raise
     
-    async def _merge_graphs(self, learner_graphs: List[Dict]) -> Dict[str, Any]:
-        """Merge all learner graphs into aggregated view"""
-        aggregated = {"concepts": {}}
-        
-        for learner_graph in learner_graphs:
-            for learner_id, masteries in learner_graph.items():
-                for concept_id, mastery in masteries.items():
-                    if concept_id not in aggregated["concepts"]:
-                        aggregated["concepts"][concept_id] = {
-                            "masteries": [],
-                            "errors": [],
-                            "misconceptions": []
-                        }
-                    
-                    aggregated["concepts"][concept_id]["masteries"].append(mastery)
+    async def _aggregate_cohort_statistics(self) -> Tuple[int, Dict[str, Any]]:
+        """
+        (num_learners, per-concept statistics) for system analysis.
         
-        return aggregated
-    
-    async def _calculate_statistics(self, aggregated: Dict) -> Dict[str, Any]:
-        """Calculate statistics across all learners"""
-        statistics = {}
+        Read from the incrementally maintained Redis store (O(concepts));
+        before its first reconciliation, one Cypher aggregation in Neo4j;
+        if that fails, a single streaming pass over learner graphs with
+        running moments (constant memory).
+        """
+        cached = await get_cohort_stats_store().get_statistics()
+        if cached is not None:
+            return cached
         
-        for concept_id, data in aggregated.get("concepts", {}).items():
-            masteries = data.get("masteries", [])
-            
-            if masteries:
-                # FIX Issue 7: Use class constant for struggle threshold
-                statistics[concept_id] = {
-                    "avg_mastery": mean(masteries),
-                    "std_dev": stdev(masteries) if len(masteries) > 1 else 0,
-                    "min_mastery": min(masteries),
-                    "max_mastery": max(masteries),
-                    "num_learners": len(masteries),
-                    "struggle_rate": len([m for m in masteries if m < self.STRUGGLE_MASTERY_THRESHOLD]) / len(masteries)
-                }
+        if not self.state_manager or not getattr(self.state_manager, 'neo4j', None):
+            self.logger.warning("Neo4j not available - cannot aggregate learner graphs")
+            return 0, {}
+        
+        result = await self.cohort_aggregator.aggregate(self.state_manager.neo4j)
+        if result is not None:
+            return result
         
-        return statistics
+        self.logger.warning("⚠️ Server-side cohort aggregation failed, streaming learner graphs instead")
+        return await self.cohort_aggregator.aggregate_stream(self._stream_learner_graphs())
     
     async def _identify_patterns(
         self,
-        aggregated_graph: Dict,
         statistics: Dict,
         depth: str = "shallow"
     ) -> Dict[str, Any]:
@@ -1211,6 +1176,10 @@ Return ONLY valid JSON:
     # EVENT HANDLERS (Per THESIS Integration)
     # ==========================================
     
+    async def _generate_batch_item_artifact(self, item: Dict) -> None:
+        async with self._artifact_semaphore:
+            await self._on_evaluation_completed(item)
+    
     async def _on_evaluation_completed(self, event: Dict):
         """
         Handle EVALUATION_COMPLETED event from Evaluator Agent.
@@ -1227,6 +1196,17 @@ Return ONLY valid JSON:
             'mastery_after': float
         }
         """
+        event = unwrap_event(event)
+        if event.get('batch'):
+            # Quiz results: one artifact per graded answer. Each item is its own
+            # background task (bounded concurrency), so a large quiz is not cut
+            # off by the bus handler timeout
+            for item in evaluation_event_items(event):
+                task = asyncio.create_task(self._generate_batch_item_artifact(item))
+                self._artifact_tasks.add(task)
+                task.add_done_callback(self._artifact_tasks.discard)
+            return
+        
         try:
             # FIX Issue 8: Consistent validation with _generate_artifact
             learner_id = (event.get('learner_id') or "").strip()
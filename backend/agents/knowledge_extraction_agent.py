@@ -12,7 +12,6 @@ Production-grade Knowledge Extraction Agent with:
 import json
 import uuid
 import logging
-import os
 import asyncio  # FIX Gap 1: Import asyncio
 from typing import Dict, Any, List, Optional
 from typing import Dict, Any, List, Optional
@@ -35,13 +34,15 @@ from backend.models.document_registry import (
 from backend.utils.semantic_chunker import SemanticChunker, SemanticChunk
 from backend.utils.kg_validator import KGValidator, ValidationResult, ValidationSeverity
 from backend.utils.entity_resolver import EntityResolver, ResolutionResult
+from backend.utils.embedding_batcher import EmbeddingBatcher
+from backend.utils.segment_vector_store import SegmentVectorStore, default_vector_store_dir
 from backend.utils.neo4j_batch_upsert import Neo4jBatchUpserter
 from backend.utils.provenance_manager import ProvenanceManager
 from backend.utils.concept_id_builder import get_concept_id_builder  # FIX Issue 1: Move import to top
 
 from backend.core.llm_factory import LLMFactory
-from llama_index.core import VectorStoreIndex, StorageContext, load_index_from_storage, Document, Settings
-from backend.utils.file_lock import file_lock
+from backend.core.llm_scheduler import Priority
+from llama_index.core import Settings
 
 logger = logging.getLogger(__name__)
 
@@ -95,7 +96,7 @@ class KnowledgeExtractionAgent(BaseAgent):
         super().__init__(agent_id, AgentType.KNOWLEDGE_EXTRACTION, state_manager, event_bus)
         
         self.settings = get_settings()
-        self.llm = llm or LLMFactory.get_llm()
+        self.llm = llm or LLMFactory.get_llm(priority=Priority.BACKGROUND)
         self.logger = logging.getLogger(f"KnowledgeExtractionAgent.{agent_id}")
         
         # Initialize production modules
@@ -112,10 +113,17 @@ class KnowledgeExtractionAgent(BaseAgent):
             min_chunk_size=self.CHUNK_MIN_SIZE
         )
         self.validator = KGValidator(strict_mode=False)
+        # Shared batched embedding service (document-wide batches + content-hash disk cache)
+        self.embedding_batcher = EmbeddingBatcher(
+            self.embedding_model,
+            cache_path=self.settings.EMBEDDING_CACHE_PATH
+        )
         self.entity_resolver = EntityResolver(
             embedding_model=self.embedding_model, # Pass Gemini Embedding
             merge_threshold=self.MERGE_THRESHOLD,  # FIX Issue 6: Use class constants
-            use_embeddings=True
+            use_embeddings=True,
+            ann_index_path=self.settings.ENTITY_ANN_INDEX_PATH,
+            embedding_batcher=self.embedding_batcher
         )
         
         # Batch upserter for AuraDB production (initialized lazily)
@@ -124,6 +132,9 @@ class KnowledgeExtractionAgent(BaseAgent):
         # Provenance manager for document-level overwrite (lazy init)
         self._provenance_manager = None
         
+        # Background segment compaction for the local vector store
+        self._compaction_task = None
+        
         # Extraction version for provenance
         self.extraction_version = ExtractionVersion.V3_ENTITY_RESOLUTION
         
@@ -320,6 +331,9 @@ class KnowledgeExtractionAgent(BaseAgent):
             
             self.logger.info(f"📦 Raw extraction: {len(all_concepts)} concepts, {len(all_relationships)} relationships")
             
+            # Layer 5 (document-wide): embed all chunks' concepts in deduplicated batches
+            all_concepts = await self._compute_embeddings(all_concepts)
+            
             # ========================================
             # STEP 4: Entity Resolution (Scalable)
             # ========================================
@@ -343,6 +357,13 @@ class KnowledgeExtractionAgent(BaseAgent):
                 existing_concepts = []
                 existing_relationships = []
             
+            # Warm resolver embeddings for new + candidate concepts in one batched pass
+            # (cache hits for texts already embedded above)
+            await self.entity_resolver.aprefetch_embeddings(all_concepts + existing_concepts)
+            
+            # Chunk -> concepts extracted from it, for the RAG store's metadata
+            chunk_concepts = self._chunk_concept_ids(all_concepts)
+            
             resolution_result = self.entity_resolver.resolve(
                 new_concepts=all_concepts,
                 existing_concepts=existing_concepts,
@@ -428,7 +449,11 @@ class KnowledgeExtractionAgent(BaseAgent):
             await self._cleanup_staging(document_id)
             
             # Persist to Local Vector Store (RAG)
-            await self._persist_vector_index(chunks, document_id)
+            merged = resolution_result.merge_mapping
+            await self._persist_vector_index(chunks, document_id, {
+                chunk_id: list(dict.fromkeys(merged.get(cid, cid) for cid in ids))
+                for chunk_id, ids in chunk_concepts.items()
+            })
             
             # Emit COURSEKG_UPDATED event
             await self.send_message(
@@ -493,8 +518,7 @@ class KnowledgeExtractionAgent(BaseAgent):
             # Layer 4: Content Keywords (LightRAG)
             content_keywords = await self._extract_content_keywords(chunk)
             
-            # Layer 5: Embedding Computation (Standard Pipeline)
-            enriched_concepts = await self._compute_embeddings(enriched_concepts)
+            # Layer 5: Embedding Computation is batched document-wide in execute()
             
             # Add provenance to each concept
             for concept in enriched_concepts:
@@ -514,30 +538,38 @@ class KnowledgeExtractionAgent(BaseAgent):
     # ===========================================
     
     async def _compute_embeddings(self, concepts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Compute embeddings for a list of concepts"""
+        """
+        Compute embeddings for a list of concepts.
+        
+        Texts are deduplicated and embedded in batches via the EmbeddingBatcher;
+        strings seen before (this run or a previous ingest) come from its cache.
+        """
         if not concepts:
             return concepts
-            
-        embed_model = await self._get_embedding_model()
         
-        for concept in concepts:
-            # Skip if already has embedding
-            if concept.get("embedding") and len(concept["embedding"]) > 0:
-                continue
-                
-            try:
-                # Semantic Signature: Name + Description + Context
-                # Include tags for better disambiguation power
-                tags = " ".join(concept.get("semantic_tags", []) or [])
-                text = f"{concept.get('name', '')} | {concept.get('context', '')} | {concept.get('description', '')} | {tags}"
-                
-                embedding = await embed_model.aget_text_embedding(text)
-                concept["embedding"] = embedding
-            except Exception as e:
-                self.logger.error(f"⚠️ Failed to compute embedding for {concept.get('name')}: {e}")
-                # Don't fail the concept, just missing embedding
-                concept["embedding"] = []
-                
+        # Skip if already has embedding
+        pending = [c for c in concepts if not (c.get("embedding") and len(c["embedding"]) > 0)]
+        if not pending:
+            return concepts
+        
+        # Semantic Signature: Name + Description + Context
+        # Include tags for better disambiguation power
+        texts = []
+        for concept in pending:
+            tags = " ".join(concept.get("semantic_tags", []) or [])
+            texts.append(f"{concept.get('name', '')} | {concept.get('context', '')} | {concept.get('description', '')} | {tags}".strip())
+        
+        try:
+            vectors = await self.embedding_batcher.aembed_many(texts)
+        except Exception as e:
+            self.logger.error(f"⚠️ Failed to compute embeddings for {len(pending)} concepts: {e}")
+            vectors = [None] * len(pending)
+        
+        for concept, vector in zip(pending, vectors):
+            # Don't fail the concept, just missing embedding
+            concept["embedding"] = vector.tolist() if vector is not None else []
+        
+        self.logger.debug(f"Embedding batcher stats: {self.embedding_batcher.stats}")
         return concepts
 
     async def _extract_concepts_from_chunk(
@@ -1202,48 +1234,60 @@ Return JSON object mapping concept_id to metadata:
             self.logger.error(f"❌ [V2+Provenance] Failed: {e}")
             return self._error_response(str(e))
 
-    async def _persist_vector_index(self, chunks: List[SemanticChunk], document_id: str):
-        """Persist chunks to local vector store"""
+    @staticmethod
+    def _chunk_concept_ids(concepts: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """Group extracted concept ids by the chunk they came from (source_chunk_id)"""
+        grouped: Dict[str, List[str]] = {}
+        for concept in concepts:
+            chunk_id, concept_id = concept.get("source_chunk_id"), concept.get("concept_id")
+            if chunk_id and concept_id and concept_id not in grouped.setdefault(chunk_id, []):
+                grouped[chunk_id].append(concept_id)
+        return grouped
+
+    async def _persist_vector_index(
+        self,
+        chunks: List[SemanticChunk],
+        document_id: str,
+        chunk_concepts: Optional[Dict[str, List[str]]] = None
+    ):
+        """
+        Persist chunks to the local segment vector store.
+        
+        Appends one immutable segment per document (embedding matrix + records)
+        and publishes it with an atomic manifest swap, so cost no longer grows
+        with corpus size and concurrent ingests only contend on the swap.
+        Small segments are compacted in the background.
+        """
         try:
-            # Safe path resolution: assume cwd is storage root
-            storage_dir = os.path.join(os.getcwd(), "backend", "storage", "vector_store")
+            texts = [chunk.content for chunk in chunks]
+            metadatas = [
+                {
+                    "document_id": document_id,
+                    "chunk_id": chunk.chunk_id,
+                    "heading": chunk.source_heading,
+                    "concept_ids": (chunk_concepts or {}).get(chunk.chunk_id, [])
+                }
+                for chunk in chunks
+            ]
+            vectors = await self.embedding_batcher.aembed_many(texts)
+            
+            rows = [(t, v, m) for t, v, m in zip(texts, vectors, metadatas) if v is not None]
+            if len(rows) < len(texts):
+                self.logger.warning(f"⚠️ [RAG] {len(texts) - len(rows)} chunks skipped (embedding failed)")
+            if not rows:
+                return
+            
+            store = SegmentVectorStore.open(default_vector_store_dir())
+            await asyncio.to_thread(
+                store.append,
+                [r[0] for r in rows],
+                [r[1] for r in rows],
+                [r[2] for r in rows]
+            )
+            self.logger.info(f"💾 [RAG] Persisted {len(rows)} chunks to local vector store ({len(store.segments)} segments)")
             
-            if not os.path.exists(storage_dir):
-                os.makedirs(storage_dir)
-                
-            lock_file = os.path.join(storage_dir, "write.lock")
-            
-            # Convert chunks to Documents
-            documents = []
-            for chunk in chunks:
-                doc = Document(
-                    text=chunk.content,
-                    metadata={
-                        "document_id": document_id,
-                        "chunk_id": chunk.chunk_id,
-                        "heading": chunk.source_heading
-                    }
-                )
-                documents.append(doc)
-            
-            self.logger.info(f"🔒 [RAG] Acquiring lock for vector store...")
-            with file_lock(lock_file, timeout=60):
-                # Check for existing index
-                if os.path.exists(os.path.join(storage_dir, "docstore.json")):
-                    self.logger.info("loading existing index")
-                    storage_context = StorageContext.from_defaults(persist_dir=storage_dir)
-                    index = load_index_from_storage(storage_context)
-                    # Loop and insert (safest for updates)
-                    for doc in documents:
-                        index.insert(doc)
-                else:
-                    self.logger.info("creating new index")
-                    index = VectorStoreIndex.from_documents(documents)
-                    
-                # Persist
-                index.storage_context.persist(persist_dir=storage_dir)
-                
-            self.logger.info(f"💾 [RAG] Persisted {len(documents)} chunks to local vector store")
+            if store.needs_compaction() and (self._compaction_task is None or self._compaction_task.done()):
+                self._compaction_task = asyncio.create_task(asyncio.to_thread(store.compact))
             
         except Exception as e:
             self.logger.error(f"❌ [RAG] Vector persistence failed: {e}")
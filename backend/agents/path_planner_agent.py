@@ -7,6 +7,9 @@ import json
 
 from backend.core.base_agent import BaseAgent, AgentType
 from backend.core.rl_engine import RLEngine, BanditStrategy
+from backend.core.planning_session import PathPlanningSession
+from backend.core.plan_store import PlanStore, PlanNotFoundError, PlanVersionConflict
+from backend.core.course_kg_cache import get_course_kg_cache
 from backend.core.constants import (
     CHAIN_RELATIONSHIPS,
     MASTERY_PROCEED_THRESHOLD,
@@ -22,12 +25,16 @@ from backend.core.constants import (
     SUCCESS_PROB_DIFFICULTY_WEIGHT,
     # Fix 2: Import Config Constants
     GATE_FULL_PASS_SCORE,
-    REVIEW_CHANCE
+    REVIEW_CHANCE,
+    TOT_MAX_CONCURRENCY
 )
 from backend.models import LearnerProfile
+from backend.models.evaluation import evaluation_event_items
+from backend.core.event_bus import unwrap_event
 from backend.config import get_settings
 import random  # Explicit import for cleaner usage
 import asyncio # For lock handling
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +106,9 @@ class PathPlannerAgent(BaseAgent):
             ChainingMode.REVIEW: ["REQUIRES"]  # Logic uses this to find prior nodes
         }
         
+        # Read model for stored plans (get_path / get_next_node / update_path)
+        self.plan_store = PlanStore(state_manager)
+        
         self._subscribe_to_events()
         
     def _subscribe_to_events(self):
@@ -107,44 +117,18 @@ class PathPlannerAgent(BaseAgent):
             self.event_bus.subscribe("EVALUATION_COMPLETED", self._on_evaluation_feedback)
             self.logger.info("Subscribed to EVALUATION_COMPLETED")
 
-    async def _load_mab_stats(self, concept_ids: List[str]):
-        """Load MAB stats from Redis for relevant concepts"""
-        redis = self.state_manager.redis
-        pipeline = redis.pipeline()
-        
-        for cid in concept_ids:
-            pipeline.get(f"mab_stats:{cid}")
-            
-        results = await pipeline.execute()
-        
-        for cid, data_str in zip(concept_ids, results):
-            if data_str:
-                try:
-                    data = json.loads(data_str)
-                    if cid in self.rl_engine.arms:
-                        self.rl_engine.arms[cid].set_stats(
-                            pulls=data.get("pulls", 0),
-                            total_reward=data.get("total_reward", 0.0)
-                        )
-                except Exception as e:
-                    self.logger.warning(f"Failed to load MAB stats for {cid}: {e}")
+    async def _load_linucb_arms(self, concept_ids: List[str]):
+        """Load persisted LinUCB arms from Redis (single MGET)"""
+        session = PathPlanningSession(self.state_manager.redis, self.rl_engine)
+        await session.prefetch(concept_ids, include_mab=False)
 
-    async def _save_mab_stats(self, concept_ids: List[str]):
-        """Save MAB stats to Redis"""
-        redis = self.state_manager.redis
-        pipeline = redis.pipeline()
-        
+    async def _save_linucb_arms(self, concept_ids: List[str]):
+        """Persist LinUCB arms to Redis (single pipelined write)"""
+        session = PathPlanningSession(self.state_manager.redis, self.rl_engine)
         for cid in concept_ids:
-            if cid in self.rl_engine.arms:
-                arm = self.rl_engine.arms[cid]
-                data = {
-                    "pulls": arm.pulls,
-                    "total_reward": arm.total_reward
-                }
-                pipeline.set(f"mab_stats:{cid}", json.dumps(data))
-                
-        await pipeline.execute()
-    
+            session.mark_dirty(cid)
+        await session.flush()
+
     async def _explore_learning_paths(self, learner_id: str, concept_ids: List[str], current_concept: str = None, force_real: bool = False) -> List[str]:
         """
         Explore learning paths using Tree of Thoughts (Beam Search).
@@ -181,56 +165,97 @@ class PathPlannerAgent(BaseAgent):
     async def _beam_search(self, learner_id: str, initial_candidates: List[str]) -> List[str]:
         """
         Execute Beam Search (b=3, d=3) to find optimal path.
+        
+        Each depth level fans out generation (one call per beam) and then
+        evaluation (one call per new path) concurrently, bounded by a shared
+        semaphore. Viability scores are memoized by path prefix for the
+        duration of this plan, so the final re-scoring of the beam is free.
+        Per-depth timings are exposed on `self.last_beam_search_stats`.
         """
         beam_width = self.settings.TOT_BEAM_WIDTH if hasattr(self.settings, 'TOT_BEAM_WIDTH') else 3
         max_depth = self.settings.TOT_MAX_DEPTH if hasattr(self.settings, 'TOT_MAX_DEPTH') else 3
         
-        beam = [[c] for c in initial_candidates] # List of paths
+        semaphore = asyncio.Semaphore(TOT_MAX_CONCURRENCY)
+        viability_cache: Dict[Tuple[str, ...], float] = {}
+        stats = {"depth_timings_ms": [], "evaluations": 0, "cache_hits": 0}
         
-        for depth in range(max_depth - 1): # Extend
-            candidates = []
-            
-            for path in beam:
-                last_node = path[-1]
+        async def expand(path: List[str]) -> List[str]:
+            last_node = path[-1]
+            async with semaphore:
                 # Generate next thoughts (neighbors) via LLM Generator
-                # We need to know the 'current_concept' context. 
-                # Ideally, we pass the profile or graph. 
-                # For now, we call the generator based on the last node.
                 thoughts = await self._thought_generator(learner_id, last_node)
                 neighbors = [t['concept'] for t in thoughts if t.get('concept')]
                 
                 if not neighbors:
                     # Fallback to Graph Neighbors if LLM fails or returns nothing
                     neighbors = await self._get_reachable_concepts(learner_id, last_node, limit=3)
-                
+            return neighbors
+        
+        async def evaluate(key: Tuple[str, ...]) -> None:
+            async with semaphore:
+                viability_cache[key] = await self._evaluate_path_viability(learner_id, list(key))
+        
+        async def score_all(paths: List[List[str]]) -> List[float]:
+            # Dedupe by prefix; only evaluate paths not seen in this plan
+            pending = []
+            for path in paths:
+                key = tuple(path)
+                if key in viability_cache or key in pending:
+                    stats["cache_hits"] += 1
+                else:
+                    pending.append(key)
+            stats["evaluations"] += len(pending)
+            await asyncio.gather(*(evaluate(key) for key in pending))
+            return [viability_cache[tuple(path)] for path in paths]
+        
+        beam = [[c] for c in initial_candidates] # List of paths
+        
+        for depth in range(max_depth - 1): # Extend
+            started = time.perf_counter()
+            candidates = []
+            
+            expansions = await asyncio.gather(*(expand(path) for path in beam))
+            
+            new_paths = []
+            for path, neighbors in zip(beam, expansions):
                 if not neighbors:
                     candidates.append((path, 0.0)) # Dead end
                     continue
-                    
-                # Evaluate new states
-                for neighbor in neighbors: 
-                    new_path = path + [neighbor]
-                    score = await self._evaluate_path_viability(learner_id, new_path)
-                    candidates.append((new_path, score))
+                new_paths.extend(path + [neighbor] for neighbor in neighbors)
+            
+            # Evaluate new states
+            scores = await score_all(new_paths)
+            candidates.extend(zip(new_paths, scores))
             
             # Select best beam (Pruning)
             candidates.sort(key=lambda x: x[1], reverse=True)
             beam = [c[0] for c in candidates[:beam_width]]
             
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            stats["depth_timings_ms"].append(elapsed_ms)
+            self.logger.debug(f"ToT depth {depth + 1}: {len(new_paths)} paths scored in {elapsed_ms}ms")
+        
+        self.last_beam_search_stats = stats
+            
         # Return best path from final beam
         if not beam:
             return []
         
-        # Re-evaluate final beams to pick absolute best
+        # Re-evaluate final beams to pick absolute best (memoized, so only
+        # paths never scored, e.g. dead ends or depth-1 seeds, hit the LLM)
+        final_scores = await score_all(beam)
         best_path = beam[0]
         best_score = -1.0
         
-        for path in beam:
-            score = await self._evaluate_path_viability(learner_id, path)
+        for path, score in zip(beam, final_scores):
             if score > best_score:
                 best_score = score
                 best_path = path
-                
+        
+        self.logger.info(
+            f"ToT beam search: {stats['evaluations']} evaluations, "
+            f"{stats['cache_hits']} cache hits, depth timings {stats['depth_timings_ms']}ms"
+        )
         return best_path
 
     async def _evaluate_path_viability(self, learner_id: str, path: List[str]) -> float:
@@ -371,7 +396,9 @@ class PathPlannerAgent(BaseAgent):
             RETURN next.concept_id as id
             LIMIT $limit
             """
-            results = await self.state_manager.neo4j.run_query(query, cid=current_concept_id, limit=limit)
+            results = await get_course_kg_cache().run_query(
+                self.state_manager.neo4j, query, cid=current_concept_id, limit=limit
+            )
             return [r['id'] for r in results]
         except Exception as e:
             self.logger.error(f"Graph fallback failed: {e}")
@@ -390,6 +417,13 @@ class PathPlannerAgent(BaseAgent):
         """
         MAX_RETRIES = 3
         
+        event = unwrap_event(event)
+        if event.get('batch'):
+            # Quiz results: one bandit update per graded answer
+            for item in evaluation_event_items(event):
+                await self._on_evaluation_feedback(item)
+            return
+        
         try:
             concept_id = event.get('concept_id')
             score = event.get('score', 0.0)
@@ -441,24 +475,27 @@ class PathPlannerAgent(BaseAgent):
                 
                 # --- UPDATE MAB STATS (with retry) ---
                 redis = self.state_manager.redis
-                key = f"mab_stats:{concept_id}"
+                key = f"{PathPlanningSession.MAB_PREFIX}{concept_id}"
                 
                 for attempt in range(MAX_RETRIES):
                     try:
-                        data_str = await redis.get(key)
+                        # RedisClient.get already JSON-decodes
+                        data = PathPlanningSession.decode(await redis.get(key))
                         
-                        if data_str:
-                            data = json.loads(data_str)
+                        if data:
                             pulls = data.get("pulls", 0) + 1
                             total_reward = data.get("total_reward", 0.0) + reward
                         else:
                             pulls = 1
                             total_reward = reward
-                            
-                        await redis.set(key, json.dumps({
+                        
+                        # Bandit state is long-lived (no TTL), like the LinUCB arms
+                        saved = await redis.set(key, json.dumps({
                             "pulls": pulls,
                             "total_reward": total_reward
-                        }))
+                        }), ttl=None)
+                        if not saved:
+                            raise ConnectionError(f"could not write {key}")
                         
                         # FIX Issue 3: Sync in-memory MAB state
                         if concept_id in self.rl_engine.arms:
@@ -477,17 +514,15 @@ class PathPlannerAgent(BaseAgent):
                 context_vector = event.get('context_vector')
                 if not context_vector:
                     # Try to load from saved selection context
-                    context_key = f"linucb_context:{concept_id}"
-                    context_str = await redis.get(context_key)
-                    if context_str:
-                        context_vector = json.loads(context_str)
+                    context_key = f"{PathPlanningSession.CONTEXT_PREFIX}{concept_id}"
+                    context_vector = PathPlanningSession.decode(await redis.get(context_key))
+                    if context_vector:
                         self.logger.debug(f"Loaded context_vector from Redis for {concept_id}")
                 
                 if context_vector:
-                    # FIX Issue 1: Load LinUCB arm from Redis if not in memory
-                    if concept_id not in self.rl_engine.linucb_arms:
-                        await self._load_linucb_arms([concept_id])
-                        self.logger.debug(f"Loaded LinUCB arm from Redis for {concept_id}")
+                    # FIX Issue 1: Always start from the shared arm (other workers
+                    # may have updated it since this process last loaded it)
+                    await self._load_linucb_arms([concept_id])
                     
                     # Now update the arm (create new if still doesn't exist)
                     if concept_id not in self.rl_engine.linucb_arms:
@@ -515,9 +550,18 @@ class PathPlannerAgent(BaseAgent):
         
 
     async def execute(self, **kwargs) -> Dict[str, Any]:
-        """Main execution method."""
+        """
+        Main execution method.
+        
+        Read actions (get_path, get_next_node, update_path) are served from the
+        PlanStore; any other call plans a new path.
+        """
+        action = kwargs.get("action")
+        if action in self.READ_ACTIONS:
+            return await self._execute_read_action(**kwargs)
+        
         try:
-            learner_id = kwargs.get("learner_id")
+            learner_id = kwargs.get("learner_id") or kwargs.get("user_id")
             goal = kwargs.get("goal")
             last_result = kwargs.get("last_result")  # From evaluator
             force_real = kwargs.get("force_real", False)
@@ -682,8 +726,8 @@ class PathPlannerAgent(BaseAgent):
                 "resources": resources
             }
             
-            # Save path to state
-            await self.save_state(f"path:{learner_id}", result)
+            # Save path to the plan store (versioned read model)
+            result = await self.plan_store.save(learner_id, result)
             
             # Emit event for tutor
             await self.send_message(
@@ -709,6 +753,46 @@ class PathPlannerAgent(BaseAgent):
                 "agent_id": self.agent_id
             }
     
+    READ_ACTIONS = ("get_path", "get_next_node", "update_path")
+    
+    async def _execute_read_action(self, action: str, **kwargs) -> Dict[str, Any]:
+        """Serve plan reads / node deltas from the PlanStore (no LLM or graph work)"""
+        try:
+            if action == "update_path":
+                plan = await self.plan_store.update_node(
+                    path_id=kwargs.get("path_id") or "",
+                    node_id=kwargs.get("node_id"),
+                    status=kwargs.get("status"),
+                    expected_version=kwargs.get("expected_version")
+                )
+            else:
+                learner_id = kwargs.get("learner_id") or kwargs.get("user_id")
+                plan = await self.plan_store.get(learner_id)
+                path_id = kwargs.get("path_id")
+                if not plan or (path_id and plan.get("path_id") != path_id):
+                    return {"status": "not_found", "message": f"No learning path for {learner_id}"}
+            
+            result = {
+                "status": "success",
+                "version": plan["version"],
+                "etag": PlanStore.etag(plan)
+            }
+            if action == "get_next_node":
+                result["next_node"] = PlanStore.next_node(plan)
+                result["next_index"] = plan.get("next_index")
+                result["path_id"] = plan.get("path_id")
+            else:
+                result["path"] = plan
+            return result
+        
+        except PlanNotFoundError as e:
+            return {"status": "not_found", "message": str(e)}
+        except PlanVersionConflict as e:
+            return {"status": "conflict", "error": str(e)}
+        except Exception as e:
+            self.logger.error(f"❌ Plan read ({action}) failed: {e}")
+            return {"status": "error", "error": str(e)}
+    
     def _build_relationship_map(self, relationships: List[Dict]) -> Dict[str, Dict[str, List[str]]]:
         """Build relationship map organized by type"""
         rel_map = {}
@@ -893,6 +977,17 @@ class PathPlannerAgent(BaseAgent):
 
             visited = set()
             
+            # Get profile vector for LinUCB (context-aware selection)
+            profile_vector = learner_profile.get("profile_vector", [0.0] * 10)
+            
+            # Bandit state for the whole (not yet mastered) concept set in one MGET;
+            # selections are buffered and flushed in one pipelined write after the loop
+            session = PathPlanningSession(self.state_manager.redis, self.rl_engine)
+            await session.prefetch([
+                c["concept_id"] for c in course_concepts
+                if current_mastery.get(c.get("concept_id"), 0.0) < 0.9
+            ])
+            
             while hours_used < total_hours * 0.8:
                 # Get candidates based on chaining mode
                 candidates = self._get_chain_candidates(
@@ -923,14 +1018,8 @@ class PathPlannerAgent(BaseAgent):
                     if not candidates:
                         break
                 
-                # LOAD MAB STATS FOR CANDIDATES (Stateful Bandit)
-                await self._load_mab_stats(candidates)
-                
-                # LOAD LINUCB STATE FOR CANDIDATES (Persistent Ridge Regression)
-                await self._load_linucb_arms(candidates)
-                
-                # Get profile vector for LinUCB (context-aware selection)
-                profile_vector = learner_profile.get("profile_vector", [0.0] * 10)
+                # Candidates outside the prefetched set (no-op when already loaded)
+                await session.prefetch(candidates)
                 
                 # Build time estimates map for candidates (FIX Issue 3)
                 concept_time_estimates = {}
@@ -995,12 +1084,9 @@ class PathPlannerAgent(BaseAgent):
                 
                 # FIX Feedback Issue 2: Save context_vector for this concept selection
                 # So Feedback Loop can load it if not provided by Evaluator
-                context_key = f"linucb_context:{next_concept}"
-                await self.state_manager.redis.set(
-                    context_key,
-                    json.dumps(profile_vector),
-                    ex=86400  # Expire after 24 hours
-                )
+                session.record_context(next_concept, profile_vector)
+            
+            await session.flush()
             
             # Determine pacing
             pacing = self._determine_pacing(hours_used, total_hours, len(path))
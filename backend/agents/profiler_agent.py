@@ -12,9 +12,13 @@ from backend.models import (
     MasteryMap, SkillLevel, LearningStyle,
     SessionEpisode, ConceptEpisode, ErrorEpisode, ArtifactEpisode, EpisodeType
 )
+from backend.models.evaluation import evaluation_event_items
+from backend.core.event_bus import unwrap_event
 from backend.prompts import LEARNER_PROFILER_SYSTEM_PROMPT
 from backend.core.llm_factory import LLMFactory
-from llama_index.core import PropertyGraphIndex, StorageContext, load_index_from_storage
+from backend.core.single_flight import coalesced_embedding
+from llama_index.core import PropertyGraphIndex
+from backend.utils.segment_vector_store import SegmentVectorStore, default_vector_store_dir
 # Fix Gap 3: Lazy import Neo4jPropertyGraphStore to prevent crash if dependency missing
 try:
     from llama_index.graph_stores.neo4j import Neo4jPropertyGraphStore
@@ -199,41 +203,37 @@ class ProfilerAgent(BaseAgent):
             )
             
             # Step 6: Initialize Personal KG in Neo4j
-            # Issue 6 Fix: Use MERGE instead of CREATE to prevent duplicate :Learner nodes
+            # Learner node, MasteryNodes and the initial SessionEpisode are
+            # written in one transaction (one round trip, all-or-nothing)
             neo4j = self.state_manager.neo4j
-            try:
-                await neo4j.run_query(
-                    """
-                    MERGE (l:Learner {learner_id: $learner_id})
-                    ON CREATE SET
-                        l.name = $name,
-                        l.goal = $goal,
-                        l.topic = $topic,
-                        l.purpose = $purpose,
-                        l.skill_level = $skill_level,
-                        l.learning_style = $learning_style,
-                        l.created_at = datetime()
-                    ON MATCH SET
-                        l.goal = $goal,
-                        l.topic = $topic,
-                        l.skill_level = $skill_level,
-                        l.last_updated = datetime()
-                    """,
-                    learner_id=learner_id,
-                    name=learner_name,
-                    goal=profile.goal,
-                    topic=profile_data["topic"],
-                    purpose=profile_data.get("purpose", ""),
-                    skill_level=profile.current_skill_level.value,
-                    learning_style=profile.preferred_learning_style.value
-                )
-            except Exception as neo4j_error:
-                # Issue 7 Fix: Log warning for partial failure (PostgreSQL succeeded but Neo4j failed)
-                self.logger.error(
-                    f"❌ Neo4j Learner node creation failed for {learner_id}: {neo4j_error}. "
-                    "PostgreSQL data exists but Neo4j is inconsistent!"
-                )
-                raise  # Re-raise to trigger main except block
+            # Issue 6 Fix: Use MERGE instead of CREATE to prevent duplicate :Learner nodes
+            statements = [(
+                """
+                MERGE (l:Learner {learner_id: $learner_id})
+                ON CREATE SET
+                    l.name = $name,
+                    l.goal = $goal,
+                    l.topic = $topic,
+                    l.purpose = $purpose,
+                    l.skill_level = $skill_level,
+                    l.learning_style = $learning_style,
+                    l.created_at = datetime()
+                ON MATCH SET
+                    l.goal = $goal,
+                    l.topic = $topic,
+                    l.skill_level = $skill_level,
+                    l.last_updated = datetime()
+                """,
+                {
+                    "learner_id": learner_id,
+                    "name": learner_name,
+                    "goal": profile.goal,
+                    "topic": profile_data["topic"],
+                    "purpose": profile_data.get("purpose", ""),
+                    "skill_level": profile.current_skill_level.value,
+                    "learning_style": profile.preferred_learning_style.value
+                }
+            )]
             
             # Issue 1 Fix: Batch create MasteryNodes using UNWIND (O(1) instead of O(N))
             if initial_mastery:
@@ -246,7 +246,7 @@ class ProfilerAgent(BaseAgent):
                     for cid, level in initial_mastery.items()
                 ]
                 
-                await neo4j.run_query(
+                statements.append((
                     """
                     MATCH (l:Learner {learner_id: $learner_id})
                     UNWIND $batch AS row
@@ -263,13 +263,12 @@ class ProfilerAgent(BaseAgent):
                     CREATE (l)-[:HAS_MASTERY]->(m)
                     CREATE (m)-[:MAPS_TO_CONCEPT]->(c)
                     """,
-                    learner_id=learner_id,
-                    batch=mastery_batch
-                )
+                    {"learner_id": learner_id, "batch": mastery_batch}
+                ))
             
             # Create initial SessionEpisode
             session_id = f"session_{learner_id}_{datetime.now().timestamp()}"
-            await neo4j.run_query(
+            statements.append((
                 """
                 MATCH (l:Learner {learner_id: $learner_id})
                 CREATE (s:SessionEpisode {
@@ -280,17 +279,26 @@ class ProfilerAgent(BaseAgent):
                 })
                 CREATE (l)-[:HAS_SESSION]->(s)
                 """,
-                learner_id=learner_id,
-                session_id=session_id,
-                concepts_covered=list(initial_mastery.keys())
-            )
+                {
+                    "learner_id": learner_id,
+                    "session_id": session_id,
+                    "concepts_covered": list(initial_mastery.keys())
+                }
+            ))
+            
+            if await neo4j.run_many(statements) is None:
+                # Issue 7 Fix: Log warning for partial failure (PostgreSQL succeeded but Neo4j failed)
+                self.logger.error(
+                    f"❌ Neo4j Personal KG initialization failed for {learner_id}. "
+                    "PostgreSQL data exists but Neo4j is inconsistent!"
+                )
+                raise RuntimeError(f"Personal KG initialization failed for {learner_id}")
             
             self.logger.info(f"Personal KG initialized: {len(initial_mastery)} MasteryNodes + SessionEpisode")
             
             # Step 7: Cache in Redis (including profile_vector for Agent 3 LinUCB)
-            redis = self.state_manager.redis
-            await redis.set(
-                f"profile:{learner_id}",
+            await self.state_manager.save_learner_profile(
+                learner_id,
                 {
                     "learner_id": learner_id,
                     "name": profile.name,
@@ -374,7 +382,7 @@ class ProfilerAgent(BaseAgent):
         """
         try:
             embed_model = await self._get_embedding_model()
-            goal_embedding = await embed_model.aget_text_embedding(user_goal)
+            goal_embedding = await coalesced_embedding(embed_model, user_goal)
             
             neo4j = self.state_manager.neo4j
             
@@ -515,18 +523,21 @@ Return ONLY valid JSON:
         return self._graph_retriever
 
     def _get_vector_index(self):
-        """Lazy load vector index (Fallback)"""
+        """Lazy open the segment vector store (Fallback); reads only its manifest"""
         if self._vector_index is None:
             try:
                 # Fix Gap 2: Configurable path instead of hardcoded
-                storage_dir = os.getenv("VECTOR_INDEX_PATH", "./storage/vector_index")
-                if os.path.exists(storage_dir):
-                    storage_context = StorageContext.from_defaults(persist_dir=storage_dir)
-                    self._vector_index = load_index_from_storage(storage_context)
+                storage_dir = os.getenv("VECTOR_INDEX_PATH", default_vector_store_dir())
+                if SegmentVectorStore.exists(storage_dir):
+                    self._vector_index = SegmentVectorStore.open(storage_dir)
             except Exception as e:
                 self.logger.warning(f"Failed to load fallback vector index: {e}")
         return self._vector_index
 
+    async def warm_up(self) -> None:
+        """Preload the fallback vector index so the first diagnostic request does not pay for it"""
+        await asyncio.to_thread(self._get_vector_index)
+
     async def _run_diagnostic_assessment(
         self, learner_id: str, topic: str, current_level: str
     ) -> Dict[str, Any]:
@@ -570,22 +581,30 @@ Return ONLY valid JSON:
                 index = self._get_vector_index()
                 if index:
                     try:
-                        retriever = index.as_retriever(similarity_top_k=5)
+                        retriever = index.as_retriever(await self._get_embedding_model(), similarity_top_k=5)
                         nodes = await retriever.aretrieve(topic)
-                        candidate_ids = [n.metadata.get("concept_id") or n.metadata.get("name") for n in nodes]
+                        # Chunks carry the concepts extracted from them; chunks
+                        # without that (migrated docstore) match by source document
+                        candidate_ids = [cid for n in nodes for cid in n.metadata.get("concept_ids") or []]
+                        document_ids = [
+                            n.metadata["document_id"] for n in nodes
+                            if not n.metadata.get("concept_ids") and n.metadata.get("document_id")
+                        ]
                         
-                        if candidate_ids:
+                        if candidate_ids or document_ids:
                              neo4j = self.state_manager.neo4j
                              concepts = await neo4j.run_query(
                                 """
                                 MATCH (c:CourseConcept)
-                                WHERE c.concept_id IN $ids OR c.name IN $ids
+                                WHERE c.concept_id IN $ids
+                                   OR any(d IN coalesce(c.source_document_ids, []) WHERE d IN $document_ids)
                                 WITH c, size((c)-[:REQUIRES]->()) + size((c)<-[:REQUIRES]-()) as centrality
                                 ORDER BY centrality DESC
                                 LIMIT 5
                                 RETURN c.concept_id as concept_id, c.name as name, c.difficulty as difficulty
                                 """,
-                                ids=candidate_ids
+                                ids=candidate_ids,
+                                document_ids=document_ids
                             )
                     except Exception as e:
                         self.logger.warning(f"Vector fallback failed: {e}")
@@ -948,7 +967,11 @@ Return ONLY valid JSON:
         - error_patterns (dim 11) if misconceptions
         - mastery_progression (Bloom's)
         - avg_mastery_level (dim 15)
+        
+        A batch event (whole quiz) is applied under one lock acquisition with
+        one profile read and one write.
         """
+        event = unwrap_event(event)
         learner_id = event.get('learner_id')
         if not learner_id:
             return
@@ -977,12 +1000,6 @@ Return ONLY valid JSON:
              return
 
         try:
-                concept_id = event['concept_id']
-                score = event['score']  # 0-1
-                misconceptions = event.get('misconceptions', [])
-                question_difficulty = event.get('question_difficulty', 2)
-                question_type = event.get('question_type', 'factual')
-                
                 # Get current profile from Redis/PostgreSQL
                 redis = self.state_manager.redis
                 profile_data = await redis.get(f"profile:{learner_id}")
@@ -994,57 +1011,17 @@ Return ONLY valid JSON:
                 version_before = profile_data.get('version', 0)
                 prev_avg_mastery = profile_data.get('avg_mastery_level', 0)
                 
-                # 1. Update concept_mastery_map (dim 9)
-                if 'concept_mastery_map' not in profile_data:
-                    profile_data['concept_mastery_map'] = {}
-                profile_data['concept_mastery_map'][concept_id] = score
-                
-                # 2. If PROCEED (score >= 0.8), add to completed_concepts (dim 10)
-                if score >= 0.8:
-                    if 'completed_concepts' not in profile_data:
-                        profile_data['completed_concepts'] = []
-                    if concept_id not in profile_data['completed_concepts']:
-                        profile_data['completed_concepts'].append(concept_id)
-                
-                # 3. Apply Interest Decay (Mechanism 3)
+                # Apply Interest Decay (Mechanism 3) once per event
                 self._apply_interest_decay(profile_data)
                 
-                # 3. Add error episodes if misconceptions detected (dim 11)
-                if misconceptions:
-                    if 'error_patterns' not in profile_data:
-                        profile_data['error_patterns'] = []
-                    
-                    for misc in misconceptions:
-                        error_episode = {
-                            'error_id': f"err_{uuid.uuid4().hex[:8]}",
-                            'timestamp': datetime.now().isoformat(),
-                            'concept_id': concept_id,
-                            'misconception_type': misc.get('type', 'unknown'),
-                            'severity': misc.get('severity', 3)
-                        }
-                        profile_data['error_patterns'].append(error_episode)
-                        
-                        # Create ErrorEpisode in Neo4j
-                        await self._create_error_episode(learner_id, error_episode)
-                
-                # 4. Estimate & update Bloom's level
-                bloom_level = self._estimate_bloom_level(
-                    score=score,
-                    difficulty=question_difficulty,
-                    question_type=question_type
-                )
-                
-                if 'mastery_progression' not in profile_data:
-                    profile_data['mastery_progression'] = {}
-                profile_data['mastery_progression'][concept_id] = {
-                    'timestamp': datetime.now().isoformat(),
-                    'bloom_level': bloom_level,
-                    'score': score,
-                    'difficulty': question_difficulty
-                }
+                # 1-4. Apply each evaluation (one for single events, N for a quiz)
+                updates = []
+                for item in evaluation_event_items(event):
+                    bloom_level = await self._apply_evaluation(learner_id, profile_data, item)
+                    updates.append((item['concept_id'], item['score'], bloom_level))
                 
                 # 5. Recalculate avg_mastery_level (dim 15)
-                mastery_values = list(profile_data['concept_mastery_map'].values())
+                mastery_values = list(profile_data.get('concept_mastery_map', {}).values())
                 profile_data['avg_mastery_level'] = (
                     sum(mastery_values) / len(mastery_values)
                     if mastery_values else 0.0
@@ -1055,7 +1032,7 @@ Return ONLY valid JSON:
                 profile_data['last_updated'] = datetime.now().isoformat()
                 profile_data['last_updated_by'] = 'profiler'
                 
-                await redis.set(f"profile:{learner_id}", profile_data, ttl=1800)
+                await self.state_manager.save_learner_profile(learner_id, profile_data, ttl=1800)
                 
                 # 7. Selective publish: only if avg_mastery changed > 10%
                 mastery_change = abs(profile_data['avg_mastery_level'] - prev_avg_mastery)
@@ -1069,13 +1046,14 @@ Return ONLY valid JSON:
                         }
                     )
                 
-                self.logger.info({
-                    'event': 'profile_updated_evaluation',
-                    'learner_id': learner_id,
-                    'concept_id': concept_id,
-                    'new_score': score,
-                    'new_bloom': bloom_level
-                })
+                for concept_id, score, bloom_level in updates:
+                    self.logger.info({
+                        'event': 'profile_updated_evaluation',
+                        'learner_id': learner_id,
+                        'concept_id': concept_id,
+                        'new_score': score,
+                        'new_bloom': bloom_level
+                    })
                 
         except Exception as e:
             self.logger.error(f"Error in _on_evaluation_completed: {e}")
@@ -1086,6 +1064,62 @@ Return ONLY valid JSON:
                 except:
                     pass
     
+    async def _apply_evaluation(self, learner_id: str, profile_data: Dict[str, Any], item: Dict[str, Any]) -> str:
+        """Apply one evaluation result to the profile in place; returns the Bloom level"""
+        concept_id = item['concept_id']
+        score = item['score']  # 0-1
+        misconceptions = item.get('misconceptions', [])
+        question_difficulty = item.get('question_difficulty', 2)
+        question_type = item.get('question_type', 'factual')
+        
+        # 1. Update concept_mastery_map (dim 9)
+        if 'concept_mastery_map' not in profile_data:
+            profile_data['concept_mastery_map'] = {}
+        profile_data['concept_mastery_map'][concept_id] = score
+        
+        # 2. If PROCEED (score >= 0.8), add to completed_concepts (dim 10)
+        if score >= 0.8:
+            if 'completed_concepts' not in profile_data:
+                profile_data['completed_concepts'] = []
+            if concept_id not in profile_data['completed_concepts']:
+                profile_data['completed_concepts'].append(concept_id)
+        
+        # 3. Add error episodes if misconceptions detected (dim 11)
+        if misconceptions:
+            if 'error_patterns' not in profile_data:
+                profile_data['error_patterns'] = []
+            
+            for misc in misconceptions:
+                error_episode = {
+                    'error_id': f"err_{uuid.uuid4().hex[:8]}",
+                    'timestamp': datetime.now().isoformat(),
+                    'concept_id': concept_id,
+                    'misconception_type': misc.get('type', 'unknown'),
+                    'severity': misc.get('severity', 3)
+                }
+                profile_data['error_patterns'].append(error_episode)
+                
+                # Create ErrorEpisode in Neo4j
+                await self._create_error_episode(learner_id, error_episode)
+        
+        # 4. Estimate & update Bloom's level
+        bloom_level = self._estimate_bloom_level(
+            score=score,
+            difficulty=question_difficulty,
+            question_type=question_type
+        )
+        
+        if 'mastery_progression' not in profile_data:
+            profile_data['mastery_progression'] = {}
+        profile_data['mastery_progression'][concept_id] = {
+            'timestamp': datetime.now().isoformat(),
+            'bloom_level': bloom_level,
+            'score': score,
+            'difficulty': question_difficulty
+        }
+        
+        return bloom_level
+    
     async def _on_pace_check(self, event: Dict[str, Any]):
         """Update learning_velocity when pace check triggered"""
         learner_id = event.get('learner_id')
@@ -1135,7 +1169,7 @@ Return ONLY valid JSON:
                 # 3. Save
                 profile_data['version'] = profile_data.get('version', 0) + 1
                 profile_data['last_updated'] = datetime.now().isoformat()
-                await redis.set(f"profile:{learner_id}", profile_data, ttl=1800)
+                await self.state_manager.save_learner_profile(learner_id, profile_data, ttl=1800)
                 
                 # 4. Publish if velocity anomaly
                 if abs(profile_data['learning_velocity'] - 1.0) > 0.3:
@@ -1197,7 +1231,7 @@ Return ONLY valid JSON:
                 
                 # 3. Save
                 profile_data['version'] = profile_data.get('version', 0) + 1
-                await redis.set(f"profile:{learner_id}", profile_data, ttl=1800)
+                await self.state_manager.save_learner_profile(learner_id, profile_data, ttl=1800)
                 
         except Exception as e:
             self.logger.error(f"Error in _on_artifact_created: {e}")
@@ -1263,7 +1297,7 @@ Return ONLY valid JSON:
                 
                 # Save
                 profile_data['version'] = profile_data.get('version', 0) + 1
-                await redis.set(f"profile:{learner_id}", profile_data, ttl=1800)
+                await self.state_manager.save_learner_profile(learner_id, profile_data, ttl=1800)
                 
                 self.logger.debug(f"KG sync recorded for {learner_id}: {sync_count} items")
                 
@@ -1329,7 +1363,7 @@ Return ONLY valid JSON:
                 
                 # Save
                 profile_data['version'] = profile_data.get('version', 0) + 1
-                await redis.set(f"profile:{learner_id}", profile_data, ttl=1800)
+                await self.state_manager.save_learner_profile(learner_id, profile_data, ttl=1800)
                 
                 self.logger.warning(f"Artifact generation failed for {learner_id}/{concept_id}: {reason}")
                 
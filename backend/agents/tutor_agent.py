@@ -1,12 +1,18 @@
+import asyncio
 import logging
 import random  # FIX Issue 2: Moved import to top
-from typing import Dict, Any, Optional, List, Tuple
+import re
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator, Callable
 from datetime import datetime
 from enum import Enum
 
 from backend.core.base_agent import BaseAgent, AgentType
 from backend.core.harvard_enforcer import Harvard7Enforcer
+from backend.core.course_kg_cache import get_course_kg_cache
+from backend.core.llm_cache import bypass_llm_cache
 from backend.models.dialogue import DialogueState, DialoguePhase, ScaffoldingLevel, UserIntent
+from backend.models.evaluation import evaluation_event_items
+from backend.core.event_bus import unwrap_event
 from backend.config import get_settings
 from backend.core.constants import (
     TUTOR_W_DOC,
@@ -17,11 +23,12 @@ from backend.core.constants import (
     TUTOR_CONFLICT_PENALTY,
     TUTOR_COT_TRACES,
     TUTOR_CONSENSUS_THRESHOLD,
+    TUTOR_TRACE_AGREEMENT_SIMILARITY,
     TUTOR_LEAKAGE_KEYWORDS
 )
 from backend.core.llm_factory import LLMFactory
-from llama_index.core import StorageContext, load_index_from_storage, Settings
-import os
+from backend.utils.segment_vector_store import SegmentVectorStore, default_vector_store_dir
+from llama_index.core import Settings
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +39,51 @@ logger = logging.getLogger(__name__)
 #     ...
 
 
+class ScaffoldStreamGuard:
+    """
+    Incremental Leakage Guard for streamed CoT traces.
+
+    Mirrors TutorAgent._extract_scaffold on a token stream: nothing is
+    released until the 'Student Hint:' marker has been generated (the CoT
+    part stays hidden), then the hint is released as it arrives, with the
+    same leading/trailing whitespace stripping as the batch path. If the
+    trace ends without a marker, flush() applies the batch fallback to the
+    whole trace.
+    """
+
+    MARKER = "Student Hint:"
+
+    def __init__(self, fallback: Callable[[str], str]):
+        self.trace = ""
+        self._fallback = fallback
+        self._released = False
+        self._started = False
+        self._pending = ""
+
+    def feed(self, delta: str) -> str:
+        """Add streamed text; return the part that is safe to show"""
+        self.trace += delta
+        if not self._released:
+            idx = self.trace.find(self.MARKER)
+            if idx < 0:
+                return ""
+            self._released = True
+            delta = self.trace[idx + len(self.MARKER):]
+
+        text = self._pending + delta
+        if not self._started:
+            text = text.lstrip()
+        visible = text.rstrip()
+        self._pending = text[len(visible):]
+        if visible:
+            self._started = True
+        return visible
+
+    def flush(self) -> str:
+        """End of stream: fallback text when no marker was generated"""
+        return "" if self._released else self._fallback(self.trace)
+
+
 
 class TutorAgent(BaseAgent):
     """
@@ -73,54 +125,57 @@ class TutorAgent(BaseAgent):
             event_bus.subscribe('EVALUATION_COMPLETED', self._on_evaluation_completed)
             self.logger.info("Subscribed to PATH_PLANNED, EVALUATION_COMPLETED")
             
-        # Initialize RAG Query Engine
-        self.query_engine = self._load_vector_index()
+        # Local RAG store (opened lazily: reads only the segment manifest)
+        self.vector_store = self._load_vector_index()
 
-    def _load_vector_index(self):
-        """Load local vector index if available"""
+    def _load_vector_index(self) -> Optional[SegmentVectorStore]:
+        """Open the local segment vector store if available"""
         try:
-            # Safe path resolution
-            storage_dir = os.path.join(os.getcwd(), "backend", "storage", "vector_store")
-            docstore_path = os.path.join(storage_dir, "docstore.json")
+            storage_dir = default_vector_store_dir()
             
-            if os.path.exists(docstore_path):
-                self.logger.info(f"📚 Loading vector index from {storage_dir}")
-                storage_context = StorageContext.from_defaults(persist_dir=storage_dir)
-                index = load_index_from_storage(storage_context)
-                # Enable async for non-blocking
-                return index.as_query_engine(use_async=True)
+            if SegmentVectorStore.exists(storage_dir):
+                store = SegmentVectorStore.open(storage_dir)
+                self.logger.info(f"📚 Opened vector store at {storage_dir} ({len(store)} chunks)")
+                return store
             else:
                 self.logger.warning(f"⚠️ Vector store not found at {storage_dir}. RAG will be disabled.")
                 return None
         except Exception as e:
             self.logger.error(f"Failed to load vector index: {e}")
             return None
-    
+
+    def _parse_tutor_input(self, kwargs: Dict[str, Any]) -> Tuple[str, str, str, bool, int, List[Dict]]:
+        """Normalize execute()/execute_stream() arguments"""
+        # FIX: Support object-based input
+        tutor_input = kwargs.get("tutor_input")
+        if tutor_input:
+            learner_id = tutor_input.learner_id
+            question = tutor_input.question
+            concept_id = tutor_input.concept_id
+            force_real = tutor_input.force_real
+            hint_level = tutor_input.hint_level
+        else:
+            learner_id = kwargs.get("learner_id")
+            question = kwargs.get("question")
+            concept_id = kwargs.get("concept_id")
+            force_real = kwargs.get("force_real", False)
+            hint_level = kwargs.get("hint_level", 0)
+
+        # FIX: Validate hint_level range (0-4)
+        hint_level = min(4, max(0, int(hint_level)))  # Clamp to valid range
+        
+        # Conversation history check
+        conversation_history = kwargs.get("conversation_history", [])
+        if not isinstance(conversation_history, list):
+             conversation_history = []
+
+        return learner_id, question, concept_id, force_real, hint_level, conversation_history
+
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """Main execution method."""
         try:
-            # FIX: Support object-based input
-            tutor_input = kwargs.get("tutor_input")
-            if tutor_input:
-                learner_id = tutor_input.learner_id
-                question = tutor_input.question
-                concept_id = tutor_input.concept_id
-                force_real = tutor_input.force_real
-                hint_level = tutor_input.hint_level
-            else:
-                learner_id = kwargs.get("learner_id")
-                question = kwargs.get("question")
-                concept_id = kwargs.get("concept_id")
-                force_real = kwargs.get("force_real", False)
-                hint_level = kwargs.get("hint_level", 0)
-
-            # FIX: Validate hint_level range (0-4)
-            hint_level = min(4, max(0, int(hint_level)))  # Clamp to valid range
-            
-            # Conversation history check
-            conversation_history = kwargs.get("conversation_history", [])
-            if not isinstance(conversation_history, list):
-                 conversation_history = []
+            learner_id, question, concept_id, force_real, hint_level, conversation_history = \
+                self._parse_tutor_input(kwargs)
 
             # ---------------------------------------------------------------
             # HYBRID ARCHITECTURE: State Machine + CoT
@@ -184,6 +239,164 @@ class TutorAgent(BaseAgent):
                 "agent_id": self.agent_id
             }
 
+    async def execute_stream(self, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of execute() for the SSE endpoint.
+
+        Yields {"event": ..., "data": {...}} as the pipeline progresses:
+            retrieval   KG contexts fetched (scores)
+            phase       dialogue phase that will answer this turn
+            token       next piece of visible guidance text
+            replace     full guidance text that supersedes the streamed tokens
+                        (the streamed CoT hint lost the self-consistency vote)
+            done        same payload execute() returns
+            error       {"success": False, "error": ...}
+        """
+        try:
+            learner_id, question, concept_id, force_real, hint_level, conversation_history = \
+                self._parse_tutor_input(kwargs)
+
+            state = self._get_or_create_dialogue_state(learner_id, concept_id)
+            state.turn_count += 1
+
+            if state.phase == DialoguePhase.ASSESSMENT:
+                await self._handoff_to_evaluator(learner_id, concept_id, state)
+                yield {"event": "done", "data": {
+                    "response": "I've noticed you're doing great! Let's verify your mastery with a quick quiz.",
+                    "action": "HANDOFF_TO_EVALUATOR"
+                }}
+                return
+
+            (course_context, course_score), (personal_context, personal_score) = await asyncio.gather(
+                self._course_kg_retrieve(concept_id),
+                self._personal_kg_retrieve(learner_id, concept_id)
+            )
+            yield {"event": "retrieval", "data": {"course_score": course_score, "personal_score": personal_score}}
+            yield {"event": "phase", "data": {"phase": state.phase.value}}
+
+            response_text = ""
+            async for event in self._stream_socratic_response(
+                state, question, conversation_history, course_context, personal_context, hint_level, force_real
+            ):
+                if event["event"] == "token":
+                    response_text += event["data"]["text"]
+                elif event["event"] == "replace":
+                    response_text = event["data"]["text"]
+                yield event
+
+            if state.phase == DialoguePhase.EXPLANATION and state.should_advance_phase():
+                state.advance_phase()
+
+            state.interaction_log.append({"role": "user", "content": question})
+            state.interaction_log.append({"role": "assistant", "content": response_text})
+
+            yield {"event": "done", "data": {
+                "success": True,
+                "guidance": response_text,
+                "current_phase": state.phase.value,
+                "hint_level": 1, # Default/Placeholder
+                "source": "Socratic Tutor"
+            }}
+        except Exception as e:
+            self.logger.error(f"Tutor streaming failed: {e}")
+            yield {"event": "error", "data": {"success": False, "error": str(e), "agent_id": self.agent_id}}
+
+    async def _stream_socratic_response(
+        self,
+        state: DialogueState,
+        question: str,
+        conversation_history: List[Dict],
+        course_context: Dict,
+        personal_context: Dict,
+        hint_level: int,
+        force_real: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Token events for the turn; LLM-backed phases stream, the rest yield one chunk"""
+        live_llm = self.llm is not None and (force_real or not self.settings.MOCK_LLM)
+
+        if live_llm and state.phase == DialoguePhase.EXPLANATION:
+            prompt = self._probing_prompt(question, state, course_context)
+            async for delta in self._stream_completion(prompt):
+                yield {"event": "token", "data": {"text": delta}}
+            return
+
+        if live_llm and state.phase == DialoguePhase.QUESTIONING and not state.current_cot_trace:
+            prompt = self._cot_prompt(
+                question, conversation_history, state.concept_id,
+                course_context, personal_context, hint_level
+            )
+            async for event in self._stream_cot_hint(prompt, state):
+                yield event
+            return
+
+        text = await self._determine_socratic_state(
+            state=state,
+            question=question,
+            conversation_history=conversation_history,
+            course_context=course_context,
+            personal_context=personal_context,
+            hint_level=hint_level,
+            force_real=force_real
+        )
+        yield {"event": "token", "data": {"text": text}}
+
+    async def _stream_completion(self, prompt: str) -> AsyncIterator[str]:
+        """Yield completion deltas via astream_complete"""
+        stream = await self.llm.astream_complete(prompt)
+        async for chunk in stream:
+            if chunk.delta:
+                yield chunk.delta
+
+    async def _stream_cot_hint(self, prompt: str, state: DialogueState,
+                               n: int = TUTOR_COT_TRACES) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Speculative self-consistency: stream one CoT trace through the
+        incremental Leakage Guard while the other n-1 samples run alongside.
+        If the streamed hint does not agree with the consensus trace, a
+        'replace' event carries the consensus hint instead.
+        """
+        with bypass_llm_cache():
+            others = [asyncio.create_task(self.llm.acomplete(prompt)) for _ in range(n - 1)]
+        guard = ScaffoldStreamGuard(self._extract_scaffold)
+        prefix = self._format_scaffold_step("", 0)
+        try:
+            async for delta in self._stream_completion(prompt):
+                visible = guard.feed(delta)
+                if visible:
+                    yield {"event": "token", "data": {"text": prefix + visible}}
+                    prefix = ""
+            tail = guard.flush()
+            if tail:
+                yield {"event": "token", "data": {"text": prefix + tail}}
+
+            traces = [guard.trace]
+            for result in await asyncio.gather(*others, return_exceptions=True):
+                if isinstance(result, Exception):
+                    self.logger.warning(f"CoT trace failed: {result}")
+                else:
+                    traces.append(result.text)
+        finally:
+            for task in others:
+                if not task.done():
+                    task.cancel()
+
+        best_trace = self._check_consensus(traces) or guard.trace
+        streamed_tokens = self._hint_tokens(guard.trace)
+        best_tokens = self._hint_tokens(best_trace)
+        union = streamed_tokens | best_tokens
+        replaced = bool(union) and len(streamed_tokens & best_tokens) / len(union) < TUTOR_TRACE_AGREEMENT_SIMILARITY
+        if replaced:
+            self.logger.info("Streamed CoT hint lost the consensus vote, replacing it")
+        else:
+            best_trace = guard.trace
+
+        # The first scaffold step has been served; later turns continue from step 2
+        steps = self._slice_cot_trace(best_trace)
+        state.current_cot_trace = steps
+        state.cot_step_index = 1
+        if replaced:
+            yield {"event": "replace", "data": {"text": self._format_scaffold_step(steps[0], 0)}}
+
     async def _determine_socratic_state(
         self,
         state: DialogueState,
@@ -277,12 +490,17 @@ class TutorAgent(BaseAgent):
         if self.settings.MOCK_LLM and not force_real:
              return f"Create a probing question about {state.concept_id} based on '{question}'? (Mock)"
 
+        prompt = self._probing_prompt(question, state, course_context)
+        response = await self.llm.acomplete(prompt)
+        return response.text
+
+    def _probing_prompt(self, question: str, state: DialogueState, course_context: Dict = None) -> str:
         # Prepare Context String
         context_str = ""
         if course_context:
             context_str += f"\n[Confirmed Knowledge]\nDefinition: {course_context.get('definition')}\nMisconceptions: {course_context.get('misconceptions')}"
 
-        prompt = f"""
+        return f"""
         Act as a Socratic Tutor.
         Context: Learner {state.learner_id} is asking about {state.concept_id}.
         Phase: {state.phase.value}
@@ -294,8 +512,6 @@ class TutorAgent(BaseAgent):
         Goal: Ask a guiding question to check understanding without giving the answer.
         Keep it short (1-2 sentences).
         """
-        response = await self.llm.acomplete(prompt)
-        return response.text
 
     async def _generate_cot_traces(self, question: str, history: List[Dict], concept_id: str, 
                                    course_context: Dict = None, personal_context: Dict = None, 
@@ -312,7 +528,39 @@ class TutorAgent(BaseAgent):
 
         if not self.llm:
             return []
-            
+
+        prompt = self._cot_prompt(question, history, concept_id, course_context, personal_context, hint_level)
+        # Self-Consistency sampling: issue all n calls concurrently and stop as
+        # soon as the completed traces already reach consensus (Wang 2022).
+        # The samples must be independent, so they bypass the response cache.
+        with bypass_llm_cache():
+            tasks = [asyncio.create_task(self.llm.acomplete(prompt)) for _ in range(n)]
+        traces = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    response = await next_done
+                    traces.append(response.text)
+                except Exception as e:
+                    self.logger.warning(f"CoT trace failed: {e}")
+                    continue
+                
+                _, support = self._consensus_support(traces)
+                if len(traces) < n and support / n >= TUTOR_CONSENSUS_THRESHOLD:
+                    self.logger.info(f"CoT consensus reached early ({support}/{n}), cancelling remaining traces")
+                    break
+            return traces
+        except Exception as e:
+            self.logger.error(f"CoT generation failed: {e}")
+            return traces
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _cot_prompt(self, question: str, history: List[Dict], concept_id: str,
+                    course_context: Dict = None, personal_context: Dict = None,
+                    hint_level: int = 1) -> str:
         # Determine Scaffolding Strategy based on Hint Level (1-3)
         strategy_instruction = ""
         if hint_level == 1:
@@ -330,7 +578,7 @@ class TutorAgent(BaseAgent):
             context_str += f"\n[Learner Profile]\nStyle: {personal_context.get('learning_style')}\nKnown Weaknesses: {personal_context.get('past_errors')}"
 
         # SOTA PROMPTING STRATEGY via NotebookLM Audit
-        prompt = f"""
+        return f"""
         Instruction: You are a Tutor. Solve the problem step-by-step to identify the logic, but DO NOT reveal the answer to the student yet.
         
         ### CONTEXT FROM KNOWLEDGE GRAPH
@@ -354,16 +602,6 @@ class TutorAgent(BaseAgent):
         CoT: [Internal reasoning trace about the error]
         Student Hint: [The scaffolding step based on strategy]
         """
-        try:
-             # Simulation of multiple calls (in production, run in parallel)
-             traces = []
-             for _ in range(n):
-                 response = await self.llm.acomplete(prompt)
-                 traces.append(response.text)
-             return traces
-        except Exception as e:
-            self.logger.error(f"CoT generation failed: {e}")
-            return []
 
     def _slice_cot_trace(self, trace: str) -> List[str]:
         """
@@ -399,7 +637,7 @@ class TutorAgent(BaseAgent):
     def _check_consensus(self, traces: List[str]) -> Optional[str]:
         """
         Metacognitive Check: Self-Consistency (Wang 2022).
-        For V1, pick the trace that follows the format 'CoT:... Student Hint:...'
+        Pick a trace from the largest group of agreeing 'Student Hint' traces.
         """
         if not traces:
             return None
@@ -408,8 +646,38 @@ class TutorAgent(BaseAgent):
         if not valid_traces:
             return max(traces, key=len) # Fallback to longest
             
-        # Placeholder: Return the first valid one as 'best'
-        return valid_traces[0]
+        best_trace, _ = self._consensus_support(valid_traces)
+        return best_trace
+
+    @staticmethod
+    def _hint_tokens(trace: str) -> set:
+        """Normalized token set of the 'Student Hint' part of a trace"""
+        hint = trace.split("Student Hint:", 1)[1] if "Student Hint:" in trace else trace
+        return set(re.findall(r"[a-z0-9]+", hint.lower()))
+
+    def _consensus_support(self, traces: List[str]) -> Tuple[Optional[str], int]:
+        """
+        Majority vote over hints: two traces agree when their hint token sets
+        overlap by at least TUTOR_TRACE_AGREEMENT_SIMILARITY (Jaccard).
+        
+        Returns:
+            (representative trace of the largest agreeing group, group size)
+        """
+        valid = [t for t in traces if "Student Hint:" in t]
+        if not valid:
+            return None, 0
+        
+        token_sets = [self._hint_tokens(t) for t in valid]
+        best_idx, best_support = 0, 0
+        for i, tokens_i in enumerate(token_sets):
+            support = 0
+            for tokens_j in token_sets:
+                union = tokens_i | tokens_j
+                if not union or len(tokens_i & tokens_j) / len(union) >= TUTOR_TRACE_AGREEMENT_SIMILARITY:
+                    support += 1
+            if support > best_support:
+                best_idx, best_support = i, support
+        return valid[best_idx], best_support
 
     def _extract_scaffold(self, trace: str) -> str:
         """
@@ -490,7 +758,8 @@ class TutorAgent(BaseAgent):
         """Layer 2: Retrieve from Course Knowledge Graph"""
         try:
             neo4j = self.state_manager.neo4j
-            result = await neo4j.run_query(
+            result = await get_course_kg_cache().run_query(
+                neo4j,
                 """
                 MATCH (c:CourseConcept {concept_id: $concept_id})
                 OPTIONAL MATCH (c)-[:REQUIRES]->(prereq)
@@ -598,6 +867,12 @@ class TutorAgent(BaseAgent):
     
     async def _on_evaluation_completed(self, event: Dict):
         """Handle evaluation result from Agent 5"""
+        event = unwrap_event(event)
+        if event.get('batch'):
+            for item in evaluation_event_items(event):
+                await self._on_evaluation_completed(item)
+            return
+        
         try:
             learner_id = event.get('learner_id')
             concept_id = event.get('concept_id')
@@ -4,6 +4,7 @@ from datetime import datetime
 import random # Mock data for now, replace with DB queries later
 
 from backend.core.state_manager import CentralStateManager
+from backend.core.cohort_stats import get_cohort_stats_store
 from backend.database.database_factory import get_factory
 
 router = APIRouter(prefix="/api/v1/admin", tags=["Admin"])
@@ -66,6 +67,25 @@ async def get_cohort_stats(
         }
     }
 
+@router.get("/stats/cohort-concepts")
+async def get_cohort_concept_stats():
+    """
+    Per-concept cohort mastery (mean, std dev, struggle rate, histogram).
+    
+    Served from the incrementally maintained Redis store in O(concepts).
+    """
+    store = get_cohort_stats_store()
+    result = await store.get_statistics()
+    if result is None:
+        raise HTTPException(status_code=503, detail="Cohort statistics not available yet")
+    
+    num_learners, statistics = result
+    return {
+        "num_learners": num_learners,
+        "num_concepts": len(statistics),
+        "concepts": statistics
+    }
+
 @router.get("/stats/agent-health")
 async def get_agent_health(
     state_manager: CentralStateManager = Depends(get_state_manager)
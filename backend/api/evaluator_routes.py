@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, Optional
 import logging
 import time
 
@@ -8,7 +8,7 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/evaluation", tags=["evaluation"])
 
-from backend.models.schemas import EvaluationInput
+from backend.models.schemas import EvaluationInput, BatchEvaluationInput
 
 _evaluator_agent = None
 
@@ -103,6 +103,51 @@ async def evaluate_response(request: EvaluationInput) -> EvaluationResponse:
         logger.error(f"Evaluation endpoint error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/evaluate/batch")
+async def evaluate_batch(request: BatchEvaluationInput) -> Dict[str, Any]:
+    """
+    Evaluate a whole quiz for one learner.
+    
+    Concepts and the learner profile are loaded once, answers are graded
+    concurrently, mastery is updated once per concept and a single
+    EVALUATION_COMPLETED batch event is emitted. Answers that fail
+    validation or grading are reported per item without failing the quiz.
+    
+    Example request:
+    {
+        "learner_id": "user_123",
+        "answers": [
+            {"question_id": "q1", "concept_id": "SQL_WHERE",
+             "learner_response": "WHERE filters rows", "expected_answer": "WHERE filters rows"},
+            {"question_id": "q2", "concept_id": "SQL_JOIN",
+             "learner_response": "JOIN filters rows", "expected_answer": "JOIN combines tables"}
+        ]
+    }
+    """
+    try:
+        if not _evaluator_agent:
+            raise HTTPException(status_code=500, detail="Evaluator Agent not initialized")
+        
+        start_time = time.time()
+        
+        result = await _evaluator_agent.execute_batch(
+            learner_id=request.learner_id,
+            answers=[answer.model_dump() for answer in request.answers],
+            force_real=request.force_real
+        )
+        
+        if not result.get("success"):
+            raise HTTPException(status_code=400, detail=result.get("error"))
+        
+        result["execution_time_ms"] = (time.time() - start_time) * 1000
+        return result
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch evaluation endpoint error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/error-types")
 async def get_error_types():
     """Get supported error classifications"""
@@ -86,7 +86,7 @@ async def signup_learner(
             await state_manager.postgres.assign_experiment_group(learner_id, cohort_group)
             
         # 4. Cache profile
-        await state_manager.set(f"profile:{learner_id}", profile)
+        await state_manager.save_learner_profile(learner_id, profile)
         
         logger.info(f"Learner {learner_id} signed up. Cohort: {cohort_group}")
         
@@ -132,6 +132,6 @@ async def submit_pre_test(
     profile["mastery_level"] = score / 10.0 # Normalize 0-1
     
     # Save
-    await state_manager.set(f"profile:{submission.learner_id}", profile)
+    await state_manager.save_learner_profile(submission.learner_id, profile)
     
     return {"status": "success", "score": score}
@@ -2,7 +2,7 @@
 Learning Path API Routes
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 
@@ -31,6 +31,23 @@ class PathResponse(BaseModel):
     message: Optional[str] = None
 
 
+def _set_version_headers(response: Response, result: Dict[str, Any]) -> None:
+    """Expose the stored plan version for conditional requests"""
+    if result.get("etag"):
+        response.headers["ETag"] = result["etag"]
+        response.headers["X-Plan-Version"] = str(result["version"])
+
+
+def _parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """If-Match carries our weak ETag W/"{path_id}-{version}"; return the version"""
+    if not if_match or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().rsplit("-", 1)[1].rstrip('"'))
+    except (IndexError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Malformed If-Match: {if_match}")
+
+
 @router.post("/generate", response_model=PathResponse)
 async def generate_learning_path(
     request: GeneratePathRequest,
@@ -61,50 +78,84 @@ async def generate_learning_path(
 @router.get("/{user_id}", response_model=PathResponse)
 async def get_learning_path(
     user_id: str,
+    response: Response,
     path_id: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     agent = Depends(get_path_planner_agent)
 ):
-    """Get current learning path for user"""
+    """Get current learning path for user (served from the stored plan)"""
     result = await agent.execute(
         user_id=user_id,
         action="get_path",
         path_id=path_id
     )
     
+    if result["status"] == "not_found":
+        raise HTTPException(status_code=404, detail=result.get("message"))
+    if result["status"] == "error":
+        raise HTTPException(status_code=500, detail=result.get("error"))
+    
+    if if_none_match and if_none_match == result.get("etag"):
+        return Response(status_code=304, headers={"ETag": result["etag"]})
+    
+    _set_version_headers(response, result)
     return PathResponse(**result)
 
 
 @router.post("/update", response_model=PathResponse)
 async def update_path_node(
     request: UpdatePathRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     agent = Depends(get_path_planner_agent)
 ):
-    """Update a node status in the learning path"""
+    """
+    Update a node status in the learning path (in-place delta, no re-planning).
+    
+    Send the ETag from a previous read as If-Match to reject lost updates (412).
+    """
     result = await agent.execute(
         user_id="",
         action="update_path",
         path_id=request.path_id,
         node_id=request.node_id,
-        status=request.status
+        status=request.status,
+        expected_version=_parse_if_match(if_match)
     )
     
+    if result["status"] == "not_found":
+        raise HTTPException(status_code=404, detail=result.get("message"))
+    if result["status"] == "conflict":
+        raise HTTPException(status_code=412, detail=result.get("error"))
     if result["status"] == "error":
         raise HTTPException(status_code=400, detail=result.get("error"))
     
+    _set_version_headers(response, result)
     return PathResponse(**result)
 
 
 @router.get("/{user_id}/next", response_model=Dict[str, Any])
 async def get_next_node(
     user_id: str,
+    response: Response,
     path_id: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     agent = Depends(get_path_planner_agent)
 ):
-    """Get the next node to learn"""
+    """Get the next node to learn (O(1) from the stored plan cursor)"""
     result = await agent.execute(
         user_id=user_id,
         action="get_next_node",
         path_id=path_id
     )
     
+    if result["status"] == "not_found":
+        raise HTTPException(status_code=404, detail=result.get("message"))
+    if result["status"] == "error":
+        raise HTTPException(status_code=500, detail=result.get("error"))
+    
+    if if_none_match and if_none_match == result.get("etag"):
+        return Response(status_code=304, headers={"ETag": result["etag"]})
+    
+    _set_version_headers(response, result)
     return result
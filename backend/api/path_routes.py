@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Header, Response
 from pydantic import BaseModel
 from typing import Optional
 import logging
@@ -80,21 +80,27 @@ async def plan_learning_path(request: PlanPathRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/learner/{learner_id}")
-async def get_learner_path(learner_id: str):
+async def get_learner_path(learner_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
     """
     Get previously planned learning path for a learner.
     
-    Returns cached path if available.
+    Served from the stored plan (never re-plans). Supports ETag / If-None-Match.
     """
     try:
         if not _path_planner_agent:
             raise HTTPException(status_code=500, detail="Path Planner Agent not initialized")
         
-        path = await _path_planner_agent.state_manager.get(f"path:{learner_id}")
+        path = await _path_planner_agent.plan_store.get(learner_id)
         
         if not path:
             raise HTTPException(status_code=404, detail=f"No path found for learner {learner_id}")
         
+        etag = _path_planner_agent.plan_store.etag(path)
+        if if_none_match and if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        response.headers["X-Plan-Version"] = str(path.get("version", 0))
+        
         return {
             "success": True,
             "learner_id": learner_id,
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator
+import json
 import logging
 import time
 
@@ -9,6 +11,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/tutoring", tags=["tutoring"])
 
 from backend.models.schemas import TutorInput
+from backend.core.course_kg_cache import get_course_kg_cache
 
 # Global agent instance
 _tutor_agent = None
@@ -95,6 +98,46 @@ async def ask_tutor(request: TutorInput) -> TutorResponse:
         logger.error(f"Tutor endpoint error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/ask/stream")
+async def ask_tutor_stream(request: TutorInput) -> StreamingResponse:
+    """
+    Streaming variant of /ask over Server-Sent Events.
+
+    Events (each `data:` is JSON):
+        retrieval   {"course_score", "personal_score"}
+        phase       {"phase"}
+        token       {"text"}   append to the guidance shown so far
+        replace     {"text"}   replace the guidance shown so far
+        done        same fields as /ask, plus "execution_time_ms" and "ttft_ms"
+        error       {"success": false, "error"}
+    """
+    if not _tutor_agent:
+        raise HTTPException(status_code=500, detail="Tutor Agent not initialized")
+
+    async def event_stream() -> AsyncIterator[str]:
+        start_time = time.time()
+        ttft_ms = None
+        async for event in _tutor_agent.execute_stream(
+            learner_id=request.learner_id,
+            question=request.question,
+            concept_id=request.concept_id,
+            hint_level=request.hint_level,
+            conversation_history=request.conversation_history or [],
+            force_real=request.force_real
+        ):
+            data = event["data"]
+            if event["event"] == "token" and ttft_ms is None:
+                ttft_ms = (time.time() - start_time) * 1000
+            elif event["event"] == "done":
+                data = {**data, "execution_time_ms": (time.time() - start_time) * 1000, "ttft_ms": ttft_ms}
+            yield f"event: {event['event']}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/concept/{concept_id}")
 async def get_concept_help(learner_id: str, concept_id: str):
     """
@@ -108,7 +151,8 @@ async def get_concept_help(learner_id: str, concept_id: str):
         
         # Get concept from KG
         neo4j = _tutor_agent.state_manager.neo4j
-        concept_result = await neo4j.run_query(
+        concept_result = await get_course_kg_cache().run_query(
+            neo4j,
             "MATCH (c:CourseConcept {concept_id: $concept_id}) RETURN c",
             concept_id=concept_id
         )
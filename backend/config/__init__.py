@@ -34,6 +34,11 @@ class Settings(BaseSettings):
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str = "testpassword"  # Matches docker-compose.yml
+    NEO4J_DATABASE: Optional[str] = None  # None = server default database
+    NEO4J_MAX_POOL_SIZE: int = 50
+    NEO4J_ACQUISITION_TIMEOUT: float = 30.0  # Seconds to wait for a pooled connection
+    NEO4J_MAX_TRANSACTION_RETRY_TIME: float = 15.0  # Retry budget for execute_read/execute_write
+    NEO4J_STREAM_FETCH_SIZE: int = 1000  # Records per pull for stream_query
     
     # ============================================
     # Redis Cache
@@ -55,6 +60,23 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: Optional[str] = None
 
     MOCK_LLM: bool = True  # Enable mock mode for testing/demo when API quota is exceeded
+
+    # LLM response cache (LLMFactory.get_llm wraps low-temperature LLMs)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.3  # Only cache (near-)deterministic LLMs
+    LLM_CACHE_MAX_ENTRIES: int = 2048  # In-process LRU size
+    LLM_CACHE_TTL_SECONDS: int = 86400  # Redis tier TTL
+
+    # LLM scheduler (per-provider admission control, see core/llm_scheduler.py)
+    LLM_SCHEDULER_ENABLED: bool = True
+    LLM_MAX_CONCURRENCY: int = 8  # AIMD ceiling per provider
+    LLM_MIN_CONCURRENCY: int = 1  # AIMD floor per provider
+    LLM_REQUESTS_PER_MINUTE: Optional[int] = None  # Per provider, None = unlimited
+    LLM_TOKENS_PER_MINUTE: Optional[int] = None  # Estimated, per provider, None = unlimited
+    LLM_MAX_RETRIES: int = 4
+    LLM_RETRY_BASE_DELAY: float = 1.0  # Seconds, doubled per attempt (full jitter)
+    LLM_RETRY_MAX_DELAY: float = 30.0
+    LLM_REQUEST_TIMEOUT: Optional[float] = 60.0  # Per attempt
     
     # ============================================
     # Chroma Vector Database
@@ -63,6 +85,12 @@ class Settings(BaseSettings):
     CHROMA_PORT: int = 8001
     CHROMA_PERSIST_DIRECTORY: str = "./chroma_db"
 
+    # ============================================
+    # Agent 1: Knowledge Extraction
+    # ============================================
+    ENTITY_ANN_INDEX_PATH: Optional[str] = None  # e.g. ./storage/entity_ann (requires hnswlib)
+    EMBEDDING_CACHE_PATH: Optional[str] = "./backend/storage/embedding_cache.sqlite3"  # None = memory only
+    
     # ============================================
     # Agent 3: Path Planner
     # ============================================
@@ -70,6 +98,27 @@ class Settings(BaseSettings):
     TOT_BEAM_WIDTH: int = 3
     TOT_LOOKAHEAD_DEPTH: int = 3
     
+    # ============================================
+    # Event Bus
+    # ============================================
+    EVENT_BUS_BACKEND: str = "memory"  # memory (single process) or redis_streams (multi-worker)
+    EVENT_BUS_MODE: str = "queued"  # queued (background workers) or inline (publish awaits handlers)
+    EVENT_BUS_QUEUE_SIZE: int = 1000  # Max pending events per event type
+    EVENT_BUS_WORKERS_PER_TYPE: int = 2
+    EVENT_BUS_HANDLER_TIMEOUT: float = 30.0  # Seconds
+    EVENT_BUS_BACKPRESSURE: str = "block"  # block or drop_oldest
+    EVENT_BUS_LOG_SIZE: int = 1000  # Ring buffer size for get_event_log
+    EVENT_STREAM_BATCH_SIZE: int = 32  # XREADGROUP COUNT
+    EVENT_STREAM_BLOCK_MS: int = 1000  # XREADGROUP BLOCK
+    EVENT_STREAM_MAXLEN: int = 10000  # Approximate per-stream trim length
+    EVENT_STREAM_CLAIM_IDLE_MS: int = 60000  # Reclaim entries pending longer than this
+    EVENT_STREAM_MAX_DELIVERIES: int = 5  # Drop (ack) entries whose handlers failed on this many deliveries
+    
+    # ============================================
+    # Agent 6: Cohort Statistics
+    # ============================================
+    COHORT_STATS_RECONCILE_SECONDS: int = 900  # Rebuild Redis cohort stats from Neo4j (0 = never)
+    
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -5,13 +5,50 @@ Core infrastructure for multi-agent system
 from .base_agent import BaseAgent, AgentType
 from .state_manager import CentralStateManager
 from .event_bus import EventBus
+from .redis_event_bus import RedisStreamEventBus, InMemoryStreams
 from .rl_engine import RLEngine, BanditStrategy
+from .agent_registry import AgentRegistry, get_registry
+from .course_kg_cache import CourseKGCache, get_course_kg_cache
+from .llm_cache import LLMResponseCache, CachedLLM, get_llm_cache, bypass_llm_cache
+from .single_flight import SingleFlight, get_single_flight, single_flight_stats, coalesced_embedding
+from .llm_scheduler import LLMScheduler, ScheduledLLM, Priority, get_llm_scheduler, llm_priority
+from .grading_cascade import GradingCascade, CascadeVerdict
+from .cohort_stats import CohortAggregator, RunningStats, CohortStatsStore, get_cohort_stats_store
+from .profile_cache import ProfileCache, get_profile_cache, profile_request_scope
 
 __all__ = [
     "BaseAgent",
     "AgentType",
     "CentralStateManager",
     "EventBus",
+    "RedisStreamEventBus",
+    "InMemoryStreams",
     "RLEngine",
-    "BanditStrategy"
+    "BanditStrategy",
+    "AgentRegistry",
+    "get_registry",
+    "CourseKGCache",
+    "get_course_kg_cache",
+    "LLMResponseCache",
+    "CachedLLM",
+    "get_llm_cache",
+    "bypass_llm_cache",
+    "SingleFlight",
+    "get_single_flight",
+    "single_flight_stats",
+    "coalesced_embedding",
+    "LLMScheduler",
+    "ScheduledLLM",
+    "Priority",
+    "get_llm_scheduler",
+    "llm_priority",
+    "GradingCascade",
+    "CascadeVerdict",
+    "CohortAggregator",
+    "RunningStats",
+    "CohortStatsStore",
+    "get_cohort_stats_store",
+    "ProfileCache",
+    "get_profile_cache",
+    "profile_request_scope"
 ]
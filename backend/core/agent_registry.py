@@ -0,0 +1,274 @@
+"""
+Application-scoped agent registry.
+
+Builds the shared infrastructure (state manager, event bus) and every agent
+exactly once per process, so request handlers reuse long-lived agents with
+their LLM/embedding clients, vector indexes and event subscriptions instead
+of re-creating them per request.
+
+Usage (FastAPI lifespan):
+    registry = get_registry()
+    await registry.startup()
+    ...
+    tutor = registry.get("tutor")
+    ...
+    await registry.shutdown()
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from backend.config import get_settings
+from .state_manager import CentralStateManager
+from .event_bus import EventBus
+from .redis_event_bus import RedisStreamEventBus
+from .course_kg_cache import get_course_kg_cache
+from .llm_cache import get_llm_cache
+from .single_flight import single_flight_stats
+from .llm_scheduler import get_llm_scheduler
+from .cohort_stats import get_cohort_stats_store
+from .profile_cache import get_profile_cache
+
+logger = logging.getLogger(__name__)
+
+
+class AgentStatus:
+    """Lifecycle states of a registered agent"""
+    PENDING = "pending"
+    READY = "ready"
+    WARM = "warm"
+    FAILED = "failed"
+
+
+class AgentRegistry:
+    """
+    Owns the agent instances for the lifetime of the application.
+
+    Responsibilities:
+    - Construct CentralStateManager + EventBus from the DatabaseFactory once
+    - Construct each agent once (clients, indexes and subscriptions are shared)
+    - Run optional per-agent warm-up (BaseAgent.warm_up)
+    - Expose per-agent health / warm-up state for health endpoints
+    """
+
+    # name -> (class name in backend.agents, agent_id)
+    AGENT_SPECS = {
+        "knowledge_extraction": ("KnowledgeExtractionAgent", "knowledge_extraction_1"),
+        "profiler": ("ProfilerAgent", "profiler_1"),
+        "path_planner": ("PathPlannerAgent", "path_planner_1"),
+        "tutor": ("TutorAgent", "tutor_1"),
+        "evaluator": ("EvaluatorAgent", "evaluator_1"),
+        "kag": ("KAGAgent", "kag_1"),
+    }
+
+    def __init__(self, factory=None):
+        """
+        Args:
+            factory: DatabaseFactory with connected clients (defaults to the global factory)
+        """
+        self._factory = factory
+        self.state_manager: Optional[CentralStateManager] = None
+        self.event_bus: Optional[EventBus] = None
+        self.agents: Dict[str, Any] = {}
+        self._status: Dict[str, Dict[str, Any]] = {
+            name: {"status": AgentStatus.PENDING, "error": None, "init_ms": None, "warmup_ms": None}
+            for name in self.AGENT_SPECS
+        }
+        self._started_at: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self.logger = logging.getLogger("AgentRegistry")
+
+    @property
+    def is_started(self) -> bool:
+        return self._started_at is not None
+
+    async def startup(self, warm_up: bool = True) -> None:
+        """
+        Build infrastructure and all agents. Idempotent.
+
+        Raises:
+            RuntimeError: if any agent fails to construct
+        """
+        async with self._lock:
+            if self.is_started:
+                return
+
+            if self._factory is None:
+                from backend.database.database_factory import get_factory
+                self._factory = get_factory()
+
+            self.state_manager = CentralStateManager(self._factory.redis, self._factory.postgres)
+            self.state_manager.neo4j = self._factory.neo4j  # Add neo4j to state_manager
+            self.event_bus = self._build_event_bus(get_settings())
+            await self.event_bus.start()
+
+            # Shared Course KG read cache: Redis tier + invalidation on ingest
+            course_kg_cache = get_course_kg_cache()
+            course_kg_cache.attach_redis(self._factory.redis)
+            self.event_bus.subscribe("COURSEKG_UPDATED", course_kg_cache.on_course_kg_updated)
+
+            # Shared LLM response cache tier
+            get_llm_cache().attach_redis(self._factory.redis)
+
+            # Learner profile LRU tier, invalidated across workers via pub/sub
+            profile_cache = get_profile_cache()
+            profile_cache.attach_redis(self._factory.redis)
+            await profile_cache.start_listener()
+
+            # Incremental cohort statistics, fed by every evaluation
+            cohort_stats = get_cohort_stats_store()
+            cohort_stats.attach_redis(self._factory.redis)
+            self.event_bus.subscribe("EVALUATION_COMPLETED", cohort_stats.on_evaluation_completed)
+            self.logger.info("✅ Infrastructure initialized")
+
+            import backend.agents as agents_module
+
+            failed = []
+            for name, (class_name, agent_id) in self.AGENT_SPECS.items():
+                started = time.perf_counter()
+                try:
+                    agent_cls = getattr(agents_module, class_name)
+                    self.agents[name] = agent_cls(
+                        agent_id=agent_id,
+                        state_manager=self.state_manager,
+                        event_bus=self.event_bus
+                    )
+                    self._status[name].update(status=AgentStatus.READY, error=None)
+                except Exception as e:
+                    self.logger.error(f"❌ Failed to initialize {class_name}: {e}")
+                    self._status[name].update(status=AgentStatus.FAILED, error=str(e))
+                    failed.append(name)
+                finally:
+                    self._status[name]["init_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            if failed:
+                raise RuntimeError(f"Agent initialization failed: {', '.join(failed)}")
+
+            self._started_at = datetime.now().isoformat()
+            self.logger.info(f"✅ Agents initialized ({', '.join(self.agents)})")
+
+            cohort_stats.start_reconciliation(
+                self._factory.neo4j, get_settings().COHORT_STATS_RECONCILE_SECONDS
+            )
+
+        if warm_up:
+            await self.warm_up()
+
+    def _build_event_bus(self, settings) -> EventBus:
+        """In-process bus, or the Redis Streams bus when running several workers"""
+        if settings.EVENT_BUS_BACKEND == "redis_streams":
+            return RedisStreamEventBus(
+                self._factory.redis.client,
+                batch_size=settings.EVENT_STREAM_BATCH_SIZE,
+                block_ms=settings.EVENT_STREAM_BLOCK_MS,
+                stream_maxlen=settings.EVENT_STREAM_MAXLEN,
+                claim_idle_ms=settings.EVENT_STREAM_CLAIM_IDLE_MS,
+                max_deliveries=settings.EVENT_STREAM_MAX_DELIVERIES,
+                handler_timeout=settings.EVENT_BUS_HANDLER_TIMEOUT,
+                log_size=settings.EVENT_BUS_LOG_SIZE
+            )
+        return EventBus(
+            mode=settings.EVENT_BUS_MODE,
+            queue_size=settings.EVENT_BUS_QUEUE_SIZE,
+            workers_per_type=settings.EVENT_BUS_WORKERS_PER_TYPE,
+            handler_timeout=settings.EVENT_BUS_HANDLER_TIMEOUT,
+            backpressure=settings.EVENT_BUS_BACKPRESSURE,
+            log_size=settings.EVENT_BUS_LOG_SIZE
+        )
+
+    async def warm_up(self) -> Dict[str, str]:
+        """
+        Run each agent's warm_up() hook concurrently.
+
+        Warm-up failures are logged and recorded but never fatal: the agent
+        stays usable and will load lazily on first request.
+        """
+        async def _warm(name: str, agent) -> None:
+            started = time.perf_counter()
+            try:
+                hook = getattr(agent, "warm_up", None)
+                if hook is not None:
+                    await hook()
+                self._status[name].update(status=AgentStatus.WARM, error=None)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Warm-up failed for {name}: {e}")
+                self._status[name]["error"] = f"warm_up: {e}"
+            finally:
+                self._status[name]["warmup_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        await asyncio.gather(*(_warm(name, agent) for name, agent in self.agents.items()))
+        return {name: info["status"] for name, info in self._status.items()}
+
+    def get(self, name: str):
+        """
+        Get a shared agent instance.
+
+        Raises:
+            RuntimeError: if the registry has not been started or the agent failed
+        """
+        agent = self.agents.get(name)
+        if agent is None:
+            raise RuntimeError(f"Agent '{name}' is not available (status: {self._status.get(name, {}).get('status', 'unknown')})")
+        return agent
+
+    def health(self) -> Dict[str, Any]:
+        """Per-agent lifecycle state for /health and /api/v1/system/status"""
+        return {
+            "started_at": self._started_at,
+            "agents": {name: dict(info) for name, info in self._status.items()},
+            "event_bus": self.event_bus.get_stats() if self.event_bus is not None else None,
+            "llm_cache": get_llm_cache().get_stats(),
+            "single_flight": single_flight_stats(),
+            "llm_scheduler": get_llm_scheduler().get_stats(),
+            "neo4j_queries": self._neo4j_query_stats(),
+            "cohort_stats": get_cohort_stats_store().get_stats(),
+            "profile_cache": get_profile_cache().get_stats(),
+            "grading_cascade": self._grading_cascade_stats(),
+        }
+
+    def _neo4j_query_stats(self) -> Optional[List[Dict[str, Any]]]:
+        """Slowest Neo4j statements by total latency (None before startup)"""
+        neo4j = getattr(self._factory, "neo4j", None)
+        return neo4j.get_query_stats(top=10) if hasattr(neo4j, "get_query_stats") else None
+
+    def _grading_cascade_stats(self) -> Optional[Dict[str, Any]]:
+        """Evaluator fast-path tier / escalation counters (None before startup)"""
+        evaluator = self.agents.get("evaluator")
+        return evaluator.grading_cascade.get_stats() if evaluator is not None else None
+
+    def availability(self) -> Dict[str, bool]:
+        """Backwards-compatible {agent_name: is_available} map"""
+        return {name: name in self.agents for name in self.AGENT_SPECS}
+
+    async def shutdown(self) -> None:
+        """Drain queued events, drop agent references; database connections are closed by the DatabaseFactory."""
+        await get_cohort_stats_store().stop_reconciliation()
+        await get_profile_cache().stop_listener()
+        if self.event_bus is not None:
+            await self.event_bus.stop()
+        self.agents.clear()
+        for info in self._status.values():
+            info.update(status=AgentStatus.PENDING, warmup_ms=None)
+        self._started_at = None
+        self.logger.info("🛑 Agent registry shut down")
+
+
+# Global registry instance
+_registry: Optional[AgentRegistry] = None
+
+
+def get_registry() -> AgentRegistry:
+    """Get or create global registry instance"""
+    global _registry
+    if _registry is None:
+        _registry = AgentRegistry()
+    return _registry
+
+
+def set_registry(registry: Optional[AgentRegistry]) -> None:
+    """Replace the global registry (used by tests / custom lifespans)"""
+    global _registry
+    _registry = registry
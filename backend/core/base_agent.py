@@ -55,6 +55,15 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def warm_up(self) -> None:
+        """
+        Preload expensive resources (indexes, models) before serving traffic.
+        
+        Called once by the AgentRegistry at startup. Default is a no-op;
+        override in agents that load lazily.
+        """
+        return None
+    
     async def save_state(self, key: str, value: Any) -> None:
         """
         Save state to central state manager.
@@ -0,0 +1,491 @@
+"""
+Cohort statistics: per-concept mastery aggregates for KAG system analysis.
+
+For every CourseConcept: learner count, mean, sample standard deviation,
+min/max and struggle rate (share of learners below the struggle mastery).
+
+CohortAggregator offers two ways to compute them:
+    aggregate()         one Cypher aggregation inside Neo4j (primary path);
+                        only one row per concept crosses the wire
+    aggregate_stream()  a single pass over streamed learner graphs with
+                        running moments (Welford), constant memory per
+                        concept; used when the server-side query fails
+
+Both return (num_learners, {concept_id: statistics}) with the keys
+KAGAgent._identify_patterns reads: avg_mastery, std_dev, min_mastery,
+max_mastery, num_learners, struggle_rate.
+
+CohortStatsStore keeps the same statistics up to date incrementally in
+Redis hashes, one EVALUATION_COMPLETED at a time, so reads cost
+O(concepts) instead of a graph scan. A periodic reconciliation job
+rebuilds the store from Neo4j to correct drift. Both sides use the same
+number: the evaluator's LKT mastery, carried as new_mastery on the event
+and written to (Learner)-[:HAS_MASTERY {level}]->(CourseConcept).
+
+Redis layout:
+    cohort:meta               hash  reconciled_at, num_learners
+    cohort:learners           set   learner ids seen
+    cohort:concepts           set   concept ids seen
+    cohort:stats:<concept>    hash  count, mean, m2, min, max, struggling,
+                                    h0..h<bins-1> (mastery histogram)
+    cohort:mastery:<concept>  hash  learner_id -> latest mastery
+
+Usage:
+    store = get_cohort_stats_store()
+    store.attach_redis(redis)
+    event_bus.subscribe("EVALUATION_COMPLETED", store.on_evaluation_completed)
+    store.start_reconciliation(neo4j, interval_seconds=900)
+    num_learners, statistics = await store.get_statistics()
+"""
+
+import asyncio
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from redis.exceptions import WatchError
+
+from backend.core.constants import (
+    KAG_STRUGGLE_MASTERY_THRESHOLD,
+    KAG_COHORT_HISTOGRAM_BINS,
+    KAG_COHORT_UPDATE_RETRIES,
+)
+from backend.core.event_bus import unwrap_event
+from backend.models.evaluation import evaluation_event_items
+
+logger = logging.getLogger(__name__)
+
+
+class RunningStats:
+    """Welford running mean/variance plus min, max and struggle counter"""
+
+    __slots__ = ("count", "mean", "m2", "min", "max", "struggling")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.struggling = 0
+
+    def add(self, value: float, struggling: bool) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.struggling += int(struggling)
+
+    def remove(self, value: float, struggling: bool) -> None:
+        """Inverse of add(); min/max are left for the caller to recompute"""
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        else:
+            mean = (self.count * self.mean - value) / (self.count - 1)
+            self.m2 = max(self.m2 - (value - self.mean) * (value - mean), 0.0)
+            self.mean = mean
+            self.count -= 1
+        self.struggling = max(self.struggling - int(struggling), 0)
+
+    def to_mapping(self) -> Dict[str, Any]:
+        """Redis hash fields"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_mapping(cls, mapping: Dict[str, Any]) -> "RunningStats":
+        stats = cls()
+        if mapping.get("count"):
+            stats.count = int(mapping["count"])
+            stats.mean = float(mapping["mean"])
+            stats.m2 = float(mapping["m2"])
+            stats.min = float(mapping["min"])
+            stats.max = float(mapping["max"])
+            stats.struggling = int(mapping.get("struggling") or 0)
+        return stats
+
+    def to_statistics(self) -> Dict[str, Any]:
+        return {
+            "avg_mastery": self.mean,
+            "std_dev": math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0,
+            "min_mastery": self.min,
+            "max_mastery": self.max,
+            "num_learners": self.count,
+            "struggle_rate": self.struggling / self.count
+        }
+
+
+class CohortAggregator:
+    """Per-concept cohort statistics, pushed down to Neo4j where possible"""
+
+    # stDev() is the sample standard deviation (0 for a single value),
+    # matching statistics.stdev as used by the in-Python path
+    CONCEPT_STATS_QUERY = """
+    MATCH (:Learner)-[m:HAS_MASTERY]->(c:CourseConcept)
+    WHERE m.level IS NOT NULL
+    RETURN c.concept_id AS concept_id,
+           count(m) AS num_learners,
+           avg(m.level) AS avg_mastery,
+           stDev(m.level) AS std_dev,
+           min(m.level) AS min_mastery,
+           max(m.level) AS max_mastery,
+           sum(CASE WHEN m.level < $struggle_threshold THEN 1 ELSE 0 END) AS struggling
+    """
+
+    LEARNER_COUNT_QUERY = """
+    MATCH (l:Learner)
+    WHERE (l)-[:HAS_MASTERY]->(:CourseConcept)
+    RETURN count(l) AS num_learners
+    """
+
+    def __init__(self, struggle_threshold: float = KAG_STRUGGLE_MASTERY_THRESHOLD):
+        self.struggle_threshold = struggle_threshold
+
+    async def aggregate(self, neo4j) -> Optional[Tuple[int, Dict[str, Dict[str, Any]]]]:
+        """
+        Compute cohort statistics with one read transaction in Neo4j.
+
+        Returns:
+            (num_learners, statistics), or None if the aggregation failed
+        """
+        results = await neo4j.run_many(
+            [
+                (self.LEARNER_COUNT_QUERY, {}),
+                (self.CONCEPT_STATS_QUERY, {"struggle_threshold": self.struggle_threshold}),
+            ],
+            read_only=True
+        )
+        if results is None:
+            return None
+
+        learner_rows, concept_rows = results
+        num_learners = learner_rows[0].get("num_learners", 0) if learner_rows else 0
+        statistics = {}
+        for row in concept_rows:
+            count = row.get("num_learners") or 0
+            if not count:
+                continue
+            statistics[row["concept_id"]] = {
+                "avg_mastery": row["avg_mastery"],
+                "std_dev": (row.get("std_dev") or 0) if count > 1 else 0,
+                "min_mastery": row["min_mastery"],
+                "max_mastery": row["max_mastery"],
+                "num_learners": count,
+                "struggle_rate": (row.get("struggling") or 0) / count
+            }
+        return num_learners, statistics
+
+    async def aggregate_stream(
+        self,
+        learner_graphs: AsyncIterator[Dict[str, Dict[str, float]]]
+    ) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """Single pass over streamed {learner_id: {concept_id: mastery}} graphs"""
+        running: Dict[str, RunningStats] = {}
+        num_learners = 0
+
+        async for learner_graph in learner_graphs:
+            for masteries in learner_graph.values():
+                num_learners += 1
+                for concept_id, mastery in masteries.items():
+                    if mastery is None:
+                        continue
+                    stats = running.get(concept_id)
+                    if stats is None:
+                        stats = running[concept_id] = RunningStats()
+                    stats.add(mastery, mastery < self.struggle_threshold)
+
+        return num_learners, {concept_id: stats.to_statistics() for concept_id, stats in running.items()}
+
+
+def histogram_bin(value: float, bins: int = KAG_COHORT_HISTOGRAM_BINS) -> int:
+    """Equal-width bin over [0, 1]; 1.0 falls in the last bin"""
+    return min(max(int(value * bins), 0), bins - 1)
+
+
+def _decode_hash(raw: Dict) -> Dict[str, str]:
+    return {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in (raw or {}).items()
+    }
+
+
+class CohortStatsStore:
+    """
+    Incrementally maintained per-concept cohort statistics in Redis.
+
+    Each evaluation replaces the learner's previous mastery for the concept
+    (Welford remove + add) inside an optimistic WATCH/MULTI transaction, so
+    concurrent workers never lose updates. Min/max are recomputed from the
+    concept's mastery hash only when the replaced value was an extreme.
+
+    get_statistics() returns None until the first reconciliation, so
+    callers never see a cohort built only from recent events.
+    """
+
+    PREFIX = "cohort"
+    META_KEY = "cohort:meta"
+    LEARNERS_KEY = "cohort:learners"
+    CONCEPTS_KEY = "cohort:concepts"
+    RECONCILE_LOCK = "lock:cohort:reconcile"
+
+    MASTERY_ROWS_QUERY = """
+    MATCH (l:Learner)-[m:HAS_MASTERY]->(c:CourseConcept)
+    WHERE m.level IS NOT NULL
+    RETURN l.learner_id AS learner_id, c.concept_id AS concept_id, m.level AS mastery
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        struggle_threshold: float = KAG_STRUGGLE_MASTERY_THRESHOLD,
+        bins: int = KAG_COHORT_HISTOGRAM_BINS,
+        max_retries: int = KAG_COHORT_UPDATE_RETRIES
+    ):
+        """
+        Args:
+            redis: RedisClient holding the statistics
+            struggle_threshold: Mastery below this counts as struggling
+            bins: Histogram bins over [0, 1]
+            max_retries: WATCH conflicts tolerated per update before giving up
+        """
+        self.redis = redis
+        self.struggle_threshold = struggle_threshold
+        self.bins = bins
+        self.max_retries = max_retries
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self.stats = {"updates": 0, "conflicts": 0, "failed_updates": 0, "reconciliations": 0}
+        self.last_reconciled_at: Optional[str] = None
+
+    def attach_redis(self, redis) -> None:
+        self.redis = redis
+
+    def _stats_key(self, concept_id: str) -> str:
+        return f"{self.PREFIX}:stats:{concept_id}"
+
+    def _mastery_key(self, concept_id: str) -> str:
+        return f"{self.PREFIX}:mastery:{concept_id}"
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    async def on_evaluation_completed(self, event: Dict[str, Any]) -> None:
+        """EventBus handler for EVALUATION_COMPLETED (single or batch)"""
+        for item in evaluation_event_items(unwrap_event(event)):
+            learner_id = item.get("learner_id")
+            concept_id = item.get("concept_id")
+            mastery = item.get("new_mastery")
+            if learner_id and concept_id and mastery is not None:
+                await self.record(learner_id, concept_id, float(mastery))
+
+    async def record(self, learner_id: str, concept_id: str, mastery: float) -> bool:
+        """Replace learner's mastery for concept in the running statistics"""
+        if self.redis is None:
+            return False
+
+        stats_key = self._stats_key(concept_id)
+        mastery_key = self._mastery_key(concept_id)
+
+        for _ in range(self.max_retries):
+            try:
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    await pipe.watch(stats_key, mastery_key)
+                    previous = await pipe.hget(mastery_key, learner_id)
+                    stats = RunningStats.from_mapping(_decode_hash(await pipe.hgetall(stats_key)))
+
+                    histogram = defaultdict(int)
+                    if previous is not None:
+                        previous = float(previous)
+                        extreme = previous in (stats.min, stats.max)
+                        stats.remove(previous, previous < self.struggle_threshold)
+                        histogram[histogram_bin(previous, self.bins)] -= 1
+                    stats.add(mastery, mastery < self.struggle_threshold)
+                    histogram[histogram_bin(mastery, self.bins)] += 1
+
+                    if previous is not None and extreme:
+                        others = _decode_hash(await pipe.hgetall(mastery_key))
+                        values = [float(v) for k, v in others.items() if k != learner_id] + [mastery]
+                        stats.min, stats.max = min(values), max(values)
+
+                    pipe.multi()
+                    pipe.hset(stats_key, mapping=stats.to_mapping())
+                    for bin_index, delta in histogram.items():
+                        if delta:
+                            pipe.hincrby(stats_key, f"h{bin_index}", delta)
+                    pipe.hset(mastery_key, learner_id, mastery)
+                    pipe.sadd(self.CONCEPTS_KEY, concept_id)
+                    pipe.sadd(self.LEARNERS_KEY, learner_id)
+                    await pipe.execute()
+
+                self.stats["updates"] += 1
+                return True
+            except WatchError:
+                self.stats["conflicts"] += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Cohort stats update failed for {concept_id}: {e}")
+                break
+
+        self.stats["failed_updates"] += 1
+        return False
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get_statistics(self) -> Optional[Tuple[int, Dict[str, Dict[str, Any]]]]:
+        """
+        (num_learners, {concept_id: statistics + histogram}) in O(concepts).
+
+        Returns:
+            None if Redis is unavailable or the store was never reconciled
+        """
+        if self.redis is None:
+            return None
+        try:
+            client = self.redis.client
+            meta = _decode_hash(await client.hgetall(self.META_KEY))
+            if not meta.get("reconciled_at"):
+                return None
+
+            concept_ids = sorted(
+                c.decode() if isinstance(c, bytes) else c
+                for c in await client.smembers(self.CONCEPTS_KEY)
+            )
+            num_learners = await client.scard(self.LEARNERS_KEY)
+
+            pipe = self.redis.pipeline()
+            for concept_id in concept_ids:
+                pipe.hgetall(self._stats_key(concept_id))
+            rows = await pipe.execute() if concept_ids else []
+        except Exception as e:
+            logger.warning(f"⚠️ Cohort stats read failed: {e}")
+            return None
+
+        statistics = {}
+        for concept_id, raw in zip(concept_ids, rows):
+            row = _decode_hash(raw)
+            stats = RunningStats.from_mapping(row)
+            if not stats.count:
+                continue
+            statistics[concept_id] = {
+                **stats.to_statistics(),
+                "histogram": [int(row.get(f"h{i}") or 0) for i in range(self.bins)]
+            }
+        return num_learners, statistics
+
+    # ------------------------------------------------------------------
+    # Reconciliation against Neo4j
+    # ------------------------------------------------------------------
+
+    async def reconcile(self, neo4j) -> bool:
+        """
+        Rebuild the store from Neo4j HAS_MASTERY levels in one pass.
+
+        Updates recorded while the rebuild streams are overwritten; the
+        next evaluation of that learner/concept re-applies them.
+        """
+        if self.redis is None or neo4j is None:
+            return False
+
+        running: Dict[str, RunningStats] = {}
+        histograms: Dict[str, List[int]] = {}
+        masteries: Dict[str, Dict[str, float]] = defaultdict(dict)
+        learners = set()
+
+        try:
+            async for record in neo4j.stream_query(self.MASTERY_ROWS_QUERY):
+                learner_id, concept_id, mastery = record["learner_id"], record["concept_id"], record["mastery"]
+                if not learner_id or not concept_id or mastery is None:
+                    continue
+                learners.add(learner_id)
+                masteries[concept_id][learner_id] = mastery
+                stats = running.get(concept_id)
+                if stats is None:
+                    stats = running[concept_id] = RunningStats()
+                    histograms[concept_id] = [0] * self.bins
+                stats.add(mastery, mastery < self.struggle_threshold)
+                histograms[concept_id][histogram_bin(mastery, self.bins)] += 1
+        except Exception as e:
+            logger.error(f"❌ Cohort stats reconciliation failed to read Neo4j: {e}")
+            return False
+
+        reconciled_at = datetime.now().isoformat()
+        try:
+            stale = await self.redis.client.smembers(self.CONCEPTS_KEY)
+            pipe = self.redis.pipeline(transaction=True)
+            for concept_id in stale:
+                concept_id = concept_id.decode() if isinstance(concept_id, bytes) else concept_id
+                pipe.delete(self._stats_key(concept_id), self._mastery_key(concept_id))
+            pipe.delete(self.CONCEPTS_KEY, self.LEARNERS_KEY)
+            for concept_id, stats in running.items():
+                pipe.hset(self._stats_key(concept_id), mapping={
+                    **stats.to_mapping(),
+                    **{f"h{i}": n for i, n in enumerate(histograms[concept_id])}
+                })
+                pipe.hset(self._mastery_key(concept_id), mapping=masteries[concept_id])
+                pipe.sadd(self.CONCEPTS_KEY, concept_id)
+            if learners:
+                pipe.sadd(self.LEARNERS_KEY, *learners)
+            pipe.hset(self.META_KEY, mapping={"reconciled_at": reconciled_at, "num_learners": len(learners)})
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"❌ Cohort stats reconciliation failed to write Redis: {e}")
+            return False
+
+        self.stats["reconciliations"] += 1
+        self.last_reconciled_at = reconciled_at
+        logger.info(f"🔄 Cohort stats reconciled: {len(learners)} learners, {len(running)} concepts")
+        return True
+
+    async def _reconcile_if_due(self, neo4j, interval_seconds: float) -> bool:
+        """Reconcile unless another worker already did within this interval"""
+        lease = self.redis.lock(self.RECONCILE_LOCK, timeout=interval_seconds)
+        if not await lease.acquire(blocking=False):
+            return False
+        # The lease is left to expire: it marks the interval as done
+        return await self.reconcile(neo4j)
+
+    async def _reconcile_loop(self, neo4j, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self._reconcile_if_due(neo4j, interval_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Cohort stats reconciliation error: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def start_reconciliation(self, neo4j, interval_seconds: float) -> None:
+        """Reconcile now and then every interval_seconds (no-op if 0 or no Redis)"""
+        if self._reconcile_task is not None or not interval_seconds or self.redis is None:
+            return
+        self._reconcile_task = asyncio.get_running_loop().create_task(
+            self._reconcile_loop(neo4j, interval_seconds)
+        )
+
+    async def stop_reconciliation(self) -> None:
+        task, self._reconcile_task = self._reconcile_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "last_reconciled_at": self.last_reconciled_at}
+
+
+# Global store instance
+_cohort_stats_store: Optional[CohortStatsStore] = None
+
+
+def get_cohort_stats_store() -> CohortStatsStore:
+    """Get or create the process-wide cohort statistics store"""
+    global _cohort_stats_store
+    if _cohort_stats_store is None:
+        _cohort_stats_store = CohortStatsStore()
+    return _cohort_stats_store
@@ -28,6 +28,15 @@ TUTOR_CONFLICT_PENALTY = 0.1
 EVAL_MASTERY_WEIGHT = 0.6  # Score weight for WMA
 EVAL_DIFFICULTY_ADJUSTMENT = 0.05
 EVAL_MASTERY_BOOST = 0.03
+EVAL_FUSED_GRADING = True  # One structured LLM call for score + error + misconception + feedback
+EVAL_FAST_PATH_ENABLED = True  # Grading cascade (exact / numeric / embedding) before the LLM
+EVAL_NUMERIC_REL_TOLERANCE = 1e-4
+EVAL_NUMERIC_ABS_TOLERANCE = 1e-9
+EVAL_FAST_PATH_SIMILARITY = 0.95  # Cosine needed to accept a paraphrase without the LLM
+EVAL_FAST_PATH_MIN_TOKENS = 4  # Shorter answers are too ambiguous for the embedding tier
+EVAL_REFERENCE_EMBEDDING_CACHE_SIZE = 1024
+EVAL_BATCH_CONCURRENCY = 4  # Answers of one quiz graded in parallel
+EVAL_BATCH_MAX_ITEMS = 50
 
 # Decision Thresholds
 THRESHOLD_MASTERED = 0.9
@@ -46,6 +55,9 @@ KAG_EASY_THRESHOLD = 0.8       # Avg mastery > 0.8 = Easy
 KAG_PRIORITY_STRUGGLE_THRESHOLD = 0.6  # > 60% struggle = Priority
 KAG_MODERATE_STRUGGLE_THRESHOLD = 0.3  # > 30% struggle = Moderate
 KAG_STRUGGLE_MASTERY_THRESHOLD = 0.5   # Mastery < 0.5 counts as struggle
+KAG_COHORT_HISTOGRAM_BINS = 10         # Per-concept mastery histogram: [0, 0.1), ..., [0.9, 1.0]
+KAG_COHORT_UPDATE_RETRIES = 5          # Optimistic (WATCH) retries per incremental stats update
+KAG_BATCH_ARTIFACT_CONCURRENCY = 4     # Concurrent artifact generations for a batch (quiz) evaluation
 
 # GATE
 GATE_FULL_PASS_SCORE = 0.8  # Probabilistic Gate: 100% pass if score >= this
@@ -65,6 +77,20 @@ DIFFICULTY_MULTIPLIER = {
     5: 2.0    # Very hard: 60 min
 }
 
+# ============================================================================
+# COURSE KG READ CACHE
+# ============================================================================
+COURSE_KG_CACHE_TTL_SECONDS = 600       # Safety net; COURSEKG_UPDATED invalidates earlier
+COURSE_KG_CACHE_MAX_ENTRIES = 4096      # In-process LRU bound
+COURSE_KG_CACHE_GENERATION_CHECK_SECONDS = 5  # How often workers poll Redis for invalidations
+
+# ============================================================================
+# LEARNER PROFILE CACHE
+# ============================================================================
+PROFILE_CACHE_MAX_ENTRIES = 2048        # In-process LRU bound
+PROFILE_CACHE_TTL_SECONDS = 60          # Safety net if an invalidation message is missed
+PROFILE_CACHE_CHANNEL = "profile:invalidate"  # Redis pub/sub channel shared by workers
+
 # ============================================================================
 # RL ENGINE
 # ============================================================================
@@ -75,6 +101,7 @@ UCB_EXPLORATION_CONSTANT = 1.41  # sqrt(2) for UCB1
 # ============================================================================
 MAX_PATH_CONCEPTS = 50
 TIME_BUDGET_FACTOR = 0.9  # Use 90% of available time
+PLAN_UPDATE_RETRIES = 5  # Optimistic (WATCH) retries per stored-plan node update
 
 # ============================================================================
 # PACING DETERMINATION
@@ -106,6 +133,7 @@ SUCCESS_PROB_DIFFICULTY_WEIGHT = 0.2  # Risk: concept hardness
 TOT_BEAM_WIDTH = 3  # b=3: Keep top 3 paths
 TOT_MAX_DEPTH = 3   # T=3: Look ahead 3 steps
 TOT_EVAL_TEMPERATURE = 0.5 # Balance precision/creativity in evaluation
+TOT_MAX_CONCURRENCY = 6  # Max in-flight generator/evaluator calls per depth level
 
 # ============================================================================
 # CHAIN OF THOUGHT (CoT) - Agent 4
@@ -113,6 +141,7 @@ TOT_EVAL_TEMPERATURE = 0.5 # Balance precision/creativity in evaluation
 # ============================================================================
 TUTOR_COT_TRACES = 3      # n=3: Generate 3 internal traces (Self-Consistency)
 TUTOR_CONSENSUS_THRESHOLD = 0.6 # >60% agreement required
+TUTOR_TRACE_AGREEMENT_SIMILARITY = 0.5 # Jaccard overlap for two hints to "agree"
 TUTOR_LEAKAGE_KEYWORDS = [
     "Therefore", "The answer is", "So", "Thus", "Hence"
 ] # Stop words for Leakage Guard
@@ -0,0 +1,221 @@
+"""
+Course KG Read Cache: shared TTL + LRU cache for hot CourseConcept reads.
+
+Tutor, Evaluator, Path Planner, GroundingManager and the tutoring routes
+all issue near-identical Cypher reads against the Course KG on every
+request. The Course KG only changes when Knowledge Extraction commits a
+document, so these reads are cached here and dropped on COURSEKG_UPDATED.
+
+Tiers:
+    1. In-process  OrderedDict LRU, bounded, per-entry TTL
+    2. Redis       optional, shared across workers (JSON, same TTL)
+
+Concurrent misses for the same key are coalesced into a single load
+(see core/single_flight.py).
+
+Keys are fingerprints of (normalized Cypher, sorted params) prefixed with
+a generation number. Invalidation bumps the generation (locally and in
+Redis), so stale Redis entries are simply never read again and expire on
+their own; other workers notice the new generation within
+COURSE_KG_CACHE_GENERATION_CHECK_SECONDS.
+
+Usage:
+    cache = get_course_kg_cache()
+    rows = await cache.run_query(neo4j, "MATCH (c:CourseConcept ...", concept_id=cid)
+    value = await cache.get_or_load(query, {"id": cid}, loader)
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from backend.core.single_flight import get_single_flight
+from backend.core.constants import (
+    COURSE_KG_CACHE_TTL_SECONDS,
+    COURSE_KG_CACHE_MAX_ENTRIES,
+    COURSE_KG_CACHE_GENERATION_CHECK_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class CourseKGCache:
+    """
+    Two-tier read-through cache for Course KG query results.
+
+    Empty results are not cached, so "not found" lookups keep hitting Neo4j
+    until the concept exists. Cached values are deep-copied on the way in
+    and out; callers may mutate what they get back.
+    """
+
+    REDIS_PREFIX = "coursekg"
+    GENERATION_KEY = "coursekg:generation"
+
+    def __init__(
+        self,
+        redis=None,
+        ttl_seconds: int = COURSE_KG_CACHE_TTL_SECONDS,
+        max_entries: int = COURSE_KG_CACHE_MAX_ENTRIES
+    ):
+        """
+        Args:
+            redis: Optional RedisClient for the shared tier
+            ttl_seconds: Entry lifetime in both tiers
+            max_entries: In-process LRU bound
+        """
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generation = 0
+        self._generation_checked_at = 0.0
+        self.stats = {"hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0}
+
+    def attach_redis(self, redis) -> None:
+        """Enable the shared Redis tier"""
+        self.redis = redis
+        self._generation_checked_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def fingerprint(query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Stable key for (query text modulo whitespace, params)"""
+        normalized = _WHITESPACE.sub(" ", query).strip()
+        payload = json.dumps(params or {}, sort_keys=True, default=str)
+        return hashlib.sha256(f"{normalized}\0{payload}".encode("utf-8")).hexdigest()[:32]
+
+    def _redis_key(self, fp: str) -> str:
+        return f"{self.REDIS_PREFIX}:v{self._generation}:{fp}"
+
+    async def _sync_generation(self) -> None:
+        """Pick up invalidations issued by other workers (rate-limited)"""
+        if self.redis is None:
+            return
+        now = time.monotonic()
+        if now - self._generation_checked_at < COURSE_KG_CACHE_GENERATION_CHECK_SECONDS:
+            return
+        self._generation_checked_at = now
+        try:
+            remote = await self.redis.get(self.GENERATION_KEY)
+            remote = int(remote) if remote is not None else 0
+        except Exception as e:
+            logger.debug(f"Course KG cache generation check failed: {e}")
+            return
+        if remote != self._generation:
+            self._generation = remote
+            self._entries.clear()
+
+    # ------------------------------------------------------------------
+    # Read-through
+    # ------------------------------------------------------------------
+
+    async def get_or_load(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]],
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached result for (query, params), calling loader() on a miss.
+        """
+        await self._sync_generation()
+        fp = self.fingerprint(query, params)
+
+        entry = self._entries.get(fp)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(fp)
+                self.stats["hits"] += 1
+                return copy.deepcopy(value)
+            del self._entries[fp]
+
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(self._redis_key(fp))
+            except Exception as e:
+                logger.debug(f"Course KG cache Redis read failed: {e}")
+                value = None
+            if value:
+                self.stats["redis_hits"] += 1
+                self._remember(fp, value)
+                return copy.deepcopy(value)
+
+        self.stats["misses"] += 1
+        generation = self._generation
+
+        async def load() -> Any:
+            value = await loader()
+            if value and generation == self._generation:
+                # Skip storing if an invalidation landed while we were loading
+                self._remember(fp, copy.deepcopy(value))
+                if self.redis is not None:
+                    try:
+                        await self.redis.set(self._redis_key(fp), value, ttl=self.ttl_seconds)
+                    except Exception as e:
+                        logger.debug(f"Course KG cache Redis write failed: {e}")
+            return value
+
+        # Concurrent misses for the same read share one Neo4j round-trip
+        value = await get_single_flight("course_kg").do(f"v{generation}:{fp}", load)
+        return copy.deepcopy(value)
+
+    async def run_query(self, neo4j, query: str, **params) -> Any:
+        """Cached drop-in for Neo4jClient.run_query"""
+        return await self.get_or_load(query, params, lambda: neo4j.run_query(query, **params))
+
+    def _remember(self, fp: str, value: Any) -> None:
+        self._entries[fp] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(fp)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    async def invalidate(self) -> None:
+        """Drop every cached Course KG read (all workers)"""
+        self._entries.clear()
+        self._generation += 1
+        self.stats["invalidations"] += 1
+        if self.redis is not None:
+            try:
+                self._generation = max(self._generation, int(await self.redis.increment(self.GENERATION_KEY)))
+            except Exception as e:
+                logger.warning(f"⚠️ Could not publish Course KG cache invalidation: {e}")
+        self._generation_checked_at = time.monotonic()
+
+    async def on_course_kg_updated(self, event: Dict[str, Any]) -> None:
+        """EventBus handler for COURSEKG_UPDATED"""
+        payload = event.get("payload", event)
+        await self.invalidate()
+        logger.info(
+            f"🔄 Course KG cache invalidated (document={payload.get('document_id')}, "
+            f"generation={self._generation})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global cache instance
+_course_kg_cache: Optional[CourseKGCache] = None
+
+
+def get_course_kg_cache() -> CourseKGCache:
+    """Get or create the process-wide Course KG cache"""
+    global _course_kg_cache
+    if _course_kg_cache is None:
+        _course_kg_cache = CourseKGCache()
+    return _course_kg_cache
@@ -1,40 +1,104 @@
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Any, Optional
+from collections import deque
 from datetime import datetime
 import logging
 import asyncio
+import time
 
 logger = logging.getLogger(__name__)
 
+
+class DispatchMode:
+    """How publish() delivers events to handlers"""
+    INLINE = "inline"  # publish awaits every handler (original behaviour)
+    QUEUED = "queued"  # publish enqueues; worker pool runs handlers in the background
+
+
+class BackpressurePolicy:
+    """What publish() does when an event type's queue is full (QUEUED mode)"""
+    BLOCK = "block"              # wait for space
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued event
+
+
+def unwrap_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Payload of an event as delivered to handlers.
+
+    Handlers receive the publish() envelope {timestamp, sender, receiver,
+    message_type, payload}; a bare payload (direct calls, fan-out of batch
+    items) is returned as-is.
+    """
+    if "message_type" in event and isinstance(event.get("payload"), dict):
+        return event["payload"]
+    return event
+
+
 class EventBus:
     """
     Event bus for inter-agent communication.
-    
+
     Enables agents to:
     - Publish events/messages
     - Subscribe to specific event types
     - React to events asynchronously
+
+    In QUEUED mode (after start()), publish() only enqueues the event onto a
+    bounded per-event-type queue, so the publisher's latency no longer includes
+    its subscribers' work (locks, LLM calls, bandit updates). Until start() is
+    called, or in INLINE mode, publish() awaits the handlers directly.
     """
-    
-    def __init__(self):
-        """Initialize event bus"""
+
+    def __init__(
+        self,
+        mode: str = DispatchMode.INLINE,
+        queue_size: int = 1000,
+        workers_per_type: int = 2,
+        handler_timeout: Optional[float] = None,
+        backpressure: str = BackpressurePolicy.BLOCK,
+        log_size: int = 1000
+    ):
+        """
+        Initialize event bus.
+
+        Args:
+            mode: DispatchMode.INLINE or DispatchMode.QUEUED
+            queue_size: Max queued events per event type (QUEUED mode)
+            workers_per_type: Worker tasks draining each event type's queue
+            handler_timeout: Seconds before a handler call is cancelled (None = no limit; the
+                registry passes EVENT_BUS_HANDLER_TIMEOUT)
+            backpressure: BackpressurePolicy applied when a queue is full
+            log_size: Events kept in the ring buffer behind get_event_log()
+        """
         self.subscribers: Dict[str, List[Callable]] = {}
-        self.event_log: List[Dict[str, Any]] = []
+        self.event_log: deque = deque(maxlen=log_size)
         self.logger = logging.getLogger(__name__)
-    
+
+        self.mode = mode
+        self.queue_size = queue_size
+        self.workers_per_type = max(1, workers_per_type)
+        self.handler_timeout = handler_timeout
+        self.backpressure = backpressure
+
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, List[asyncio.Task]] = {}
+        self._running = False
+        self.queue_stats: Dict[str, Dict[str, int]] = {}
+        self.handler_stats: Dict[str, Dict[str, Any]] = {}
+
     def subscribe(self, event_type: str, handler: Callable) -> None:
         """
         Subscribe to events of a specific type.
-        
+
         Args:
             event_type: Type of event to subscribe to
             handler: Async handler function to call when event occurs
         """
         if event_type not in self.subscribers:
             self.subscribers[event_type] = []
-        
+
         self.subscribers[event_type].append(handler)
         self.logger.info(f"Handler subscribed to {event_type}")
-    
+
     async def publish(
         self,
         sender: str,
@@ -44,7 +108,7 @@ class EventBus:
     ) -> None:
         """
         Publish an event to all interested subscribers.
-        
+
         Args:
             sender: Agent ID of sender
             receiver: Agent ID or type of receiver
@@ -58,29 +122,161 @@ class EventBus:
             "message_type": message_type,
             "payload": payload
         }
-        
+
         # Log event
         self.event_log.append(event)
         self.logger.info(f"Event published: {sender} → {receiver} ({message_type})")
-        
-        # Call all subscribers for this event type
-        if message_type in self.subscribers:
-            handlers = self.subscribers[message_type]
-            tasks = [handler(event) for handler in handlers]
-            await asyncio.gather(*tasks, return_exceptions=True)
-    
+
+        if message_type not in self.subscribers:
+            return
+
+        if self._running and self.mode == DispatchMode.QUEUED:
+            await self._enqueue(event)
+        else:
+            await self._dispatch(event)
+
+    # ========== DISPATCH ==========
+
+    @staticmethod
+    def _handler_name(handler: Callable) -> str:
+        return getattr(handler, "__qualname__", None) or repr(handler)
+
+    async def _run_handler(self, handler: Callable, event: Dict[str, Any]) -> bool:
+        """Run one handler with timeout, recording latency/error stats; True on success"""
+        key = f"{event['message_type']}:{self._handler_name(handler)}"
+        stats = self.handler_stats.setdefault(
+            key, {"calls": 0, "errors": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        started = time.perf_counter()
+        try:
+            if self.handler_timeout:
+                await asyncio.wait_for(handler(event), timeout=self.handler_timeout)
+            else:
+                await handler(event)
+            return True
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            self.logger.warning(f"⚠️ Handler {key} timed out after {self.handler_timeout}s")
+            return False
+        except Exception as e:
+            stats["errors"] += 1
+            self.logger.warning(f"⚠️ Handler {key} failed: {e}")
+            return False
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    async def _dispatch(self, event: Dict[str, Any]) -> None:
+        """Call all subscribers for this event type concurrently"""
+        handlers = list(self.subscribers.get(event["message_type"], []))
+        await asyncio.gather(*(self._run_handler(h, event) for h in handlers))
+
+    # ========== QUEUED MODE ==========
+
+    def _queue_for(self, event_type: str) -> asyncio.Queue:
+        """Get (or lazily create) the bounded queue + workers for an event type"""
+        queue = self._queues.get(event_type)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.queue_size)
+            self._queues[event_type] = queue
+            self.queue_stats[event_type] = {"enqueued": 0, "dropped": 0, "max_depth": 0}
+            self._workers[event_type] = [
+                asyncio.create_task(self._worker(event_type, queue))
+                for _ in range(self.workers_per_type)
+            ]
+        return queue
+
+    async def _enqueue(self, event: Dict[str, Any]) -> None:
+        event_type = event["message_type"]
+        queue = self._queue_for(event_type)
+        stats = self.queue_stats[event_type]
+
+        if queue.full() and self.backpressure == BackpressurePolicy.DROP_OLDEST:
+            try:
+                queue.get_nowait()
+                queue.task_done()
+                stats["dropped"] += 1
+                self.logger.warning(f"⚠️ Event queue full for {event_type}: dropped oldest event")
+            except asyncio.QueueEmpty:
+                pass
+
+        await queue.put(event)  # BLOCK policy waits here when full
+        stats["enqueued"] += 1
+        stats["max_depth"] = max(stats["max_depth"], queue.qsize())
+
+    async def _worker(self, event_type: str, queue: asyncio.Queue) -> None:
+        while True:
+            event = await queue.get()
+            try:
+                await self._dispatch(event)
+            except Exception as e:
+                self.logger.error(f"❌ Event worker for {event_type} failed: {e}")
+            finally:
+                queue.task_done()
+
+    async def start(self) -> None:
+        """Enable background dispatch (QUEUED mode only). Workers start lazily per event type."""
+        if self.mode == DispatchMode.QUEUED:
+            self._running = True
+            self.logger.info(
+                f"✅ EventBus dispatching via queues (size={self.queue_size}, "
+                f"workers/type={self.workers_per_type}, backpressure={self.backpressure})"
+            )
+
+    async def stop(self, drain_timeout: Optional[float] = 10.0) -> None:
+        """Stop accepting queued dispatch, drain pending events, then stop workers"""
+        self._running = False
+        if self._queues:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(q.join() for q in self._queues.values())),
+                    timeout=drain_timeout
+                )
+            except asyncio.TimeoutError:
+                self.logger.warning("⚠️ EventBus stopped before all queued events were handled")
+
+        workers = [task for tasks in self._workers.values() for task in tasks]
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queues.clear()
+        self._workers.clear()
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been handled"""
+        await asyncio.gather(*(q.join() for q in list(self._queues.values())))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and per-handler latency stats"""
+        return {
+            "mode": self.mode if self._running else DispatchMode.INLINE,
+            "queues": {
+                event_type: {**stats, "depth": self._queues[event_type].qsize() if event_type in self._queues else 0}
+                for event_type, stats in self.queue_stats.items()
+            },
+            "handlers": {
+                key: {
+                    **stats,
+                    "avg_ms": round(stats["total_ms"] / stats["calls"], 2) if stats["calls"] else 0.0
+                }
+                for key, stats in self.handler_stats.items()
+            }
+        }
+
     async def get_event_log(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Get recent events from log.
-        
+
         Args:
             limit: Maximum number of events to return
-            
+
         Returns:
             List of recent events
         """
-        return self.event_log[-limit:]
-    
+        return list(self.event_log)[-limit:]
+
     async def clear_log(self) -> None:
         """Clear event log"""
         self.event_log.clear()
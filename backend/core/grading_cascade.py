@@ -0,0 +1,231 @@
+"""
+Grading Cascade: deterministic fast path before any LLM grading call.
+
+Tiers (cheapest first); the first tier that is confident the answer is
+correct short-circuits grading:
+
+    1. exact      normalized match (case, whitespace, trailing punctuation,
+                  surrounding quotes/backticks)
+    2. numeric    both answers are a single number (int, decimal, %, a/b)
+                  and agree within tolerance; a numeric mismatch escalates
+                  immediately instead of trying embeddings
+    3. embedding  cosine similarity against the cached reference-answer
+                  embedding >= EVAL_FAST_PATH_SIMILARITY, for answers with at
+                  least EVAL_FAST_PATH_MIN_TOKENS tokens and no negation
+                  mismatch
+
+Only confident *correct* verdicts short-circuit: an incorrect answer still
+needs an error type, misconception and feedback, which the fused LLM call
+produces together with the score, so grading it locally saves nothing.
+
+Reference embeddings are cached per reference text (LRU), so every learner
+answering the same question after the first reuses it; precompute() warms
+the cache for a known question set.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from backend.core.constants import (
+    EVAL_NUMERIC_REL_TOLERANCE,
+    EVAL_NUMERIC_ABS_TOLERANCE,
+    EVAL_FAST_PATH_SIMILARITY,
+    EVAL_FAST_PATH_MIN_TOKENS,
+    EVAL_REFERENCE_EMBEDDING_CACHE_SIZE,
+)
+from backend.core.single_flight import coalesced_embedding
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"^[-+]?(\d+\.?\d*|\.\d+)(e[-+]?\d+)?%?$")
+_FRACTION = re.compile(r"^([-+]?\d+)\s*/\s*(\d+)$")
+_NEGATIONS = {"not", "no", "never", "none", "cannot", "can't", "isn't", "doesn't", "don't", "without"}
+
+
+@dataclass
+class CascadeVerdict:
+    """Confident score produced without an LLM call"""
+    score: float
+    tier: str
+
+
+class GradingCascade:
+    """Tiered, LLM-free grading for answers that are clearly correct"""
+
+    TIERS = ("exact", "numeric", "embedding")
+
+    def __init__(
+        self,
+        embedding_model=None,
+        embedding_loader: Optional[Callable[[], Any]] = None,
+        similarity_threshold: float = EVAL_FAST_PATH_SIMILARITY,
+        cache_size: int = EVAL_REFERENCE_EMBEDDING_CACHE_SIZE
+    ):
+        """
+        Args:
+            embedding_model: LlamaIndex embedding (aget_text_embedding) or
+                sentence-transformer style model (encode)
+            embedding_loader: Called once, lazily, when no model was given
+            similarity_threshold: Cosine similarity needed by the embedding tier
+            cache_size: Reference-answer embeddings kept in memory
+        """
+        self.embedding_model = embedding_model
+        self._embedding_loader = embedding_loader
+        self.similarity_threshold = similarity_threshold
+        self.cache_size = cache_size
+        self._reference_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.stats = {tier: 0 for tier in self.TIERS}
+        self.stats.update({"escalated": 0, "reference_cache_hits": 0})
+
+    # ------------------------------------------------------------------
+    # Normalization helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        text = _WHITESPACE.sub(" ", (text or "").casefold()).strip()
+        text = text.strip("\"'`").strip()
+        return text.rstrip(".;!").strip()
+
+    @staticmethod
+    def parse_number(text: str) -> Optional[float]:
+        candidate = GradingCascade.normalize(text).replace(",", "").replace(" ", "")
+        fraction = _FRACTION.match(candidate)
+        if fraction:
+            denominator = int(fraction.group(2))
+            return int(fraction.group(1)) / denominator if denominator else None
+        if not _NUMBER.match(candidate):
+            return None
+        if candidate.endswith("%"):
+            return float(candidate[:-1]) / 100.0
+        return float(candidate)
+
+    @staticmethod
+    def _negations(text: str) -> set:
+        return {token for token in re.findall(r"[a-z']+", text.casefold()) if token in _NEGATIONS}
+
+    # ------------------------------------------------------------------
+    # Embeddings
+    # ------------------------------------------------------------------
+
+    def _model(self):
+        if self.embedding_model is None and self._embedding_loader is not None:
+            loader, self._embedding_loader = self._embedding_loader, None
+            try:
+                self.embedding_model = loader()
+            except Exception as e:
+                logger.warning(f"⚠️ Grading cascade embedding tier disabled: {e}")
+        return self.embedding_model
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        model = self._model()
+        if model is None:
+            return None
+        if hasattr(model, "aget_text_embedding"):
+            return await coalesced_embedding(model, text)
+        if hasattr(model, "encode"):
+            # Sentence-transformers encode is CPU-bound; keep it off the event loop
+            return list(await asyncio.to_thread(model.encode, text))
+        return None
+
+    async def _reference_embedding(self, reference: str) -> Optional[List[float]]:
+        key = hashlib.sha256(reference.encode("utf-8")).hexdigest()
+        cached = self._reference_embeddings.get(key)
+        if cached is not None:
+            self._reference_embeddings.move_to_end(key)
+            self.stats["reference_cache_hits"] += 1
+            return cached
+
+        embedding = await self._embed(reference)
+        if embedding is not None:
+            self._reference_embeddings[key] = embedding
+            while len(self._reference_embeddings) > self.cache_size:
+                self._reference_embeddings.popitem(last=False)
+        return embedding
+
+    async def precompute(self, references: Iterable[str]) -> int:
+        """Warm the reference-embedding cache (e.g. for a quiz about to be graded)"""
+        references = list(dict.fromkeys(reference for reference in references if reference))
+        if not references or self._model() is None:
+            return 0
+        embeddings = await asyncio.gather(
+            *(self._reference_embedding(reference) for reference in references),
+            return_exceptions=True
+        )
+        failed = [e for e in embeddings if isinstance(e, Exception)]
+        if failed:
+            logger.warning(f"⚠️ {len(failed)} reference embeddings failed to precompute: {failed[0]}")
+        return sum(1 for e in embeddings if e is not None and not isinstance(e, Exception))
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+    # ------------------------------------------------------------------
+    # Cascade
+    # ------------------------------------------------------------------
+
+    async def grade(self, learner_answer: str, reference: str, use_embeddings: bool = True) -> Optional[CascadeVerdict]:
+        """
+        Returns:
+            CascadeVerdict when a tier is confident the answer is correct,
+            None when the answer must be escalated to the LLM
+        """
+        verdict = await self._grade(learner_answer, reference, use_embeddings)
+        self.stats[verdict.tier if verdict else "escalated"] += 1
+        return verdict
+
+    async def _grade(self, learner_answer: str, reference: str, use_embeddings: bool) -> Optional[CascadeVerdict]:
+        if not learner_answer or not reference:
+            return None
+
+        # Tier 1: normalized exact match
+        if self.normalize(learner_answer) == self.normalize(reference):
+            return CascadeVerdict(score=1.0, tier="exact")
+
+        # Tier 2: numeric tolerance
+        learner_num, reference_num = self.parse_number(learner_answer), self.parse_number(reference)
+        if learner_num is not None and reference_num is not None:
+            if math.isclose(learner_num, reference_num,
+                            rel_tol=EVAL_NUMERIC_REL_TOLERANCE, abs_tol=EVAL_NUMERIC_ABS_TOLERANCE):
+                return CascadeVerdict(score=1.0, tier="numeric")
+            return None  # a wrong number is not a near-synonym
+
+        # Tier 3: embedding similarity against the cached reference embedding
+        if not use_embeddings or len(learner_answer.split()) < EVAL_FAST_PATH_MIN_TOKENS:
+            return None
+        if self._negations(learner_answer) != self._negations(reference):
+            return None
+        try:
+            reference_embedding = await self._reference_embedding(reference)
+            if reference_embedding is None:
+                return None
+            learner_embedding = await self._embed(learner_answer)
+            if learner_embedding is None:
+                return None
+        except Exception as e:
+            logger.warning(f"⚠️ Grading cascade embedding tier failed: {e}")
+            return None
+
+        similarity = self._cosine(learner_embedding, reference_embedding)
+        if similarity >= self.similarity_threshold:
+            return CascadeVerdict(score=round(min(1.0, similarity), 4), tier="embedding")
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        short_circuited = sum(self.stats[tier] for tier in self.TIERS)
+        total = short_circuited + self.stats["escalated"]
+        return {
+            **self.stats,
+            "llm_calls_avoided": short_circuited,
+            "fast_path_rate": round(short_circuited / total, 4) if total else 0.0,
+        }
@@ -14,6 +14,8 @@ import logging
 from typing import Dict, Tuple, List, Optional
 from dataclasses import dataclass, field
 
+from backend.core.course_kg_cache import get_course_kg_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -200,9 +202,13 @@ class GroundingManager:
                    collect(p.concept_id) as prerequisites
             """
             
-            async with self.neo4j.session() as session:
-                result = await session.run(query, id=concept_id)
-                record = await result.single()
+            async def load():
+                async with self.neo4j.session() as session:
+                    result = await session.run(query, id=concept_id)
+                    record = await result.single()
+                return dict(record) if record else None
+            
+            record = await get_course_kg_cache().get_or_load(query, {"id": concept_id}, load)
             
             if record:
                 context.layer2_kg['definition'] = record['definition'] or ''
@@ -9,7 +9,7 @@ Per THESIS Section 3.5.5:
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -61,20 +61,18 @@ class KGSynchronizer:
             })
             RETURN n.note_id as note_id
             """
-            
-            await self.neo4j.run_query(
-                create_query,
-                note_id=note.get('note_id'),
-                learner_id=learner_id,
-                concept_id=note.get('concept_id', ''),
-                type=note.get('type', 'ATOMIC_NOTE'),
-                title=note.get('title', ''),
-                content=note.get('content', ''),
-                key_insight=note.get('key_insight', ''),
-                personal_example=note.get('personal_example', ''),
-                common_mistake=note.get('common_mistake', ''),
-                tags=note.get('tags', [])
-            )
+            statements = [(create_query, {
+                "note_id": note.get('note_id'),
+                "learner_id": learner_id,
+                "concept_id": note.get('concept_id', ''),
+                "type": note.get('type', 'ATOMIC_NOTE'),
+                "title": note.get('title', ''),
+                "content": note.get('content', ''),
+                "key_insight": note.get('key_insight', ''),
+                "personal_example": note.get('personal_example', ''),
+                "common_mistake": note.get('common_mistake', ''),
+                "tags": note.get('tags', [])
+            })]
             
             # Step 2: Link Learner → Note
             link_learner_query = """
@@ -82,11 +80,10 @@ class KGSynchronizer:
             MATCH (n:NoteNode {note_id: $note_id})
             MERGE (l)-[:CREATED_NOTE]->(n)
             """
-            await self.neo4j.run_query(
-                link_learner_query,
-                learner_id=learner_id,
-                note_id=note.get('note_id')
-            )
+            statements.append((link_learner_query, {
+                "learner_id": learner_id,
+                "note_id": note.get('note_id')
+            }))
             
             # Step 3: Link Note → Concept (ABOUT)
             link_concept_query = """
@@ -94,11 +91,10 @@ class KGSynchronizer:
             MATCH (c:CourseConcept {concept_id: $concept_id})
             MERGE (n)-[:ABOUT]->(c)
             """
-            await self.neo4j.run_query(
-                link_concept_query,
-                note_id=note.get('note_id'),
-                concept_id=note.get('concept_id')
-            )
+            statements.append((link_concept_query, {
+                "note_id": note.get('note_id'),
+                "concept_id": note.get('concept_id')
+            }))
             
             # Step 4: Link to SessionNode if available
             session_id = note.get('source_session_id')
@@ -108,11 +104,15 @@ class KGSynchronizer:
                 MERGE (s:SessionNode {session_id: $session_id})
                 MERGE (n)-[:DERIVED_FROM]->(s)
                 """
-                await self.neo4j.run_query(
-                    session_query,
-                    note_id=note.get('note_id'),
-                    session_id=session_id
-                )
+                statements.append((session_query, {
+                    "note_id": note.get('note_id'),
+                    "session_id": session_id
+                }))
+            
+            # One write transaction: the note and its links commit together
+            if await self.neo4j.run_many(statements) is None:
+                self.logger.error(f"Failed to sync note {note.get('note_id')} to KG")
+                return False
             
             self.logger.info(f"Synced note {note.get('note_id')} to KG")
             return True
@@ -137,28 +137,23 @@ class KGSynchronizer:
             return 0
         
         try:
-            link_count = 0
+            link_query = """
+            MATCH (n1:NoteNode {note_id: $note_id})
+            MATCH (l:Learner {learner_id: $learner_id})-[:CREATED_NOTE]->(n2:NoteNode)
+            MATCH (n2)-[:ABOUT]->(c:CourseConcept {concept_id: $concept_id})
+            WHERE n1.note_id <> n2.note_id
+              AND NOT (n1)-[:LINKSTO]->(n2)
+            CREATE (n1)-[:LINKSTO]->(n2)
+            RETURN count(*) as created
+            """
             
-            for related_concept in related_concept_ids:
-                link_query = """
-                MATCH (n1:NoteNode {note_id: $note_id})
-                MATCH (l:Learner {learner_id: $learner_id})-[:CREATED_NOTE]->(n2:NoteNode)
-                MATCH (n2)-[:ABOUT]->(c:CourseConcept {concept_id: $concept_id})
-                WHERE n1.note_id <> n2.note_id
-                  AND NOT (n1)-[:LINKSTO]->(n2)
-                CREATE (n1)-[:LINKSTO]->(n2)
-                RETURN count(*) as created
-                """
-                
-                result = await self.neo4j.run_query(
-                    link_query,
-                    note_id=note_id,
-                    learner_id=learner_id,
-                    concept_id=related_concept
-                )
-                
-                if result and len(result) > 0:
-                    link_count += result[0].get('created', 0)
+            # One transaction for all related concepts
+            results = await self.neo4j.run_many([
+                (link_query, {"note_id": note_id, "learner_id": learner_id, "concept_id": related_concept})
+                for related_concept in related_concept_ids
+            ]) or []
+            
+            link_count = sum(result[0].get('created', 0) for result in results if result)
             
             self.logger.info(f"Created {link_count} LINKSTO relationships for {note_id}")
             return link_count
@@ -167,6 +162,27 @@ class KGSynchronizer:
             self.logger.exception(f"Error linking notes: {e}")
             return 0
     
+    @staticmethod
+    def mastery_levels_statement(learner_id: str, levels: Dict[str, float]) -> Tuple[str, Dict]:
+        """
+        (query, params) setting (Learner)-[:HAS_MASTERY {level}]->(CourseConcept)
+        for several concepts; cohort analysis reads these levels.
+        """
+        query = """
+        MATCH (l:Learner {learner_id: $learner_id})
+        UNWIND $rows AS row
+        MATCH (c:CourseConcept {concept_id: row.concept_id})
+        MERGE (l)-[m:HAS_MASTERY]->(c)
+        SET m.level = row.level, m.updated_at = datetime()
+        """
+        return query, {
+            "learner_id": learner_id,
+            "rows": [
+                {"concept_id": concept_id, "level": level}
+                for concept_id, level in levels.items()
+            ]
+        }
+    
     async def update_mastery_node(
         self, 
         learner_id: str, 
@@ -0,0 +1,236 @@
+"""
+LLM Response Cache: memoize deterministic completions.
+
+Most prompts run at temperature 0.1 and repeat verbatim (domain extraction,
+metadata enrichment, error classification of identical wrong answers, probing
+questions per concept/phase). LLMFactory.get_llm() wraps the provider LLM in a
+CachedLLM so repeated prompts are answered from cache instead of the API.
+
+Tiers:
+    1. In-process  OrderedDict LRU (sync complete() and async acomplete())
+    2. Redis       optional, shared across workers, TTL (acomplete() only)
+
+Key: sha256(provider, model, temperature, whitespace-normalized prompt, kwargs)
+
+Concurrent acomplete() misses for the same key are coalesced through the
+"llm" single-flight group, so only one upstream request is made.
+
+Opting out for a single call (e.g. self-consistency sampling, which needs
+independent samples of the same prompt):
+    await llm.acomplete(prompt, cache=False)       # CachedLLM only
+    with bypass_llm_cache():                       # works with any LLM
+        await llm.acomplete(prompt)
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import re
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Sequence
+
+from llama_index.core.llms import LLM, CompletionResponse, LLMMetadata
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+
+from backend.core.single_flight import get_single_flight
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_bypass: contextvars.ContextVar = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_llm_cache():
+    """Disable LLM response caching for calls made (or tasks created) inside the block"""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class LLMResponseCache:
+    """Two-tier store for completion texts with hit-rate metrics"""
+
+    REDIS_PREFIX = "llmcache:"
+
+    def __init__(self, redis=None, max_entries: int = 2048, ttl_seconds: int = 86400):
+        """
+        Args:
+            redis: Optional RedisClient for the shared tier
+            max_entries: In-process LRU bound
+            ttl_seconds: Redis entry lifetime
+        """
+        self.redis = redis
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {"hits": 0, "redis_hits": 0, "misses": 0, "bypassed": 0}
+
+    def attach_redis(self, redis) -> None:
+        self.redis = redis
+
+    @staticmethod
+    def make_key(provider: str, model: str, temperature: float, prompt: str, kwargs: Dict[str, Any]) -> str:
+        normalized = _WHITESPACE.sub(" ", prompt).strip()
+        extra = json.dumps(kwargs, sort_keys=True, default=str) if kwargs else ""
+        raw = f"{provider}\0{model}\0{temperature}\0{normalized}\0{extra}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["redis_hits"] + self.stats["misses"]
+        return (self.stats["hits"] + self.stats["redis_hits"]) / lookups if lookups else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries), "hit_rate": round(self.hit_rate, 4)}
+
+    def get_local(self, key: str) -> Optional[str]:
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+        return text
+
+    def put_local(self, key: str, text: str) -> None:
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def aget(self, key: str) -> Optional[str]:
+        text = self.get_local(key)
+        if text is not None or self.redis is None:
+            return text
+        try:
+            value = await self.redis.get(f"{self.REDIS_PREFIX}{key}")
+        except Exception as e:
+            logger.debug(f"LLM cache Redis read failed: {e}")
+            return None
+        if isinstance(value, dict) and "text" in value:
+            self.stats["redis_hits"] += 1
+            self.put_local(key, value["text"])
+            return value["text"]
+        return None
+
+    async def aput(self, key: str, text: str) -> None:
+        self.put_local(key, text)
+        if self.redis is not None:
+            try:
+                await self.redis.set(f"{self.REDIS_PREFIX}{key}", {"text": text}, ttl=self.ttl_seconds)
+            except Exception as e:
+                logger.debug(f"LLM cache Redis write failed: {e}")
+
+
+class CachedLLM(LLM):
+    """LLM wrapper that serves repeated complete()/acomplete() calls from LLMResponseCache"""
+
+    inner: LLM = Field(description="Wrapped provider LLM")
+    provider: str = Field(default="")
+    model_id: str = Field(default="")
+    temperature: float = Field(default=0.1)
+    _cache: LLMResponseCache = PrivateAttr()
+
+    def __init__(self, inner: LLM, cache: LLMResponseCache, provider: str, model_id: str, temperature: float):
+        super().__init__(inner=inner, provider=provider, model_id=model_id, temperature=temperature)
+        self._cache = cache
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedLLM"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return self.inner.metadata
+
+    @property
+    def cache(self) -> LLMResponseCache:
+        return self._cache
+
+    def _key(self, prompt: str, formatted: bool, kwargs: Dict[str, Any]) -> Optional[str]:
+        if _bypass.get():
+            self._cache.stats["bypassed"] += 1
+            return None
+        return self._cache.make_key(
+            self.provider, self.model_id, self.temperature, prompt, {"formatted": formatted, **kwargs}
+        )
+
+    # ----- Completion (cached) -----
+
+    def complete(self, prompt: str, formatted: bool = False, cache: bool = True, **kwargs: Any) -> CompletionResponse:
+        key = self._key(prompt, formatted, kwargs) if cache else None
+        if key is not None:
+            text = self._cache.get_local(key)
+            if text is not None:
+                return CompletionResponse(text=text)
+            self._cache.stats["misses"] += 1
+        elif not cache:
+            self._cache.stats["bypassed"] += 1
+
+        response = self.inner.complete(prompt, formatted=formatted, **kwargs)
+        if key is not None and response.text:
+            self._cache.put_local(key, response.text)
+        return response
+
+    async def acomplete(self, prompt: str, formatted: bool = False, cache: bool = True, **kwargs: Any) -> CompletionResponse:
+        key = self._key(prompt, formatted, kwargs) if cache else None
+        if key is not None:
+            text = await self._cache.aget(key)
+            if text is not None:
+                return CompletionResponse(text=text)
+            self._cache.stats["misses"] += 1
+        elif not cache:
+            self._cache.stats["bypassed"] += 1
+
+        if key is None:
+            return await self.inner.acomplete(prompt, formatted=formatted, **kwargs)
+
+        async def load() -> CompletionResponse:
+            response = await self.inner.acomplete(prompt, formatted=formatted, **kwargs)
+            if response.text:
+                await self._cache.aput(key, response.text)
+            return response
+
+        # Identical prompts already in flight share one upstream request
+        response = await get_single_flight("llm").do(key, load)
+        return CompletionResponse(text=response.text, additional_kwargs=response.additional_kwargs)
+
+    # ----- Everything else is passed through -----
+
+    def chat(self, messages: Sequence[Any], **kwargs: Any):
+        return self.inner.chat(messages, **kwargs)
+
+    async def achat(self, messages: Sequence[Any], **kwargs: Any):
+        return await self.inner.achat(messages, **kwargs)
+
+    def stream_chat(self, messages: Sequence[Any], **kwargs: Any):
+        return self.inner.stream_chat(messages, **kwargs)
+
+    async def astream_chat(self, messages: Sequence[Any], **kwargs: Any):
+        return await self.inner.astream_chat(messages, **kwargs)
+
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        return self.inner.stream_complete(prompt, formatted=formatted, **kwargs)
+
+    async def astream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        return await self.inner.astream_complete(prompt, formatted=formatted, **kwargs)
+
+
+# Global cache instance
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get or create the process-wide LLM response cache"""
+    global _llm_cache
+    if _llm_cache is None:
+        from backend.config import get_settings
+        settings = get_settings()
+        _llm_cache = LLMResponseCache(
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS
+        )
+    return _llm_cache
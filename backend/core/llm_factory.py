@@ -15,8 +15,53 @@ class LLMFactory:
     """
     
     @staticmethod
-    def get_llm(model_name: Optional[str] = None, temperature: float = 0.1) -> LLM:
+    def get_llm(
+        model_name: Optional[str] = None,
+        temperature: float = 0.1,
+        cache: Optional[bool] = None,
+        priority: Optional[int] = None
+    ) -> LLM:
+        """
+        Create the configured provider LLM.
+
+        When LLM_SCHEDULER_ENABLED is set, async calls go through the
+        process-wide LLMScheduler (see core/llm_scheduler.py) at `priority`
+        (default Priority.INTERACTIVE; pass Priority.BACKGROUND for ingestion
+        and analysis work).
+
+        Low-temperature LLMs are wrapped in a CachedLLM (see core/llm_cache.py)
+        when LLM_CACHE_ENABLED is set, so identical prompts are served from the
+        response cache. Pass cache=False for an unwrapped LLM, cache=True to
+        force the wrapper regardless of temperature.
+        """
         settings = get_settings()
+        llm = LLMFactory._create_llm(settings, model_name, temperature)
+
+        if settings.LLM_SCHEDULER_ENABLED:
+            from backend.core.llm_scheduler import ScheduledLLM, Priority, get_llm_scheduler
+            llm = ScheduledLLM(
+                inner=llm,
+                scheduler=get_llm_scheduler(),
+                provider=settings.LLM_PROVIDER.lower(),
+                priority=Priority.INTERACTIVE if priority is None else priority
+            )
+
+        if cache is None:
+            cache = settings.LLM_CACHE_ENABLED and temperature <= settings.LLM_CACHE_MAX_TEMPERATURE
+        if not cache:
+            return llm
+
+        from backend.core.llm_cache import CachedLLM, get_llm_cache
+        return CachedLLM(
+            inner=llm,
+            cache=get_llm_cache(),
+            provider=settings.LLM_PROVIDER.lower(),
+            model_id=model_name or settings.LLM_MODEL,
+            temperature=temperature
+        )
+
+    @staticmethod
+    def _create_llm(settings, model_name: Optional[str], temperature: float) -> LLM:
         provider = settings.LLM_PROVIDER.lower()
         model = model_name or settings.LLM_MODEL
         
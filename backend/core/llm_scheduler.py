@@ -0,0 +1,550 @@
+"""
+LLM Scheduler: process-wide, provider-aware admission control for LLM calls.
+
+Tutor, Evaluator, Planner, KAG and ingestion all call the same provider
+from one process. Without coordination they race each other into 429s,
+and a long ingestion can starve the interactive agents. Every LLM created
+by LLMFactory.get_llm() is wrapped in a ScheduledLLM, which routes every
+completion/chat call (async, sync and streaming) through the provider's
+limiter:
+
+    1. Token buckets        requests/min and (estimated) tokens/min, only
+                            when LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE
+                            are configured; waiters are admitted in priority
+                            order and hold no concurrency slot while waiting
+    2. Priority admission   INTERACTIVE (tutor, evaluator, planner, profiler)
+                            before BACKGROUND (ingestion, KAG analysis); one
+                            slot is held back for interactive traffic
+    3. AIMD concurrency     slot limit grows by ~1 per window of successes
+                            and halves on a 429 / timeout signal
+    4. Retry                throttling, timeouts and 5xx are retried with
+                            full-jitter exponential backoff
+
+Priority comes from the ScheduledLLM (LLMFactory.get_llm(priority=...)) and
+can be overridden for a block of calls:
+
+    with llm_priority(Priority.BACKGROUND):
+        await llm.acomplete(prompt)
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from llama_index.core.llms import LLM, LLMMetadata
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+
+class Priority:
+    """Scheduling classes (lower value is admitted first)"""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_priority_override: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=None)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Run the LLM calls made (or tasks created) inside the block at the given priority"""
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def estimate_tokens(text: str, completion_tokens: int = 0) -> int:
+    """Rough token count (~4 chars/token) plus the expected completion size"""
+    return max(1, len(text) // 4) + completion_tokens
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """
+    Map a provider exception to a retry class.
+
+    Returns:
+        "throttled", "timeout", "transient" or None (not retryable)
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    text = str(error).lower()
+    if status == 429 or "429" in text or "rate limit" in text or "resource exhausted" in text \
+            or "resource_exhausted" in text or "too many requests" in text:
+        return "throttled"
+    if "timed out" in text or "timeout" in text:
+        return "timeout"
+    if status in (500, 502, 503, 504) or "503" in text or "overloaded" in text or "unavailable" in text:
+        return "transient"
+    return None
+
+
+class TokenBucket:
+    """Continuous-refill token bucket; callers check delay() and then take()"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float = 1) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def take(self, amount: float = 1) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+class ProviderLimiter:
+    """Priority-ordered concurrency slots with AIMD limit and rate buckets for one provider"""
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1
+    ):
+        self.provider = provider
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+        self._in_flight = 0
+        self._waiters: List[Any] = []  # heap of (priority, seq, future)
+        self._rate_waiters: List[Any] = []  # heap of (priority, seq, tokens, future)
+        self._rate_task: Optional[asyncio.Task] = None
+        self._seq = itertools.count()
+        self.stats = {
+            "calls": 0, "retries": 0, "throttled": 0, "timeouts": 0,
+            "failures": 0, "queued": 0, "rate_wait_s": 0.0, "unscheduled": 0
+        }
+
+    # ----- Slots -----
+
+    def _capacity(self, priority: int) -> int:
+        capacity = int(self.limit)
+        if priority != Priority.INTERACTIVE and capacity > 1:
+            capacity -= 1  # keep one slot free for interactive calls
+        return capacity
+
+    async def acquire(self, priority: int) -> None:
+        if not self._waiters and self._in_flight < self._capacity(priority):
+            self._in_flight += 1
+            return
+
+        self.stats["queued"] += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # slot was granted as we were cancelled
+            raise
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            if self._in_flight >= self._capacity(priority):
+                break
+            heapq.heappop(self._waiters)
+            self._in_flight += 1
+            future.set_result(None)
+
+    # ----- AIMD -----
+
+    def on_success(self) -> None:
+        if self.limit < self.max_concurrency:
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def on_throttle(self) -> None:
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        logger.warning(f"⚠️ LLM provider {self.provider} throttling: concurrency limit -> {int(self.limit)}")
+
+    # ----- Rate -----
+
+    async def wait_for_rate(self, priority: int, tokens: int) -> None:
+        """Wait for request/token budget; called before a slot is acquired"""
+        if self.requests is None and self.tokens is None:
+            return
+        if not self._rate_waiters and self._rate_delay(tokens) == 0:
+            self._take_rate(tokens)
+            return
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        future = loop.create_future()
+        heapq.heappush(self._rate_waiters, (priority, next(self._seq), tokens, future))
+        if self._rate_task is None or self._rate_task.done():
+            self._rate_task = loop.create_task(self._admit_rate())
+        await future
+        self.stats["rate_wait_s"] += loop.time() - started
+
+    def _rate_delay(self, tokens: int) -> float:
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.delay(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.delay(tokens))
+        return delay
+
+    def _take_rate(self, tokens: int) -> None:
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(tokens)
+
+    async def _admit_rate(self) -> None:
+        """Hand out budget to the highest-priority waiter as it refills"""
+        while self._rate_waiters:
+            _, _, tokens, future = self._rate_waiters[0]
+            if future.done():
+                heapq.heappop(self._rate_waiters)
+                continue
+            delay = self._rate_delay(tokens)
+            if delay > 0:
+                # Re-check the head afterwards: an interactive call may have queued meanwhile
+                await asyncio.sleep(delay)
+                continue
+            heapq.heappop(self._rate_waiters)
+            self._take_rate(tokens)
+            future.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "rate_wait_s": round(self.stats["rate_wait_s"], 3),
+            "limit": round(self.limit, 2),
+            "in_flight": self._in_flight,
+            "waiting": sum(1 for _, _, f in self._waiters if not f.done()),
+            "rate_waiting": sum(1 for *_, f in self._rate_waiters if not f.done()),
+        }
+
+
+class LLMScheduler:
+    """Owns one ProviderLimiter per provider and runs calls through it with retry"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_retries: int = 4,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 30.0,
+        request_timeout: Optional[float] = 60.0,
+        completion_tokens: int = 512,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        """
+        Args:
+            max_concurrency: Upper bound for each provider's AIMD slot limit
+            min_concurrency: Floor the limit never drops below
+            max_retries: Retries after the first attempt (retryable errors only)
+            retry_base_delay: Backoff base in seconds (doubles per attempt, full jitter)
+            retry_max_delay: Backoff cap in seconds
+            request_timeout: Per-attempt timeout in seconds (None = no limit)
+            completion_tokens: Expected completion size added to token estimates
+            requests_per_minute: Request budget per provider (None = unlimited)
+            tokens_per_minute: Estimated token budget per provider (None = unlimited)
+        """
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.request_timeout = request_timeout
+        self.completion_tokens = completion_tokens
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def limiter_for(self, provider: str) -> ProviderLimiter:
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            limiter = ProviderLimiter(
+                provider,
+                requests_per_minute=self.requests_per_minute,
+                tokens_per_minute=self.tokens_per_minute,
+                max_concurrency=self.max_concurrency,
+                min_concurrency=self.min_concurrency
+            )
+            self._limiters[provider] = limiter
+        return limiter
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt)))
+
+    async def run(
+        self,
+        provider: str,
+        priority: int,
+        estimated_tokens: int,
+        call: Callable[[], Awaitable[Any]],
+        keep_slot: bool = False
+    ) -> Any:
+        """
+        Admit, rate-limit and retry one LLM call.
+
+        With keep_slot=True the concurrency slot is still held when the
+        result is returned; the caller must call limiter_for(provider).release().
+        """
+        self.loop = asyncio.get_running_loop()
+        limiter = self.limiter_for(provider)
+        limiter.stats["calls"] += 1
+        attempt = 0
+        while True:
+            await limiter.wait_for_rate(priority, estimated_tokens + self.completion_tokens)
+            await limiter.acquire(priority)
+            held = False
+            try:
+                if self.request_timeout:
+                    result = await asyncio.wait_for(call(), timeout=self.request_timeout)
+                else:
+                    result = await call()
+                limiter.on_success()
+                held = keep_slot
+                return result
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == "throttled":
+                    limiter.stats["throttled"] += 1
+                    limiter.on_throttle()
+                elif kind == "timeout":
+                    limiter.stats["timeouts"] += 1
+                    limiter.on_throttle()
+                if kind is None or attempt >= self.max_retries:
+                    limiter.stats["failures"] += 1
+                    raise
+            finally:
+                if not held:
+                    limiter.release()
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            limiter.stats["retries"] += 1
+            logger.info(f"🔄 Retrying {provider} LLM call in {delay:.1f}s (attempt {attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def stream(
+        self,
+        provider: str,
+        priority: int,
+        estimated_tokens: int,
+        open_stream: Callable[[], Awaitable[Any]]
+    ) -> "ScheduledStream":
+        """
+        Run a streaming call: opening the stream and its first chunk are
+        retried like run(), and the slot is held until the stream ends.
+        """
+        async def open_and_prime():
+            stream = await open_stream()
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, ()
+            return stream, (first,)
+
+        stream, head = await self.run(provider, priority, estimated_tokens, open_and_prime, keep_slot=True)
+        return ScheduledStream(stream, head, self.limiter_for(provider).release)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {provider: limiter.get_stats() for provider, limiter in self._limiters.items()}
+
+
+class ScheduledStream:
+    """Async iterator over a provider stream that frees its scheduler slot once, when done"""
+
+    def __init__(self, stream: Any, head: Sequence[Any], release: Callable[[], None]):
+        self._stream = stream
+        self._head = list(head)
+        self._release = release
+
+    def _done(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __aiter__(self) -> "ScheduledStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._head:
+            return self._head.pop(0)
+        if self._release is None:
+            raise StopAsyncIteration
+        try:
+            return await self._stream.__anext__()
+        except BaseException:
+            self._done()
+            raise
+
+    async def aclose(self) -> None:
+        self._done()
+        aclose = getattr(self._stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    def __del__(self) -> None:
+        self._done()  # abandoned without being exhausted
+
+
+class ScheduledLLM(LLM):
+    """LLM wrapper that runs every completion/chat call through the LLMScheduler"""
+
+    inner: LLM = Field(description="Wrapped provider LLM")
+    provider: str = Field(default="")
+    priority: int = Field(default=Priority.INTERACTIVE)
+    _scheduler: LLMScheduler = PrivateAttr()
+
+    def __init__(self, inner: LLM, scheduler: LLMScheduler, provider: str, priority: int = Priority.INTERACTIVE):
+        super().__init__(inner=inner, provider=provider, priority=priority)
+        self._scheduler = scheduler
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ScheduledLLM"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return self.inner.metadata
+
+    def _priority(self) -> int:
+        override = _priority_override.get()
+        return self.priority if override is None else override
+
+    @staticmethod
+    def _messages_text(messages: Sequence[Any]) -> str:
+        return " ".join(str(getattr(m, "content", m) or "") for m in messages)
+
+    # ----- Async -----
+
+    async def acomplete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        return await self._scheduler.run(
+            self.provider, self._priority(), estimate_tokens(prompt),
+            lambda: self.inner.acomplete(prompt, formatted=formatted, **kwargs)
+        )
+
+    async def achat(self, messages: Sequence[Any], **kwargs: Any):
+        return await self._scheduler.run(
+            self.provider, self._priority(), estimate_tokens(self._messages_text(messages)),
+            lambda: self.inner.achat(messages, **kwargs)
+        )
+
+    async def astream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        return await self._scheduler.stream(
+            self.provider, self._priority(), estimate_tokens(prompt),
+            lambda: self.inner.astream_complete(prompt, formatted=formatted, **kwargs)
+        )
+
+    async def astream_chat(self, messages: Sequence[Any], **kwargs: Any):
+        return await self._scheduler.stream(
+            self.provider, self._priority(), estimate_tokens(self._messages_text(messages)),
+            lambda: self.inner.astream_chat(messages, **kwargs)
+        )
+
+    # ----- Sync -----
+
+    def _run_sync(self, estimated_tokens: int, call: Callable[[], Any]) -> Any:
+        """
+        Run a blocking provider call through the scheduler. The call itself
+        runs in a worker thread; admission happens on the scheduler's loop
+        (or a private one when no loop is running).
+        """
+        priority = self._priority()
+        scheduled = self._scheduler.run(self.provider, priority, estimated_tokens, lambda: asyncio.to_thread(call))
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        loop = self._scheduler.loop
+        if loop is not None and loop.is_running() and loop is not running:
+            return asyncio.run_coroutine_threadsafe(scheduled, loop).result()
+        if running is None:
+            return asyncio.run(scheduled)
+
+        # Blocking call made on the event loop thread itself: waiting for
+        # admission here would deadlock the loop, so it goes straight through
+        scheduled.close()
+        self._scheduler.limiter_for(self.provider).stats["unscheduled"] += 1
+        return call()
+
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        return self._run_sync(
+            estimate_tokens(prompt),
+            lambda: self.inner.complete(prompt, formatted=formatted, **kwargs)
+        )
+
+    def chat(self, messages: Sequence[Any], **kwargs: Any):
+        return self._run_sync(
+            estimate_tokens(self._messages_text(messages)),
+            lambda: self.inner.chat(messages, **kwargs)
+        )
+
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        # Admission covers the call that opens the stream; the slot is freed on return
+        return self._run_sync(
+            estimate_tokens(prompt),
+            lambda: self.inner.stream_complete(prompt, formatted=formatted, **kwargs)
+        )
+
+    def stream_chat(self, messages: Sequence[Any], **kwargs: Any):
+        return self._run_sync(
+            estimate_tokens(self._messages_text(messages)),
+            lambda: self.inner.stream_chat(messages, **kwargs)
+        )
+
+
+# Global scheduler instance
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get or create the process-wide LLM scheduler"""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        from backend.config import get_settings
+        settings = get_settings()
+        _llm_scheduler = LLMScheduler(
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            min_concurrency=settings.LLM_MIN_CONCURRENCY,
+            max_retries=settings.LLM_MAX_RETRIES,
+            retry_base_delay=settings.LLM_RETRY_BASE_DELAY,
+            retry_max_delay=settings.LLM_RETRY_MAX_DELAY,
+            request_timeout=settings.LLM_REQUEST_TIMEOUT,
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE
+        )
+    return _llm_scheduler
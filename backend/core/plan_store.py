@@ -0,0 +1,179 @@
+"""
+Plan Store: versioned read model for planned learning paths.
+
+PathPlannerAgent.execute() is the write path (profile fetch, graph queries,
+ToT / LinUCB planning). Everything the dashboard reads afterwards - the
+full path, the next node, node status changes - is served from the stored
+plan document instead of re-planning.
+
+Storage (Redis, via CentralStateManager):
+    path:{learner_id}          plan document (the planner result + read-model fields)
+    path_version:{learner_id}  monotonically increasing version counter (INCR)
+
+Read-model fields added to the plan document:
+    path_id       "{learner_id}:{token}", new for every generated plan
+    version       bumped on every write (plan or node delta)
+    updated_at    ISO timestamp of the last write
+    node_index    {concept_id: position in learning_path} for O(1) node lookup
+    next_index    position of the first node not yet done (None when finished)
+
+Node deltas are read-modify-write under WATCH/MULTI on path:{learner_id},
+so the If-Match version check and the write are atomic across workers.
+"""
+
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from redis.exceptions import WatchError
+
+from backend.core.constants import PLAN_UPDATE_RETRIES
+
+logger = logging.getLogger(__name__)
+
+
+class PlanNotFoundError(LookupError):
+    """No stored plan (or node) matches the request"""
+
+
+class PlanVersionConflict(ValueError):
+    """Stored plan changed since the version the client based its write on"""
+
+
+class PlanStore:
+    """Persisted, versioned learning-path documents with in-place node deltas"""
+
+    PLAN_PREFIX = "path:"
+    VERSION_PREFIX = "path_version:"
+    DONE_STATUSES = {"completed", "mastered", "skipped"}
+
+    def __init__(self, state_manager, max_retries: int = PLAN_UPDATE_RETRIES):
+        """
+        Args:
+            state_manager: CentralStateManager (Redis-backed)
+            max_retries: WATCH conflicts tolerated per node update before giving up
+        """
+        self.state_manager = state_manager
+        self.max_retries = max_retries
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def etag(plan: Dict[str, Any]) -> str:
+        return f'W/"{plan.get("path_id", "")}-{plan.get("version", 0)}"'
+
+    @staticmethod
+    def learner_id_from_path_id(path_id: str) -> str:
+        return path_id.rsplit(":", 1)[0]
+
+    @classmethod
+    def next_node(cls, plan: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        index = plan.get("next_index")
+        path = plan.get("learning_path") or []
+        return path[index] if index is not None and index < len(path) else None
+
+    @classmethod
+    def _advance(cls, plan: Dict[str, Any], start: int = 0) -> None:
+        path = plan.get("learning_path") or []
+        index = start
+        while index < len(path) and path[index].get("status") in cls.DONE_STATUSES:
+            index += 1
+        plan["next_index"] = index if index < len(path) else None
+
+    async def _next_version(self, learner_id: str, current: int) -> int:
+        version = await self.state_manager.redis.increment(f"{self.VERSION_PREFIX}{learner_id}")
+        # increment() returns 0 on Redis errors; never go backwards
+        return max(int(version or 0), current + 1)
+
+    async def _write(self, learner_id: str, plan: Dict[str, Any]) -> Dict[str, Any]:
+        plan["version"] = await self._next_version(learner_id, plan.get("version", 0))
+        plan["updated_at"] = datetime.now().isoformat()
+        await self.state_manager.set(f"{self.PLAN_PREFIX}{learner_id}", plan)
+        return plan
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def save(self, learner_id: str, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a freshly generated plan (new path_id, next version)"""
+        path = plan.get("learning_path") or []
+        plan["path_id"] = f"{learner_id}:{uuid.uuid4().hex[:12]}"
+        plan["node_index"] = {step.get("concept"): i for i, step in enumerate(path)}
+        self._advance(plan)
+        return await self._write(learner_id, plan)
+
+    async def get(self, learner_id: str) -> Optional[Dict[str, Any]]:
+        plan = await self.state_manager.get(f"{self.PLAN_PREFIX}{learner_id}")
+        return plan if isinstance(plan, dict) else None
+
+    async def update_node(
+        self,
+        path_id: str,
+        node_id: str,
+        status: str,
+        expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply a node status change to the stored plan in place.
+
+        Raises:
+            PlanNotFoundError: unknown path_id / node_id (or path superseded by a re-plan)
+            PlanVersionConflict: expected_version no longer matches (or the plan
+                kept changing under concurrent writers)
+        """
+        learner_id = self.learner_id_from_path_id(path_id)
+        plan_key = f"{self.PLAN_PREFIX}{learner_id}"
+
+        for _ in range(self.max_retries):
+            try:
+                async with self.state_manager.redis.pipeline(transaction=True) as pipe:
+                    await pipe.watch(plan_key)
+                    raw = await pipe.get(plan_key)
+                    plan = json.loads(raw) if raw else None
+                    self._apply_node_status(plan, path_id, node_id, status, expected_version)
+
+                    plan["version"] = await self._next_version(learner_id, plan.get("version", 0))
+                    plan["updated_at"] = datetime.now().isoformat()
+                    pipe.multi()
+                    pipe.set(plan_key, json.dumps(plan, default=str))
+                    await pipe.execute()
+
+                logger.debug(f"Path {path_id}: {node_id} -> {status} (v{plan['version']})")
+                return plan
+            except WatchError:
+                # Another writer got in between; re-read (the version check
+                # fails on the retry when the client pinned a version)
+                continue
+
+        raise PlanVersionConflict(f"Path {path_id} kept changing, gave up after {self.max_retries} attempts")
+
+    def _apply_node_status(
+        self,
+        plan: Optional[Dict[str, Any]],
+        path_id: str,
+        node_id: str,
+        status: str,
+        expected_version: Optional[int]
+    ) -> None:
+        if not isinstance(plan, dict) or plan.get("path_id") != path_id:
+            raise PlanNotFoundError(f"Path not found: {path_id}")
+        if expected_version is not None and plan.get("version") != expected_version:
+            raise PlanVersionConflict(
+                f"Path {path_id} is at version {plan.get('version')}, expected {expected_version}"
+            )
+
+        index = (plan.get("node_index") or {}).get(node_id)
+        if index is None:
+            raise PlanNotFoundError(f"Node {node_id} not in path {path_id}")
+
+        plan["learning_path"][index]["status"] = status
+        next_index = plan.get("next_index")
+        if next_index is None or index <= next_index:
+            # Only a change at or before the cursor can move it; every node
+            # before the cursor is done, so a re-opened node becomes the cursor
+            self._advance(plan, start=index if status in self.DONE_STATUSES else 0)
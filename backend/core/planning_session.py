@@ -0,0 +1,145 @@
+"""
+Path Planning Session: batched Redis I/O for one adaptive path plan.
+
+The LinUCB fallback loop in PathPlannerAgent used to reload MAB stats and
+LinUCB arms and write a context vector on every step (3+ round trips per
+concept). A session instead:
+
+1. prefetch()  - loads MAB stats + LinUCB arms for the whole candidate
+                 set in a single MGET and keeps them in the RLEngine
+2. record_context() / mark_dirty() - buffer writes in memory
+3. flush()     - writes context vectors and changed LinUCB arms back in
+                 one pipelined round trip
+
+MAB stats are read-only here: they are only incremented by the feedback
+handler, so a plan never overwrites a concurrent update.
+
+Redis keys (unchanged):
+    mab_stats:{concept_id}       {"pulls", "total_reward"}
+    linucb:{concept_id}          LinUCBArm.to_bytes() blob (legacy JSON dicts still load)
+    linucb_context:{concept_id}  profile vector used for the last selection (24h TTL)
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Set
+
+from backend.core.rl_engine import RLEngine, LinUCBArm
+
+logger = logging.getLogger(__name__)
+
+
+class PathPlanningSession:
+    """In-memory view of bandit state for the concepts touched by one plan"""
+
+    MAB_PREFIX = "mab_stats:"
+    LINUCB_PREFIX = "linucb:"
+    CONTEXT_PREFIX = "linucb_context:"
+    CONTEXT_TTL_SECONDS = 86400
+
+    def __init__(self, redis, rl_engine: RLEngine):
+        """
+        Args:
+            redis: RedisClient (needs mget + pipeline)
+            rl_engine: Engine whose arms are hydrated / persisted
+        """
+        self.redis = redis
+        self.rl_engine = rl_engine
+        self._loaded: Set[str] = set()
+        self._contexts: Dict[str, List[float]] = {}
+        self._dirty: Set[str] = set()
+        self.stats = {"round_trips": 0, "prefetched": 0, "written": 0}
+
+    @staticmethod
+    def decode(value: Any) -> Any:
+        """Raw MGET bytes/str, or a value RedisClient.get already decoded"""
+        if value is None:
+            return None
+        if isinstance(value, (bytes, str)):
+            return json.loads(value)
+        return value
+
+    async def prefetch(self, concept_ids: Iterable[str], include_mab: bool = True) -> int:
+        """
+        Load bandit state for concepts not yet in this session (one MGET).
+
+        Returns:
+            Number of concepts fetched
+        """
+        ids = [cid for cid in dict.fromkeys(concept_ids) if cid and cid not in self._loaded]
+        if not ids:
+            return 0
+
+        keys = [f"{self.LINUCB_PREFIX}{cid}" for cid in ids]
+        if include_mab:
+            keys += [f"{self.MAB_PREFIX}{cid}" for cid in ids]
+
+        try:
+            values = await self.redis.mget(keys, raw=True)
+        except Exception as e:
+            logger.warning(f"Bandit state prefetch failed: {e}")
+            return 0
+        self.stats["round_trips"] += 1
+
+        for cid, raw in zip(ids, values[:len(ids)]):
+            try:
+                if LinUCBArm.is_blob(raw):
+                    self.rl_engine.linucb_arms[cid] = LinUCBArm.from_bytes(cid, raw)
+                else:
+                    data = self.decode(raw)
+                    if data:
+                        self.rl_engine.linucb_arms[cid] = LinUCBArm.from_dict(data)
+            except Exception as e:
+                logger.warning(f"Failed to load LinUCB arm for {cid}: {e}")
+
+        if include_mab:
+            for cid, raw in zip(ids, values[len(ids):]):
+                try:
+                    data = self.decode(raw)
+                    if data and cid in self.rl_engine.arms:
+                        self.rl_engine.arms[cid].set_stats(
+                            pulls=data.get("pulls", 0),
+                            total_reward=data.get("total_reward", 0.0)
+                        )
+                except Exception as e:
+                    logger.warning(f"Failed to load MAB stats for {cid}: {e}")
+
+        self._loaded.update(ids)
+        self.stats["prefetched"] += len(ids)
+        return len(ids)
+
+    def record_context(self, concept_id: str, context_vector: List[float]) -> None:
+        """Remember the context a concept was selected under (for later feedback)"""
+        self._contexts[concept_id] = list(context_vector)
+
+    def mark_dirty(self, concept_id: str) -> None:
+        """Flag a concept whose LinUCB arm changed in memory"""
+        self._dirty.add(concept_id)
+
+    async def flush(self) -> int:
+        """
+        Write buffered context vectors and dirty arm state in one pipeline.
+
+        Returns:
+            Number of keys written
+        """
+        if not self._contexts and not self._dirty:
+            return 0
+
+        pipe = self.redis.pipeline()
+        written = 0
+        for cid, vector in self._contexts.items():
+            pipe.set(f"{self.CONTEXT_PREFIX}{cid}", json.dumps(vector), ex=self.CONTEXT_TTL_SECONDS)
+            written += 1
+        for cid in self._dirty:
+            arm = self.rl_engine.linucb_arms.get(cid)
+            if arm is not None:
+                pipe.set(f"{self.LINUCB_PREFIX}{cid}", arm.to_bytes())
+                written += 1
+
+        await pipe.execute()
+        self.stats["round_trips"] += 1
+        self.stats["written"] += written
+        self._contexts.clear()
+        self._dirty.clear()
+        return written
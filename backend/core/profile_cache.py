@@ -0,0 +1,253 @@
+"""
+Learner Profile Cache: request-scoped memo + in-process LRU over Redis.
+
+Evaluator, Path Planner and the learner routes read the same profile
+several times per request (the planner once per candidate path), and
+every read used to be a Redis GET. Profiles are written through
+CentralStateManager.save_learner_profile, which keeps these tiers current.
+
+Tiers:
+    1. Request memo  per HTTP request (contextvar), repeatable reads
+    2. In-process    OrderedDict LRU, bounded, per-entry TTL, keyed by
+                     the profile 'version' the profiler maintains
+    3. Redis         profile:<learner_id> (then PostgreSQL on a miss)
+
+Writers publish {learner_id, version, origin} on PROFILE_CACHE_CHANNEL;
+every worker drops its LRU entry unless it already holds a newer version
+(out-of-order delivery). The LRU tier is only used while the pub/sub
+listener is running, so workers never serve another worker's stale
+profile for longer than message latency (or the TTL if a message is lost).
+
+Usage:
+    cache = get_profile_cache()
+    cache.attach_redis(redis)
+    await cache.start_listener()
+
+    with profile_request_scope():
+        profile = await state_manager.get_learner_profile(learner_id)
+"""
+
+import asyncio
+import contextvars
+import copy
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from backend.core.constants import (
+    PROFILE_CACHE_MAX_ENTRIES,
+    PROFILE_CACHE_TTL_SECONDS,
+    PROFILE_CACHE_CHANNEL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+_request_memo: contextvars.ContextVar = contextvars.ContextVar("profile_request_memo", default=None)
+
+
+@contextmanager
+def profile_request_scope():
+    """Memoize profile reads for the block (and tasks created inside it)"""
+    token = _request_memo.set({})
+    try:
+        yield
+    finally:
+        _request_memo.reset(token)
+
+
+def request_memo() -> Optional[Dict[str, Dict[str, Any]]]:
+    """The current request's {learner_id: profile} memo, or None outside a scope"""
+    return _request_memo.get()
+
+
+class ProfileCache:
+    """
+    Version-aware LRU of learner profiles with cross-worker invalidation.
+
+    Values are deep-copied on the way in and out; callers may mutate what
+    they get back.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        max_entries: int = PROFILE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = PROFILE_CACHE_TTL_SECONDS,
+        channel: str = PROFILE_CACHE_CHANNEL
+    ):
+        """
+        Args:
+            redis: RedisClient used for pub/sub invalidation
+            max_entries: In-process LRU bound
+            ttl_seconds: Entry lifetime if no invalidation arrives
+            channel: Pub/sub channel shared by all workers
+        """
+        self.redis = redis
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+        self._pubsub = None
+        self.stats = {"memo_hits": 0, "hits": 0, "misses": 0, "invalidations": 0}
+
+    def attach_redis(self, redis) -> None:
+        self.redis = redis
+
+    @property
+    def enabled(self) -> bool:
+        """LRU tier is active only while invalidations are being received"""
+        return self._listener is not None and not self._listener.done()
+
+    @staticmethod
+    def version_of(profile: Dict[str, Any]) -> int:
+        try:
+            return int(profile.get("version") or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    # ------------------------------------------------------------------
+    # Tiers 1-2
+    # ------------------------------------------------------------------
+
+    def get(self, learner_id: str) -> Optional[Dict[str, Any]]:
+        """Memo, then LRU; None on a miss"""
+        memo = request_memo()
+        if memo is not None and learner_id in memo:
+            self.stats["memo_hits"] += 1
+            return copy.deepcopy(memo[learner_id])
+
+        if not self.enabled:
+            return None
+        entry = self._entries.get(learner_id)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            self._entries.pop(learner_id, None)
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(learner_id)
+        self.stats["hits"] += 1
+        profile = entry[2]
+        if memo is not None:
+            memo[learner_id] = copy.deepcopy(profile)
+        return copy.deepcopy(profile)
+
+    def put(self, learner_id: str, profile: Dict[str, Any]) -> None:
+        """Store a profile read from Redis/PostgreSQL or just written"""
+        memo = request_memo()
+        if memo is not None:
+            memo[learner_id] = copy.deepcopy(profile)
+
+        if not self.enabled:
+            return
+        version = self.version_of(profile)
+        current = self._entries.get(learner_id)
+        if current is not None and current[1] > version:
+            return  # Never replace a newer profile with an older read
+        self._entries[learner_id] = (time.monotonic(), version, copy.deepcopy(profile))
+        self._entries.move_to_end(learner_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, learner_id: str, version: Optional[int] = None) -> None:
+        """Drop learner's entry unless it is newer than version"""
+        current = self._entries.get(learner_id)
+        if current is None:
+            return
+        if version is not None and current[1] > version:
+            return
+        del self._entries[learner_id]
+        self.stats["invalidations"] += 1
+
+    # ------------------------------------------------------------------
+    # Cross-worker invalidation (Redis pub/sub)
+    # ------------------------------------------------------------------
+
+    async def publish(self, learner_id: str, version: int) -> None:
+        """Tell other workers learner's profile changed"""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.client.publish(
+                self.channel,
+                json.dumps({"learner_id": learner_id, "version": version, "origin": self.origin})
+            )
+        except Exception as e:
+            # Other workers fall back to the TTL
+            logger.warning(f"⚠️ Profile invalidation publish failed for {learner_id}: {e}")
+
+    def on_message(self, data: Any) -> None:
+        """Apply one invalidation message"""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.origin or not message.get("learner_id"):
+            return
+        self.invalidate(message["learner_id"], message.get("version"))
+
+    async def start_listener(self) -> None:
+        """Subscribe to invalidations; enables the LRU tier"""
+        if self.redis is None or self.enabled:
+            return
+        try:
+            self._pubsub = self.redis.client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(self.channel)
+        except Exception as e:
+            logger.warning(f"⚠️ Profile cache listener unavailable, LRU tier disabled: {e}")
+            self._pubsub = None
+            return
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+        logger.info(f"✅ Profile cache listening on {self.channel}")
+
+    async def _listen(self) -> None:
+        try:
+            async for message in self._pubsub.listen():
+                if message.get("type") == "message":
+                    self.on_message(message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Profile cache listener stopped, LRU tier disabled: {e}")
+        finally:
+            self._entries.clear()
+
+    async def stop_listener(self) -> None:
+        task, self._listener = self._listener, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = None
+        self._entries.clear()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries), "enabled": self.enabled}
+
+
+# Global cache instance
+_profile_cache: Optional[ProfileCache] = None
+
+
+def get_profile_cache() -> ProfileCache:
+    """Get or create the process-wide learner profile cache"""
+    global _profile_cache
+    if _profile_cache is None:
+        _profile_cache = ProfileCache()
+    return _profile_cache
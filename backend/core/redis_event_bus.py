@@ -0,0 +1,378 @@
+"""
+Redis Streams EventBus for multi-worker deployments.
+
+The in-process EventBus only reaches subscribers living in the same Python
+process. RedisStreamEventBus keeps the same interface (subscribe / publish /
+get_event_log / get_stats) but routes every event through Redis Streams, so an
+EVALUATION_COMPLETED published by one uvicorn worker is handled by the
+planner / profiler / KAG / tutor of whichever worker picks it up.
+
+Layout:
+    stream   events:{message_type}          XADD ... MAXLEN ~ stream_maxlen
+    group    {agent_type}                   one consumer group per agent type
+    consumer {hostname}-{pid}               one consumer per process
+
+Each (event type, group) pair is served by one consumer task that:
+- reads batches with XREADGROUP (COUNT batch_size, BLOCK block_ms)
+- runs the group's handlers (with the base class timeout / stats) and XACKs
+  the entries whose handlers all succeeded; failed or timed-out ones stay pending
+- periodically reclaims entries left pending by dead consumers or failed
+  handlers (XPENDING idle > claim_idle_ms -> XCLAIM); entries delivered more than
+  max_deliveries times are acknowledged and dropped (logged as poison)
+
+Handlers that do not belong to an agent (e.g. CourseKGCache invalidation) get
+a group named after their class, so each event reaches exactly one process per
+group. Per-process caches must therefore propagate through Redis themselves
+(CourseKGCache does this via its generation counter).
+
+InMemoryStreams implements the subset of the redis.asyncio stream API used
+here, for local development and tests without a Redis server.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .event_bus import EventBus
+
+logger = logging.getLogger(__name__)
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class RedisStreamEventBus(EventBus):
+    """Drop-in EventBus backed by Redis Streams consumer groups"""
+
+    STREAM_PREFIX = "events:"
+
+    def __init__(
+        self,
+        client,
+        consumer_name: Optional[str] = None,
+        batch_size: int = 32,
+        block_ms: int = 1000,
+        stream_maxlen: int = 10000,
+        claim_idle_ms: int = 60000,
+        max_deliveries: int = 5,
+        handler_timeout: Optional[float] = None,
+        log_size: int = 1000
+    ):
+        """
+        Args:
+            client: redis.asyncio.Redis (RedisClient.client) or InMemoryStreams
+            consumer_name: Consumer name within each group (default hostname-pid)
+            batch_size: Max entries per XREADGROUP
+            block_ms: XREADGROUP block timeout
+            stream_maxlen: Approximate MAXLEN applied on XADD (trimming)
+            claim_idle_ms: Pending entries idle this long are reclaimed
+            max_deliveries: Deliveries before an entry is dropped as poison
+            handler_timeout: Seconds before a handler call is cancelled (None = no limit)
+            log_size: Ring buffer size for get_event_log (events published by this process)
+        """
+        super().__init__(handler_timeout=handler_timeout, log_size=log_size)
+        self.client = client
+        self.consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.stream_maxlen = stream_maxlen
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+
+        # (event_type, group) -> handlers
+        self._group_handlers: "OrderedDict[Tuple[str, str], List[Callable]]" = OrderedDict()
+        self._consumers: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stream_stats: Dict[str, Dict[str, int]] = {}
+
+    # ========== SUBSCRIPTION ==========
+
+    @staticmethod
+    def group_for(handler: Callable) -> str:
+        """Consumer group for a handler: its agent type, else its owner's class name"""
+        owner = getattr(handler, "__self__", None)
+        agent_type = getattr(owner, "agent_type", None)
+        if agent_type is not None:
+            return getattr(agent_type, "value", str(agent_type))
+        if owner is not None:
+            return type(owner).__name__
+        return getattr(handler, "__qualname__", "handlers").split(".")[0]
+
+    def stream_key(self, event_type: str) -> str:
+        return f"{self.STREAM_PREFIX}{event_type}"
+
+    def _stream_stats(self, event_type: str) -> Dict[str, int]:
+        return self.stream_stats.setdefault(
+            event_type, {"published": 0, "handled": 0, "failed": 0, "reclaimed": 0, "dropped": 0}
+        )
+
+    def subscribe(self, event_type: str, handler: Callable) -> None:
+        super().subscribe(event_type, handler)
+        key = (event_type, self.group_for(handler))
+        self._group_handlers.setdefault(key, []).append(handler)
+        if self._running and key not in self._consumers:
+            self._consumers[key] = asyncio.get_running_loop().create_task(self._consume(*key))
+
+    # ========== PUBLISH ==========
+
+    async def publish(
+        self,
+        sender: str,
+        receiver: str,
+        message_type: str,
+        payload: Dict[str, Any]
+    ) -> None:
+        event = {
+            "timestamp": datetime.now().isoformat(),
+            "sender": sender,
+            "receiver": receiver,
+            "message_type": message_type,
+            "payload": payload
+        }
+        self.event_log.append(event)
+        await self.client.xadd(
+            self.stream_key(message_type),
+            {"event": json.dumps(event, default=str)},
+            maxlen=self.stream_maxlen,
+            approximate=True
+        )
+        stats = self._stream_stats(message_type)
+        stats["published"] += 1
+        self.logger.info(f"Event published to stream: {sender} → {receiver} ({message_type})")
+
+    # ========== CONSUMERS ==========
+
+    async def _ensure_group(self, stream: str, group: str) -> None:
+        try:
+            await self.client.xgroup_create(stream, group, id="$", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _handle_entries(self, event_type: str, group: str, entries) -> None:
+        stream = self.stream_key(event_type)
+        handlers = self._group_handlers.get((event_type, group), [])
+        stats = self._stream_stats(event_type)
+        ids = []
+        for entry_id, fields in entries:
+            if fields is None:
+                # Entry trimmed away while pending
+                ids.append(entry_id)
+                continue
+            raw = fields.get(b"event") if b"event" in fields else fields.get("event")
+            try:
+                event = json.loads(_text(raw))
+            except Exception as e:
+                self.logger.error(f"❌ Undecodable event {_text(entry_id)} on {stream}: {e}")
+                ids.append(entry_id)
+                continue
+            results = await asyncio.gather(*(self._run_handler(h, event) for h in handlers))
+            if all(results):
+                ids.append(entry_id)
+                stats["handled"] += 1
+            else:
+                # Left pending: _reclaim retries it (every handler in the group
+                # runs again) until max_deliveries, then drops it
+                stats["failed"] += 1
+        if ids:
+            await self.client.xack(stream, group, *ids)
+
+    async def _reclaim(self, event_type: str, group: str) -> None:
+        """Take over entries left pending by dead consumers; drop poison entries"""
+        stream = self.stream_key(event_type)
+        pending = await self.client.xpending_range(
+            stream, group, min="-", max="+", count=self.batch_size, idle=self.claim_idle_ms
+        )
+        if not pending:
+            return
+        stats = self._stream_stats(event_type)
+        # Claiming counts as another delivery: stop once max_deliveries is reached
+        poison = [p["message_id"] for p in pending if p["times_delivered"] >= self.max_deliveries]
+        if poison:
+            await self.client.xack(stream, group, *poison)
+            stats["dropped"] += len(poison)
+            self.logger.error(f"❌ Dropped {len(poison)} poison events on {stream} ({group})")
+        retry = [p["message_id"] for p in pending if p["times_delivered"] < self.max_deliveries]
+        if retry:
+            claimed = await self.client.xclaim(stream, group, self.consumer_name, self.claim_idle_ms, retry)
+            stats["reclaimed"] += len(claimed)
+            await self._handle_entries(event_type, group, claimed)
+
+    async def _consume(self, event_type: str, group: str) -> None:
+        stream = self.stream_key(event_type)
+        await self._ensure_group(stream, group)
+        last_reclaim = 0.0
+        while self._running:
+            try:
+                now = time.monotonic()
+                if now - last_reclaim >= self.claim_idle_ms / 1000:
+                    last_reclaim = now
+                    await self._reclaim(event_type, group)
+
+                response = await self.client.xreadgroup(
+                    group, self.consumer_name, {stream: ">"},
+                    count=self.batch_size, block=self.block_ms
+                )
+                for _, entries in response or []:
+                    await self._handle_entries(event_type, group, entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"❌ Stream consumer {stream} ({group}) failed: {e}")
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        """Create consumer groups and start one consumer task per (event type, group)"""
+        # Groups exist before start() returns, so nothing published afterwards is missed
+        for event_type, group in self._group_handlers:
+            await self._ensure_group(self.stream_key(event_type), group)
+        self._running = True
+        loop = asyncio.get_running_loop()
+        for key in self._group_handlers:
+            if key not in self._consumers:
+                self._consumers[key] = loop.create_task(self._consume(*key))
+        self.logger.info(f"✅ Redis Streams EventBus started ({len(self._consumers)} consumers as {self.consumer_name})")
+
+    async def stop(self, drain_timeout: Optional[float] = 10.0) -> None:
+        """Stop consumers. Unacknowledged entries stay pending and are reclaimed by other workers."""
+        self._running = False
+        tasks = list(self._consumers.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._consumers.clear()
+
+    async def drain(self) -> None:
+        """Wait until every group has read and acknowledged everything published so far"""
+        while True:
+            busy = False
+            for event_type, group in self._group_handlers:
+                for info in await self.client.xinfo_groups(self.stream_key(event_type)):
+                    if _text(info.get("name")) == group and (info.get("pending") or info.get("lag")):
+                        busy = True
+            if not busy:
+                return
+            await asyncio.sleep(0.01)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["mode"] = "redis_streams"
+        stats["consumer"] = self.consumer_name
+        stats["streams"] = {k: dict(v) for k, v in self.stream_stats.items()}
+        return stats
+
+
+class InMemoryStreams:
+    """
+    In-process stand-in for the redis.asyncio stream commands used by
+    RedisStreamEventBus (xadd, xgroup_create, xreadgroup, xack, xpending_range,
+    xclaim, xinfo_groups). Single process only; for development and tests.
+    """
+
+    def __init__(self):
+        self._streams: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+        self._groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._seq = 0
+        self._cond = asyncio.Condition()
+
+    async def xadd(self, name, fields, id="*", maxlen=None, approximate=True):
+        async with self._cond:
+            self._seq += 1
+            entry_id = f"{int(time.time() * 1000)}-{self._seq}"
+            stream = self._streams.setdefault(name, OrderedDict())
+            stream[entry_id] = dict(fields)
+            while maxlen is not None and len(stream) > maxlen:
+                stream.popitem(last=False)
+            self._cond.notify_all()
+            return entry_id
+
+    async def xgroup_create(self, name, groupname, id="$", mkstream=False):
+        if (name, groupname) in self._groups:
+            raise RuntimeError("BUSYGROUP Consumer Group name already exists")
+        stream = self._streams.setdefault(name, OrderedDict())
+        last = next(reversed(stream), "0-0") if id == "$" and stream else "0-0"
+        self._groups[(name, groupname)] = {"last": last, "pending": OrderedDict()}
+        return True
+
+    @staticmethod
+    def _after(entry_id: str, last: str) -> bool:
+        a, b = (tuple(int(p) for p in x.split("-")) for x in (entry_id, last))
+        return a > b
+
+    def _new_entries(self, name, group, count):
+        stream = self._streams.get(name, {})
+        return [(eid, f) for eid, f in stream.items() if self._after(eid, group["last"])][:count]
+
+    async def xreadgroup(self, groupname, consumername, streams, count=None, block=None, noack=False):
+        deadline = time.monotonic() + (block or 0) / 1000
+        async with self._cond:
+            while True:
+                response = []
+                for name in streams:
+                    group = self._groups[(name, groupname)]
+                    entries = self._new_entries(name, group, count or 1 << 30)
+                    if entries:
+                        group["last"] = entries[-1][0]
+                        for eid, _ in entries:
+                            group["pending"][eid] = {
+                                "consumer": consumername, "delivered_at": time.monotonic(), "times_delivered": 1
+                            }
+                        response.append((name, entries))
+                remaining = deadline - time.monotonic()
+                if response or not block or remaining <= 0:
+                    return response
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def xack(self, name, groupname, *ids):
+        pending = self._groups[(name, groupname)]["pending"]
+        return sum(1 for eid in ids if pending.pop(_text(eid), None) is not None)
+
+    async def xpending_range(self, name, groupname, min, max, count, consumername=None, idle=None):
+        now = time.monotonic()
+        result = []
+        for eid, info in self._groups[(name, groupname)]["pending"].items():
+            idle_ms = int((now - info["delivered_at"]) * 1000)
+            if idle is not None and idle_ms < idle:
+                continue
+            result.append({
+                "message_id": eid,
+                "consumer": info["consumer"],
+                "time_since_delivered": idle_ms,
+                "times_delivered": info["times_delivered"]
+            })
+            if len(result) >= count:
+                break
+        return result
+
+    async def xclaim(self, name, groupname, consumername, min_idle_time, message_ids):
+        now = time.monotonic()
+        stream = self._streams.get(name, {})
+        pending = self._groups[(name, groupname)]["pending"]
+        claimed = []
+        for eid in message_ids:
+            info = pending.get(_text(eid))
+            if info is None or (now - info["delivered_at"]) * 1000 < min_idle_time:
+                continue
+            info.update(consumer=consumername, delivered_at=now, times_delivered=info["times_delivered"] + 1)
+            claimed.append((_text(eid), stream.get(_text(eid))))
+        return claimed
+
+    async def xinfo_groups(self, name):
+        return [
+            {
+                "name": groupname,
+                "pending": len(group["pending"]),
+                "last-delivered-id": group["last"],
+                "lag": len(self._new_entries(name, group, 1 << 30))
+            }
+            for (stream, groupname), group in self._groups.items() if stream == name
+        ]
@@ -3,6 +3,9 @@ from enum import Enum
 import random
 import math
 import logging
+import struct
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -73,12 +76,19 @@ class LinUCBArm:
     Scientific Basis: Li et al., 2010 - "A Contextual-Bandit Approach to
     Personalized News Article Recommendation" (Yahoo! Research).
     
-    Each arm maintains:
-    - A: d×d matrix (context covariance)
-    - b: d×1 vector (reward accumulator)
-    - theta: Ridge regression weights
+    Each arm maintains (as float64 NumPy arrays):
+    - A_inv: d×d inverse context covariance (A starts at I, so A_inv does too)
+    - b: d reward accumulator
+    - theta: Ridge regression weights (A_inv b), kept in sync on update
+    
+    Updates are rank-1 Sherman–Morrison steps, so no matrix is ever inverted.
     """
     
+    # Binary blob layout: magic, version, d, pulls, alpha | A_inv (d*d f8) | b (d f8)
+    BLOB_MAGIC = b"LUCB"
+    BLOB_VERSION = 1
+    _BLOB_HEADER = struct.Struct("<4sBHqd")
+    
     def __init__(self, concept_id: str, d: int = 10, alpha: float = 1.0):
         """
         Initialize LinUCB arm.
@@ -93,10 +103,16 @@ class LinUCBArm:
         self.alpha = alpha
         
         # Ridge Regression components
-        self.A = [[1.0 if i == j else 0.0 for j in range(d)] for i in range(d)]  # d×d identity
-        self.b = [0.0] * d  # d×1 zero vector
+        self.A_inv = np.eye(d)      # (A = I)^-1
+        self.b = np.zeros(d)        # d×1 zero vector
+        self.theta = np.zeros(d)    # A^-1 b
         self.pulls = 0
     
+    @property
+    def A(self) -> np.ndarray:
+        """Covariance matrix (derived; only needed for inspection/legacy export)"""
+        return np.linalg.inv(self.A_inv)
+    
     def get_ucb_score(self, context: List[float]) -> float:
         """
         Calculate UCB score for this arm given context.
@@ -109,69 +125,76 @@ class LinUCBArm:
         Returns:
             UCB score (higher = better)
         """
-        import numpy as np
-        
-        x = np.array(context).reshape(-1, 1)  # d×1
-        A = np.array(self.A)  # d×d
-        b = np.array(self.b).reshape(-1, 1)  # d×1
-        
-        # Ridge regression: theta = A^{-1} b
-        A_inv = np.linalg.inv(A)
-        theta = A_inv @ b
-        
-        # UCB score
-        exploitation = float(theta.T @ x)
-        exploration = self.alpha * math.sqrt(float(x.T @ A_inv @ x))
-        
+        x = np.asarray(context, dtype=np.float64)
+        exploitation = float(self.theta @ x)
+        exploration = self.alpha * math.sqrt(max(float(x @ self.A_inv @ x), 0.0))
         return exploitation + exploration
     
     def update(self, context: List[float], reward: float) -> None:
         """
         Update arm statistics after observing reward.
         
-        A_a = A_a + x x^T
+        A_a = A_a + x x^T   (applied to A_a^{-1} via Sherman–Morrison)
         b_a = b_a + r x
         
         Args:
             context: Context vector used for selection
             reward: Observed reward (0-1)
         """
-        import numpy as np
-        
-        x = np.array(context).reshape(-1, 1)
-        A = np.array(self.A)
-        b = np.array(self.b).reshape(-1, 1)
-        
-        # Update
-        A = A + (x @ x.T)
-        b = b + (reward * x)
-        
-        # Store back
-        self.A = A.tolist()
-        self.b = b.flatten().tolist()
+        x = np.asarray(context, dtype=np.float64)
+        A_inv_x = self.A_inv @ x
+        self.A_inv -= np.outer(A_inv_x, A_inv_x) / (1.0 + float(x @ A_inv_x))
+        self.b += reward * x
+        self.theta = self.A_inv @ self.b
         self.pulls += 1
     
+    def to_bytes(self) -> bytes:
+        """Serialize arm state as a compact binary blob (Redis)."""
+        header = self._BLOB_HEADER.pack(self.BLOB_MAGIC, self.BLOB_VERSION, self.d, self.pulls, self.alpha)
+        return header + self.A_inv.astype("<f8").tobytes() + self.b.astype("<f8").tobytes()
+    
+    @classmethod
+    def from_bytes(cls, concept_id: str, blob: bytes) -> 'LinUCBArm':
+        """Deserialize arm state from to_bytes()."""
+        magic, version, d, pulls, alpha = cls._BLOB_HEADER.unpack_from(blob)
+        if magic != cls.BLOB_MAGIC or version != cls.BLOB_VERSION:
+            raise ValueError(f"Not a LinUCB arm blob (magic={magic!r}, version={version})")
+        offset = cls._BLOB_HEADER.size
+        arm = cls(concept_id, d=d, alpha=alpha)
+        arm.A_inv = np.frombuffer(blob, dtype="<f8", count=d * d, offset=offset).reshape(d, d).copy()
+        arm.b = np.frombuffer(blob, dtype="<f8", count=d, offset=offset + 8 * d * d).copy()
+        arm.theta = arm.A_inv @ arm.b
+        arm.pulls = pulls
+        return arm
+    
+    @classmethod
+    def is_blob(cls, data: Any) -> bool:
+        return isinstance(data, (bytes, bytearray)) and bytes(data[:4]) == cls.BLOB_MAGIC
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Serialize arm state for persistence (Redis)."""
+        """Serialize arm state as JSON-friendly dict (legacy format)."""
         return {
             "concept_id": self.concept_id,
             "d": self.d,
             "alpha": self.alpha,
-            "A": self.A,
-            "b": self.b,
+            "A": self.A.tolist(),
+            "b": self.b.tolist(),
             "pulls": self.pulls
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'LinUCBArm':
-        """Deserialize arm state from persistence."""
+        """Deserialize arm state from the legacy JSON dict (inverts A once)."""
         arm = cls(
             concept_id=data["concept_id"],
             d=data.get("d", 10),
             alpha=data.get("alpha", 1.0)
         )
-        arm.A = data.get("A", arm.A)
-        arm.b = data.get("b", arm.b)
+        if "A" in data:
+            arm.A_inv = np.linalg.inv(np.asarray(data["A"], dtype=np.float64))
+        if "b" in data:
+            arm.b = np.asarray(data["b"], dtype=np.float64).reshape(-1)
+        arm.theta = arm.A_inv @ arm.b
         arm.pulls = data.get("pulls", 0)
         return arm
 
@@ -338,10 +361,11 @@ class RLEngine:
         
         Uses Ridge Regression to learn context-reward relationship.
         Scientific Basis: Li et al., 2010 (Yahoo! Research).
-        """
-        best_concept = None
-        best_score = -float('inf')
         
+        All eligible arms are scored at once: A_inv stacked into (n, d, d),
+        theta into (n, d).
+        """
+        arms = []
         for concept_id in eligible:
             # Get or create LinUCB arm
             if concept_id not in self.linucb_arms:
@@ -349,15 +373,20 @@ class RLEngine:
                     concept_id, 
                     d=self.context_dim
                 )
-            
-            arm = self.linucb_arms[concept_id]
-            score = arm.get_ucb_score(context)
-            
-            if score > best_score:
-                best_score = score
-                best_concept = concept_id
+            arms.append(self.linucb_arms[concept_id])
         
-        return best_concept
+        scores = self.linucb_scores(arms, context)
+        return eligible[int(np.argmax(scores))]
+    
+    @staticmethod
+    def linucb_scores(arms: List[LinUCBArm], context: List[float]) -> np.ndarray:
+        """Vectorized p_a = theta_a^T x + alpha_a * sqrt(x^T A_a^{-1} x) for all arms"""
+        x = np.asarray(context, dtype=np.float64)
+        A_inv = np.stack([arm.A_inv for arm in arms])      # (n, d, d)
+        theta = np.stack([arm.theta for arm in arms])      # (n, d)
+        alpha = np.array([arm.alpha for arm in arms])      # (n,)
+        variance = np.einsum("i,nij,j->n", x, A_inv, x)
+        return theta @ x + alpha * np.sqrt(np.maximum(variance, 0.0))
     
     def record_feedback(self, concept_id: str, evaluation_score: float, context_vector: Optional[List[float]] = None) -> None:
         """
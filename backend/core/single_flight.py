@@ -0,0 +1,85 @@
+"""
+Single-flight: coalesce identical in-flight async calls.
+
+When a class hits the same concept at once, every request issues the same
+LLM prompt, the same goal embedding and the same Course KG read. A
+SingleFlight group runs the first call for a key and hands its result (or
+exception) to every caller that asks for the same key while it is running.
+Nothing is kept once the call finishes - that is what the caches are for.
+
+Groups used by the backend (see get_single_flight):
+    llm         CachedLLM.acomplete misses, keyed by the response-cache key
+    embedding   coalesced_embedding(), keyed by model + text
+    course_kg   CourseKGCache misses, keyed by the query fingerprint
+
+Usage:
+    flights = get_single_flight("llm")
+    value = await flights.do(key, lambda: expensive_call())
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent awaitables"""
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {"calls": 0, "executions": 0, "collapsed": 0, "errors": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn() once per key across concurrent callers.
+
+        The shared call runs in its own task and is shielded, so a caller
+        being cancelled does not cancel the result the others are waiting on.
+        """
+        self.stats["calls"] += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.stats["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        else:
+            self.stats["collapsed"] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "in_flight": len(self._in_flight)}
+
+
+# Process-wide groups
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Get or create the named single-flight group"""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for every group (how many calls were collapsed)"""
+    return {name: group.get_stats() for name, group in _groups.items()}
+
+
+async def coalesced_embedding(embed_model, text: str) -> List[float]:
+    """aget_text_embedding() with identical concurrent requests collapsed into one"""
+    model_id = getattr(embed_model, "model_name", None) or type(embed_model).__name__
+    key = hashlib.sha256(f"{model_id}\0{text}".encode("utf-8")).hexdigest()
+    return await get_single_flight("embedding").do(key, lambda: embed_model.aget_text_embedding(text))
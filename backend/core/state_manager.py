@@ -2,6 +2,8 @@ from typing import Dict, Any, Optional
 import json
 import logging
 
+from backend.core.profile_cache import get_profile_cache
+
 logger = logging.getLogger(__name__)
 
 class CentralStateManager:
@@ -25,6 +27,7 @@ class CentralStateManager:
         """
         self.redis = redis_client
         self.postgres = postgres_client
+        self.profile_cache = get_profile_cache()
         self.logger = logging.getLogger(__name__)
     
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
@@ -84,15 +87,23 @@ class CentralStateManager:
         """
         Get learner profile from cache or database.
         
+        Read-through: request memo -> in-process LRU -> Redis -> PostgreSQL
+        (see core/profile_cache.py).
+        
         Args:
             learner_id: Learner ID
             
         Returns:
             Learner profile dict or None
         """
-        # Try cache first
+        profile = self.profile_cache.get(learner_id)
+        if profile is not None:
+            return profile
+        
+        # Try Redis next
         profile = await self.get(f"profile:{learner_id}")
         if profile:
+            self.profile_cache.put(learner_id, profile)
             return profile
         
         # Fall back to database
@@ -101,11 +112,36 @@ class CentralStateManager:
             if profile:
                 # Cache for future access (1 hour TTL)
                 await self.set(f"profile:{learner_id}", profile, ttl=3600)
+                self.profile_cache.put(learner_id, profile)
             return profile
         except Exception as e:
             self.logger.error(f"Failed to get learner profile {learner_id}: {e}")
             return None
     
+    async def save_learner_profile(
+        self,
+        learner_id: str,
+        profile: Dict[str, Any],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Write learner profile to Redis and invalidate other workers' copies.
+        
+        Args:
+            learner_id: Learner ID
+            profile: Full profile dict
+            ttl: Time to live in seconds (None = no expiry)
+            
+        Returns:
+            True if successful
+        """
+        saved = await self.set(f"profile:{learner_id}", profile, ttl=ttl)
+        self.profile_cache.invalidate(learner_id)
+        if saved:
+            self.profile_cache.put(learner_id, profile)
+        await self.profile_cache.publish(learner_id, self.profile_cache.version_of(profile))
+        return saved
+    
     async def update_learner_progress(
         self,
         learner_id: str,
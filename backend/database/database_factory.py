@@ -59,7 +59,12 @@ class DatabaseFactory:
                     self.neo4j = Neo4jClient(
                         self.settings.NEO4J_URI,
                         self.settings.NEO4J_USER,
-                        self.settings.NEO4J_PASSWORD
+                        self.settings.NEO4J_PASSWORD,
+                        database=self.settings.NEO4J_DATABASE,
+                        max_pool_size=self.settings.NEO4J_MAX_POOL_SIZE,
+                        acquisition_timeout=self.settings.NEO4J_ACQUISITION_TIMEOUT,
+                        max_transaction_retry_time=self.settings.NEO4J_MAX_TRANSACTION_RETRY_TIME,
+                        stream_fetch_size=self.settings.NEO4J_STREAM_FETCH_SIZE
                     )
                 neo4j_connected = await self.neo4j.connect()
 
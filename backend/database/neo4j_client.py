@@ -1,6 +1,8 @@
-from neo4j import AsyncGraphDatabase, AsyncSession, AsyncResult
-from typing import Optional, List, Dict, Any
+from neo4j import AsyncGraphDatabase, AsyncSession, AsyncResult, READ_ACCESS, WRITE_ACCESS
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Mapping
 import logging
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -18,29 +20,62 @@ class Neo4jClient:
       Relationships: learned_from, confused_with, struggling_with
     
     Uses neo4j AsyncGraphDatabase for async operations.
+    
+    Besides auto-commit run_query, the client offers managed transactions
+    (execute_read / execute_write, retried by the driver on transient errors;
+    reads are routed to replicas with a neo4j:// cluster URI) and run_many,
+    which submits several statements in one transaction / round trip.
+    stream_query yields large results page by page (server-side cursor).
+    Per-query latency counters are available from get_query_stats().
     """
     
-    def __init__(self, uri: str, user: str, password: str):
+    MAX_TRACKED_QUERIES = 256  # Distinct statements with their own latency counters
+    
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        password: str,
+        database: Optional[str] = None,
+        max_pool_size: int = 50,
+        acquisition_timeout: float = 30.0,
+        max_transaction_retry_time: float = 15.0,
+        stream_fetch_size: int = 1000
+    ):
         """
         Initialize Neo4j client.
         
         Args:
-            uri: Neo4j URI (bolt://localhost:7687)
+            uri: Neo4j URI (bolt://localhost:7687, neo4j:// for routing)
             user: Username (default: neo4j)
             password: Password
+            database: Database name (None = server default)
+            max_pool_size: Maximum pooled connections
+            acquisition_timeout: Seconds to wait for a pooled connection
+            max_transaction_retry_time: Retry budget of managed transactions
+            stream_fetch_size: Records per server pull in stream_query
         """
         self.uri = uri
         self.user = user
         self.password = password
+        self.database = database
+        self.max_pool_size = max_pool_size
+        self.acquisition_timeout = acquisition_timeout
+        self.max_transaction_retry_time = max_transaction_retry_time
+        self.stream_fetch_size = stream_fetch_size
         self.driver = None
         self.logger = logging.getLogger("Neo4jClient")
+        self._query_stats: Dict[str, Dict[str, Any]] = {}
     
     async def connect(self) -> bool:
         """Create connection to Neo4j"""
         try:
             self.driver = AsyncGraphDatabase.driver(
                 self.uri,
-                auth=(self.user, self.password)
+                auth=(self.user, self.password),
+                max_connection_pool_size=self.max_pool_size,
+                connection_acquisition_timeout=self.acquisition_timeout,
+                max_transaction_retry_time=self.max_transaction_retry_time
             )
             # Verify connection
             async with self.driver.session() as session:
@@ -257,16 +292,168 @@ class Neo4jClient:
     # ============= GENERIC OPERATIONS =============
     
     async def run_query(self, query: str, **params) -> List[Dict]:
-        """Run arbitrary Cypher query"""
+        """Run arbitrary Cypher query (auto-commit)"""
+        start = time.perf_counter()
         try:
-            async with self.driver.session() as session:
+            async with self._session() as session:
                 result = await session.run(query, **params)
                 records = await result.data()
-                return [dict(record) for record in records]
+            self._record(query, start)
+            return [dict(record) for record in records]
         except Exception as e:
+            self._record(query, start, failed=True)
             self.logger.error(f"❌ Query failed: {e}")
             return []
     
+    async def execute_read(self, query: str, params: Optional[Mapping[str, Any]] = None, **kwargs) -> List[Dict]:
+        """
+        Run a read query in a managed read transaction.
+        
+        Retried by the driver on transient errors and routed to a read
+        replica when connected to a cluster. Parameters may be given as a
+        dict, as keyword arguments, or both (keywords win).
+        """
+        params = {**(params or {}), **kwargs}
+        start = time.perf_counter()
+        try:
+            async with self._session(READ_ACCESS) as session:
+                records = await session.execute_read(self._run_statements, [(query, params)])
+            self._record(query, start)
+            return records[0]
+        except Exception as e:
+            self._record(query, start, failed=True)
+            self.logger.error(f"❌ Read transaction failed: {e}")
+            return []
+    
+    async def execute_write(self, query: str, params: Optional[Mapping[str, Any]] = None, **kwargs) -> List[Dict]:
+        """Run a write query in a managed (retried) write transaction (params as in execute_read)"""
+        params = {**(params or {}), **kwargs}
+        start = time.perf_counter()
+        try:
+            async with self._session(WRITE_ACCESS) as session:
+                records = await session.execute_write(self._run_statements, [(query, params)])
+            self._record(query, start)
+            return records[0]
+        except Exception as e:
+            self._record(query, start, failed=True)
+            self.logger.error(f"❌ Write transaction failed: {e}")
+            return []
+    
+    async def run_many(
+        self,
+        statements: List[Tuple[str, Dict[str, Any]]],
+        read_only: bool = False
+    ) -> Optional[List[List[Dict]]]:
+        """
+        Run several parameterized statements in one managed transaction.
+        
+        Statements run in order and commit (or roll back) together, so a
+        multi-step workflow costs one transaction instead of one per statement.
+        
+        Args:
+            statements: (query, params) pairs
+            read_only: Use a read transaction (routable to replicas)
+            
+        Returns:
+            Records per statement, or None if the transaction failed
+        """
+        if not statements:
+            return []
+        start = time.perf_counter()
+        label = f"BATCH[{len(statements)}] " + statements[0][0]
+        try:
+            async with self._session(READ_ACCESS if read_only else WRITE_ACCESS) as session:
+                work = session.execute_read if read_only else session.execute_write
+                records = await work(self._run_statements, statements)
+            self._record(label, start)
+            return records
+        except Exception as e:
+            self._record(label, start, failed=True)
+            self.logger.error(f"❌ Batched transaction failed ({len(statements)} statements): {e}")
+            return None
+    
+    async def stream_query(
+        self,
+        query: str,
+        fetch_size: Optional[int] = None,
+        **params
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield records of a large read query one at a time.
+        
+        The server keeps a cursor and sends fetch_size records per pull, so
+        memory stays bounded by the page size rather than the result size.
+        Runs in a read session (routable to replicas). Unlike run_query,
+        errors are raised: a half-consumed stream cannot be retried silently.
+        
+        Usage:
+            async for record in neo4j.stream_query(query, fetch_size=500, x=1):
+                ...
+        """
+        start = time.perf_counter()
+        failed = False
+        try:
+            async with self.driver.session(
+                database=self.database,
+                default_access_mode=READ_ACCESS,
+                fetch_size=fetch_size or self.stream_fetch_size
+            ) as session:
+                result = await session.run(query, **params)
+                async for record in result:
+                    yield dict(record)
+        except Exception as e:
+            failed = True
+            self.logger.error(f"❌ Streamed query failed: {e}")
+            raise
+        finally:
+            self._record(query, start, failed=failed)
+    
+    @staticmethod
+    async def _run_statements(tx, statements: List[Tuple[str, Dict[str, Any]]]) -> List[List[Dict]]:
+        """Transaction function; may be re-run by the driver, so it only reads results"""
+        records = []
+        for query, params in statements:
+            result = await tx.run(query, params or {})
+            records.append([dict(record) for record in await result.data()])
+        return records
+    
+    def _session(self, access_mode: str = WRITE_ACCESS):
+        return self.driver.session(database=self.database, default_access_mode=access_mode)
+    
+    # ============= QUERY METRICS =============
+    
+    @staticmethod
+    def _query_key(query: str) -> str:
+        return re.sub(r"\s+", " ", query).strip()[:120]
+    
+    def _record(self, query: str, start: float, failed: bool = False) -> None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        key = self._query_key(query)
+        stats = self._query_stats.get(key)
+        if stats is None:
+            if len(self._query_stats) >= self.MAX_TRACKED_QUERIES:
+                key = "<other>"
+                stats = self._query_stats.get(key)
+            if stats is None:
+                stats = self._query_stats[key] = {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+        stats["count"] += 1
+        stats["errors"] += int(failed)
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+    
+    def get_query_stats(self, top: int = 20) -> List[Dict[str, Any]]:
+        """Latency counters per statement, slowest (by total time) first"""
+        rows = [
+            {
+                "query": key,
+                **stats,
+                "avg_ms": round(stats["total_ms"] / stats["count"], 2) if stats["count"] else 0.0
+            }
+            for key, stats in self._query_stats.items()
+        ]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows[:top]
+    
     async def health_check(self) -> bool:
         """Check Neo4j connection health"""
         try:
@@ -1,5 +1,5 @@
 import redis.asyncio as redis
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 import json
 import logging
 
@@ -115,6 +115,41 @@ class RedisClient:
             self.logger.error(f"❌ TTL check failed: {e}")
             return -2
     
+    @staticmethod
+    def _decode(value: Any) -> Optional[Any]:
+        """Decode a raw Redis value the same way get() does"""
+        if not value:
+            return None
+        try:
+            return json.loads(value)
+        except Exception:
+            return value.decode() if isinstance(value, bytes) else value
+    
+    async def mget(self, keys: List[str], raw: bool = False) -> List[Optional[Any]]:
+        """
+        Get many keys in one round trip.
+        
+        Args:
+            keys: Keys to fetch
+            raw: Return raw bytes (binary blobs) instead of decoding like get()
+        """
+        if not keys:
+            return []
+        try:
+            values = await self.client.mget(keys)
+            return list(values) if raw else [self._decode(v) for v in values]
+        except Exception as e:
+            self.logger.error(f"❌ MGET failed: {e}")
+            return [None] * len(keys)
+    
+    def pipeline(self, transaction: bool = False):
+        """Raw redis pipeline (queue commands, then `await pipe.execute()`)"""
+        return self.client.pipeline(transaction=transaction)
+    
+    def lock(self, name: str, timeout: Optional[float] = None, blocking_timeout: Optional[float] = None):
+        """Raw redis distributed lock"""
+        return self.client.lock(name, timeout=timeout, blocking_timeout=blocking_timeout)
+    
     # ============= SESSION OPERATIONS =============
     
     async def create_session(self, session_id: str, data: Dict, ttl: int = 3600) -> bool:
@@ -9,15 +9,7 @@ from backend.database.database_factory import (
     shutdown_databases,
     get_factory
 )
-from backend.agents import (
-    KnowledgeExtractionAgent,
-    ProfilerAgent,
-    PathPlannerAgent,
-    TutorAgent,
-    EvaluatorAgent,
-    KAGAgent
-)
-from backend.core import CentralStateManager, EventBus
+from backend.core.agent_registry import get_registry
 from backend.api.agent_routes import router as agents_router, set_agents
 from backend.api.path_routes import router as paths_router, set_path_planner_agent
 from backend.api.tutor_routes import router as tutor_router, set_tutor_agent
@@ -44,75 +36,34 @@ async def lifespan(app: FastAPI):
         logger.error("❌ Failed to initialize databases")
         raise RuntimeError("Database initialization failed")
     
-    # Initialize infrastructure
-    factory = get_factory()
-    global _state_manager, _event_bus
-    _state_manager = CentralStateManager(factory.redis, factory.postgres)
-    _state_manager.neo4j = factory.neo4j  # Add neo4j to state_manager
-    _event_bus = EventBus()
-    
-    logger.info("✅ Infrastructure initialized")
-    
-    # Initialize agents
+    # Build infrastructure + agents once; shared by every request
+    registry = get_registry()
     try:
-        ke_agent = KnowledgeExtractionAgent(
-            agent_id="knowledge_extraction_1",
-            state_manager=_state_manager,
-            event_bus=_event_bus
-        )
-        
-        profiler_agent = ProfilerAgent(
-            agent_id="profiler_1",
-            state_manager=_state_manager,
-            event_bus=_event_bus
-        )
-        
-        path_planner_agent = PathPlannerAgent(
-            agent_id="path_planner_1",
-            state_manager=_state_manager,
-            event_bus=_event_bus
-        )
-        
-        tutor_agent = TutorAgent(
-            agent_id="tutor_1",
-            state_manager=_state_manager,
-            event_bus=_event_bus
-        )
-        
-        evaluator_agent = EvaluatorAgent(
-            agent_id="evaluator_1",
-            state_manager=_state_manager,
-            event_bus=_event_bus
-        )
-        
-        kag_agent = KAGAgent(
-            agent_id="kag_1",
-            state_manager=_state_manager,
-            event_bus=_event_bus
-        )
-        
-        _agents["knowledge_extraction"] = ke_agent
-        _agents["profiler"] = profiler_agent
-        _agents["path_planner"] = path_planner_agent
-        _agents["tutor"] = tutor_agent
-        _agents["evaluator"] = evaluator_agent
-        _agents["kag"] = kag_agent
-        
-        # Set agents in routes
-        set_agents(ke_agent, profiler_agent)
-        set_path_planner_agent(path_planner_agent)
-        set_tutor_agent(tutor_agent)
-        set_evaluator_agent(evaluator_agent)
-        set_kag_agent(kag_agent)
-        
-        logger.info("✅ Agents initialized (KE, Profiler, PathPlanner, Tutor, Evaluator, KAG)")
+        await registry.startup(warm_up=True)
     except Exception as e:
         logger.error(f"❌ Agent initialization failed: {e}")
         raise RuntimeError("Agent initialization failed")
     
+    global _state_manager, _event_bus
+    _state_manager = registry.state_manager
+    _event_bus = registry.event_bus
+    _agents.update(registry.agents)
+    app.state.agent_registry = registry
+    
+    # Set agents in routes
+    set_agents(registry.get("knowledge_extraction"), registry.get("profiler"))
+    set_path_planner_agent(registry.get("path_planner"))
+    set_tutor_agent(registry.get("tutor"))
+    set_evaluator_agent(registry.get("evaluator"))
+    set_kag_agent(registry.get("kag"))
+    
+    logger.info("✅ Agents initialized (KE, Profiler, PathPlanner, Tutor, Evaluator, KAG)")
+    
     yield
     
     logger.info("🛑 Shutting down...")
+    await registry.shutdown()
+    _agents.clear()
     await shutdown_databases()
 
 # Create FastAPI app
@@ -133,6 +84,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request-scoped learner profile memo
+from backend.middleware.profile_scope import ProfileScopeMiddleware
+app.add_middleware(ProfileScopeMiddleware)
+
 # Exception Handlers
 from fastapi.exceptions import RequestValidationError
 from backend.middleware.error_handler import global_exception_handler, validation_exception_handler
@@ -166,14 +121,7 @@ async def health_check():
         "status": "healthy" if all_healthy else "degraded",
         "version": settings.API_VERSION,
         "databases": db_health,
-        "agents": {
-            "knowledge_extraction": "knowledge_extraction" in _agents,
-            "profiler": "profiler" in _agents,
-            "path_planner": "path_planner" in _agents,
-            "tutor": "tutor" in _agents,
-            "evaluator": "evaluator" in _agents,
-            "kag": "kag" in _agents
-        },
+        "agents": get_registry().availability(),
         "message": "✅ All systems operational" if all_healthy else "⚠️ Some systems degraded"
     }
 
@@ -192,6 +140,7 @@ async def system_status():
     """Detailed system status"""
     factory = get_factory()
     db_health = await factory.health_check()
+    registry_health = get_registry().health()
     
     return {
         "timestamp": __import__('datetime').datetime.now().isoformat(),
@@ -210,14 +159,10 @@ async def system_status():
                 "url": settings.REDIS_URL
             }
         },
-        "agents": {
-            "knowledge_extraction": "knowledge_extraction" in _agents,
-            "profiler": "profiler" in _agents,
-            "path_planner": "path_planner" in _agents,
-            "tutor": "tutor" in _agents,
-            "evaluator": "evaluator" in _agents,
-            "kag": "kag" in _agents
-        }
+        "agents": registry_health.pop("agents"),
+        "agent_registry_started_at": registry_health.pop("started_at"),
+        # Event bus, LLM cache/scheduler, Neo4j query, cohort, profile cache and grading cascade stats
+        "metrics": registry_health
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+from backend.core.profile_cache import profile_request_scope
+
+
+class ProfileScopeMiddleware:
+    """
+    Give every HTTP request its own learner profile memo, so repeated
+    get_learner_profile calls within a request cost one Redis GET at most.
+    
+    Plain ASGI middleware: the endpoint runs in the same context, so the
+    memo is visible to agents and to tasks they create.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with profile_request_scope():
+            await self.app(scope, receive, send)
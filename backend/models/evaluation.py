@@ -8,6 +8,7 @@ Per THESIS Section 3.5.4:
 - EvaluationResult with multi-audience feedback
 """
 
+import re
 from enum import Enum
 from datetime import datetime
 from typing import List, Optional, Dict
@@ -172,3 +173,65 @@ class EvaluationResult:
         """Check for conceptual errors"""
         return self.error_type == ErrorType.CONCEPTUAL or \
                any('conceptual' in m.type.lower() for m in self.misconceptions)
+
+
+@dataclass
+class FusedEvaluation:
+    """
+    Structured output of the fused grading call (score + diagnosis + feedback).
+    
+    from_dict() validates the (already repaired) JSON object: a missing or
+    non-numeric score is a schema violation; an unknown error type degrades
+    to CARELESS like the staged classifier does.
+    """
+    score: float                      # 0-1
+    error_type: ErrorType = ErrorType.CORRECT
+    misconception: Optional[str] = None
+    feedback: str = ""
+    dimensions: Dict = field(default_factory=dict)  # correctness/completeness/clarity, 0-10
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FusedEvaluation':
+        if not isinstance(data, dict):
+            raise ValueError("fused evaluation must be a JSON object")
+        
+        raw_score = data.get('score')
+        if isinstance(raw_score, str):
+            match = re.search(r"\d+(?:\.\d+)?", raw_score)
+            raw_score = match.group() if match else None
+        if raw_score is None or isinstance(raw_score, bool):
+            raise ValueError("fused evaluation has no numeric 'score'")
+        score = min(1.0, max(0.0, float(raw_score) / 10.0))
+        
+        error_name = str(data.get('error_type') or 'CARELESS').strip().upper()
+        error_type = ErrorType(error_name) if error_name in ErrorType.__members__ else ErrorType.CARELESS
+        
+        misconception = data.get('misconception')
+        if not isinstance(misconception, str) or misconception.strip().lower() in ('', 'none', 'null', 'n/a'):
+            misconception = None
+        
+        feedback = data.get('feedback')
+        dimensions = {
+            key: data[key] for key in ('correctness', 'completeness', 'clarity')
+            if isinstance(data.get(key), (int, float))
+        }
+        
+        return cls(
+            score=score,
+            error_type=error_type,
+            misconception=misconception.strip() if misconception else None,
+            feedback=feedback.strip() if isinstance(feedback, str) else "",
+            dimensions=dimensions
+        )
+
+
+def evaluation_event_items(event: Dict) -> List[Dict]:
+    """
+    Per-answer payloads of an EVALUATION_COMPLETED event.
+    
+    Batch events (EvaluatorAgent.execute_batch) carry one entry per graded
+    answer under 'items'; a single evaluation is returned as-is.
+    """
+    if not event.get('batch'):
+        return [event]
+    return [{'learner_id': event.get('learner_id'), **item} for item in event.get('items', [])]
@@ -69,6 +69,20 @@ class EvaluationInput(BaseModel):
     correct_answer_explanation: Optional[str] = None
     force_real: bool = False
 
+class BatchAnswerInput(BaseModel):
+    """One answer of a quiz submitted for batch evaluation"""
+    concept_id: str
+    learner_response: str
+    expected_answer: str
+    correct_answer_explanation: Optional[str] = None
+    question_id: Optional[str] = None
+
+class BatchEvaluationInput(BaseModel):
+    """Input for batch (whole quiz) evaluation"""
+    learner_id: str
+    answers: List[BatchAnswerInput]
+    force_real: bool = False
+
 class KAGInput(BaseModel):
     """Input for KAG Agent"""
     agent_id: str = "kag_agent"
@@ -0,0 +1,212 @@
+"""
+Unit tests for cohort statistics aggregation.
+
+Run: pytest backend/tests/test_cohort_stats.py -v
+"""
+
+from statistics import mean, stdev
+
+import pytest
+
+from backend.core.cohort_stats import CohortAggregator, CohortStatsStore
+
+
+class FakeNeo4j:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    async def run_many(self, statements, read_only=False):
+        self.calls.append((statements, read_only))
+        return self.results
+
+
+async def learner_stream(graphs):
+    for graph in graphs:
+        yield graph
+
+
+class TestCohortAggregator:
+    """Cypher push-down and streaming fallback"""
+
+    @pytest.mark.asyncio
+    async def test_aggregate_stream_matches_batch_statistics(self):
+        values = [0.2, 0.3, 0.1, 0.4, 0.9]
+        graphs = [{f"l{i}": {"SQL_JOIN": value, "SQL_WHERE": 0.8}} for i, value in enumerate(values)]
+
+        num_learners, stats = await CohortAggregator(struggle_threshold=0.4).aggregate_stream(
+            learner_stream(graphs)
+        )
+
+        join = stats["SQL_JOIN"]
+        assert num_learners == 5
+        assert join["avg_mastery"] == pytest.approx(mean(values))
+        assert join["std_dev"] == pytest.approx(stdev(values))
+        assert (join["min_mastery"], join["max_mastery"]) == (0.1, 0.9)
+        assert join["struggle_rate"] == pytest.approx(0.6)
+        assert stats["SQL_WHERE"]["std_dev"] == pytest.approx(0.0)
+
+    @pytest.mark.asyncio
+    async def test_aggregate_reads_one_row_per_concept(self):
+        neo4j = FakeNeo4j([
+            [{"num_learners": 3}],
+            [
+                {"concept_id": "SQL_JOIN", "num_learners": 2, "avg_mastery": 0.5, "std_dev": 0.1,
+                 "min_mastery": 0.4, "max_mastery": 0.6, "struggling": 1},
+                {"concept_id": "SQL_WHERE", "num_learners": 1, "avg_mastery": 0.9, "std_dev": None,
+                 "min_mastery": 0.9, "max_mastery": 0.9, "struggling": 0},
+            ],
+        ])
+
+        num_learners, stats = await CohortAggregator(struggle_threshold=0.5).aggregate(neo4j)
+
+        statements, read_only = neo4j.calls[0]
+        assert read_only is True
+        assert statements[1][1] == {"struggle_threshold": 0.5}
+        assert num_learners == 3
+        assert stats["SQL_JOIN"]["struggle_rate"] == 0.5
+        assert stats["SQL_WHERE"]["std_dev"] == 0
+
+    @pytest.mark.asyncio
+    async def test_aggregate_returns_none_when_transaction_fails(self):
+        assert await CohortAggregator().aggregate(FakeNeo4j(None)) is None
+
+
+class FakeRedisServer:
+    """Hashes and sets only, enough for CohortStatsStore"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.sets = {}
+        self.conflicts_to_raise = 0
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def scard(self, key):
+        return len(self.sets.get(key, set()))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        target = self.hashes.setdefault(key, {})
+        if mapping:
+            target.update({k: str(v) for k, v in mapping.items()})
+        if field is not None:
+            target[field] = str(value)
+
+    def hincrby(self, key, field, amount):
+        target = self.hashes.setdefault(key, {})
+        target[field] = str(int(target.get(field, 0)) + amount)
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.sets.pop(key, None)
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self.server = server
+        self.queued = []
+        self.buffering = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def watch(self, *keys):
+        self.buffering = False
+
+    def multi(self):
+        self.buffering = True
+
+    def __getattr__(self, name):
+        method = getattr(self.server, name)
+        if not self.buffering:
+            return method
+
+        def queue(*args, **kwargs):
+            self.queued.append((method, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        from redis.exceptions import WatchError
+        if self.server.conflicts_to_raise:
+            self.server.conflicts_to_raise -= 1
+            raise WatchError("watched key changed")
+        results = []
+        for method, args, kwargs in self.queued:
+            result = method(*args, **kwargs)
+            results.append(await result if hasattr(result, "__await__") else result)
+        return results
+
+
+class FakeRedisClient:
+    def __init__(self):
+        self.client = FakeRedisServer()
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self.client)
+
+
+class FakeStreamingNeo4j:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def stream_query(self, query, **params):
+        for row in self.rows:
+            yield row
+
+
+class TestCohortStatsStore:
+    """Incremental Welford updates in Redis and reconciliation"""
+
+    @pytest.mark.asyncio
+    async def test_reevaluation_replaces_previous_mastery(self):
+        store = CohortStatsStore(FakeRedisClient(), struggle_threshold=0.5)
+        await store.reconcile(FakeStreamingNeo4j([]))
+
+        for learner_id, mastery in [("l1", 0.2), ("l2", 0.6), ("l3", 0.9)]:
+            await store.record(learner_id, "SQL_JOIN", mastery)
+        store.redis.client.conflicts_to_raise = 1
+        await store.on_evaluation_completed({
+            "learner_id": "l1", "batch": True,
+            "items": [{"concept_id": "SQL_JOIN", "new_mastery": 0.7}]
+        })
+
+        num_learners, stats = await store.get_statistics()
+        join = stats["SQL_JOIN"]
+        assert num_learners == 3
+        assert join["avg_mastery"] == pytest.approx(mean([0.7, 0.6, 0.9]))
+        assert join["std_dev"] == pytest.approx(stdev([0.7, 0.6, 0.9]))
+        assert (join["min_mastery"], join["max_mastery"]) == (0.6, 0.9)
+        assert join["struggle_rate"] == 0
+        assert join["histogram"][6:] == [1, 1, 0, 1]
+        assert store.get_stats()["conflicts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_statistics_unavailable_until_reconciled(self):
+        store = CohortStatsStore(FakeRedisClient())
+        await store.record("l1", "SQL_JOIN", 0.4)
+        assert await store.get_statistics() is None
+
+        await store.reconcile(FakeStreamingNeo4j([
+            {"learner_id": "l1", "concept_id": "SQL_JOIN", "mastery": 0.3},
+            {"learner_id": "l2", "concept_id": "SQL_JOIN", "mastery": 1.0},
+        ]))
+
+        num_learners, stats = await store.get_statistics()
+        assert num_learners == 2
+        assert stats["SQL_JOIN"]["avg_mastery"] == pytest.approx(0.65)
+        assert stats["SQL_JOIN"]["histogram"][3] == 1 and stats["SQL_JOIN"]["histogram"][9] == 1
@@ -0,0 +1,77 @@
+"""
+Unit tests for the shared Course KG read cache.
+
+Run: pytest backend/tests/test_course_kg_cache.py -v
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.core.course_kg_cache import CourseKGCache
+
+QUERY = "MATCH (c:CourseConcept {concept_id: $concept_id}) RETURN c"
+
+
+class TestCourseKGCache:
+    """Read-through, LRU bound and COURSEKG_UPDATED invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_second_read_is_served_from_cache(self):
+        cache = CourseKGCache()
+        neo4j = AsyncMock()
+        neo4j.run_query.return_value = [{"c": {"name": "Loops"}}]
+
+        first = await cache.run_query(neo4j, QUERY, concept_id="loops")
+        # Whitespace differences map to the same fingerprint
+        second = await cache.run_query(neo4j, "  " + QUERY.replace(" ", "\n  "), concept_id="loops")
+
+        assert first == second == [{"c": {"name": "Loops"}}]
+        assert neo4j.run_query.await_count == 1
+        assert cache.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_values_are_copies(self):
+        cache = CourseKGCache()
+        neo4j = AsyncMock()
+        neo4j.run_query.return_value = [{"c": {"name": "Loops"}}]
+
+        rows = await cache.run_query(neo4j, QUERY, concept_id="loops")
+        rows[0]["c"]["name"] = "mutated"
+
+        rows = await cache.run_query(neo4j, QUERY, concept_id="loops")
+        assert rows[0]["c"]["name"] == "Loops"
+
+    @pytest.mark.asyncio
+    async def test_empty_results_are_not_cached(self):
+        cache = CourseKGCache()
+        neo4j = AsyncMock()
+        neo4j.run_query.return_value = []
+
+        await cache.run_query(neo4j, QUERY, concept_id="missing")
+        await cache.run_query(neo4j, QUERY, concept_id="missing")
+
+        assert neo4j.run_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_course_kg_updated_invalidates(self):
+        cache = CourseKGCache()
+        neo4j = AsyncMock()
+        neo4j.run_query.return_value = [{"c": {"name": "Loops"}}]
+
+        await cache.run_query(neo4j, QUERY, concept_id="loops")
+        await cache.on_course_kg_updated({"payload": {"document_id": "doc_1"}})
+        await cache.run_query(neo4j, QUERY, concept_id="loops")
+
+        assert neo4j.run_query.await_count == 2
+        assert cache.stats["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        cache = CourseKGCache(max_entries=2)
+        neo4j = AsyncMock()
+        neo4j.run_query.return_value = [{"c": {}}]
+
+        for cid in ("a", "b", "c"):
+            await cache.run_query(neo4j, QUERY, concept_id=cid)
+
+        assert len(cache) == 2
@@ -0,0 +1,167 @@
+"""
+Unit tests for the Entity Resolver.
+
+Run: pytest backend/tests/test_entity_resolver.py -v
+"""
+
+import numpy as np
+
+from backend.utils.entity_resolver import EntityResolver
+
+
+class FakeEmbedding:
+    """Deterministic random vectors per text"""
+    model_name = "fake-embedding"
+
+    def __init__(self, dim=16, seed=0):
+        self.dim = dim
+        self.rng = np.random.default_rng(seed)
+        self.vectors = {}
+
+    def get_text_embedding_batch(self, texts):
+        for text in texts:
+            if text not in self.vectors:
+                self.vectors[text] = self.rng.normal(size=self.dim).tolist()
+        return [self.vectors[t] for t in texts]
+
+
+def make_concepts(prefix, n):
+    return [{"concept_id": f"{prefix}{i}", "name": f"{prefix} concept {i}"} for i in range(n)]
+
+
+class TestCandidateRetrieval:
+    """Vectorized Stage-1 retrieval"""
+
+    def _loop_candidates(self, resolver, new_concept, existing_concepts, top_k):
+        """Per-pair cosine loop the matrix version replaced"""
+        new_embedding = resolver._get_embedding(resolver._get_concept_text(new_concept))
+        similarities = []
+        for existing in existing_concepts:
+            embedding = resolver._get_embedding(resolver._get_concept_text(existing))
+            norm = np.linalg.norm(new_embedding) * np.linalg.norm(embedding)
+            similarities.append((existing, float(np.dot(new_embedding, embedding) / norm) if norm else 0.0))
+        similarities.sort(key=lambda x: x[1], reverse=True)
+        return [concept for concept, _ in similarities[:top_k]]
+
+    def test_matrix_retrieval_matches_pairwise_loop(self):
+        resolver = EntityResolver(embedding_model=FakeEmbedding())
+        new_concepts = make_concepts("new", 12)
+        existing_concepts = make_concepts("kg", 60)
+
+        batched = resolver._retrieve_candidates_batch(new_concepts, existing_concepts, top_k=7)
+
+        for new_concept, candidates in zip(new_concepts, batched):
+            expected = self._loop_candidates(resolver, new_concept, existing_concepts, top_k=7)
+            assert [c["concept_id"] for c in candidates] == [c["concept_id"] for c in expected]
+
+    def test_failed_embedding_does_not_break_the_matrix(self):
+        from unittest.mock import MagicMock
+
+        resolver = EntityResolver(embedding_model=FakeEmbedding(dim=4))
+        existing_concepts = make_concepts("kg", 5)
+        new_concepts = make_concepts("new", 2)
+        resolver._get_embeddings([resolver._get_concept_text(c) for c in existing_concepts + new_concepts[:1]])
+        resolver._batcher = MagicMock(embed_many=MagicMock(return_value=[None]))  # provider down
+
+        batched = resolver._retrieve_candidates_batch(new_concepts, existing_concepts, top_k=3)
+
+        assert [len(candidates) for candidates in batched] == [3, 3]
+        expected = self._loop_candidates(resolver, new_concepts[0], existing_concepts, top_k=3)
+        assert [c["concept_id"] for c in batched[0]] == [c["concept_id"] for c in expected]
+        assert resolver._get_concept_text(new_concepts[1]) not in resolver._embedding_cache
+
+
+class TestFindClusters:
+    """Blocked heap linkage vs the all-pairs greedy linkage it replaced"""
+
+    def _all_pairs_clusters(self, resolver, concepts, relationships, threshold):
+        """Previous O(n^3) implementation: full similarity matrix + rescan every cluster pair"""
+        prereq_map = resolver._build_prereq_map(relationships)
+        n = len(concepts)
+        similarity = np.zeros((n, n))
+        for i in range(n):
+            for j in range(i + 1, n):
+                match = resolver._calculate_similarity(
+                    concepts[i], concepts[j],
+                    prereq_map.get(concepts[i]["concept_id"], set()),
+                    prereq_map.get(concepts[j]["concept_id"], set())
+                )
+                similarity[i][j] = similarity[j][i] = match.combined_score
+
+        clusters = [[i] for i in range(n)]
+        while len(clusters) > 1:
+            best_sim, best_pair = 0, None
+            for i, c1 in enumerate(clusters):
+                for j, c2 in enumerate(clusters[i + 1:], i + 1):
+                    sim = np.mean([similarity[a][b] for a in c1 for b in c2])
+                    if sim > best_sim:
+                        best_sim, best_pair = sim, (i, j)
+            if best_sim < threshold:
+                break
+            i, j = best_pair
+            merged = clusters[i] + clusters[j]
+            clusters = [c for k, c in enumerate(clusters) if k not in (i, j)] + [merged]
+        return {frozenset(concepts[i]["concept_id"] for i in c) for c in clusters}
+
+    def _fixture(self):
+        """
+        Six topics x four members, interleaved so every topic spans several
+        row blocks. Topics come in pairs with correlated embeddings, and
+        members differ in shared prerequisites / tags, so some cross-topic
+        pairs pass the threshold while their cluster averages do not.
+        """
+        rng = np.random.default_rng(21)
+        dim = 32
+        bases = []
+        for _ in range(3):
+            a = rng.normal(size=dim)
+            a /= np.linalg.norm(a)
+            b = 0.8 * a + 0.6 * rng.normal(size=dim) / np.sqrt(dim)
+            bases += [a, b / np.linalg.norm(b)]
+
+        concepts, relationships, vectors = [], [], {}
+        for i in range(24):
+            topic, member = i % 6, i // 6
+            concept = {
+                "concept_id": f"c{i}",
+                "name": f"topic{topic} member{member}",
+                "semantic_tags": [f"pair{topic // 2}"] if member < 2 else [f"topic{topic}"],
+            }
+            if member != 3:
+                relationships.append({"source": f"c{i}", "target": f"pre{topic // 2}", "relationship_type": "REQUIRES"})
+            concepts.append(concept)
+            vector = bases[topic] + 0.05 * rng.normal(size=dim)
+            vectors[concept["name"]] = vector.tolist()
+        return concepts, relationships, vectors
+
+    def test_blocked_linkage_matches_all_pairs_with_embeddings(self):
+        concepts, relationships, vectors = self._fixture()
+
+        class TopicEmbedding:
+            model_name = "topic-embedding"
+
+            def get_text_embedding_batch(self, texts):
+                return [vectors[t.split(" | ")[0]] for t in texts]
+
+        resolver = EntityResolver(embedding_model=TopicEmbedding())
+        resolver.CLUSTER_BLOCK_ROWS = 5  # merges cross row-block boundaries
+
+        clusters = resolver.find_clusters(concepts, relationships, threshold=0.80)
+
+        expected = self._all_pairs_clusters(resolver, concepts, relationships, threshold=0.80)
+        assert {frozenset(c) for c in clusters} == expected
+        assert any(len(c) > 1 for c in expected) and len(expected) > 6
+
+    def test_blocked_linkage_matches_all_pairs_with_name_buckets(self):
+        concepts, relationships, _ = self._fixture()
+        for concept in concepts:
+            concept["semantic_tags"] = []
+
+        resolver = EntityResolver(use_embeddings=False)
+        resolver.BLOCKING_MIN_SIZE = 0  # force name-token blocking
+
+        clusters = resolver.find_clusters(concepts, relationships, threshold=0.5)
+
+        expected = self._all_pairs_clusters(resolver, concepts, relationships, threshold=0.5)
+        assert {frozenset(c) for c in clusters} == expected
+        assert any(len(c) > 2 for c in expected)
@@ -277,3 +277,122 @@ class TestEvaluatorIntegration:
         assert evaluator.classifier is not None
         assert evaluator.tracker is not None
         assert evaluator.decision_engine is not None
+
+
+class TestFusedEvaluation:
+    """Test fused single-call grading"""
+    
+    def _evaluator(self, llm):
+        import logging
+        from types import SimpleNamespace
+        from backend.agents.evaluator_agent import EvaluatorAgent
+        
+        evaluator = EvaluatorAgent.__new__(EvaluatorAgent)
+        evaluator.logger = logging.getLogger("test")
+        evaluator.settings = SimpleNamespace(MOCK_LLM=False)
+        evaluator.llm = llm
+        return evaluator
+    
+    @pytest.mark.asyncio
+    async def test_fused_output_is_repaired_and_validated(self):
+        """Fenced JSON with a trailing comma and Python None still parses"""
+        from unittest.mock import AsyncMock, MagicMock
+        
+        llm = MagicMock()
+        llm.acomplete = AsyncMock(return_value=MagicMock(text=(
+            'Here is my evaluation:\n```json\n{"score": 4, "error_type": "conceptual", '
+            '"misconception": "Thinks WHERE joins tables", "feedback": "WHERE filters rows.", '
+            '"correctness": 3, "extra": None,}\n```'
+        )))
+        evaluator = self._evaluator(llm)
+        
+        score, fused = await evaluator._grade_response("JOIN", "WHERE filters", "", {"name": "WHERE"}, force_real=True)
+        error_type, misconception, feedback = await evaluator._diagnose_response(
+            score, fused, "JOIN", "WHERE filters", "", {"name": "WHERE"}, force_real=True
+        )
+        
+        assert score == pytest.approx(0.4)
+        assert llm.acomplete.await_count == 1
+        assert error_type == ErrorType.CONCEPTUAL
+        assert misconception == "Thinks WHERE joins tables"
+        assert feedback == "WHERE filters rows."
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_to_staged_pipeline_on_parse_failure(self):
+        """Unparseable fused output falls back to the JudgeLM scoring call"""
+        from unittest.mock import AsyncMock, MagicMock
+        
+        llm = MagicMock()
+        llm.acomplete = AsyncMock(side_effect=[
+            MagicMock(text="I think the answer is mostly right."),
+            MagicMock(text="10.0 9\nGood answer."),
+        ])
+        evaluator = self._evaluator(llm)
+        
+        score, fused = await evaluator._grade_response("WHERE filters rows", "WHERE filters", "", {}, force_real=True)
+        
+        assert fused is None
+        assert score == pytest.approx(0.9)
+        assert llm.acomplete.await_count == 2
+
+
+class TestBatchEvaluation:
+    """Test whole-quiz grading"""
+    
+    @pytest.mark.asyncio
+    async def test_quiz_loads_shared_state_once_and_emits_one_event(self):
+        import logging
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from backend.agents.evaluator_agent import EvaluatorAgent
+        from backend.core.grading_cascade import GradingCascade
+        
+        neo4j = MagicMock()
+        neo4j.run_query = AsyncMock(return_value=[{"c": {"name": "WHERE", "difficulty": 2}}])
+        neo4j.run_many = AsyncMock(return_value=[[]])
+        state_manager = MagicMock(neo4j=neo4j)
+        state_manager.get_learner_profile = AsyncMock(return_value={"current_mastery": []})
+        state_manager.set = AsyncMock()
+        
+        evaluator = EvaluatorAgent.__new__(EvaluatorAgent)
+        evaluator.agent_id = "evaluator_batch"
+        evaluator.state_manager = state_manager
+        evaluator.logger = logging.getLogger("test")
+        evaluator.settings = SimpleNamespace(MOCK_LLM=True)
+        evaluator.llm = MagicMock(acomplete=AsyncMock())
+        evaluator.grading_cascade = GradingCascade()
+        evaluator.notification_service = MagicMock(notify_failure=AsyncMock())
+        evaluator.send_message = AsyncMock()
+        
+        result = await evaluator.execute_batch(
+            learner_id="learner_batch",
+            answers=[
+                {"question_id": "q1", "concept_id": "BATCH_WHERE", "learner_response": "42", "expected_answer": "42.0"},
+                {"question_id": "q2", "concept_id": "BATCH_WHERE", "learner_response": "WHERE filters rows",
+                 "expected_answer": "where filters rows."},
+                {"question_id": "q3", "concept_id": "bad id!", "learner_response": "x", "expected_answer": "y"},
+            ]
+        )
+        
+        assert result["success"] is True
+        assert [r["success"] for r in result["results"]] == [True, True, False]
+        assert result["results"][0]["grading_mode"] == "fast_path:numeric"
+        assert result["summary"] == {
+            "total": 3, "graded": 2, "failed": 1, "average_score": 1.0,
+            "grading_modes": {"fast_path:numeric": 1, "fast_path:exact": 1}
+        }
+        
+        assert neo4j.run_query.await_count == 1
+        assert state_manager.get_learner_profile.await_count == 1
+        assert evaluator.llm.acomplete.await_count == 0
+        # one profile-history save + one mastery save for the single concept
+        assert state_manager.set.await_count == 2
+        # LKT mastery is mirrored to HAS_MASTERY.level for cohort reconciliation
+        (query, params), = neo4j.run_many.await_args.args[0]
+        assert "HAS_MASTERY" in query
+        assert params["rows"] == [{"concept_id": "BATCH_WHERE", "level": result["new_mastery"]["BATCH_WHERE"]}]
+        
+        evaluator.send_message.assert_awaited_once()
+        payload = evaluator.send_message.await_args.kwargs["payload"]
+        assert payload["batch"] is True
+        assert [item["question_id"] for item in payload["items"]] == ["q1", "q2"]
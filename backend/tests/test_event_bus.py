@@ -0,0 +1,193 @@
+"""
+Unit tests for EventBus dispatch modes.
+
+Run: pytest backend/tests/test_event_bus.py -v
+"""
+
+import asyncio
+import pytest
+
+from backend.core.event_bus import EventBus, DispatchMode, BackpressurePolicy
+
+
+class TestEventBus:
+    """Inline vs queued dispatch, backpressure, timeouts and the event log"""
+
+    @pytest.mark.asyncio
+    async def test_queued_publish_does_not_wait_for_handlers(self):
+        bus = EventBus(mode=DispatchMode.QUEUED)
+        release = asyncio.Event()
+        handled = []
+
+        async def slow_handler(event):
+            await release.wait()
+            handled.append(event["payload"]["n"])
+
+        bus.subscribe("EVALUATION_COMPLETED", slow_handler)
+        await bus.start()
+
+        await asyncio.wait_for(bus.publish("evaluator", "planner", "EVALUATION_COMPLETED", {"n": 1}), timeout=1)
+        assert handled == []
+
+        release.set()
+        await bus.drain()
+        assert handled == [1]
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_inline_mode_awaits_handlers(self):
+        bus = EventBus()
+        handled = []
+
+        async def handler(event):
+            handled.append(event["message_type"])
+
+        bus.subscribe("PATH_PLANNED", handler)
+        await bus.publish("planner", "tutor", "PATH_PLANNED", {})
+        assert handled == ["PATH_PLANNED"]
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_backpressure(self):
+        bus = EventBus(
+            mode=DispatchMode.QUEUED, queue_size=2, workers_per_type=1,
+            backpressure=BackpressurePolicy.DROP_OLDEST
+        )
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(event):
+            await release.wait()
+            handled.append(event["payload"]["n"])
+
+        bus.subscribe("X", handler)
+        await bus.start()
+        for n in range(5):
+            await bus.publish("a", "b", "X", {"n": n})
+            await asyncio.sleep(0)  # let the worker pick up the first event
+
+        release.set()
+        await bus.drain()
+        await bus.stop()
+
+        assert handled == [0, 3, 4]
+        assert bus.queue_stats["X"]["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_handler_timeout_and_stats(self):
+        bus = EventBus(handler_timeout=0.01)
+
+        async def stuck(event):
+            await asyncio.sleep(1)
+
+        async def failing(event):
+            raise RuntimeError("boom")
+
+        bus.subscribe("X", stuck)
+        bus.subscribe("X", failing)
+        await bus.publish("a", "b", "X", {})
+
+        stats = bus.get_stats()["handlers"]
+        assert sum(s["timeouts"] for s in stats.values()) == 1
+        assert sum(s["errors"] for s in stats.values()) == 1
+
+    def test_handler_timeout_comes_from_registry_settings(self):
+        from backend.config import get_settings
+        from backend.core.agent_registry import AgentRegistry
+
+        settings = get_settings()
+        assert EventBus().handler_timeout is None
+        assert AgentRegistry()._build_event_bus(settings).handler_timeout == settings.EVENT_BUS_HANDLER_TIMEOUT
+
+    @pytest.mark.asyncio
+    async def test_event_log_is_bounded(self):
+        bus = EventBus(log_size=3)
+        for n in range(10):
+            await bus.publish("a", "b", "X", {"n": n})
+
+        log = await bus.get_event_log()
+        assert [e["payload"]["n"] for e in log] == [7, 8, 9]
+
+
+class TestRedisStreamEventBus:
+    """Streams bus against the in-memory stand-in"""
+
+    @staticmethod
+    def _agent(agent_type, handled):
+        from types import SimpleNamespace
+
+        class Agent:
+            def __init__(self):
+                self.agent_type = SimpleNamespace(value=agent_type)
+
+            async def on_event(self, event):
+                handled.append((agent_type, event["payload"]["n"]))
+
+        return Agent()
+
+    @pytest.mark.asyncio
+    async def test_each_group_receives_every_event_once(self):
+        from backend.core.redis_event_bus import RedisStreamEventBus, InMemoryStreams
+
+        streams = InMemoryStreams()
+        handled = []
+        # Two "workers" sharing the same streams: each group is load-balanced across them
+        workers = [RedisStreamEventBus(streams, consumer_name=f"w{i}", block_ms=20) for i in range(2)]
+        for bus in workers:
+            bus.subscribe("EVALUATION_COMPLETED", self._agent("path_planner", handled).on_event)
+            bus.subscribe("EVALUATION_COMPLETED", self._agent("profiler", handled).on_event)
+            await bus.start()
+
+        for n in range(5):
+            await workers[n % 2].publish("evaluator_1", "planner", "EVALUATION_COMPLETED", {"n": n})
+        await asyncio.wait_for(workers[0].drain(), timeout=2)
+        for bus in workers:
+            await bus.stop()
+
+        assert sorted(n for t, n in handled if t == "path_planner") == [0, 1, 2, 3, 4]
+        assert sorted(n for t, n in handled if t == "profiler") == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_pending_entries_are_reclaimed(self):
+        from backend.core.redis_event_bus import RedisStreamEventBus, InMemoryStreams
+
+        streams = InMemoryStreams()
+        handled = []
+        bus = RedisStreamEventBus(streams, consumer_name="alive", block_ms=20, claim_idle_ms=0)
+        bus.subscribe("X", self._agent("kag", handled).on_event)
+
+        # A consumer that died after reading but before acknowledging
+        await streams.xgroup_create("events:X", "kag", id="$", mkstream=True)
+        await bus.publish("a", "b", "X", {"n": 7})
+        await streams.xreadgroup("kag", "dead", {"events:X": ">"}, count=10)
+
+        await bus.start()
+        await asyncio.wait_for(bus.drain(), timeout=2)
+        await bus.stop()
+
+        assert handled == [("kag", 7)]
+        assert bus.stream_stats["X"]["reclaimed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_handlers_are_retried_then_dropped(self):
+        from backend.core.redis_event_bus import RedisStreamEventBus, InMemoryStreams
+
+        streams = InMemoryStreams()
+        attempts = {"flaky": 0, "poison": 0}
+
+        async def on_event(event):
+            kind = event["payload"]["kind"]
+            attempts[kind] += 1
+            if kind == "poison" or attempts[kind] < 3:
+                raise RuntimeError("handler failed")
+
+        bus = RedisStreamEventBus(streams, consumer_name="w0", block_ms=20, claim_idle_ms=0, max_deliveries=3)
+        bus.subscribe("X", on_event)
+        await bus.start()
+        await bus.publish("a", "b", "X", {"kind": "flaky"})
+        await bus.publish("a", "b", "X", {"kind": "poison"})
+        await asyncio.wait_for(bus.drain(), timeout=2)
+        await bus.stop()
+
+        assert attempts == {"flaky": 3, "poison": 3}
+        stats = bus.stream_stats["X"]
+        assert stats["handled"] == 1 and stats["dropped"] == 1 and stats["failed"] == 5
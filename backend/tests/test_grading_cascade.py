@@ -0,0 +1,128 @@
+"""
+Unit tests for the deterministic grading cascade.
+
+Run: pytest backend/tests/test_grading_cascade.py -v
+"""
+
+import pytest
+
+from backend.core.grading_cascade import GradingCascade
+
+
+class FakeEncoder:
+    """Sentence-transformer style model with hand-made vectors"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = []
+
+    def encode(self, text):
+        self.calls.append(text)
+        return self.vectors[text]
+
+
+class TestGradingCascade:
+    """Exact, numeric and embedding tiers"""
+
+    @pytest.mark.asyncio
+    async def test_exact_and_numeric_tiers(self):
+        cascade = GradingCascade()
+
+        exact = await cascade.grade("  select *   FROM users; ", "SELECT * FROM users")
+        numeric = await cascade.grade("1,000.0", "1000")
+        percent = await cascade.grade("50%", "0.5")
+        wrong_number = await cascade.grade("41", "42")
+
+        assert (exact.tier, exact.score) == ("exact", 1.0)
+        assert numeric.tier == "numeric" and percent.tier == "numeric"
+        assert wrong_number is None
+        assert cascade.get_stats()["escalated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_embedding_tier_reuses_cached_reference(self):
+        reference = "WHERE filters rows before grouping"
+        encoder = FakeEncoder({
+            reference: [1.0, 0.0],
+            "WHERE removes rows prior to grouping": [0.99, 0.05],
+            "WHERE removes rows before GROUP BY": [0.98, 0.06],
+            "HAVING is used to sort the result set": [0.2, 0.9],
+        })
+        cascade = GradingCascade(embedding_model=encoder)
+
+        first = await cascade.grade("WHERE removes rows prior to grouping", reference)
+        second = await cascade.grade("WHERE removes rows before GROUP BY", reference)
+        unrelated = await cascade.grade("HAVING is used to sort the result set", reference)
+
+        assert first.tier == "embedding" and second.tier == "embedding"
+        assert unrelated is None
+        assert encoder.calls.count(reference) == 1
+        assert cascade.get_stats()["reference_cache_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_answers_escalate(self):
+        """Short answers and negation mismatches never skip the LLM"""
+        encoder = FakeEncoder({})
+        cascade = GradingCascade(embedding_model=encoder)
+
+        assert await cascade.grade("true", "false") is None
+        assert await cascade.grade("WHERE does not filter rows", "WHERE does filter rows") is None
+        assert encoder.calls == []
+
+        stats = cascade.get_stats()
+        assert stats["escalated"] == 2
+        assert stats["llm_calls_avoided"] == 0
+
+    @pytest.mark.asyncio
+    async def test_evaluator_skips_llm_on_fast_path(self):
+        import logging
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from backend.agents.evaluator_agent import EvaluatorAgent
+
+        evaluator = EvaluatorAgent.__new__(EvaluatorAgent)
+        evaluator.logger = logging.getLogger("test")
+        evaluator.settings = SimpleNamespace(MOCK_LLM=False)
+        evaluator.llm = MagicMock(acomplete=AsyncMock())
+        evaluator.grading_cascade = GradingCascade()
+
+        verdict = await evaluator._fast_path_grade("3/4", "0.75")
+
+        assert verdict.tier == "numeric"
+        assert evaluator.llm.acomplete.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_precomputes_reference_embeddings(self):
+        import logging
+        from types import SimpleNamespace
+        from backend.agents.evaluator_agent import EvaluatorAgent
+
+        reference = "WHERE filters rows before grouping"
+        encoder = FakeEncoder({reference: [1.0, 0.0], "WHERE removes rows prior to grouping": [0.99, 0.05]})
+        evaluator = EvaluatorAgent.__new__(EvaluatorAgent)
+        evaluator.logger = logging.getLogger("test")
+        evaluator.settings = SimpleNamespace(MOCK_LLM=False)
+        evaluator.grading_cascade = GradingCascade(embedding_model=encoder)
+
+        assert await evaluator._precompute_reference_embeddings([reference, reference, ""]) == 1
+        verdict = await evaluator._fast_path_grade("WHERE removes rows prior to grouping", reference)
+
+        assert verdict.tier == "embedding"
+        assert encoder.calls.count(reference) == 1
+        assert evaluator.grading_cascade.get_stats()["reference_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_registry_health_reports_cascade_counters(self):
+        from types import SimpleNamespace
+        from backend.core.agent_registry import AgentRegistry
+
+        cascade = GradingCascade()
+        await cascade.grade("42", "42.0")
+        await cascade.grade("JOIN", "WHERE filters rows", use_embeddings=False)
+
+        registry = AgentRegistry()
+        assert registry.health()["grading_cascade"] is None
+        registry.agents["evaluator"] = SimpleNamespace(grading_cascade=cascade)
+
+        stats = registry.health()["grading_cascade"]
+        assert stats["numeric"] == 1 and stats["escalated"] == 1
+        assert stats["fast_path_rate"] == 0.5
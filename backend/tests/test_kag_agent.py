@@ -202,3 +202,68 @@ class TestKAGIntegration:
         
         # Should return some result (may be error due to no data)
         assert result is not None
+    
+    @pytest.mark.asyncio
+    async def test_failed_learner_stream_is_not_reported_as_partial_stats(self):
+        """Fallback aggregation raises instead of returning a truncated cohort"""
+        import logging
+        from unittest.mock import AsyncMock, MagicMock
+        from backend.agents.kag_agent import KAGAgent
+        from backend.core.cohort_stats import CohortAggregator
+        
+        async def stream_query(query, **params):
+            yield {"learner_id": "l1", "masteries": [{"concept_id": "SQL_WHERE", "mastery": 0.4}]}
+            raise ConnectionError("cursor lost")
+        
+        kag = KAGAgent.__new__(KAGAgent)
+        kag.logger = logging.getLogger("test")
+        kag.cohort_aggregator = CohortAggregator()
+        kag.state_manager = MagicMock(neo4j=MagicMock(
+            run_many=AsyncMock(return_value=None),  # server-side aggregation failed
+            stream_query=stream_query
+        ))
+        
+        with pytest.raises(ConnectionError):
+            await kag._aggregate_cohort_statistics()
+
+
+class TestBatchEvaluationEvents:
+    """EVALUATION_COMPLETED batch events delivered through the real EventBus"""
+    
+    @pytest.mark.asyncio
+    async def test_batch_event_fans_out_one_artifact_per_item(self):
+        import asyncio
+        import logging
+        from unittest.mock import AsyncMock, MagicMock
+        from backend.agents.kag_agent import KAGAgent
+        from backend.core.event_bus import EventBus
+        
+        kag = KAGAgent.__new__(KAGAgent)
+        kag.agent_id = "kag_batch"
+        kag.state_manager = None
+        kag.logger = logging.getLogger("test")
+        kag.note_generator = MagicMock(generate_note=AsyncMock(return_value=None))
+        kag.send_message = AsyncMock()
+        kag._artifact_semaphore = asyncio.Semaphore(2)
+        kag._artifact_tasks = set()
+        
+        bus = EventBus()
+        bus.subscribe("EVALUATION_COMPLETED", kag._on_evaluation_completed)
+        await bus.publish(
+            sender="evaluator_1",
+            receiver="path_planner",
+            message_type="EVALUATION_COMPLETED",
+            payload={
+                "learner_id": "learner_1",
+                "batch": True,
+                "items": [
+                    {"concept_id": f"SQL_{i}", "score": 0.9, "new_mastery": 0.7}
+                    for i in range(5)
+                ]
+            }
+        )
+        await asyncio.gather(*list(kag._artifact_tasks))
+        
+        calls = kag.note_generator.generate_note.await_args_list
+        assert sorted(c.kwargs["concept_id"] for c in calls) == [f"SQL_{i}" for i in range(5)]
+        assert {c.kwargs["learner_id"] for c in calls} == {"learner_1"}
@@ -0,0 +1,81 @@
+"""
+Unit tests for the LLM response cache.
+
+Run: pytest backend/tests/test_llm_cache.py -v
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from llama_index.core.llms import CompletionResponse, MockLLM
+
+from backend.core.llm_cache import CachedLLM, LLMResponseCache, bypass_llm_cache
+
+
+def _cached(cache, temperature=0.1):
+    inner = MockLLM()
+    llm = CachedLLM(inner=inner, cache=cache, provider="mock", model_id="mock", temperature=temperature)
+    calls = []
+
+    async def acomplete(prompt, formatted=False, **kwargs):
+        calls.append(prompt)
+        return CompletionResponse(text=f"answer {len(calls)}")
+
+    object.__setattr__(inner, "acomplete", acomplete)
+    return llm, calls
+
+
+class TestLLMResponseCache:
+    """Keying, opt-out and Redis tier"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_is_served_from_cache(self):
+        cache = LLMResponseCache()
+        llm, calls = _cached(cache)
+
+        first = await llm.acomplete("Classify   this error")
+        second = await llm.acomplete("Classify this error\n")
+
+        assert first.text == second.text == "answer 1"
+        assert len(calls) == 1
+        assert cache.get_stats()["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_key_includes_temperature(self):
+        cache = LLMResponseCache()
+        cold, _ = _cached(cache, temperature=0.1)
+        warm, warm_calls = _cached(cache, temperature=0.2)
+
+        await cold.acomplete("prompt")
+        await warm.acomplete("prompt")
+        assert len(warm_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_per_call_opt_out(self):
+        cache = LLMResponseCache()
+        llm, calls = _cached(cache)
+
+        await llm.acomplete("prompt")
+        await llm.acomplete("prompt", cache=False)
+        with bypass_llm_cache():
+            await llm.acomplete("prompt")
+
+        assert len(calls) == 3
+        assert cache.stats["bypassed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shared_across_processes(self):
+        store = {}
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+        redis.set = AsyncMock(side_effect=lambda key, value, ttl=None: store.__setitem__(key, value))
+
+        llm_a, calls_a = _cached(LLMResponseCache(redis=redis))
+        llm_b, calls_b = _cached(LLMResponseCache(redis=redis))
+
+        await llm_a.acomplete("prompt")
+        response = await llm_b.acomplete("prompt")
+
+        assert response.text == "answer 1"
+        assert calls_b == []
+        assert llm_b.cache.stats["redis_hits"] == 1
@@ -0,0 +1,121 @@
+"""
+Unit tests for the LLM scheduler.
+
+Run: pytest backend/tests/test_llm_scheduler.py -v
+"""
+
+import asyncio
+import pytest
+
+from backend.core.llm_scheduler import LLMScheduler, Priority, classify_error
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class TestLLMScheduler:
+    """Priority admission, AIMD and retry"""
+
+    @pytest.mark.asyncio
+    async def test_interactive_calls_are_admitted_before_background(self):
+        scheduler = LLMScheduler(max_concurrency=1, request_timeout=None)
+        release = asyncio.Event()
+        order = []
+
+        async def call(name):
+            order.append(name)
+            await release.wait()
+
+        first = asyncio.create_task(scheduler.run("mock", Priority.BACKGROUND, 1, lambda: call("bg-1")))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(scheduler.run("mock", Priority.BACKGROUND, 1, lambda: call("bg-2"))),
+            asyncio.create_task(scheduler.run("mock", Priority.INTERACTIVE, 1, lambda: call("tutor"))),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()["mock"]["waiting"] == 2
+
+        release.set()
+        await asyncio.gather(first, *queued)
+        assert order == ["bg-1", "tutor", "bg-2"]
+
+    @pytest.mark.asyncio
+    async def test_throttling_is_retried_and_halves_concurrency(self):
+        scheduler = LLMScheduler(max_concurrency=8, retry_base_delay=0.001, request_timeout=None)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RateLimitError("quota")
+            return "ok"
+
+        assert await scheduler.run("mock", Priority.INTERACTIVE, 10, flaky) == "ok"
+
+        stats = scheduler.get_stats()["mock"]
+        assert stats["retries"] == 2
+        assert stats["throttled"] == 2
+        assert 2 <= stats["limit"] < 3  # 8 -> 4 -> 2, then one additive step
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_errors_fail_fast(self):
+        scheduler = LLMScheduler(retry_base_delay=0.001, request_timeout=None)
+        attempts = []
+
+        async def broken():
+            attempts.append(1)
+            raise ValueError("invalid prompt")
+
+        with pytest.raises(ValueError):
+            await scheduler.run("mock", Priority.INTERACTIVE, 1, broken)
+        assert len(attempts) == 1
+        assert scheduler.get_stats()["mock"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_budget_is_granted_by_priority_without_holding_slots(self):
+        scheduler = LLMScheduler(max_concurrency=4, requests_per_minute=600, completion_tokens=0,
+                                 request_timeout=None)
+        limiter = scheduler.limiter_for("mock")
+        limiter.requests.tokens = 0  # budget exhausted; one request refills every 0.1s
+        order = []
+
+        async def call(name):
+            order.append(name)
+
+        background = [
+            asyncio.create_task(scheduler.run("mock", Priority.BACKGROUND, 1, lambda n=n: call(n)))
+            for n in ("bg-1", "bg-2")
+        ]
+        await asyncio.sleep(0)
+        tutor = asyncio.create_task(scheduler.run("mock", Priority.INTERACTIVE, 1, lambda: call("tutor")))
+        await asyncio.sleep(0)
+
+        stats = scheduler.get_stats()["mock"]
+        assert stats["rate_waiting"] == 3
+        assert stats["in_flight"] == 0
+
+        await asyncio.gather(*background, tutor)
+        assert order == ["tutor", "bg-1", "bg-2"]
+
+    @pytest.mark.asyncio
+    async def test_stream_holds_its_slot_until_consumed(self):
+        scheduler = LLMScheduler(request_timeout=None)
+
+        async def open_stream():
+            async def chunks():
+                for chunk in ("a", "b"):
+                    yield chunk
+            return chunks()
+
+        stream = await scheduler.stream("mock", Priority.INTERACTIVE, 1, open_stream)
+        assert scheduler.get_stats()["mock"]["in_flight"] == 1
+
+        assert [chunk async for chunk in stream] == ["a", "b"]
+        assert scheduler.get_stats()["mock"]["in_flight"] == 0
+
+    def test_classify_error(self):
+        assert classify_error(RateLimitError()) == "throttled"
+        assert classify_error(RuntimeError("503 Service Unavailable")) == "transient"
+        assert classify_error(asyncio.TimeoutError()) == "timeout"
+        assert classify_error(KeyError("x")) is None
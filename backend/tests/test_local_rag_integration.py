@@ -2,8 +2,8 @@ import unittest
 import shutil
 import os
 import asyncio
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
-from backend.utils.semantic_chunker import SemanticChunk
 from backend.agents.knowledge_extraction_agent import KnowledgeExtractionAgent
 from backend.agents.tutor_agent import TutorAgent
 
@@ -31,53 +31,104 @@ class TestLocalRAGIntegration(unittest.TestCase):
         
         # 1. Setup Data
         chunks = [
-            SemanticChunk(
+            # Only the fields _persist_vector_index reads
+            SimpleNamespace(
                 chunk_id="c1",
                 content="LlamaIndex is a data framework for LLMs.",
-                source_heading="Intro",
-                metadata={}
+                source_heading="Intro"
             ),
-            SemanticChunk(
+            SimpleNamespace(
                 chunk_id="c2", 
                 content="RAG stands for Retrieval Augmented Generation.",
-                source_heading="Definition",
-                metadata={}
+                source_heading="Definition"
             )
         ]
         
         # 2. Agent 1: Persist
-        # Mock GeminiEmbedding to avoid API keys and avoid creating real files with invalid keys
-        with patch('backend.agents.knowledge_extraction_agent.GeminiEmbedding') as MockEmbed:
-            # Mock get_text_embedding to return a fixed vector
-            MockEmbed.return_value.get_text_embedding.return_value = [0.1] * 768
+        # Mock the LLM/embedding factory to avoid API keys
+        class FakeEmbedding:
+            model_name = "fake-embedding"
+            
+            def get_text_embedding_batch(self, texts):
+                return [[float(len(t)), 1.0, 0.5] for t in texts]
+            
+            async def aget_text_embedding_batch(self, texts):
+                return self.get_text_embedding_batch(texts)
+        
+        with patch('backend.agents.knowledge_extraction_agent.LLMFactory') as MockFactory, \
+             patch('backend.agents.knowledge_extraction_agent.Settings'):
+            MockFactory.get_embedding_model.return_value = FakeEmbedding()
             
             agent1 = KnowledgeExtractionAgent("agent1", self.mock_state_manager, self.mock_event_bus)
         
         # Define async runner
         async def run_persist():
-            await agent1._persist_vector_index(chunks, "doc_test_1")
+            await agent1._persist_vector_index(chunks, "doc_test_1", {"c1": ["llamaindex"]})
             
         loop = asyncio.new_event_loop()
         loop.run_until_complete(run_persist())
         loop.close()
         
-        # Verify files created
+        # Verify segment + manifest created
         self.assertTrue(os.path.exists(self.storage_path))
-        self.assertTrue(os.path.exists(os.path.join(self.storage_path, "docstore.json")))
+        self.assertTrue(os.path.exists(os.path.join(self.storage_path, "manifest.json")))
         
         # 3. Agent 4: Load
-        # Mock settings for TutorAgent
-        with patch('backend.agents.tutor_agent.get_settings') as mock_settings:
-            mock_settings.return_value.GEMINI_MODEL = "gemini-pro"
-            mock_settings.return_value.GOOGLE_API_KEY = "dummy"
-            
-            # We must mock Gemini or it will try to hit API on init
-            with patch('backend.agents.tutor_agent.Gemini'), \
-                 patch('backend.agents.tutor_agent.GeminiEmbedding'):
-                 agent4 = TutorAgent("agent4", self.mock_state_manager, self.mock_event_bus)
+        with patch('backend.agents.tutor_agent.LLMFactory'), \
+             patch('backend.agents.tutor_agent.Settings'):
+            agent4 = TutorAgent("agent4", self.mock_state_manager, self.mock_event_bus)
+        
+        self.assertIsNotNone(agent4.vector_store, "Vector store should be loaded")
+        self.assertEqual(len(agent4.vector_store), 2)
+        
+        # 4. Agent 4: Query (exact cosine over the memory-mapped segment)
+        hits = agent4.vector_store.search([40.0, 1.0, 0.5], top_k=1)
+        self.assertEqual(hits[0].metadata["chunk_id"], "c1")
+        self.assertEqual(hits[0].metadata["concept_ids"], ["llamaindex"])
+
+
+class TestSegmentVectorStore(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_compacted_segments_outlive_the_grace_period(self):
+        """Readers holding the old manifest can still read replaced segments"""
+        from backend.utils.segment_vector_store import SegmentVectorStore
+        
+        store = SegmentVectorStore.open(self.root)
+        for i in range(3):
+            store.append([f"chunk {i}"], [[1.0, float(i)]])
+        reader = SegmentVectorStore.open(self.root)
+        victims = [s["name"] for s in reader.segments]
+        
+        self.assertEqual(store.compact(), 3)
+        self.assertTrue(all(os.path.exists(os.path.join(self.root, f"{n}.npy")) for n in victims))
+        self.assertEqual(len(reader._segment_records(victims[0])), 1)
+        
+        store.RETIRED_GRACE_SECONDS = 0
+        store.append(["chunk 3"], [[1.0, 3.0]])
+        self.assertFalse(any(os.path.exists(os.path.join(self.root, f"{n}.npy")) for n in victims))
+        self.assertEqual(len(SegmentVectorStore.open(self.root)), 4)
+
+    def test_legacy_docstore_is_migrated_on_open(self):
+        import json
+        from backend.utils.segment_vector_store import SegmentVectorStore
+        
+        with open(os.path.join(self.root, "docstore.json"), "w") as f:
+            json.dump({"docstore/data": {
+                "n1": {"__type__": "1", "__data__": {"text": "WHERE filters rows", "metadata": {"chunk_id": "c1"}}},
+                "n2": {"__type__": "1", "__data__": {"text": "JOIN combines tables", "metadata": {"chunk_id": "c2"}}},
+            }}, f)
+        with open(os.path.join(self.root, "default__vector_store.json"), "w") as f:
+            json.dump({"embedding_dict": {"n1": [1.0, 0.0], "n2": [0.0, 1.0]}}, f)
         
-        self.assertIsNotNone(agent4.query_engine, "Query engine should be loaded")
+        self.assertTrue(SegmentVectorStore.exists(self.root))
+        store = SegmentVectorStore.open(self.root)
         
-        # 4. Agent 4: Query (Mocking query for unit test speed/safety)
-        # We checked plumbing. Actual query needs real embeddings which requires API key.
-        # We trust LlamaIndex works if index loaded correctly.
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.search([0.1, 1.0], top_k=1)[0].metadata["chunk_id"], "c2")
+        self.assertTrue(os.path.exists(os.path.join(self.root, "docstore.json.migrated")))
@@ -0,0 +1,152 @@
+"""
+Unit tests for Neo4jClient transaction helpers.
+
+Run: pytest backend/tests/test_neo4j_client.py -v
+"""
+
+import pytest
+from neo4j import READ_ACCESS, WRITE_ACCESS
+
+from backend.database.neo4j_client import Neo4jClient
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def data(self):
+        return self.rows
+
+    async def __aiter__(self):
+        for row in self.rows:
+            yield row
+
+
+class FakeTx:
+    def __init__(self, log, fail_on=None):
+        self.log = log
+        self.fail_on = fail_on
+
+    async def run(self, query, params):
+        if self.fail_on and self.fail_on in query:
+            raise RuntimeError("constraint violation")
+        self.log.append((query, params))
+        return FakeResult([{"n": len(self.log)}])
+
+
+class FakeSession:
+    def __init__(self, driver, access_mode):
+        self.driver = driver
+        self.access_mode = access_mode
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, **params):
+        return FakeResult([{"i": i} for i in range(params["n"])])
+
+    async def execute_read(self, work, *args):
+        self.driver.transactions.append(READ_ACCESS)
+        return await work(FakeTx(self.driver.log, self.driver.fail_on), *args)
+
+    async def execute_write(self, work, *args):
+        self.driver.transactions.append(WRITE_ACCESS)
+        return await work(FakeTx(self.driver.log, self.driver.fail_on), *args)
+
+
+class FakeDriver:
+    def __init__(self, fail_on=None):
+        self.log = []
+        self.transactions = []
+        self.sessions = []
+        self.fail_on = fail_on
+
+    def session(self, database=None, default_access_mode=WRITE_ACCESS, fetch_size=None):
+        self.sessions.append((database, default_access_mode))
+        self.fetch_size = fetch_size
+        return FakeSession(self, default_access_mode)
+
+
+class TestNeo4jClientTransactions:
+    """run_many / execute_read / stream_query / latency counters"""
+
+    def _client(self, driver):
+        client = Neo4jClient("bolt://localhost:7687", "neo4j", "pw", database="learning")
+        client.driver = driver
+        return client
+
+    @pytest.mark.asyncio
+    async def test_run_many_uses_one_write_transaction(self):
+        driver = FakeDriver()
+        client = self._client(driver)
+
+        results = await client.run_many([
+            ("CREATE (n:NoteNode {note_id: $id})", {"id": "n1"}),
+            ("MATCH (n:NoteNode {note_id: $id}) MERGE (n)-[:ABOUT]->(:C)", {"id": "n1"}),
+        ])
+
+        assert results == [[{"n": 1}], [{"n": 2}]]
+        assert driver.sessions == [("learning", WRITE_ACCESS)]
+        assert driver.transactions == [WRITE_ACCESS]
+        assert [params for _, params in driver.log] == [{"id": "n1"}, {"id": "n1"}]
+
+    @pytest.mark.asyncio
+    async def test_execute_read_routes_reads_and_records_latency(self):
+        driver = FakeDriver()
+        client = self._client(driver)
+
+        rows = await client.execute_read("MATCH (c:CourseConcept)\n   RETURN c", limit=5)
+
+        assert rows == [{"n": 1}]
+        assert driver.sessions == [("learning", READ_ACCESS)]
+        stats = client.get_query_stats()
+        assert stats[0]["query"] == "MATCH (c:CourseConcept) RETURN c"
+        assert stats[0]["count"] == 1 and stats[0]["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_returns_none_and_counts_error(self):
+        client = self._client(FakeDriver(fail_on="MERGE"))
+
+        results = await client.run_many([
+            ("CREATE (n:NoteNode {note_id: $id})", {"id": "n1"}),
+            ("MATCH (n:NoteNode {note_id: $id}) MERGE (n)-[:ABOUT]->(:C)", {"id": "n1"}),
+        ])
+
+        assert results is None
+        assert client.get_query_stats()[0]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_query_yields_records_from_a_paged_read_session(self):
+        driver = FakeDriver()
+        client = self._client(driver)
+
+        seen = []
+        async for record in client.stream_query("MATCH (l:Learner) RETURN l", fetch_size=2, n=5):
+            seen.append(record["i"])
+
+        assert seen == [0, 1, 2, 3, 4]
+        assert driver.sessions == [("learning", READ_ACCESS)]
+        assert driver.fetch_size == 2
+        assert client.get_query_stats()[0]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_positional_params_from_dual_kg_manager(self):
+        from backend.core.dual_kg_manager import DualKGManager
+
+        driver = FakeDriver()
+        client = self._client(driver)
+        manager = DualKGManager(client, client)
+
+        await manager._fetch_course_concepts("sql")
+        await manager._handle_deleted_concept("learner1", "sql.where")
+        await client.execute_read("MATCH (c) WHERE c.id = $id RETURN c", {"id": "a"}, id="b")
+
+        assert driver.transactions == [READ_ACCESS, WRITE_ACCESS, READ_ACCESS]
+        assert [params for _, params in driver.log] == [
+            {"course_id": "sql"},
+            {"concept_id": "sql.where", "learner_id": "learner1"},
+            {"id": "b"},
+        ]
@@ -183,3 +183,301 @@ class TestRelationshipMap:
         assert 'NEXT' in rel_map
         assert 'SQL_SELECT' in rel_map['REQUIRES']['SQL_JOIN']
         assert 'SQL_WHERE' in rel_map['REQUIRES']['SQL_JOIN']
+
+
+class TestBeamSearch:
+    """Test concurrent Tree-of-Thoughts beam search"""
+    
+    @pytest.mark.asyncio
+    async def test_beam_search_memoizes_viability(self):
+        """Final re-scoring reuses per-prefix scores instead of re-calling the evaluator"""
+        import logging
+        from types import SimpleNamespace
+        
+        agent = PathPlannerAgent.__new__(PathPlannerAgent)
+        agent.logger = logging.getLogger("test")
+        agent.settings = SimpleNamespace(TOT_BEAM_WIDTH=2, TOT_MAX_DEPTH=3)
+        
+        graph = {'A': ['B', 'C'], 'B': ['D'], 'C': ['E']}
+        scores = {'B': 0.9, 'C': 0.6, 'D': 0.8, 'E': 0.95}
+        calls = []
+        
+        async def thought_generator(learner_id, node, target_concept=None):
+            return [{'concept': n} for n in graph.get(node, [])]
+        
+        async def reachable(learner_id, node, limit=5):
+            return []
+        
+        async def evaluate(learner_id, path):
+            calls.append(tuple(path))
+            return scores.get(path[-1], 0.5)
+        
+        agent._thought_generator = thought_generator
+        agent._get_reachable_concepts = reachable
+        agent._evaluate_path_viability = evaluate
+        
+        best = await agent._beam_search("learner_1", ['A'])
+        
+        assert best == ['A', 'C', 'E']
+        assert len(calls) == len(set(calls))  # no path scored twice
+        assert len(agent.last_beam_search_stats['depth_timings_ms']) == 2
+
+
+class TestPlanningSession:
+    """Test batched Redis I/O for adaptive path planning"""
+    
+    @pytest.mark.asyncio
+    async def test_prefetch_and_flush_are_single_round_trips(self):
+        import json
+        from unittest.mock import AsyncMock, MagicMock
+        from backend.core.planning_session import PathPlanningSession
+        from backend.core.rl_engine import LinUCBArm
+        
+        engine = RLEngine(feature_dim=10)
+        engine.add_arm('c1', difficulty=2)
+        engine.add_arm('c2', difficulty=2)
+        
+        redis = MagicMock()
+        redis.mget = AsyncMock(return_value=[
+            LinUCBArm('c1', d=10).to_bytes(), None,             # linucb:c1, linucb:c2
+            b'{"pulls": 4, "total_reward": 2.0}', None          # mab_stats:c1, mab_stats:c2
+        ])
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[])
+        redis.pipeline.return_value = pipe
+        
+        session = PathPlanningSession(redis, engine)
+        await session.prefetch(['c1', 'c2'])
+        await session.prefetch(['c1', 'c2'])  # already loaded: no second MGET
+        
+        assert redis.mget.await_count == 1
+        assert 'c1' in engine.linucb_arms
+        assert engine.arms['c1'].pulls == 4
+        
+        session.record_context('c1', [0.1] * 10)
+        session.record_context('c2', [0.2] * 10)
+        written = await session.flush()
+        
+        assert written == 2
+        assert pipe.execute.await_count == 1
+        keys = [call.args[0] for call in pipe.set.call_args_list]
+        assert keys == ['linucb_context:c1', 'linucb_context:c2']
+        assert json.loads(pipe.set.call_args_list[0].args[1]) == [0.1] * 10
+    
+    @pytest.mark.asyncio
+    async def test_feedback_updates_shared_bandit_state(self):
+        """Decoded Redis values are used as-is, stats never expire, the shared arm wins"""
+        import json
+        import logging
+        from unittest.mock import AsyncMock, MagicMock
+        from backend.core.rl_engine import LinUCBArm
+        
+        shared = LinUCBArm('c1', d=10)
+        shared.update([1.0] * 10, 1.0)
+        
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=lambda key: {
+            'mab_stats:c1': {"pulls": 4, "total_reward": 2.0},
+            'linucb_context:c1': [0.5] * 10,
+        }.get(key))
+        redis.set = AsyncMock(return_value=True)
+        redis.mget = AsyncMock(return_value=[shared.to_bytes()])
+        redis.lock.return_value = MagicMock(acquire=AsyncMock(return_value=True), release=AsyncMock())
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[])
+        redis.pipeline.return_value = pipe
+        
+        agent = PathPlannerAgent.__new__(PathPlannerAgent)
+        agent.logger = logging.getLogger("test")
+        agent.state_manager = MagicMock(redis=redis)
+        agent.rl_engine = RLEngine(feature_dim=10)
+        agent.rl_engine.linucb_arms['c1'] = LinUCBArm('c1', d=10)  # stale local copy
+        
+        await agent._on_evaluation_feedback({"concept_id": "c1", "score": 1.0, "passed": True})
+        
+        (key, stats), kwargs = redis.set.await_args
+        assert key == 'mab_stats:c1'
+        assert json.loads(stats) == {"pulls": 5, "total_reward": 3.0}
+        assert kwargs == {"ttl": None}
+        assert agent.rl_engine.linucb_arms['c1'].pulls == 2
+        assert [call.args[0] for call in pipe.set.call_args_list] == ['linucb:c1']
+
+
+class TestLinUCB:
+    """Test NumPy LinUCB arms (Sherman-Morrison updates, batch scoring, blobs)"""
+    
+    def test_sherman_morrison_matches_direct_inverse(self):
+        import numpy as np
+        from backend.core.rl_engine import LinUCBArm
+        
+        rng = np.random.default_rng(0)
+        arm = LinUCBArm('c1', d=10)
+        A = np.eye(10)
+        b = np.zeros(10)
+        for _ in range(25):
+            x = rng.random(10)
+            r = float(rng.random())
+            arm.update(x.tolist(), r)
+            A += np.outer(x, x)
+            b += r * x
+        
+        assert np.allclose(arm.A_inv, np.linalg.inv(A))
+        assert np.allclose(arm.theta, np.linalg.solve(A, b))
+        assert arm.pulls == 25
+    
+    def test_batch_scores_match_single_scores(self):
+        import numpy as np
+        from backend.core.rl_engine import LinUCBArm
+        
+        rng = np.random.default_rng(1)
+        arms = []
+        for i in range(5):
+            arm = LinUCBArm(f'c{i}', d=10, alpha=0.5 + i * 0.1)
+            for _ in range(i + 1):
+                arm.update(rng.random(10).tolist(), float(rng.random()))
+            arms.append(arm)
+        context = rng.random(10).tolist()
+        
+        batch = RLEngine.linucb_scores(arms, context)
+        single = [arm.get_ucb_score(context) for arm in arms]
+        assert np.allclose(batch, single)
+    
+    def test_blob_round_trip_and_legacy_dict(self):
+        import numpy as np
+        from backend.core.rl_engine import LinUCBArm
+        
+        arm = LinUCBArm('c1', d=10, alpha=0.7)
+        arm.update([0.3] * 10, 0.9)
+        
+        restored = LinUCBArm.from_bytes('c1', arm.to_bytes())
+        assert restored.pulls == 1 and restored.alpha == 0.7
+        assert np.allclose(restored.A_inv, arm.A_inv)
+        assert np.allclose(restored.theta, arm.theta)
+        
+        legacy = LinUCBArm.from_dict(arm.to_dict())
+        assert np.allclose(legacy.theta, arm.theta)
+
+
+class TestPlanStore:
+    """Test the stored-plan read model (no re-planning on reads)"""
+    
+    @staticmethod
+    def _state_manager():
+        import asyncio
+        import json
+        from unittest.mock import AsyncMock, MagicMock
+        from redis.exceptions import WatchError
+        
+        store, counters, writes = {}, {}, {}
+        
+        def put(key, value):
+            store[key] = value
+            writes[key] = writes.get(key, 0) + 1
+        
+        async def increment(key, amount=1):
+            await asyncio.sleep(0)
+            counters[key] = counters.get(key, 0) + amount
+            return counters[key]
+        
+        class Pipeline:
+            """WATCH/MULTI/EXEC over the dict store"""
+            def __init__(self):
+                self.watched, self.queued = {}, []
+            async def __aenter__(self):
+                return self
+            async def __aexit__(self, *exc):
+                return False
+            async def watch(self, *keys):
+                self.watched = {k: writes.get(k, 0) for k in keys}
+            async def get(self, key):
+                await asyncio.sleep(0)
+                return store.get(key)
+            def multi(self):
+                pass
+            def set(self, key, value):
+                self.queued.append((key, value))
+            async def execute(self):
+                if any(writes.get(k, 0) != n for k, n in self.watched.items()):
+                    raise WatchError("watched key changed")
+                for key, value in self.queued:
+                    put(key, value)
+        
+        state_manager = MagicMock()
+        # Round-trip through JSON like Redis does (no shared dict objects)
+        state_manager.set = AsyncMock(side_effect=lambda k, v, ttl=None: put(k, json.dumps(v)))
+        state_manager.get = AsyncMock(side_effect=lambda k: json.loads(store[k]) if k in store else None)
+        state_manager.redis.increment = AsyncMock(side_effect=increment)
+        state_manager.redis.pipeline = lambda transaction=False: Pipeline()
+        return state_manager
+    
+    @pytest.mark.asyncio
+    async def test_read_actions_do_not_replan(self):
+        agent = PathPlannerAgent.__new__(PathPlannerAgent)
+        from backend.core.plan_store import PlanStore
+        agent.plan_store = PlanStore(self._state_manager())
+        
+        plan = await agent.plan_store.save("u1", {
+            "learning_path": [{"concept": "A"}, {"concept": "B"}, {"concept": "C"}]
+        })
+        
+        result = await agent.execute(user_id="u1", action="get_next_node")
+        assert result["next_node"]["concept"] == "A"
+        assert result["etag"] == PlanStore.etag(plan)
+        
+        result = await agent.execute(
+            action="update_path", path_id=plan["path_id"], node_id="A", status="completed"
+        )
+        assert result["status"] == "success"
+        assert result["version"] == plan["version"] + 1
+        
+        result = await agent.execute(user_id="u1", action="get_next_node")
+        assert result["next_node"]["concept"] == "B"
+    
+    @pytest.mark.asyncio
+    async def test_stale_version_is_rejected(self):
+        from backend.core.plan_store import PlanStore
+        agent = PathPlannerAgent.__new__(PathPlannerAgent)
+        agent.plan_store = PlanStore(self._state_manager())
+        
+        plan = await agent.plan_store.save("u1", {"learning_path": [{"concept": "A"}]})
+        await agent.execute(action="update_path", path_id=plan["path_id"], node_id="A", status="completed")
+        
+        result = await agent.execute(
+            action="update_path", path_id=plan["path_id"], node_id="A",
+            status="in_progress", expected_version=plan["version"]
+        )
+        assert result["status"] == "conflict"
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_if_match_updates_admit_one_writer(self):
+        import asyncio
+        from backend.core.plan_store import PlanStore, PlanVersionConflict
+        store = PlanStore(self._state_manager())
+        
+        plan = await store.save("u1", {"learning_path": [{"concept": "A"}, {"concept": "B"}]})
+        results = await asyncio.gather(
+            store.update_node(plan["path_id"], "A", "completed", expected_version=plan["version"]),
+            store.update_node(plan["path_id"], "B", "completed", expected_version=plan["version"]),
+            return_exceptions=True
+        )
+        
+        assert sum(isinstance(r, PlanVersionConflict) for r in results) == 1
+        stored = await store.get("u1")
+        assert stored["version"] == plan["version"] + 1
+        assert [step.get("status") for step in stored["learning_path"]].count("completed") == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_unpinned_updates_are_not_lost(self):
+        import asyncio
+        from backend.core.plan_store import PlanStore
+        store = PlanStore(self._state_manager())
+        
+        plan = await store.save("u1", {"learning_path": [{"concept": "A"}, {"concept": "B"}]})
+        await asyncio.gather(
+            store.update_node(plan["path_id"], "A", "completed"),
+            store.update_node(plan["path_id"], "B", "completed")
+        )
+        
+        stored = await store.get("u1")
+        assert [step["status"] for step in stored["learning_path"]] == ["completed", "completed"]
+        assert stored["next_index"] is None
@@ -0,0 +1,115 @@
+"""
+Unit tests for the learner profile cache tiers.
+
+Run: pytest backend/tests/test_profile_cache.py -v
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.core.profile_cache import ProfileCache, profile_request_scope
+from backend.core.state_manager import CentralStateManager
+
+
+class FakePubSub:
+    def __init__(self, bus):
+        self.bus = bus
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.bus.subscribers.append(self)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        self.bus.subscribers.remove(self)
+
+
+class FakeRedis:
+    """RedisClient stand-in: JSON values, GET counter, in-memory pub/sub"""
+
+    def __init__(self):
+        self.values = {}
+        self.gets = 0
+        self.subscribers = []
+        self.client = self
+
+    async def get(self, key):
+        self.gets += 1
+        return json.loads(self.values[key]) if key in self.values else None
+
+    async def set(self, key, value, ttl=None):
+        self.values[key] = json.dumps(value)
+        return True
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        return FakePubSub(self)
+
+    async def publish(self, channel, data):
+        for subscriber in self.subscribers:
+            subscriber.queue.put_nowait({"type": "message", "data": data})
+
+
+def _state_manager(redis, cache):
+    state_manager = CentralStateManager(redis, postgres_client=None)
+    state_manager.profile_cache = cache
+    return state_manager
+
+
+class TestProfileCache:
+    """Request memo, version-aware LRU and pub/sub invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_request_memo_reads_redis_once(self):
+        redis = FakeRedis()
+        state_manager = _state_manager(redis, ProfileCache(redis))
+        await redis.set("profile:l1", {"learner_id": "l1", "version": 1, "history": []})
+
+        with profile_request_scope():
+            first = await state_manager.get_learner_profile("l1")
+            first["history"].append("mutated")
+            second = await state_manager.get_learner_profile("l1")
+
+        await state_manager.get_learner_profile("l1")
+
+        assert second["history"] == []
+        assert redis.gets == 2  # one inside the request, one outside (no LRU without listener)
+
+    @pytest.mark.asyncio
+    async def test_lru_is_invalidated_by_other_workers(self):
+        redis = FakeRedis()
+        worker_a, worker_b = ProfileCache(redis), ProfileCache(redis)
+        await worker_a.start_listener()
+        await worker_b.start_listener()
+        try:
+            reader = _state_manager(redis, worker_a)
+            writer = _state_manager(redis, worker_b)
+            await writer.save_learner_profile("l1", {"learner_id": "l1", "version": 1})
+
+            assert (await reader.get_learner_profile("l1"))["version"] == 1
+            assert (await reader.get_learner_profile("l1"))["version"] == 1
+            assert redis.gets == 1
+
+            await writer.save_learner_profile("l1", {"learner_id": "l1", "version": 2})
+            await asyncio.sleep(0)
+
+            assert (await reader.get_learner_profile("l1"))["version"] == 2
+            assert redis.gets == 2
+            assert worker_a.get_stats()["invalidations"] == 1
+        finally:
+            await worker_a.stop_listener()
+            await worker_b.stop_listener()
+
+    def test_stale_invalidation_keeps_newer_entry(self):
+        cache = ProfileCache()
+        cache._entries["l1"] = (float("inf"), 3, {"version": 3})
+
+        cache.on_message(json.dumps({"learner_id": "l1", "version": 2, "origin": "other"}))
+        assert "l1" in cache._entries
+
+        cache.on_message(json.dumps({"learner_id": "l1", "version": 3, "origin": "other"}))
+        assert "l1" not in cache._entries
@@ -0,0 +1,83 @@
+"""
+Unit tests for single-flight call coalescing.
+
+Run: pytest backend/tests/test_single_flight.py -v
+"""
+
+import asyncio
+import pytest
+
+from backend.core.single_flight import SingleFlight
+from backend.core.course_kg_cache import CourseKGCache
+
+
+class TestSingleFlight:
+    """Concurrent identical calls share one execution"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_collapsed(self):
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return "value"
+
+        waiters = [asyncio.create_task(flights.do("k", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["value"] * 5
+        assert len(calls) == 1
+        assert flights.get_stats() == {"calls": 5, "executions": 1, "collapsed": 4, "errors": 0, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter_and_are_not_remembered(self):
+        flights = SingleFlight("test")
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            await asyncio.sleep(0)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(flights.do("k", failing), flights.do("k", failing), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        with pytest.raises(RuntimeError):
+            await flights.do("k", failing)
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return 42
+
+        first = asyncio.create_task(flights.do("k", fetch))
+        second = asyncio.create_task(flights.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == 42
+
+    @pytest.mark.asyncio
+    async def test_course_kg_misses_share_one_neo4j_read(self):
+        cache = CourseKGCache()
+        loads = []
+
+        async def loader():
+            loads.append(1)
+            await asyncio.sleep(0.01)
+            return [{"concept_id": "c1"}]
+
+        rows = await asyncio.gather(*(cache.get_or_load("MATCH (c) RETURN c", {"id": "c1"}, loader) for _ in range(4)))
+
+        assert len(loads) == 1
+        assert rows[0] == rows[3] and rows[0] is not rows[3]
@@ -221,3 +221,100 @@ class TestGroundingManager:
         assert manager.W_KG == 0.35
         assert manager.W_PERSONAL == 0.25
         assert abs(manager.W_DOC + manager.W_KG + manager.W_PERSONAL - 1.0) < 0.01
+
+
+class TestSelfConsistency:
+    """Test concurrent CoT sampling with early consensus stop"""
+    
+    @pytest.mark.asyncio
+    async def test_early_stop_cancels_outstanding_traces(self):
+        """Two agreeing traces out of 3 reach the 0.6 threshold; the slow call is cancelled"""
+        import asyncio
+        import logging
+        from types import SimpleNamespace
+        from backend.agents.tutor_agent import TutorAgent
+        
+        cancelled = []
+        
+        class FakeLLM:
+            def __init__(self):
+                self.calls = 0
+            
+            async def acomplete(self, prompt):
+                self.calls += 1
+                if self.calls == 3:
+                    try:
+                        await asyncio.sleep(10)
+                    except asyncio.CancelledError:
+                        cancelled.append(True)
+                        raise
+                return SimpleNamespace(text="CoT: join keys. Student Hint: Which column links both tables?")
+        
+        tutor = TutorAgent.__new__(TutorAgent)
+        tutor.logger = logging.getLogger("test")
+        tutor.settings = SimpleNamespace(MOCK_LLM=False)
+        tutor.llm = FakeLLM()
+        
+        traces = await asyncio.wait_for(
+            tutor._generate_cot_traces("How do joins work?", [], "sql.join", n=3),
+            timeout=2
+        )
+        await asyncio.sleep(0)
+        
+        assert len(traces) == 2
+        assert cancelled == [True]
+        assert tutor._check_consensus(traces) == traces[0]
+
+
+class TestStreaming:
+    """Test SSE streaming path and the incremental Leakage Guard"""
+    
+    def test_guard_hides_cot_until_hint_marker(self):
+        """Chunks before 'Student Hint:' are withheld; the hint streams with batch-path stripping"""
+        from backend.agents.tutor_agent import ScaffoldStreamGuard
+        
+        guard = ScaffoldStreamGuard(fallback=lambda trace: "fallback")
+        chunks = ["CoT: The answer is 11. Stud", "ent Hi", "nt:  Count the", " new balls first.", "\n"]
+        visible = "".join(guard.feed(c) for c in chunks) + guard.flush()
+        
+        assert visible == "Count the new balls first."
+        assert "answer" not in visible
+    
+    def test_guard_falls_back_without_marker(self):
+        """Traces without the marker go through the batch fallback at the end"""
+        from backend.agents.tutor_agent import ScaffoldStreamGuard
+        
+        guard = ScaffoldStreamGuard(fallback=lambda trace: f"safe:{len(trace)}")
+        assert guard.feed("Thus the result") == ""
+        assert guard.flush() == "safe:15"
+    
+    @pytest.mark.asyncio
+    async def test_stream_cot_hint_replaces_when_outvoted(self):
+        """A streamed hint that disagrees with the other samples is replaced by the consensus hint"""
+        import logging
+        from types import SimpleNamespace
+        from backend.agents.tutor_agent import TutorAgent
+        from backend.models.dialogue import DialogueState
+        
+        class FakeLLM:
+            async def astream_complete(self, prompt):
+                async def gen():
+                    for delta in ["CoT: x. Student Hint: ", "Think about ", "sorting"]:
+                        yield SimpleNamespace(delta=delta)
+                return gen()
+            
+            async def acomplete(self, prompt):
+                return SimpleNamespace(text="CoT: y. Student Hint: Which column links both tables?")
+        
+        tutor = TutorAgent.__new__(TutorAgent)
+        tutor.logger = logging.getLogger("test")
+        tutor.llm = FakeLLM()
+        state = DialogueState("learner1", "sql.join")
+        
+        events = [e async for e in tutor._stream_cot_hint("prompt", state, n=3)]
+        tokens = "".join(e["data"]["text"] for e in events if e["event"] == "token")
+        
+        assert tokens == "Hint: Think about sorting"
+        assert events[-1] == {"event": "replace", "data": {"text": "Hint: Which column links both tables?"}}
+        assert state.current_cot_trace == ["Which column links both tables?"]
+        assert state.cot_step_index == 1
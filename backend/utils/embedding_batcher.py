@@ -0,0 +1,217 @@
+"""
+Embedding Batcher: collect, deduplicate and batch-embed texts.
+
+Used by KnowledgeExtractionAgent (concept embeddings for a whole document)
+and EntityResolver (new + existing candidate concepts) so that:
+
+1. Each distinct text is embedded at most once per ingestion run
+2. Model calls go out in large batches (get_text_embedding_batch /
+   aget_text_embedding_batch / SentenceTransformer.encode(list))
+3. Embeddings are cached on disk keyed by a content hash (model + text),
+   so re-ingesting an overlapping document never re-embeds a known string
+
+Persistent cache: SQLite file (stdlib, safe for concurrent readers),
+vectors stored as float32 blobs.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Batched, content-addressed embedding service.
+
+    Lookup order per text: in-memory LRU -> persistent cache -> model batch.
+    """
+
+    DEFAULT_BATCH_SIZE = 64
+    MEMORY_CACHE_SIZE = 50000
+
+    def __init__(
+        self,
+        embedding_model: Any,
+        cache_path: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Args:
+            embedding_model: LlamaIndex BaseEmbedding or SentenceTransformer-like model
+            cache_path: SQLite file for the persistent cache (None = memory only)
+            batch_size: Max texts per model call
+        """
+        self._model = embedding_model
+        self.batch_size = batch_size
+        self._namespace = str(
+            getattr(embedding_model, "model_name", None) or type(embedding_model).__name__
+        )
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {"requested": 0, "memory_hits": 0, "disk_hits": 0, "embedded": 0, "model_calls": 0}
+
+        if cache_path:
+            try:
+                os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(cache_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+                )
+                self._db.commit()
+            except Exception as e:
+                logger.warning(f"Embedding cache disabled ({cache_path}): {e}")
+                self._db = None
+
+    # ------------------------------------------------------------------
+    # Cache helpers
+    # ------------------------------------------------------------------
+
+    def content_key(self, text: str) -> str:
+        """Content hash of (model namespace, text)"""
+        return hashlib.sha256(f"{self._namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Resolve keys from memory, then from the persistent cache"""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+            self.stats["memory_hits"] += len(found)
+
+            if missing and self._db is not None:
+                # SQLite caps bound parameters; query in slices
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vec = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vec
+                        self._remember(key, vec)
+                        self.stats["disk_hits"] += 1
+        return found
+
+    def _store(self, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for key, vec in items.items():
+                self._remember(key, vec)
+            if self._db is not None and items:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                        [(key, vec.tobytes()) for key, vec in items.items()]
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    logger.warning(f"Failed to persist {len(items)} embeddings: {e}")
+
+    # ------------------------------------------------------------------
+    # Model calls
+    # ------------------------------------------------------------------
+
+    def _embed_batch_sync(self, texts: List[str]) -> List[Any]:
+        self.stats["model_calls"] += 1
+        if hasattr(self._model, "get_text_embedding_batch"):
+            return self._model.get_text_embedding_batch(texts)
+        if hasattr(self._model, "encode"):
+            return list(self._model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True))
+        if hasattr(self._model, "get_text_embedding"):
+            return [self._model.get_text_embedding(t) for t in texts]
+        raise TypeError(f"Unknown embedding model interface: {type(self._model).__name__}")
+
+    async def _embed_batch_async(self, texts: List[str]) -> List[Any]:
+        if hasattr(self._model, "aget_text_embedding_batch"):
+            self.stats["model_calls"] += 1
+            return await self._model.aget_text_embedding_batch(texts)
+        # Sync-only models (e.g. SentenceTransformer): keep the event loop free
+        return await asyncio.to_thread(self._embed_batch_sync, texts)
+
+    def _plan(self, texts: Sequence[str]):
+        """Dedupe texts and split into cached / to-embed"""
+        keys = [self.content_key(t) for t in texts]
+        unique: Dict[str, str] = dict(zip(keys, texts))
+        self.stats["requested"] += len(texts)
+        found = self._lookup(list(unique))
+        pending = [(k, t) for k, t in unique.items() if k not in found]
+        return keys, found, pending
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def embed_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Embed texts synchronously in batches.
+
+        Returns one float32 vector per input text (None if embedding failed).
+        """
+        keys, found, pending = self._plan(texts)
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            try:
+                vectors = self._embed_batch_sync([t for _, t in batch])
+            except Exception as e:
+                logger.error(f"Embedding batch of {len(batch)} failed: {e}")
+                continue
+            fresh = {k: np.asarray(v, dtype=np.float32) for (k, _), v in zip(batch, vectors)}
+            self.stats["embedded"] += len(fresh)
+            self._store(fresh)
+            found.update(fresh)
+        return [found.get(k) for k in keys]
+
+    async def aembed_many(self, texts: Sequence[str], max_concurrency: int = 4) -> List[Optional[np.ndarray]]:
+        """
+        Embed texts asynchronously; batches run concurrently (bounded).
+
+        Returns one float32 vector per input text (None if embedding failed).
+        """
+        keys, found, pending = self._plan(texts)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(batch):
+            async with semaphore:
+                try:
+                    vectors = await self._embed_batch_async([t for _, t in batch])
+                except Exception as e:
+                    logger.error(f"Embedding batch of {len(batch)} failed: {e}")
+                    return {}
+            return {k: np.asarray(v, dtype=np.float32) for (k, _), v in zip(batch, vectors)}
+
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        for fresh in await asyncio.gather(*(run(b) for b in batches)):
+            self.stats["embedded"] += len(fresh)
+            self._store(fresh)
+            found.update(fresh)
+        return [found.get(k) for k in keys]
+
+    def embed_one(self, text: str) -> Optional[np.ndarray]:
+        """Single-text convenience wrapper (still cache-backed)"""
+        return self.embed_many([text])[0]
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
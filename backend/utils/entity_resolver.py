@@ -9,17 +9,31 @@ Similarity Components:
 
 Algorithm:
 1. Compute pairwise similarities for new vs existing concepts
-2. Cluster similar concepts using agglomerative clustering
+2. Cluster similar concepts using agglomerative clustering (blocked, priority-queue linkage)
 3. Select representative for each cluster
 4. Remap all relationships to representatives
 """
 
+import heapq
+import json
 import logging
+import os
+import re
 from typing import List, Dict, Any, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 import numpy as np
 
+from backend.utils.embedding_batcher import EmbeddingBatcher
+
+# Optional ANN backend for very large candidate pools
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    hnswlib = None
+    HNSWLIB_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +79,72 @@ class ResolutionResult:
         }
 
 
+class PersistentAnnIndex:
+    """
+    Optional persistent HNSW index over existing concept embeddings.
+    
+    Files:
+    - {path}.bin       hnswlib index (cosine space)
+    - {path}.ids.json  label -> concept_id list
+    
+    Only used when hnswlib is installed and an index path is configured;
+    otherwise EntityResolver falls back to exact matrix retrieval.
+    """
+    
+    EF_CONSTRUCTION = 200
+    M = 16
+    
+    def __init__(self, path: str, dim: int, max_elements: int = 10000):
+        self.path = path
+        self.dim = dim
+        self._ids: List[str] = []
+        self._labels: Dict[str, int] = {}
+        self._index = hnswlib.Index(space="cosine", dim=dim)
+        
+        if os.path.exists(f"{path}.bin") and os.path.exists(f"{path}.ids.json"):
+            with open(f"{path}.ids.json", "r", encoding="utf-8") as f:
+                self._ids = json.load(f)
+            self._index.load_index(f"{path}.bin", max_elements=max(max_elements, len(self._ids)))
+            self._labels = {cid: i for i, cid in enumerate(self._ids)}
+        else:
+            self._index.init_index(max_elements=max_elements, ef_construction=self.EF_CONSTRUCTION, M=self.M)
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def add(self, concept_ids: List[str], matrix: np.ndarray) -> int:
+        """Add embeddings for concept_ids not yet indexed. Returns number added."""
+        missing = [i for i, cid in enumerate(concept_ids) if cid not in self._labels]
+        if not missing:
+            return 0
+        
+        needed = len(self._ids) + len(missing)
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+        
+        labels = np.arange(len(self._ids), needed)
+        self._index.add_items(matrix[missing], labels)
+        for i in missing:
+            self._labels[concept_ids[i]] = len(self._ids)
+            self._ids.append(concept_ids[i])
+        return len(missing)
+    
+    def query(self, queries: np.ndarray, k: int) -> List[List[str]]:
+        """Return the k nearest concept_ids for each query row"""
+        k = min(k, len(self._ids))
+        if k == 0:
+            return [[] for _ in range(len(queries))]
+        self._index.set_ef(max(k * 2, 50))
+        labels, _ = self._index.knn_query(queries, k=k)
+        return [[self._ids[label] for label in row] for row in labels]
+    
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._index.save_index(f"{self.path}.bin")
+        with open(f"{self.path}.ids.json", "w", encoding="utf-8") as f:
+            json.dump(self._ids, f)
+
+
 class EntityResolver:
     """
     Entity Resolver: Merge duplicate concepts.
@@ -87,6 +167,13 @@ class EntityResolver:
     
     # Scalability: Two-Stage Resolution Parameters
     TOP_K_CANDIDATES = 20   # Max candidates to retrieve per concept
+    ANN_MIN_CANDIDATES = 5000  # Below this, exact matrix retrieval is faster than ANN
+    ANN_OVERFETCH = 2       # ANN index spans the whole KG; over-fetch then filter to the pool
+    
+    # Internal clustering (find_clusters) blocking parameters
+    CLUSTER_BLOCK_ROWS = 1024  # Row chunk for the blocked similarity matrix
+    BLOCKING_MIN_SIZE = 300    # Jaccard fallback: below this, score all pairs
+    NAME_BUCKET_MAX = 200      # Skip name-token buckets larger than this (too generic)
     
     # Default confidence values for consistency
     DEFAULT_CONFIDENCE_EXISTING = 1.0  # Trusted DB concepts
@@ -97,7 +184,9 @@ class EntityResolver:
         self,
         embedding_model: Optional[Any] = None,
         merge_threshold: float = None,  # Use class constant if not provided
-        use_embeddings: bool = True
+        use_embeddings: bool = True,
+        ann_index_path: Optional[str] = None,
+        embedding_batcher: Optional[EmbeddingBatcher] = None
     ):
         """
         Initialize Entity Resolver.
@@ -106,11 +195,23 @@ class EntityResolver:
             embedding_model: LlamaIndex/Gemini-compatible embedding model
             merge_threshold: Similarity threshold for merging (default: MERGE_THRESHOLD)
             use_embeddings: Whether to use embeddings for semantic similarity
+            ann_index_path: Optional path prefix for a persistent HNSW candidate index
+                (requires hnswlib; ignored otherwise)
+            embedding_batcher: Shared batched/cached embedding service (created
+                in-memory from embedding_model if not provided)
         """
         self.merge_threshold = merge_threshold if merge_threshold is not None else self.MERGE_THRESHOLD
         self.use_embeddings = use_embeddings
         self._embedding_model = embedding_model
         self._embedding_cache: Dict[str, np.ndarray] = {}
+        self._batcher = embedding_batcher
+        if self._batcher is None and embedding_model is not None:
+            self._batcher = EmbeddingBatcher(embedding_model)
+        self.ann_index_path = ann_index_path
+        self._ann_index: Optional[PersistentAnnIndex] = None
+        
+        if ann_index_path and not HNSWLIB_AVAILABLE:
+            logger.warning("hnswlib not installed. ANN candidate index disabled; using exact retrieval.")
         
         if use_embeddings and embedding_model is None:
             logger.warning("No embedding model provided. Semantic similarity will fallback to Jaccard.")
@@ -144,10 +245,12 @@ class EntityResolver:
         unique_new_concepts = []
         internal_mapping = {} # old_id -> representative_id
         
+        new_by_id = {c["concept_id"]: c for c in new_concepts}
+        
         for cluster_ids in internal_clusters:
-            cluster_objs = [c for c in new_concepts if c["concept_id"] in cluster_ids]
+            cluster_objs = [new_by_id[cid] for cid in dict.fromkeys(cluster_ids)]
             rep_id = self.select_representative(cluster_objs)
-            rep_obj = next(c for c in cluster_objs if c["concept_id"] == rep_id)
+            rep_obj = new_by_id[rep_id]
             
             unique_new_concepts.append(rep_obj)
             for cid in cluster_ids:
@@ -165,28 +268,20 @@ class EntityResolver:
         existing_prereqs = self._build_prereq_map(existing_relationships)
         new_prereqs = self._build_prereq_map(unique_new_relationships)
         
-        # Pre-compute embeddings for existing concepts (cached)
-        existing_embeddings = {}
-        if self.use_embeddings and existing_concepts:
-            logger.info(f"Pre-computing embeddings for {len(existing_concepts)} existing concepts...")
-            for c in existing_concepts:
-                text = self._get_concept_text(c)
-                existing_embeddings[c["concept_id"]] = self._get_embedding(text)
+        # STAGE 1: Candidate Retrieval (Vector Similarity Top-K) for all new
+        # concepts at once: one normalized matrix product + argpartition
+        candidate_lists = self._retrieve_candidates_batch(
+            new_concepts=unique_new_concepts,
+            existing_concepts=existing_concepts,
+            top_k=self.TOP_K_CANDIDATES
+        )
         
         matches = []
         external_mapping: Dict[str, str] = {}  # unique_new_id -> existing_id
         
-        for new_concept in unique_new_concepts:
+        for new_concept, candidates in zip(unique_new_concepts, candidate_lists):
             new_id = new_concept.get("concept_id", "")
             
-            # STAGE 1: Candidate Retrieval (Vector Similarity Top-K)
-            candidates = self._retrieve_candidates(
-                new_concept=new_concept,
-                existing_concepts=existing_concepts,
-                existing_embeddings=existing_embeddings,
-                top_k=self.TOP_K_CANDIDATES
-            )
-            
             if not candidates:
                 continue  # No similar candidates found
             
@@ -215,7 +310,7 @@ class EntityResolver:
                 matches.append(best_match)
                 
                 # CONFLICT RESOLUTION: Update the existing concept's attributes
-                target_concept = next(c for c in existing_concepts if c["concept_id"] == best_match.existing_concept_id)
+                target_concept = existing_by_id[best_match.existing_concept_id]
                 merged_attributes = self._resolve_attribute_conflicts(target_concept, new_concept)
                 target_concept.update(merged_attributes)
                 logger.debug(f"Merged attributes for {best_match.existing_concept_id} using Weighted Average")
@@ -319,6 +414,8 @@ class EntityResolver:
         # Get or compute embeddings
         emb1 = self._get_embedding(text1)
         emb2 = self._get_embedding(text2)
+        if emb1 is None or emb2 is None or emb1.shape != emb2.shape:
+            return self._text_similarity(text1, text2)
         
         # Cosine similarity
         dot_product = np.dot(emb1, emb2)
@@ -330,87 +427,153 @@ class EntityResolver:
         
         return float(dot_product / (norm1 * norm2))
     
-    def _get_embedding(self, text: str) -> np.ndarray:
-        """Get embedding for text, with caching"""
-        if text in self._embedding_cache:
-            return self._embedding_cache[text]
-        
-        # Support LlamaIndex embedding model interface
-        if hasattr(self._embedding_model, "get_text_embedding"):
-            embedding = self._embedding_model.get_text_embedding(text)
-            embedding_np = np.array(embedding)
-        # Support SentenceTransformer interface
-        elif hasattr(self._embedding_model, "encode"):
-            embedding_np = self._embedding_model.encode(text, convert_to_numpy=True)
+    def _get_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Get embedding for text, with caching (None if embedding failed)"""
+        return self._get_embeddings([text])[0]
+    
+    def _get_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Get embeddings for many texts; uncached texts are deduplicated and
+        embedded in batches through the EmbeddingBatcher.
+        
+        Failed embeddings come back as None and are not cached, so the next
+        call retries them.
+        """
+        missing = [t for t in dict.fromkeys(texts) if t not in self._embedding_cache]
+        if missing:
+            if self._batcher is not None:
+                vectors = self._batcher.embed_many(missing)
+            else:
+                logger.warning("Unknown embedding model interface")
+                vectors = [None] * len(missing)
+            fresh = {text: vec for text, vec in zip(missing, vectors) if vec is not None}
+            self._embedding_cache.update(fresh)
+            if len(fresh) < len(missing):
+                logger.warning(f"{len(missing) - len(fresh)} concept embeddings failed")
+        return [self._embedding_cache.get(t) for t in texts]
+    
+    async def aprefetch_embeddings(self, concepts: List[Dict[str, Any]]) -> int:
+        """
+        Warm the embedding cache for concepts (async, batched) before the
+        synchronous resolve() runs. Returns number of texts prefetched.
+        """
+        if not self.use_embeddings or self._batcher is None or not concepts:
+            return 0
+        texts = [t for t in dict.fromkeys(self._get_concept_text(c) for c in concepts)
+                 if t not in self._embedding_cache]
+        vectors = await self._batcher.aembed_many(texts)
+        for text, vec in zip(texts, vectors):
+            if vec is not None:
+                self._embedding_cache[text] = vec
+        return len(texts)
+    
+    def _embedding_matrix(self, concepts: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Stack L2-normalized concept embeddings into a (n, d) float32 matrix.
+        
+        Concepts whose embedding failed get a zero row (similarity 0 to
+        everything). Returns None when embeddings are disabled, all failed,
+        or have inconsistent shapes.
+        """
+        if not self.use_embeddings or not concepts:
+            return None
+        embeddings = self._get_embeddings([self._get_concept_text(c) for c in concepts])
+        dim = next((np.asarray(e).size for e in embeddings if e is not None), None)
+        if dim is None:
+            return None
+        try:
+            matrix = np.vstack([
+                np.zeros(dim, dtype=np.float32) if e is None else np.asarray(e, dtype=np.float32).ravel()
+                for e in embeddings
+            ])
+        except ValueError as e:
+            logger.warning(f"Could not stack embeddings ({e}); falling back to unranked candidates")
+            return None
+        
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    @staticmethod
+    def _top_k_indices(similarities: np.ndarray, k: int) -> np.ndarray:
+        """Row-wise indices of the k largest similarities, sorted descending"""
+        n_cols = similarities.shape[1]
+        k = min(k, n_cols)
+        if k < n_cols:
+            idx = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
         else:
-            logger.warning("Unknown embedding model interface")
-            return np.zeros(1)
-            
-        self._embedding_cache[text] = embedding_np
-        return embedding_np
+            idx = np.broadcast_to(np.arange(n_cols), similarities.shape).copy()
+        order = np.argsort(-np.take_along_axis(similarities, idx, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(idx, order, axis=1)
     
-    def _retrieve_candidates(
+    def _get_ann_index(self, dim: int) -> Optional[PersistentAnnIndex]:
+        """Lazy load the persistent ANN index (None if not configured/available)"""
+        if not self.ann_index_path or not HNSWLIB_AVAILABLE:
+            return None
+        if self._ann_index is None or self._ann_index.dim != dim:
+            try:
+                self._ann_index = PersistentAnnIndex(self.ann_index_path, dim)
+            except Exception as e:
+                logger.warning(f"Failed to open ANN index at {self.ann_index_path}: {e}")
+                self.ann_index_path = None
+                return None
+        return self._ann_index
+    
+    def _retrieve_candidates_batch(
         self,
-        new_concept: Dict[str, Any],
+        new_concepts: List[Dict[str, Any]],
         existing_concepts: List[Dict[str, Any]],
-        existing_embeddings: Dict[str, np.ndarray],
         top_k: int = 20
-    ) -> List[Dict[str, Any]]:
+    ) -> List[List[Dict[str, Any]]]:
         """
-        Two-Stage Entity Resolution: Stage 1 - Candidate Retrieval.
-        
-        Uses vector similarity to quickly find Top-K most similar existing concepts
-        before performing expensive 3-way deep comparison.
+        Two-Stage Entity Resolution: Stage 1 - Candidate Retrieval (batched).
         
-        Complexity: O(M) where M = number of existing concepts
-        vs O(M * feature_comparisons) for full comparison
+        Embeds each existing concept once into a normalized matrix E (M, d),
+        stacks the new concepts into Q (N, d) and scores everything with a
+        single product Q @ E.T; argpartition then selects the Top-K per row
+        in O(M) instead of a full sort. For pools >= ANN_MIN_CANDIDATES with a
+        configured index path, a persistent HNSW index is queried instead.
         
-        Args:
-            new_concept: The new concept to find matches for
-            existing_concepts: All concepts in the KG
-            existing_embeddings: Pre-computed embeddings for existing concepts
-            top_k: Maximum number of candidates to return
-            
         Returns:
-            List of top-K most similar existing concepts
+            One list of top-K existing concepts per new concept (same order)
         """
-        if not existing_concepts:
-            return []
-        
-        # Get embedding for new concept
-        new_text = self._get_concept_text(new_concept)
-        new_embedding = self._get_embedding(new_text)
-        
-        # Calculate cosine similarities with all existing concepts
-        similarities = []
-        for existing_concept in existing_concepts:
-            existing_id = existing_concept.get("concept_id", "")
-            
-            # Use pre-computed embedding if available
-            if existing_id in existing_embeddings:
-                existing_embedding = existing_embeddings[existing_id]
-            else:
-                existing_text = self._get_concept_text(existing_concept)
-                existing_embedding = self._get_embedding(existing_text)
-            
-            # Quick cosine similarity calculation
-            dot_product = np.dot(new_embedding, existing_embedding)
-            norm1 = np.linalg.norm(new_embedding)
-            norm2 = np.linalg.norm(existing_embedding)
-            
-            if norm1 > 0 and norm2 > 0:
-                sim = float(dot_product / (norm1 * norm2))
-            else:
-                sim = 0.0
-            
-            similarities.append((existing_concept, sim))
-        
-        # Sort by similarity (descending) and take top-K
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        candidates = [concept for concept, sim in similarities[:top_k]]
-        
-        logger.debug(f"Retrieved {len(candidates)} candidates for '{new_concept.get('name', 'unknown')}'")
-        return candidates
+        if not existing_concepts or not new_concepts:
+            return [[] for _ in new_concepts]
+        
+        existing_matrix = self._embedding_matrix(existing_concepts)
+        new_matrix = self._embedding_matrix(new_concepts)
+        
+        if existing_matrix is None or new_matrix is None or existing_matrix.shape[1] != new_matrix.shape[1]:
+            # No usable embeddings: candidates are unranked (deep comparison decides)
+            return [existing_concepts[:top_k] for _ in new_concepts]
+        
+        if len(existing_concepts) >= self.ANN_MIN_CANDIDATES:
+            ann = self._get_ann_index(existing_matrix.shape[1])
+            if ann is not None:
+                positions = {c["concept_id"]: i for i, c in enumerate(existing_concepts)}
+                existing_by_id = {cid: existing_concepts[i] for cid, i in positions.items()}
+                if ann.add(list(positions), existing_matrix[list(positions.values())]):
+                    ann.save()
+                neighbours = ann.query(new_matrix, top_k * self.ANN_OVERFETCH)
+                return [
+                    [existing_by_id[cid] for cid in row if cid in existing_by_id][:top_k]
+                    for row in neighbours
+                ]
+        
+        similarities = new_matrix @ existing_matrix.T  # (N, M) cosine similarities
+        top_idx = self._top_k_indices(similarities, top_k)
+        
+        logger.debug(f"Retrieved top-{top_idx.shape[1]} candidates for {len(new_concepts)} concepts")
+        return [[existing_concepts[j] for j in row] for row in top_idx]
+    
+    def _retrieve_candidates(
+        self,
+        new_concept: Dict[str, Any],
+        existing_concepts: List[Dict[str, Any]],
+        top_k: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Single-concept convenience wrapper around _retrieve_candidates_batch"""
+        return self._retrieve_candidates_batch([new_concept], existing_concepts, top_k)[0]
     
     def _text_similarity(self, text1: str, text2: str) -> float:
         """Fallback: Jaccard word similarity"""
@@ -508,62 +671,158 @@ class EntityResolver:
         threshold: float = 0.80
     ) -> List[List[str]]:
         """
-        Find clusters of similar concepts using agglomerative clustering.
+        Find clusters of similar concepts using average-linkage agglomerative clustering.
         
         For use within a single extraction batch (not new vs existing).
         
+        Scalable implementation:
+        1. Blocking: only pairs that can reach `threshold` are scored. With
+           embeddings, the semantic term bounds the combined score, so pairs
+           below (threshold - W_STRUCTURAL - W_CONTEXTUAL) / W_SEMANTIC cosine
+           are pruned from a chunked, vectorized E @ E.T. Without embeddings,
+           large batches are blocked by shared name tokens.
+        2. Threshold graph: surviving pairs with combined score >= threshold.
+        3. Linkage: greedy average linkage driven by a priority queue over the
+           threshold graph. Two clusters can only average >= threshold if some
+           cross pair does, so only graph-adjacent clusters are ever compared;
+           their average is computed exactly from cached cross-pair sums.
+        
         Returns:
             List of clusters, each cluster is a list of concept_ids
         """
-        if len(concepts) < 2:
+        n = len(concepts)
+        if n < 2:
             return [[c["concept_id"]] for c in concepts]
         
-        # Build prerequisite map
         prereq_map = self._build_prereq_map(relationships)
+        prereqs = [prereq_map.get(c["concept_id"], set()) for c in concepts]
+        tags = [set(c.get("semantic_tags", []) or []) for c in concepts]
+        matrix = self._embedding_matrix(concepts)
+        words = None if matrix is not None else [
+            set(self._get_concept_text(c).lower().split()) for c in concepts
+        ]
+        
+        def pair_scores(rows: List[int], cols: List[int]) -> np.ndarray:
+            """Combined 3-way scores for every (row, col) pair, shape (len(rows), len(cols))"""
+            if matrix is not None:
+                semantic = matrix[rows] @ matrix[cols].T
+            else:
+                semantic = np.array([[self._jaccard_similarity(words[i], words[j]) for j in cols] for i in rows])
+            structural = np.array([[self._jaccard_similarity(prereqs[i], prereqs[j]) for j in cols] for i in rows])
+            contextual = np.array([[self._jaccard_similarity(tags[i], tags[j]) for j in cols] for i in rows])
+            return (
+                self.W_SEMANTIC * semantic +
+                self.W_STRUCTURAL * structural +
+                self.W_CONTEXTUAL * contextual
+            )
         
-        # Compute pairwise similarities
-        n = len(concepts)
-        similarity_matrix = np.zeros((n, n))
-        
-        for i in range(n):
-            for j in range(i + 1, n):
-                match = self._calculate_similarity(
-                    concepts[i],
-                    concepts[j],
-                    prereq_map.get(concepts[i]["concept_id"], set()),
-                    prereq_map.get(concepts[j]["concept_id"], set())
-                )
-                similarity_matrix[i][j] = match.combined_score
-                similarity_matrix[j][i] = match.combined_score
+        # --- 1. Blocking + 2. Threshold graph ---
+        candidate_pairs = self._blocked_candidate_pairs(concepts, matrix, threshold)
+        edges: Dict[Tuple[int, int], float] = {}
+        for i, j in candidate_pairs:
+            score = float(pair_scores([i], [j])[0, 0])
+            if score >= threshold:
+                edges[(i, j)] = score
         
-        # Simple agglomerative clustering
-        clusters = [[i] for i in range(n)]  # Start with each concept in its own cluster
+        if not edges:
+            return [[c["concept_id"]] for c in concepts]
         
-        while len(clusters) > 1:
-            # Find most similar pair of clusters
-            best_sim = 0
-            best_pair = None
+        # --- 3. Priority-queue average linkage ---
+        members: Dict[int, List[int]] = {i: [i] for i in range(n)}
+        neighbours: Dict[int, Set[int]] = defaultdict(set)
+        cross_sum: Dict[Tuple[int, int], float] = {}  # (cluster_a, cluster_b) -> sum of pair scores
+        heap: List[Tuple[float, int, int]] = []
+        
+        for (i, j), score in edges.items():
+            neighbours[i].add(j)
+            neighbours[j].add(i)
+            cross_sum[(i, j)] = score
+            heapq.heappush(heap, (-score, i, j))
+        
+        def get_cross_sum(a: int, b: int) -> float:
+            key = (a, b) if a < b else (b, a)
+            if key not in cross_sum:
+                cross_sum[key] = float(pair_scores(members[a], members[b]).sum())
+            return cross_sum[key]
+        
+        next_id = n
+        while heap:
+            neg_avg, a, b = heapq.heappop(heap)
+            if -neg_avg < threshold:
+                break  # No more clusters to merge
+            if a not in members or b not in members:
+                continue  # Stale entry: one side was already merged
             
-            for i, c1 in enumerate(clusters):
-                for j, c2 in enumerate(clusters[i + 1:], i + 1):
-                    # Average linkage
-                    sim = np.mean([similarity_matrix[a][b] for a in c1 for b in c2])
-                    if sim > best_sim:
-                        best_sim = sim
-                        best_pair = (i, j)
+            # Merge clusters a + b -> new cluster
+            merged = next_id
+            next_id += 1
+            members[merged] = members[a] + members[b]
+            adjacent = (neighbours.pop(a, set()) | neighbours.pop(b, set())) - {a, b}
             
-            if best_sim < threshold:
-                break  # No more clusters to merge
+            for k in adjacent:
+                # Average-linkage update: sum(a∪b, k) = sum(a, k) + sum(b, k)
+                total = get_cross_sum(a, k) + get_cross_sum(b, k)
+                cross_sum[(k, merged)] = total
+                neighbours[k] -= {a, b}
+                neighbours[k].add(merged)
+                neighbours[merged].add(k)
+                
+                avg = total / (len(members[merged]) * len(members[k]))
+                if avg >= threshold:
+                    heapq.heappush(heap, (-avg, k, merged))
             
-            # Merge clusters
-            i, j = best_pair
-            new_cluster = clusters[i] + clusters[j]
-            clusters = [c for k, c in enumerate(clusters) if k not in (i, j)]
-            clusters.append(new_cluster)
+            del members[a], members[b]
         
-        # Convert indices to concept_ids
+        # Convert indices to concept_ids (stable order by first member)
+        clusters = sorted((sorted(m) for m in members.values()), key=lambda m: m[0])
         return [[concepts[i]["concept_id"] for i in cluster] for cluster in clusters]
     
+    def _blocked_candidate_pairs(
+        self,
+        concepts: List[Dict[str, Any]],
+        matrix: Optional[np.ndarray],
+        threshold: float
+    ) -> List[Tuple[int, int]]:
+        """
+        Blocking step for find_clusters: return (i, j) pairs (i < j) that may
+        reach `threshold`.
+        
+        - Embeddings: exact pruning on the semantic bound, computed in row
+          chunks of a normalized similarity matrix.
+        - Jaccard fallback: all pairs for small batches; otherwise pairs sharing
+          a normalized name token (buckets larger than NAME_BUCKET_MAX are
+          skipped as non-discriminative).
+        """
+        n = len(concepts)
+        
+        if matrix is not None:
+            min_semantic = (threshold - self.W_STRUCTURAL - self.W_CONTEXTUAL) / self.W_SEMANTIC
+            pairs = []
+            for start in range(0, n, self.CLUSTER_BLOCK_ROWS):
+                block = matrix[start:start + self.CLUSTER_BLOCK_ROWS] @ matrix.T
+                rows, cols = np.nonzero(block >= min_semantic)
+                rows = rows + start
+                keep = cols > rows
+                pairs.extend(zip(rows[keep].tolist(), cols[keep].tolist()))
+            return pairs
+        
+        if n <= self.BLOCKING_MIN_SIZE:
+            return [(i, j) for i in range(n) for j in range(i + 1, n)]
+        
+        buckets: Dict[str, List[int]] = defaultdict(list)
+        for idx, c in enumerate(concepts):
+            for token in set(re.findall(r"[a-z0-9]+", (c.get("name", "") or "").lower())):
+                buckets[token].append(idx)
+        
+        pairs = set()
+        for bucket in buckets.values():
+            if len(bucket) > self.NAME_BUCKET_MAX:
+                continue
+            for x, i in enumerate(bucket):
+                for j in bucket[x + 1:]:
+                    pairs.add((i, j))
+        return sorted(pairs)
+    
     def select_representative(self, cluster: List[Dict[str, Any]]) -> str:
         """
         Select representative concept from cluster and MERGE attributes.
@@ -0,0 +1,373 @@
+"""
+Segment Vector Store: append-only local vector store for chunk retrieval.
+
+Replaces the LlamaIndex JSON docstore that had to be fully loaded, mutated
+and re-persisted on every ingest.
+
+Layout (one directory):
+    manifest.json          {"version", "dim", "segments": [{"name", "count"}],
+                            "retired": [{"name", "retired_at"}]}
+    seg-<id>.npy           float32 (count, dim) L2-normalized embedding matrix
+    seg-<id>.jsonl         one {"text", "metadata"} record per row
+    manifest.lock          short-lived lock held only while swapping the manifest
+
+Writers:
+- append() writes a brand-new segment (no lock), then atomically publishes it
+  by rewriting the manifest under the lock. Concurrent ingests never block
+  on each other for longer than a manifest swap.
+- compact() merges small segments into one and swaps them out of the
+  manifest the same way (safe to run in the background). Replaced segments
+  are only retired: their files are deleted by a later manifest swap once
+  RETIRED_GRACE_SECONDS have passed, so readers still holding the previous
+  manifest can finish their search.
+
+Migration:
+- A directory still holding the LlamaIndex JSON docstore (docstore.json +
+  default__vector_store.json) is imported into one segment the first time
+  it is opened or appended to; docstore.json is then renamed *.migrated.
+
+Readers:
+- open() only reads the manifest. Embedding matrices are memory-mapped
+  (np.load(mmap_mode="r")) and record files are read lazily per segment,
+  only for the rows that make the top-k.
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend.utils.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+
+def default_vector_store_dir() -> str:
+    """Default store location used by Knowledge Extraction (writer) and readers"""
+    return os.path.join(os.getcwd(), "backend", "storage", "vector_store")
+
+
+@dataclass
+class RetrievedChunk:
+    """Search hit (mirrors the NodeWithScore surface used by the agents)"""
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    score: float = 0.0
+
+    def get_content(self) -> str:
+        return self.text
+
+
+class SegmentVectorStore:
+    """
+    Append-only, segment-based vector store.
+
+    Usage:
+        store = SegmentVectorStore.open(path)           # cheap: manifest only
+        store.append(texts, embeddings, metadatas)      # writer
+        hits = store.search(query_embedding, top_k=3)   # reader
+    """
+
+    MANIFEST = "manifest.json"
+    LOCK = "manifest.lock"
+    COMPACT_MIN_SEGMENTS = 8        # Compact once this many segments exist
+    COMPACT_MAX_SEGMENT_ROWS = 50000  # Segments larger than this are left alone
+    RETIRED_GRACE_SECONDS = 600     # Compacted-away segment files outlive the swap this long
+    LEGACY_DOCSTORE = "docstore.json"
+    LEGACY_VECTORS = "default__vector_store.json"
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._manifest: Dict[str, Any] = {"version": 0, "dim": None, "segments": [], "retired": []}
+        self._manifest_mtime: Optional[int] = None
+        self._matrices: Dict[str, np.ndarray] = {}
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+
+    # ------------------------------------------------------------------
+    # Manifest handling
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def open(cls, root_dir: Optional[str] = None) -> "SegmentVectorStore":
+        store = cls(root_dir or default_vector_store_dir())
+        if store._has_legacy_docstore() and not os.path.exists(store._path(cls.MANIFEST)):
+            with file_lock(store._path(cls.LOCK), timeout=60):
+                store._migrate_legacy_docstore()
+        store.refresh()
+        return store
+
+    @classmethod
+    def exists(cls, root_dir: Optional[str] = None) -> bool:
+        root_dir = root_dir or default_vector_store_dir()
+        return (
+            os.path.exists(os.path.join(root_dir, cls.MANIFEST))
+            or os.path.exists(os.path.join(root_dir, cls.LEGACY_DOCSTORE))
+        )
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root_dir, name)
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        path = self._path(self.MANIFEST)
+        if not os.path.exists(path):
+            return {"version": 0, "dim": None, "segments": [], "retired": []}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp = self._path(f"{self.MANIFEST}.{uuid.uuid4().hex}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self._path(self.MANIFEST))  # Atomic publish
+
+    def refresh(self) -> bool:
+        """Reload the manifest if another process changed it. Returns True if reloaded."""
+        path = self._path(self.MANIFEST)
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        if mtime == self._manifest_mtime:
+            return False
+        self._manifest = self._read_manifest()
+        self._manifest_mtime = mtime
+        live = {s["name"] for s in self._manifest["segments"]}
+        for cache in (self._matrices, self._records):
+            for name in [n for n in cache if n not in live]:
+                del cache[name]
+        return True
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._manifest.get("dim")
+
+    @property
+    def segments(self) -> List[Dict[str, Any]]:
+        return list(self._manifest["segments"])
+
+    def __len__(self) -> int:
+        return sum(s["count"] for s in self._manifest["segments"])
+
+    # ------------------------------------------------------------------
+    # Segment IO
+    # ------------------------------------------------------------------
+
+    def _write_segment(self, matrix: np.ndarray, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        name = f"seg-{uuid.uuid4().hex[:12]}"
+        np.save(self._path(f"{name}.npy"), matrix)
+        with open(self._path(f"{name}.jsonl"), "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return {"name": name, "count": len(records)}
+
+    def _matrix(self, name: str) -> np.ndarray:
+        if name not in self._matrices:
+            self._matrices[name] = np.load(self._path(f"{name}.npy"), mmap_mode="r")
+        return self._matrices[name]
+
+    def _segment_records(self, name: str) -> List[Dict[str, Any]]:
+        if name not in self._records:
+            with open(self._path(f"{name}.jsonl"), "r", encoding="utf-8") as f:
+                self._records[name] = [json.loads(line) for line in f if line.strip()]
+        return self._records[name]
+
+    def _remove_segment_files(self, names: Sequence[str]) -> None:
+        for name in names:
+            for ext in (".npy", ".jsonl"):
+                try:
+                    os.remove(self._path(f"{name}{ext}"))
+                except OSError as e:
+                    # Still memory-mapped by a reader on some platforms; harmless leftover
+                    logger.debug(f"Could not remove {name}{ext}: {e}")
+
+    def _purge_retired(self, manifest: Dict[str, Any]) -> None:
+        """Delete retired segments past their grace period (call under the lock)"""
+        cutoff = time.time() - self.RETIRED_GRACE_SECONDS
+        retired = manifest.get("retired", [])
+        expired = [r["name"] for r in retired if r["retired_at"] <= cutoff]
+        if expired:
+            self._remove_segment_files(expired)
+            manifest["retired"] = [r for r in retired if r["retired_at"] > cutoff]
+
+    def _has_legacy_docstore(self) -> bool:
+        return os.path.exists(self._path(self.LEGACY_DOCSTORE))
+
+    def _migrate_legacy_docstore(self) -> int:
+        """
+        Import the LlamaIndex JSON docstore into one segment (call under the
+        lock). Returns the number of rows imported.
+        """
+        if os.path.exists(self._path(self.MANIFEST)) or not self._has_legacy_docstore():
+            return 0  # Already migrated by another process
+
+        with open(self._path(self.LEGACY_DOCSTORE), "r", encoding="utf-8") as f:
+            nodes = json.load(f).get("docstore/data", {})
+        embeddings: Dict[str, List[float]] = {}
+        if os.path.exists(self._path(self.LEGACY_VECTORS)):
+            with open(self._path(self.LEGACY_VECTORS), "r", encoding="utf-8") as f:
+                embeddings = json.load(f).get("embedding_dict", {})
+
+        rows = []
+        for node_id, node in nodes.items():
+            data = node.get("__data__", node)
+            if isinstance(data, str):
+                data = json.loads(data)
+            vector = embeddings.get(node_id) or data.get("embedding")
+            if vector and data.get("text"):
+                rows.append((data["text"], vector, data.get("metadata") or {}))
+
+        manifest = {"version": 1, "dim": None, "segments": [], "retired": []}
+        if rows:
+            matrix = self._normalize(np.vstack([np.asarray(r[1], dtype=np.float32) for r in rows]))
+            manifest["dim"] = int(matrix.shape[1])
+            manifest["segments"].append(
+                self._write_segment(matrix, [{"text": r[0], "metadata": r[2]} for r in rows])
+            )
+        self._write_manifest(manifest)
+        os.replace(self._path(self.LEGACY_DOCSTORE), self._path(f"{self.LEGACY_DOCSTORE}.migrated"))
+        logger.info(f"📦 Migrated {len(rows)} of {len(nodes)} legacy docstore nodes into the segment store")
+        return len(rows)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    # ------------------------------------------------------------------
+    # Writers
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None
+    ) -> Optional[str]:
+        """
+        Append one segment. Only the manifest swap is done under the lock.
+
+        Returns:
+            The new segment name (None if nothing to append)
+        """
+        if not texts:
+            return None
+        metadatas = metadatas or [{} for _ in texts]
+        matrix = self._normalize(np.vstack([np.asarray(e, dtype=np.float32) for e in embeddings]))
+
+        os.makedirs(self.root_dir, exist_ok=True)
+        segment = self._write_segment(
+            matrix,
+            [{"text": t, "metadata": m} for t, m in zip(texts, metadatas)]
+        )
+
+        with file_lock(self._path(self.LOCK), timeout=30):
+            self._migrate_legacy_docstore()
+            manifest = self._read_manifest()
+            if manifest.get("dim") is None:
+                manifest["dim"] = int(matrix.shape[1])
+            elif manifest["dim"] != matrix.shape[1]:
+                self._remove_segment_files([segment["name"]])
+                raise ValueError(f"Embedding dim {matrix.shape[1]} != store dim {manifest['dim']}")
+            manifest["segments"].append(segment)
+            manifest["version"] = manifest.get("version", 0) + 1
+            self._purge_retired(manifest)
+            self._write_manifest(manifest)
+
+        self.refresh()
+        return segment["name"]
+
+    def needs_compaction(self) -> bool:
+        small = [s for s in self._manifest["segments"] if s["count"] < self.COMPACT_MAX_SEGMENT_ROWS]
+        return len(small) >= self.COMPACT_MIN_SEGMENTS
+
+    def compact(self) -> int:
+        """
+        Merge small segments into one. Segments appended while compacting are
+        preserved; the merged ones are retired (deleted after the grace period).
+        Returns the number of segments merged.
+        """
+        self.refresh()
+        victims = [s for s in self._manifest["segments"] if s["count"] < self.COMPACT_MAX_SEGMENT_ROWS]
+        if len(victims) < 2:
+            return 0
+
+        matrix = np.vstack([np.asarray(self._matrix(s["name"])) for s in victims])
+        records = [r for s in victims for r in self._segment_records(s["name"])]
+        merged = self._write_segment(matrix, records)
+        victim_names = {s["name"] for s in victims}
+
+        with file_lock(self._path(self.LOCK), timeout=30):
+            manifest = self._read_manifest()
+            current = [s for s in manifest["segments"] if s["name"] not in victim_names]
+            if len(current) + len(victim_names) != len(manifest["segments"]):
+                # Someone else compacted concurrently; drop our result
+                self._remove_segment_files([merged["name"]])
+                return 0
+            manifest["segments"] = [merged] + current
+            manifest["version"] = manifest.get("version", 0) + 1
+            self._purge_retired(manifest)
+            retired_at = time.time()
+            manifest.setdefault("retired", []).extend(
+                {"name": name, "retired_at": retired_at} for name in sorted(victim_names)
+            )
+            self._write_manifest(manifest)
+
+        self.refresh()
+        logger.info(f"🗜️ Compacted {len(victim_names)} segments ({len(records)} rows) into {merged['name']}")
+        return len(victim_names)
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def search(self, query_embedding: Sequence[float], top_k: int = 5) -> List[RetrievedChunk]:
+        """Exact cosine top-k over memory-mapped segments"""
+        self.refresh()
+        if not self._manifest["segments"]:
+            return []
+
+        query = self._normalize(query_embedding)[0]
+        if self.dim is not None and query.shape[0] != self.dim:
+            logger.warning(f"Query dim {query.shape[0]} != store dim {self.dim}")
+            return []
+
+        best: List[tuple] = []  # (score, segment name, row)
+        for segment in self._manifest["segments"]:
+            scores = np.asarray(self._matrix(segment["name"]) @ query)
+            k = min(top_k, len(scores))
+            if k == 0:
+                continue
+            idx = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+            best.extend((float(scores[i]), segment["name"], int(i)) for i in idx)
+
+        best.sort(key=lambda x: x[0], reverse=True)
+        hits = []
+        for score, name, row in best[:top_k]:
+            record = self._segment_records(name)[row]
+            hits.append(RetrievedChunk(text=record["text"], metadata=record.get("metadata", {}), score=score))
+        return hits
+
+    def as_retriever(self, embed_model: Any, similarity_top_k: int = 5) -> "SegmentRetriever":
+        return SegmentRetriever(self, embed_model, similarity_top_k)
+
+
+class SegmentRetriever:
+    """Minimal async retriever (aretrieve) over a SegmentVectorStore"""
+
+    def __init__(self, store: SegmentVectorStore, embed_model: Any, similarity_top_k: int = 5):
+        self.store = store
+        self.embed_model = embed_model
+        self.similarity_top_k = similarity_top_k
+
+    async def aretrieve(self, query: str) -> List[RetrievedChunk]:
+        if hasattr(self.embed_model, "aget_query_embedding"):
+            embedding = await self.embed_model.aget_query_embedding(query)
+        else:
+            embedding = await self.embed_model.aget_text_embedding(query)
+        return self.store.search(embedding, top_k=self.similarity_top_k)
@@ -56,10 +56,11 @@ async def run_audit():
     RETURN labels(n)[0] as label, count(n) as count
     ORDER BY count DESC
     """
+    # Records are streamed (server-side cursor) and folded as they arrive
     try:
-        nodes = await client.run_query(node_query)
+        nodes = [n async for n in client.stream_query(node_query)]
     except Exception:
-        nodes = await client.run_query(node_query_fallback)
+        nodes = [n async for n in client.stream_query(node_query_fallback)]
         
     total_nodes = sum([n.get('count', 0) for n in nodes])
     print(f"Total Nodes: {total_nodes}")
@@ -75,11 +76,13 @@ async def run_audit():
     RETURN type(r) as type, count(r) as count
     ORDER BY count DESC
     """
-    rels = await client.run_query(rel_query)
-    total_rels = sum([r.get('count', 0) for r in rels])
-    print(f"Total Relationships: {total_rels}")
-    for r in rels:
+    total_rels = 0
+    rel_types = 0
+    async for r in client.stream_query(rel_query):
+        total_rels += r.get('count', 0)
+        rel_types += 1
         print(f"  - {r.get('type', 'Unknown')}: {r.get('count', 0)}")
+    print(f"Total Relationships: {total_rels}")
     
     # ============================================
     # METRIC 3: Orphan Nodes (No Outgoing Rels)
@@ -90,13 +93,12 @@ async def run_audit():
     WHERE NOT (n)-->() AND NOT (n)<--()
     RETURN labels(n)[0] as label, count(n) as count
     """
-    orphans = await client.run_query(orphan_query)
-    total_orphans = sum([o.get('count', 0) for o in orphans])
+    total_orphans = 0
+    async for o in client.stream_query(orphan_query):
+        total_orphans += o.get('count', 0)
+        print(f"  - {o.get('label', 'Unknown')}: {o.get('count', 0)}")
     print(f"Total Orphan Nodes: {total_orphans}")
-    if orphans:
-        for o in orphans:
-            print(f"  - {o.get('label', 'Unknown')}: {o.get('count', 0)}")
-    else:
+    if not total_orphans:
         print("  (No orphans - Good!)")
     
     # ============================================
@@ -133,11 +135,11 @@ async def run_audit():
         print("[ 0] Node Count: FAIL (< 10 nodes)")
     
     # Relationship Variety
-    if len(rels) >= 2:
+    if rel_types >= 2:
         score += 20
-        print(f"[+20] Relationship Variety: PASS ({len(rels)} types)")
+        print(f"[+20] Relationship Variety: PASS ({rel_types} types)")
     else:
-        print(f"[ 0] Relationship Variety: FAIL ({len(rels)} types)")
+        print(f"[ 0] Relationship Variety: FAIL ({rel_types} types)")
         
     # Orphan Ratio
     orphan_ratio = (total_orphans / total_nodes * 100) if total_nodes > 0 else 100
@@ -4,7 +4,7 @@ Automates the execution of multiple experiment runs to generate statistical data
 
 Features:
 - Alternates between Control (Baseline) and Treatment (Agentic) groups.
-- Handles Rate Limiting (Sleep intervals).
+- Optional sleep between runs (each run rate-limits and retries its own LLM calls).
 - Resilient to individual run failures.
 - Progress tracking.
 
@@ -79,7 +79,7 @@ def main():
     parser = argparse.ArgumentParser(description="Batch Experiment Runner")
     parser.add_argument("--n", type=int, default=10, help="Total number of runs")
     parser.add_argument("--real", action="store_true", help="Use Real LLM")
-    parser.add_argument("--delay", type=int, default=10, help="Delay between runs (seconds)")
+    parser.add_argument("--delay", type=int, default=0, help="Extra delay between runs (seconds)")
     args = parser.parse_args()
     
     LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -109,7 +109,7 @@ def main():
         print(f"Progress: {i}/{args.n} | Success: {successful_runs} | Fail: {failed_runs}")
         
         # Sleep to be nice to APIs
-        if i < args.n:
+        if args.delay and i < args.n:
             print(f"Sleeping {args.delay}s...")
             time.sleep(args.delay)
             
@@ -120,8 +120,14 @@ async def run_mock_mode():
         {"learner5": {"SQL_JOIN": 0.4}}
     ]
     
-    # Patch the _retrieve_all_learner_graphs method to avoid Neo4j complexity
-    with patch.object(agent, '_retrieve_all_learner_graphs', new=AsyncMock(return_value=mock_learner_graphs)):
+    async def mock_learner_stream():
+        for graph in mock_learner_graphs:
+            yield graph
+    
+    # Fail the server-side aggregation so analysis falls back to the learner
+    # graph stream, patched to avoid Neo4j complexity
+    state_manager.neo4j.run_many = AsyncMock(return_value=None)
+    with patch.object(agent, '_stream_learner_graphs', new=mock_learner_stream):
         res_analysis = await agent._analyze_system(min_learners=5)
         
         stats = res_analysis['statistics'].get('SQL_JOIN', {})